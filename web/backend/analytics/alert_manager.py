@@ -1,11 +1,28 @@
 """
 Alert System - Epic 13: Story 13.8
 Manage performance alerts and notifications
+
+Rules are evaluated incrementally: each completed execution updates
+per-workflow sliding windows (e.g. "last 15 minutes") and only that
+workflow's rules are checked. Alerts are deduplicated by fingerprint
+(rule + workflow), rate limited by a per-rule cooldown, and kept in an
+indexed store so lookups and filtering do not scan every alert
+(SharedAlertStore keeps the same indexes in the shared metrics database
+when several workers serve the API).
 """
 
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime, timedelta
+from collections import deque
 from enum import Enum
+import itertools
+import json
+import sqlite3
+import time
+
+from utils.metrics_store import get_connection as get_metrics_connection
+
+_alert_sequence = itertools.count(1)
 
 
 class AlertType(Enum):
@@ -35,9 +52,12 @@ class Alert:
         message: str,
         workflow_id: str = None,
         workflow_name: str = None,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        rule_id: str = None
     ):
-        self.id = f"alert-{datetime.now().timestamp()}"
+        self.id = f"alert-{datetime.now().timestamp()}-{next(_alert_sequence)}"
+        self.rule_id = rule_id
+        self.fingerprint = f"{rule_id}:{workflow_id}"
         self.alert_type = alert_type
         self.severity = severity
         self.message = message
@@ -47,6 +67,14 @@ class Alert:
         self.created_at = datetime.now()
         self.acknowledged = False
         self.acknowledged_at: Optional[datetime] = None
+        self.occurrences = 1
+        self.last_seen_at = self.created_at
+
+    def record_occurrence(self, metadata: Dict[str, Any]):
+        """Fold a repeat firing into this (still open) alert"""
+        self.occurrences += 1
+        self.last_seen_at = datetime.now()
+        self.metadata = metadata
 
     def acknowledge(self):
         """Mark alert as acknowledged"""
@@ -57,6 +85,8 @@ class Alert:
         """Convert to dictionary"""
         return {
             "id": self.id,
+            "ruleId": self.rule_id,
+            "fingerprint": self.fingerprint,
             "alertType": self.alert_type.value,
             "severity": self.severity.value,
             "message": self.message,
@@ -65,7 +95,9 @@ class Alert:
             "metadata": self.metadata,
             "createdAt": self.created_at.isoformat(),
             "acknowledged": self.acknowledged,
-            "acknowledgedAt": self.acknowledged_at.isoformat() if self.acknowledged_at else None
+            "acknowledgedAt": self.acknowledged_at.isoformat() if self.acknowledged_at else None,
+            "occurrences": self.occurrences,
+            "lastSeenAt": self.last_seen_at.isoformat()
         }
 
 
@@ -78,13 +110,31 @@ class AlertRule:
         alert_type: AlertType,
         severity: AlertSeverity,
         condition: Callable[[Dict[str, Any]], bool],
-        message_template: str
+        message_template: str,
+        window_minutes: int = 15,
+        min_executions: int = 1,
+        cooldown_seconds: int = 900
     ):
+        """
+        Args:
+            rule_id: Unique rule identifier
+            alert_type: Type of alert raised
+            severity: Severity of alert raised
+            condition: Predicate over window metrics (same keys as
+                MetricsCollector.get_workflow_metrics)
+            message_template: str.format template over the metrics
+            window_minutes: Sliding window the rule is evaluated over
+            min_executions: Minimum executions in the window before evaluating
+            cooldown_seconds: Minimum time between alerts for one workflow
+        """
         self.rule_id = rule_id
         self.alert_type = alert_type
         self.severity = severity
         self.condition = condition
         self.message_template = message_template
+        self.window_minutes = window_minutes
+        self.min_executions = min_executions
+        self.cooldown_seconds = cooldown_seconds
         self.enabled = True
 
     def check(self, metrics: Dict[str, Any]) -> Optional[Alert]:
@@ -92,6 +142,9 @@ class AlertRule:
         if not self.enabled:
             return None
 
+        if metrics.get("totalExecutions", 0) < self.min_executions:
+            return None
+
         if self.condition(metrics):
             message = self.message_template.format(**metrics)
             return Alert(
@@ -100,20 +153,331 @@ class AlertRule:
                 message=message,
                 workflow_id=metrics.get("workflowId"),
                 workflow_name=metrics.get("workflowName"),
-                metadata=metrics
+                metadata=metrics,
+                rule_id=self.rule_id
             )
 
         return None
 
 
+class SlidingWindow:
+    """Execution counters over a trailing time window, updated incrementally"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._events: deque = deque()  # (timestamp, completed, failed, duration_ms)
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.duration_sum = 0
+        self.duration_count = 0
+
+    def add(self, timestamp: float, completed: bool, failed: bool, duration_ms: Optional[int]):
+        """Record one execution and evict anything that fell out of the window"""
+        self._events.append((timestamp, completed, failed, duration_ms))
+        self.total += 1
+        self.successful += completed
+        self.failed += failed
+        if duration_ms:
+            self.duration_sum += duration_ms
+            self.duration_count += 1
+        self.evict(timestamp)
+
+    def evict(self, now: float):
+        """Drop executions older than the window"""
+        cutoff = now - self.window_seconds
+        events = self._events
+        while events and events[0][0] < cutoff:
+            _, completed, failed, duration_ms = events.popleft()
+            self.total -= 1
+            self.successful -= completed
+            self.failed -= failed
+            if duration_ms:
+                self.duration_sum -= duration_ms
+                self.duration_count -= 1
+
+    def to_metrics(self, workflow_id: str, workflow_name: str) -> Dict[str, Any]:
+        """Window counters in the shape of MetricsCollector.get_workflow_metrics"""
+        return {
+            "workflowId": workflow_id,
+            "workflowName": workflow_name,
+            "windowMinutes": self.window_seconds / 60,
+            "totalExecutions": self.total,
+            "successfulExecutions": self.successful,
+            "failedExecutions": self.failed,
+            "successRate": (self.successful / self.total * 100) if self.total > 0 else 0,
+            "averageDurationMs": int(self.duration_sum / self.duration_count) if self.duration_count else 0
+        }
+
+
+class AlertStore:
+    """
+    Alerts indexed by ID, workflow, severity, open state and fingerprint
+
+    All indexes are insertion-ordered dicts, so filtered results come back in
+    creation order and expiry pops from the front without scanning.
+    """
+
+    def __init__(self):
+        self.by_id: Dict[str, Alert] = {}
+        self.by_workflow: Dict[Optional[str], Dict[str, None]] = {}
+        self.by_severity: Dict[AlertSeverity, Dict[str, None]] = {}
+        self.open: Dict[str, None] = {}
+        self.open_by_fingerprint: Dict[str, Alert] = {}
+        # fingerprint -> epoch seconds the last alert was raised
+        self._last_fired: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def open_count(self) -> int:
+        return len(self.open)
+
+    def all(self) -> List[Alert]:
+        return list(self.by_id.values())
+
+    def add(self, alert: Alert) -> bool:
+        """Store a new alert; False if an open alert already has its fingerprint"""
+        if alert.fingerprint in self.open_by_fingerprint:
+            return False
+        self.by_id[alert.id] = alert
+        self.by_workflow.setdefault(alert.workflow_id, {})[alert.id] = None
+        self.by_severity.setdefault(alert.severity, {})[alert.id] = None
+        self.open[alert.id] = None
+        self.open_by_fingerprint[alert.fingerprint] = alert
+        return True
+
+    def get(self, alert_id: str) -> Optional[Alert]:
+        return self.by_id.get(alert_id)
+
+    def find_open(self, fingerprint: str) -> Optional[Alert]:
+        return self.open_by_fingerprint.get(fingerprint)
+
+    def record_occurrence(self, alert: Alert, metadata: Dict[str, Any]):
+        alert.record_occurrence(metadata)
+
+    def acknowledge(self, alert: Alert):
+        alert.acknowledge()
+        self._close(alert)
+
+    def last_fired(self, fingerprint: str) -> Optional[float]:
+        return self._last_fired.get(fingerprint)
+
+    def set_last_fired(self, fingerprint: str, timestamp: float):
+        self._last_fired[fingerprint] = timestamp
+
+    def _close(self, alert: Alert):
+        self.open.pop(alert.id, None)
+        if self.open_by_fingerprint.get(alert.fingerprint) is alert:
+            del self.open_by_fingerprint[alert.fingerprint]
+
+    def _remove(self, alert: Alert):
+        del self.by_id[alert.id]
+        workflow_ids = self.by_workflow[alert.workflow_id]
+        del workflow_ids[alert.id]
+        if not workflow_ids:
+            del self.by_workflow[alert.workflow_id]
+        del self.by_severity[alert.severity][alert.id]
+        self._close(alert)
+
+    def _oldest(self) -> Optional[Alert]:
+        return next(iter(self.by_id.values()), None)
+
+    def prune(self, cutoff: datetime):
+        """Drop alerts created at or before `cutoff`"""
+        oldest = self._oldest()
+        while oldest is not None and oldest.created_at <= cutoff:
+            self._remove(oldest)
+            oldest = self._oldest()
+
+    def trim(self, max_alerts: int):
+        """Drop the oldest alerts beyond `max_alerts`"""
+        while len(self.by_id) > max_alerts:
+            self._remove(self._oldest())
+
+    def query(
+        self,
+        workflow_id: str = None,
+        acknowledged: bool = None,
+        severity: AlertSeverity = None
+    ) -> List[Alert]:
+        """Filter by walking the smallest matching index"""
+        candidates = [self.by_id]
+        if workflow_id:
+            candidates.append(self.by_workflow.get(workflow_id, {}))
+        if acknowledged is False:
+            candidates.append(self.open)
+        if severity:
+            candidates.append(self.by_severity.get(severity, {}))
+        ids = min(candidates, key=len)
+
+        results = []
+        for alert_id in ids:
+            alert = self.by_id[alert_id]
+            if workflow_id and alert.workflow_id != workflow_id:
+                continue
+            if acknowledged is not None and alert.acknowledged != acknowledged:
+                continue
+            if severity and alert.severity != severity:
+                continue
+            results.append(alert)
+        return results
+
+
+class SharedAlertStore:
+    """
+    AlertStore kept in the shared metrics database (multi-worker)
+
+    Same interface as AlertStore. A partial unique index on open alert
+    fingerprints deduplicates across workers; filters use the alerts
+    table's indexes.
+    """
+
+    _COLUMNS = (
+        "id, rule_id, fingerprint, alert_type, severity, message, workflow_id, workflow_name, "
+        "metadata, created_at, acknowledged, acknowledged_at, occurrences, last_seen_at"
+    )
+
+    def __len__(self) -> int:
+        return get_metrics_connection().execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+    def open_count(self) -> int:
+        return get_metrics_connection().execute(
+            "SELECT COUNT(*) FROM alerts WHERE acknowledged = 0"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _from_row(row) -> Alert:
+        alert = Alert(
+            alert_type=AlertType(row[3]),
+            severity=AlertSeverity(row[4]),
+            message=row[5],
+            workflow_id=row[6],
+            workflow_name=row[7],
+            metadata=json.loads(row[8]) if row[8] else {},
+            rule_id=row[1]
+        )
+        alert.id = row[0]
+        alert.fingerprint = row[2]
+        alert.created_at = datetime.fromisoformat(row[9])
+        alert.acknowledged = bool(row[10])
+        alert.acknowledged_at = datetime.fromisoformat(row[11]) if row[11] else None
+        alert.occurrences = row[12]
+        alert.last_seen_at = datetime.fromisoformat(row[13])
+        return alert
+
+    def _select(self, where: str = "", params: tuple = ()) -> List[Alert]:
+        rows = get_metrics_connection().execute(
+            f"SELECT {self._COLUMNS} FROM alerts {where} ORDER BY seq", params
+        ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def all(self) -> List[Alert]:
+        return self._select()
+
+    def add(self, alert: Alert) -> bool:
+        try:
+            get_metrics_connection().execute(
+                f"INSERT INTO alerts ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, NULL, ?, ?)",
+                (alert.id, alert.rule_id, alert.fingerprint, alert.alert_type.value,
+                 alert.severity.value, alert.message, alert.workflow_id, alert.workflow_name,
+                 json.dumps(alert.metadata, default=str), alert.created_at.isoformat(),
+                 alert.occurrences, alert.last_seen_at.isoformat())
+            )
+            return True
+        except sqlite3.IntegrityError:
+            # Another worker opened an alert with this fingerprint first
+            return False
+
+    def get(self, alert_id: str) -> Optional[Alert]:
+        alerts = self._select("WHERE id = ?", (alert_id,))
+        return alerts[0] if alerts else None
+
+    def find_open(self, fingerprint: str) -> Optional[Alert]:
+        alerts = self._select("WHERE fingerprint = ? AND acknowledged = 0", (fingerprint,))
+        return alerts[0] if alerts else None
+
+    def record_occurrence(self, alert: Alert, metadata: Dict[str, Any]):
+        alert.record_occurrence(metadata)
+        get_metrics_connection().execute(
+            "UPDATE alerts SET occurrences = occurrences + 1, last_seen_at = ?, metadata = ? WHERE id = ?",
+            (alert.last_seen_at.isoformat(), json.dumps(metadata, default=str), alert.id)
+        )
+
+    def acknowledge(self, alert: Alert):
+        alert.acknowledge()
+        get_metrics_connection().execute(
+            "UPDATE alerts SET acknowledged = 1, acknowledged_at = ? WHERE id = ?",
+            (alert.acknowledged_at.isoformat(), alert.id)
+        )
+
+    def last_fired(self, fingerprint: str) -> Optional[float]:
+        row = get_metrics_connection().execute(
+            "SELECT last_fired FROM alert_fires WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_last_fired(self, fingerprint: str, timestamp: float):
+        get_metrics_connection().execute(
+            "INSERT OR REPLACE INTO alert_fires (fingerprint, last_fired) VALUES (?, ?)",
+            (fingerprint, timestamp)
+        )
+
+    def prune(self, cutoff: datetime):
+        get_metrics_connection().execute(
+            "DELETE FROM alerts WHERE created_at <= ?", (cutoff.isoformat(),)
+        )
+
+    def trim(self, max_alerts: int):
+        get_metrics_connection().execute(
+            "DELETE FROM alerts WHERE seq <= (SELECT seq FROM alerts ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+            (max_alerts,)
+        )
+
+    def query(
+        self,
+        workflow_id: str = None,
+        acknowledged: bool = None,
+        severity: AlertSeverity = None
+    ) -> List[Alert]:
+        clauses, params = [], []
+        if workflow_id:
+            clauses.append("workflow_id = ?")
+            params.append(workflow_id)
+        if acknowledged is not None:
+            clauses.append("acknowledged = ?")
+            params.append(int(acknowledged))
+        if severity:
+            clauses.append("severity = ?")
+            params.append(severity.value)
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return self._select(where, tuple(params))
+
+
 class AlertManager:
     """Manages alerts and alert rules"""
 
-    def __init__(self):
-        self.alerts: List[Alert] = []
+    def __init__(self, max_alerts: int = 10000, store=None):
+        """
+        Args:
+            max_alerts: Oldest alerts are dropped beyond this many
+            store: Alert storage (AlertStore, or SharedAlertStore for
+                multi-worker deployments)
+        """
+        self.max_alerts = max_alerts
+        self.store = store if store is not None else AlertStore()
         self.rules: Dict[str, AlertRule] = {}
+        # (workflow_id, window_seconds) -> SlidingWindow
+        self._windows: Dict[Tuple[str, float], SlidingWindow] = {}
+        self.suppressed_count = 0
+        self.deduplicated_count = 0
         self._setup_default_rules()
 
+    @property
+    def alerts(self) -> List[Alert]:
+        """All stored alerts, oldest first"""
+        return self.store.all()
+
     def _setup_default_rules(self):
         """Setup default alert rules"""
 
@@ -123,7 +487,9 @@ class AlertManager:
             alert_type=AlertType.HIGH_FAILURE_RATE,
             severity=AlertSeverity.HIGH,
             condition=lambda m: m.get("successRate", 100) < 80,
-            message_template="Workflow '{workflowName}' has high failure rate: {successRate:.1f}% success"
+            message_template="Workflow '{workflowName}' has high failure rate: {successRate:.1f}% success",
+            window_minutes=15,
+            min_executions=5
         ))
 
         # Slow execution rule
@@ -132,7 +498,9 @@ class AlertManager:
             alert_type=AlertType.SLOW_EXECUTION,
             severity=AlertSeverity.MEDIUM,
             condition=lambda m: m.get("averageDurationMs", 0) > 30000,  # 30 seconds
-            message_template="Workflow '{workflowName}' is running slowly: {averageDurationMs}ms average"
+            message_template="Workflow '{workflowName}' is running slowly: {averageDurationMs}ms average",
+            window_minutes=15,
+            min_executions=3
         ))
 
         # Error spike rule
@@ -141,7 +509,9 @@ class AlertManager:
             alert_type=AlertType.ERROR_SPIKE,
             severity=AlertSeverity.CRITICAL,
             condition=lambda m: m.get("failedExecutions", 0) > 10 and m.get("successRate", 100) < 50,
-            message_template="Error spike detected in '{workflowName}': {failedExecutions} failures"
+            message_template="Error spike detected in '{workflowName}': {failedExecutions} failures",
+            window_minutes=5,
+            cooldown_seconds=300
         ))
 
     def add_rule(self, rule: AlertRule):
@@ -169,18 +539,113 @@ class AlertManager:
             return True
         return False
 
+    def record_execution(
+        self,
+        workflow_id: str,
+        workflow_name: str,
+        status: str,
+        duration_ms: Optional[int] = None,
+        timestamp: float = None,
+        evaluate: bool = True
+    ) -> List[Alert]:
+        """
+        Feed one completed execution into the sliding windows and evaluate
+        this workflow's rules
+
+        Args:
+            workflow_id: Workflow the execution belongs to
+            workflow_name: Workflow display name (used in messages)
+            status: Final execution status value ("completed", "failed", ...)
+            duration_ms: Execution duration
+            timestamp: Completion time (epoch seconds, defaults to now)
+            evaluate: Set False to only update the windows (e.g. for executions
+                another worker already evaluated)
+
+        Returns:
+            Alerts newly raised by this execution
+        """
+        now = timestamp if timestamp is not None else time.time()
+        completed = status == "completed"
+        failed = status == "failed"
+
+        window_metrics: Dict[float, Dict[str, Any]] = {}
+        new_alerts = []
+
+        for rule in self.rules.values():
+            if not rule.enabled:
+                continue
+
+            window_seconds = rule.window_minutes * 60
+            metrics = window_metrics.get(window_seconds)
+            if metrics is None:
+                key = (workflow_id, window_seconds)
+                window = self._windows.get(key)
+                if window is None:
+                    window = self._windows[key] = SlidingWindow(window_seconds)
+                window.add(now, completed, failed, duration_ms)
+                metrics = window_metrics[window_seconds] = window.to_metrics(workflow_id, workflow_name)
+
+            if not evaluate:
+                continue
+
+            alert = self._raise(rule, metrics)
+            if alert:
+                new_alerts.append(alert)
+
+        return new_alerts
+
+    def observe_execution(self, execution: Any, evaluate: bool = True) -> List[Alert]:
+        """
+        record_execution() for a completed WorkflowExecution
+
+        Matches the MetricsCollector.add_listener callback signature.
+        """
+        completed_at = execution.completed_at or datetime.now()
+        return self.record_execution(
+            workflow_id=execution.workflow_id,
+            workflow_name=execution.workflow_name,
+            status=execution.status.value,
+            duration_ms=execution.duration_ms,
+            timestamp=completed_at.timestamp(),
+            evaluate=evaluate
+        )
+
     def check_metrics(self, metrics: Dict[str, Any]) -> List[Alert]:
-        """Check metrics against all rules"""
+        """Check a precomputed metrics dict against all rules"""
         new_alerts = []
 
         for rule in self.rules.values():
-            alert = rule.check(metrics)
+            alert = self._raise(rule, metrics)
             if alert:
-                self.alerts.append(alert)
                 new_alerts.append(alert)
 
         return new_alerts
 
+    def _raise(self, rule: AlertRule, metrics: Dict[str, Any]) -> Optional[Alert]:
+        """Evaluate a rule, applying fingerprint dedup and cooldown"""
+        alert = rule.check(metrics)
+        if not alert:
+            return None
+
+        existing = self.store.find_open(alert.fingerprint)
+        if existing is not None:
+            self.store.record_occurrence(existing, alert.metadata)
+            self.deduplicated_count += 1
+            return None
+
+        now = time.time()
+        last_fired = self.store.last_fired(alert.fingerprint)
+        if last_fired is not None and now - last_fired < rule.cooldown_seconds:
+            self.suppressed_count += 1
+            return None
+
+        if not self.store.add(alert):
+            self.deduplicated_count += 1
+            return None
+        self.store.set_last_fired(alert.fingerprint, now)
+        self.store.trim(self.max_alerts)
+        return alert
+
     def get_alerts(
         self,
         workflow_id: str = None,
@@ -188,31 +653,26 @@ class AlertManager:
         severity: AlertSeverity = None
     ) -> List[Alert]:
         """Get alerts with optional filtering"""
-        filtered = self.alerts
-
-        if workflow_id:
-            filtered = [a for a in filtered if a.workflow_id == workflow_id]
-
-        if acknowledged is not None:
-            filtered = [a for a in filtered if a.acknowledged == acknowledged]
-
-        if severity:
-            filtered = [a for a in filtered if a.severity == severity]
-
-        return filtered
+        return self.store.query(workflow_id, acknowledged, severity)
 
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert"""
-        for alert in self.alerts:
-            if alert.id == alert_id:
-                alert.acknowledge()
-                return True
-        return False
+        alert = self.store.get(alert_id)
+        if not alert:
+            return False
+        self.store.acknowledge(alert)
+        return True
 
     def clear_old_alerts(self, days: int = 30):
         """Clear alerts older than specified days"""
-        cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        self.alerts = [
-            a for a in self.alerts
-            if a.created_at.timestamp() > cutoff
-        ]
+        self.store.prune(datetime.now() - timedelta(days=days))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Alert store and evaluation counters"""
+        return {
+            "totalAlerts": len(self.store),
+            "openAlerts": self.store.open_count(),
+            "deduplicated": self.deduplicated_count,
+            "suppressedByCooldown": self.suppressed_count,
+            "trackedWindows": len(self._windows)
+        }
@@ -3,10 +3,19 @@ Metrics Collection Engine - Epic 13: Story 13.1
 Collect and store workflow execution metrics for analysis
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Callable
 from datetime import datetime, timedelta
 from enum import Enum
 import json
+import threading
+import time
+
+from utils.metrics_store import get_connection as get_metrics_connection
+
+try:
+    from .trend_engine import ExecutionColumnStore
+except ImportError:
+    ExecutionColumnStore = None
 
 
 class ExecutionStatus(Enum):
@@ -67,6 +76,25 @@ class StepExecution:
             "metadata": self.metadata
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StepExecution":
+        """Rebuild a step from to_dict() output"""
+        step = cls(
+            execution_id=data["executionId"],
+            step_id=data["stepId"],
+            step_name=data["stepName"],
+            step_type=data["stepType"],
+            started_at=datetime.fromisoformat(data["startedAt"])
+        )
+        step.completed_at = datetime.fromisoformat(data["completedAt"]) if data.get("completedAt") else None
+        step.duration_ms = data.get("durationMs")
+        step.status = ExecutionStatus(data["status"])
+        step.error_message = data.get("errorMessage")
+        step.input_data = data.get("inputData") or {}
+        step.output_data = data.get("outputData") or {}
+        step.metadata = data.get("metadata") or {}
+        return step
+
 
 class WorkflowExecution:
     """Represents a complete workflow execution"""
@@ -131,6 +159,28 @@ class WorkflowExecution:
             "steps": [s.to_dict() for s in self.steps]
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowExecution":
+        """Rebuild an execution from to_dict() output"""
+        execution = cls(
+            execution_id=data["executionId"],
+            workflow_id=data["workflowId"],
+            workflow_name=data["workflowName"],
+            trigger_type=data.get("triggerType", "manual")
+        )
+        execution.started_at = datetime.fromisoformat(data["startedAt"])
+        execution.completed_at = datetime.fromisoformat(data["completedAt"]) if data.get("completedAt") else None
+        execution.duration_ms = data.get("durationMs")
+        execution.status = ExecutionStatus(data["status"])
+        execution.total_steps = data.get("totalSteps", 0)
+        execution.completed_steps = data.get("completedSteps", 0)
+        execution.failed_steps = data.get("failedSteps", 0)
+        execution.error_message = data.get("errorMessage")
+        execution.trigger_data = data.get("triggerData") or {}
+        execution.context = data.get("context") or {}
+        execution.steps = [StepExecution.from_dict(step) for step in data.get("steps", [])]
+        return execution
+
 
 class MetricsCollector:
     """Collects and manages workflow execution metrics"""
@@ -145,6 +195,21 @@ class MetricsCollector:
         self.retention_days = retention_days
         self.executions: Dict[str, WorkflowExecution] = {}
         self.execution_history: List[WorkflowExecution] = []
+        # Columnar copy of execution_history for vectorized trend analysis
+        self.execution_columns = ExecutionColumnStore() if ExecutionColumnStore else None
+        # Bumped whenever a workflow's history changes (used to key report caches)
+        self.workflow_versions: Dict[str, int] = {}
+        # Called with (execution, local) for every execution added to history
+        self._listeners: List[Callable[[WorkflowExecution, bool], None]] = []
+
+    def add_listener(self, callback: Callable[["WorkflowExecution", bool], None]):
+        """
+        Register a callback for completed executions
+
+        `local` is True when the execution was completed by this process (with
+        the shared backend, other workers' executions arrive with local=False).
+        """
+        self._listeners.append(callback)
 
     def start_execution(
         self,
@@ -228,14 +293,27 @@ class MetricsCollector:
         execution.complete(status=status, error=error)
 
         # Move to history
-        self.execution_history.append(execution)
         del self.executions[execution_id]
+        self._add_to_history(execution, local=True)
 
         # Clean old data
         self._cleanup_old_data()
 
         return True
 
+    def _add_to_history(self, execution: WorkflowExecution, local: bool):
+        """Append a completed execution to the history views and notify listeners"""
+        self.execution_history.append(execution)
+        if self.execution_columns is not None:
+            self.execution_columns.append(execution)
+        self.workflow_versions[execution.workflow_id] = self.workflow_versions.get(execution.workflow_id, 0) + 1
+        for callback in self._listeners:
+            callback(execution, local)
+
+    def get_workflow_version(self, workflow_id: str) -> int:
+        """Number of completed executions recorded for a workflow (cache key)"""
+        return self.workflow_versions.get(workflow_id, 0)
+
     def get_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
         """Get execution by ID (checks both active and history)"""
         # Check active executions
@@ -253,9 +331,15 @@ class MetricsCollector:
         self,
         workflow_id: str,
         start_date: datetime = None,
-        end_date: datetime = None
+        end_date: datetime = None,
+        include_executions: bool = True
     ) -> Dict[str, Any]:
-        """Get aggregated metrics for a workflow"""
+        """
+        Get aggregated metrics for a workflow
+
+        Pass include_executions=False to skip serializing every execution
+        (e.g. when the history is streamed separately via iter_executions).
+        """
         # Filter executions
         executions = [
             e for e in self.execution_history
@@ -301,9 +385,45 @@ class MetricsCollector:
             "minDurationMs": min_duration,
             "maxDurationMs": max_duration,
             "totalDurationMs": total_duration,
-            "executions": [e.to_dict() for e in executions]
+            "executions": [e.to_dict() for e in executions] if include_executions else []
         }
 
+    def iter_executions(
+        self,
+        workflow_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> Iterator[WorkflowExecution]:
+        """Lazily iterate completed executions matching the filters, oldest first"""
+        # _cleanup_old_data rebinds the list rather than mutating it, so this
+        # reference stays a consistent snapshot while the generator is consumed
+        history = self.execution_history
+        for e in history:
+            if workflow_id is not None and e.workflow_id != workflow_id:
+                continue
+            if start_date is not None and e.started_at < start_date:
+                continue
+            if end_date is not None and e.started_at > end_date:
+                continue
+            yield e
+
+    def get_execution_columns(
+        self,
+        workflow_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> "ExecutionColumns":
+        """
+        Get completed executions as columnar arrays for trend analysis
+
+        Slices the columnar store maintained by complete_execution, skipping
+        the per-execution to_dict() serialization done by get_workflow_metrics.
+        Requires NumPy.
+        """
+        if self.execution_columns is None:
+            raise RuntimeError("Columnar execution metrics require numpy")
+        return self.execution_columns.select(workflow_id, start_date, end_date)
+
     def get_global_metrics(
         self,
         start_date: datetime = None,
@@ -408,3 +528,216 @@ class MetricsCollector:
             e for e in self.execution_history
             if e.started_at >= cutoff_date
         ]
+        if self.execution_columns is not None:
+            self.execution_columns.prune_before(cutoff_date)
+
+
+class SharedMetricsCollector(MetricsCollector):
+    """
+    MetricsCollector backed by the shared metrics database (multi-worker)
+
+    Active executions live in the active_executions table so start, step and
+    complete calls may land on different workers. Completed executions are
+    appended to execution_log; every worker tails that log (by seq) into its
+    in-memory history before answering a query, so all workers serve the
+    same numbers and the existing aggregation code is reused unchanged.
+    """
+
+    # Seconds between retention sweeps of the shared execution log
+    DB_CLEANUP_INTERVAL = 60
+
+    def __init__(self, retention_days: int = 90):
+        super().__init__(retention_days)
+        self._last_seq = 0
+        self._last_db_cleanup = 0.0
+        self._completed_locally: set = set()
+        # sync() can be called from report worker threads as well as the loop
+        self._sync_lock = threading.Lock()
+
+    def _load_active(self, conn, execution_id: str) -> Optional[WorkflowExecution]:
+        row = conn.execute(
+            "SELECT payload FROM active_executions WHERE execution_id = ?",
+            (execution_id,)
+        ).fetchone()
+        return WorkflowExecution.from_dict(json.loads(row[0])) if row else None
+
+    def _save_active(self, conn, execution: WorkflowExecution):
+        conn.execute(
+            "INSERT OR REPLACE INTO active_executions (execution_id, payload) VALUES (?, ?)",
+            (execution.execution_id, json.dumps(execution.to_dict(), default=str))
+        )
+
+    def start_execution(
+        self,
+        execution_id: str,
+        workflow_id: str,
+        workflow_name: str,
+        trigger_type: str = "manual",
+        trigger_data: Dict[str, Any] = None
+    ) -> WorkflowExecution:
+        """Start tracking a new workflow execution"""
+        execution = super().start_execution(
+            execution_id, workflow_id, workflow_name, trigger_type, trigger_data
+        )
+        del self.executions[execution_id]
+        self._save_active(get_metrics_connection(), execution)
+        return execution
+
+    def start_step(
+        self,
+        execution_id: str,
+        step_id: str,
+        step_name: str,
+        step_type: str,
+        input_data: Dict[str, Any] = None
+    ) -> Optional[StepExecution]:
+        """Start tracking a step execution"""
+        conn = get_metrics_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            execution = self._load_active(conn, execution_id)
+            if not execution:
+                conn.execute("ROLLBACK")
+                return None
+
+            step = StepExecution(
+                execution_id=execution_id,
+                step_id=step_id,
+                step_name=step_name,
+                step_type=step_type
+            )
+            if input_data:
+                step.input_data = input_data
+
+            execution.add_step(step)
+            self._save_active(conn, execution)
+            conn.execute("COMMIT")
+            return step
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def complete_step(
+        self,
+        execution_id: str,
+        step_id: str,
+        status: ExecutionStatus = ExecutionStatus.COMPLETED,
+        output_data: Dict[str, Any] = None,
+        error: str = None
+    ) -> bool:
+        """Mark a step as completed"""
+        conn = get_metrics_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            execution = self._load_active(conn, execution_id)
+            step = next((s for s in execution.steps if s.step_id == step_id), None) if execution else None
+            if not step:
+                conn.execute("ROLLBACK")
+                return False
+
+            step.complete(status=status, error=error)
+            if output_data:
+                step.output_data = output_data
+            self._save_active(conn, execution)
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def complete_execution(
+        self,
+        execution_id: str,
+        status: ExecutionStatus = ExecutionStatus.COMPLETED,
+        error: str = None
+    ) -> bool:
+        """Mark an execution as completed and publish it to every worker"""
+        conn = get_metrics_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            execution = self._load_active(conn, execution_id)
+            if not execution:
+                conn.execute("ROLLBACK")
+                return False
+
+            execution.complete(status=status, error=error)
+            conn.execute("DELETE FROM active_executions WHERE execution_id = ?", (execution_id,))
+            conn.execute(
+                """
+                INSERT INTO execution_log (execution_id, workflow_id, started_at, payload)
+                VALUES (?, ?, ?, ?)
+                """,
+                (execution_id, execution.workflow_id, execution.started_at.isoformat(),
+                 json.dumps(execution.to_dict(), default=str))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._completed_locally.add(execution_id)
+        self.sync()
+        self._cleanup_old_data()
+        return True
+
+    def sync(self):
+        """Pull executions completed by any worker since the last sync"""
+        with self._sync_lock:
+            rows = get_metrics_connection().execute(
+                "SELECT seq, payload FROM execution_log WHERE seq > ? ORDER BY seq",
+                (self._last_seq,)
+            ).fetchall()
+            for seq, payload in rows:
+                execution = WorkflowExecution.from_dict(json.loads(payload))
+                local = execution.execution_id in self._completed_locally
+                self._completed_locally.discard(execution.execution_id)
+                self._add_to_history(execution, local)
+                self._last_seq = seq
+
+    def get_execution(self, execution_id: str) -> Optional[WorkflowExecution]:
+        """Get execution by ID (checks both active and history)"""
+        execution = self._load_active(get_metrics_connection(), execution_id)
+        if execution:
+            return execution
+        self.sync()
+        return super().get_execution(execution_id)
+
+    def get_workflow_metrics(self, *args, **kwargs) -> Dict[str, Any]:
+        self.sync()
+        return super().get_workflow_metrics(*args, **kwargs)
+
+    def get_global_metrics(self, *args, **kwargs) -> Dict[str, Any]:
+        self.sync()
+        result = super().get_global_metrics(*args, **kwargs)
+        result["runningExecutions"] = get_metrics_connection().execute(
+            "SELECT COUNT(*) FROM active_executions"
+        ).fetchone()[0]
+        return result
+
+    def get_step_metrics(self, *args, **kwargs) -> Dict[str, Any]:
+        self.sync()
+        return super().get_step_metrics(*args, **kwargs)
+
+    def iter_executions(self, *args, **kwargs) -> Iterator[WorkflowExecution]:
+        self.sync()
+        return super().iter_executions(*args, **kwargs)
+
+    def get_execution_columns(self, *args, **kwargs):
+        self.sync()
+        return super().get_execution_columns(*args, **kwargs)
+
+    def get_workflow_version(self, workflow_id: str) -> int:
+        self.sync()
+        return super().get_workflow_version(workflow_id)
+
+    def _cleanup_old_data(self):
+        """Apply retention locally, and periodically to the shared log"""
+        super()._cleanup_old_data()
+        now = time.time()
+        if now - self._last_db_cleanup >= self.DB_CLEANUP_INTERVAL:
+            self._last_db_cleanup = now
+            cutoff = datetime.now() - timedelta(days=self.retention_days)
+            get_metrics_connection().execute(
+                "DELETE FROM execution_log WHERE started_at < ?", (cutoff.isoformat(),)
+            )
+
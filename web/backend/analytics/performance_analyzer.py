@@ -3,11 +3,17 @@ Performance Analysis Engine - Epic 13: Story 13.2
 Analyze workflow performance, detect bottlenecks, and identify patterns
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from collections import defaultdict
 import statistics
 
+try:
+    from .trend_engine import TrendEngine, ExecutionColumns
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 class BottleneckDetector:
     """Detects performance bottlenecks in workflows"""
@@ -126,21 +132,32 @@ class BottleneckDetector:
 class PerformanceAnalyzer:
     """Analyzes workflow performance and trends"""
 
-    def __init__(self):
+    def __init__(self, rolling_window: int = 7):
         self.bottleneck_detector = BottleneckDetector()
+        self.trend_engine = TrendEngine(rolling_window=rolling_window) if NUMPY_AVAILABLE else None
 
     def analyze_trends(
         self,
-        executions: List[Dict[str, Any]],
+        executions: Union[List[Dict[str, Any]], "ExecutionColumns"],
         interval: str = "daily"
     ) -> Dict[str, Any]:
         """
         Analyze performance trends over time
 
+        Uses the vectorized TrendEngine when NumPy is installed (which adds
+        rolling averages, regression slopes and anomaly scores), otherwise
+        falls back to grouping dictionaries per period.
+
         Args:
-            executions: List of execution dictionaries
+            executions: List of execution dictionaries, or ExecutionColumns
+                (see MetricsCollector.get_execution_columns)
             interval: Grouping interval ('hourly', 'daily', 'weekly')
         """
+        if self.trend_engine is not None:
+            if not isinstance(executions, ExecutionColumns):
+                executions = ExecutionColumns.from_dicts(executions)
+            return self.trend_engine.analyze(executions, interval)
+
         if not executions:
             return {"trends": [], "summary": {}}
 
@@ -181,6 +198,20 @@ class PerformanceAnalyzer:
             "summary": summary
         }
 
+    def analyze_workflow_trends(
+        self,
+        columns: "ExecutionColumns",
+        interval: str = "daily"
+    ) -> Dict[str, Any]:
+        """
+        Summarize trends for every workflow in `columns` at once
+
+        Requires NumPy.
+        """
+        if self.trend_engine is None:
+            raise RuntimeError("Per-workflow trend analysis requires numpy")
+        return self.trend_engine.analyze_by_workflow(columns, interval)
+
     def detect_error_patterns(self, executions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Detect common error patterns"""
         error_executions = [e for e in executions if e["status"] == "failed"]
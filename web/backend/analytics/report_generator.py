@@ -3,11 +3,15 @@ Report Generation System - Epic 13: Story 13.9
 Generate PDF and CSV reports with 5+ templates and scheduling
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Iterator
 from datetime import datetime, timedelta
 from enum import Enum
 import csv
 import io
+import json
+
+# Rows buffered before a CSV chunk is yielded
+CSV_CHUNK_ROWS = 500
 
 
 class ReportType(Enum):
@@ -104,20 +108,48 @@ class ReportGenerator:
         """Get all available templates"""
         return [t.to_dict() for t in self.templates.values()]
 
-    def generate_csv_report(
-        self,
-        workflow_metrics: Dict[str, Any],
-        template_id: str = "detailed_performance"
-    ) -> str:
-        """Generate CSV report"""
+    def get_template(self, template_id: str) -> ReportTemplate:
+        """Get a template by ID (raises ValueError if unknown)"""
         template = self.templates.get(template_id)
         if not template:
             raise ValueError(f"Invalid template: {template_id}")
+        return template
+
+    @staticmethod
+    def _execution_dict(execution: Any) -> Dict[str, Any]:
+        """Accept either a serialized execution or a WorkflowExecution"""
+        return execution if isinstance(execution, dict) else execution.to_dict()
+
+    def iter_csv_report(
+        self,
+        workflow_metrics: Dict[str, Any],
+        template_id: str = "detailed_performance",
+        executions: Iterable[Any] = None,
+        chunk_rows: int = CSV_CHUNK_ROWS
+    ) -> Iterator[str]:
+        """
+        Generate a CSV report as a stream of text chunks
+
+        Args:
+            workflow_metrics: Aggregates from MetricsCollector.get_workflow_metrics
+            template_id: Report template
+            executions: Execution history to write (dicts or WorkflowExecution
+                objects, consumed lazily). Defaults to workflow_metrics["executions"].
+            chunk_rows: Rows buffered per yielded chunk
+        """
+        template = self.get_template(template_id)
+        if executions is None:
+            executions = workflow_metrics.get("executions") or []
 
-        # Create CSV in memory
         output = io.StringIO()
         writer = csv.writer(output)
 
+        def drain() -> str:
+            chunk = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return chunk
+
         # Write header
         writer.writerow([f"{template.name} - Generated {datetime.now().isoformat()}"])
         writer.writerow([])
@@ -135,21 +167,82 @@ class ReportGenerator:
             writer.writerow([])
 
         # Write execution history
-        if "execution_history" in template.sections and workflow_metrics.get("executions"):
-            writer.writerow(["Execution History"])
-            writer.writerow(["Execution ID", "Status", "Duration (ms)", "Steps", "Started At"])
-
-            for execution in workflow_metrics["executions"][:100]:  # Limit to 100
-                writer.writerow([
-                    execution.get("executionId", ""),
-                    execution.get("status", ""),
-                    execution.get("durationMs", ""),
-                    f"{execution.get('completedSteps', 0)}/{execution.get('totalSteps', 0)}",
-                    execution.get("startedAt", "")
-                ])
-            writer.writerow([])
+        if "execution_history" in template.sections:
+            header_written = False
+            rows = 0
+
+            for execution in executions:
+                if not header_written:
+                    writer.writerow(["Execution History"])
+                    writer.writerow(["Execution ID", "Status", "Duration (ms)", "Steps", "Started At"])
+                    header_written = True
+
+                if isinstance(execution, dict):
+                    writer.writerow([
+                        execution.get("executionId", ""),
+                        execution.get("status", ""),
+                        execution.get("durationMs", ""),
+                        f"{execution.get('completedSteps', 0)}/{execution.get('totalSteps', 0)}",
+                        execution.get("startedAt", "")
+                    ])
+                else:
+                    writer.writerow([
+                        execution.execution_id,
+                        execution.status.value,
+                        "" if execution.duration_ms is None else execution.duration_ms,
+                        f"{execution.completed_steps}/{execution.total_steps}",
+                        execution.started_at.isoformat()
+                    ])
+
+                rows += 1
+                if rows % chunk_rows == 0:
+                    yield drain()
+
+            if header_written:
+                writer.writerow([])
+
+        yield drain()
+
+    def generate_csv_report(
+        self,
+        workflow_metrics: Dict[str, Any],
+        template_id: str = "detailed_performance"
+    ) -> str:
+        """Generate CSV report"""
+        return "".join(self.iter_csv_report(workflow_metrics, template_id))
 
-        return output.getvalue()
+    def iter_json_report(
+        self,
+        workflow_metrics: Dict[str, Any],
+        template_id: str = "detailed_performance",
+        additional_data: Dict[str, Any] = None,
+        executions: Iterable[Any] = None
+    ) -> Iterator[str]:
+        """
+        Generate a JSON report as a stream of text chunks
+
+        Same document as generate_json_report, except executionHistory holds
+        the full history and is serialized one execution at a time.
+        """
+        report = self.generate_json_report(workflow_metrics, template_id, additional_data)
+        sections = report["sections"]
+        stream_history = "executionHistory" in sections
+        sections.pop("executionHistory", None)
+        if executions is None:
+            executions = workflow_metrics.get("executions") or []
+
+        body = json.dumps(report)
+        if not stream_history:
+            yield body
+            return
+
+        # Re-open the sections object and append the streamed array
+        yield body[:-2] + (', ' if sections else '') + '"executionHistory": ['
+        first = True
+        for execution in executions:
+            yield ('' if first else ', ') + json.dumps(self._execution_dict(execution))
+            first = False
+        yield ']}}'
 
     def generate_json_report(
         self,
@@ -158,9 +251,7 @@ class ReportGenerator:
         additional_data: Dict[str, Any] = None
     ) -> Dict[str, Any]:
         """Generate JSON report"""
-        template = self.templates.get(template_id)
-        if not template:
-            raise ValueError(f"Invalid template: {template_id}")
+        template = self.get_template(template_id)
 
         report = {
             "reportType": template.report_type.value,
@@ -210,9 +301,7 @@ class ReportGenerator:
         additional_data: Dict[str, Any] = None
     ) -> str:
         """Generate plain text report (used for PDF generation)"""
-        template = self.templates.get(template_id)
-        if not template:
-            raise ValueError(f"Invalid template: {template_id}")
+        template = self.get_template(template_id)
 
         lines = []
 
@@ -327,6 +416,24 @@ class ScheduledReport:
         self.enabled = enabled
         self.last_run: Optional[datetime] = None
         self.next_run: Optional[datetime] = self._calculate_next_run()
+        self.last_output: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def window_days(self) -> int:
+        """Days of history each run reports on (one schedule period)"""
+        return {"daily": 1, "weekly": 7, "monthly": 30}.get(self.frequency, 1)
+
+    def is_due(self, now: datetime = None) -> bool:
+        """Whether the report should run now"""
+        return self.enabled and self.next_run is not None and self.next_run <= (now or datetime.now())
+
+    def mark_run(self, output: str = None, error: str = None):
+        """Record a run and schedule the next one"""
+        self.last_run = datetime.now()
+        self.last_output = output
+        self.last_error = error
+        self.next_run = self._calculate_next_run()
 
     def _calculate_next_run(self) -> datetime:
         """Calculate next run time based on frequency"""
@@ -352,5 +459,7 @@ class ScheduledReport:
             "recipients": self.recipients,
             "enabled": self.enabled,
             "lastRun": self.last_run.isoformat() if self.last_run else None,
-            "nextRun": self.next_run.isoformat() if self.next_run else None
+            "nextRun": self.next_run.isoformat() if self.next_run else None,
+            "lastOutput": self.last_output,
+            "lastError": self.last_error
         }
@@ -0,0 +1,286 @@
+"""
+Report Scheduler - Epic 13: Story 13.9
+Run ScheduledReports in the background and cache generated report files
+
+Reports are rendered chunk by chunk straight from the execution history into
+a file (or an HTTP response), so memory use does not grow with the number of
+executions. Rendered files are cached by (template, workflow, format, window,
+history version): repeated downloads of the same dashboard report are served
+from disk until a new execution of that workflow completes.
+"""
+
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from datetime import datetime, timedelta
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import logging
+import os
+import threading
+import uuid
+
+from .report_generator import ReportGenerator, ScheduledReport
+
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = Path(os.getenv(
+    "REPORTS_DIR",
+    str(Path(__file__).resolve().parent.parent / "reports")
+))
+
+FILE_EXTENSIONS = {"csv": "csv", "json": "json", "text": "txt", "pdf": "txt"}
+
+MEDIA_TYPES = {"csv": "text/csv", "json": "application/json", "text": "text/plain", "pdf": "text/plain"}
+
+CacheKey = Tuple[str, str, str, int, str, int]
+
+
+class ReportCache:
+    """LRU cache of rendered report files on disk"""
+
+    def __init__(self, directory: Path = None, max_entries: int = 64):
+        self.directory = Path(directory or REPORTS_DIR)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Path]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> Optional[Path]:
+        """Return the cached file for `key`, if still present"""
+        with self._lock:
+            path = self._entries.get(key)
+            if path is not None and path.exists():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return path
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def write(self, key: CacheKey, chunks: Iterator[str], extension: str) -> Path:
+        """Stream `chunks` into a new cache file and register it under `key`"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        template_id, workflow_id = key[0], key[1]
+        safe_workflow = "".join(c if c.isalnum() or c in "-_" else "_" for c in workflow_id)
+        path = self.directory / f"{template_id}_{safe_workflow}_{uuid.uuid4().hex[:12]}.{extension}"
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                evicted.append(previous)
+            self._entries[key] = path
+            while len(self._entries) > self.max_entries:
+                _, old_path = self._entries.popitem(last=False)
+                evicted.append(old_path)
+
+        for old_path in evicted:
+            old_path.unlink(missing_ok=True)
+        return path
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "directory": str(self.directory)
+            }
+
+
+class ReportScheduler:
+    """Renders reports on demand and runs ScheduledReports on the asyncio loop"""
+
+    def __init__(
+        self,
+        metrics_collector,
+        report_generator: ReportGenerator = None,
+        performance_analyzer=None,
+        cache: ReportCache = None,
+        poll_interval_seconds: float = 60.0
+    ):
+        """
+        Args:
+            metrics_collector: MetricsCollector supplying execution history
+            report_generator: ReportGenerator used to render reports
+            performance_analyzer: Optional PerformanceAnalyzer for bottleneck data
+            cache: Rendered report cache
+            poll_interval_seconds: Maximum sleep between schedule checks
+        """
+        self.metrics_collector = metrics_collector
+        self.report_generator = report_generator or ReportGenerator()
+        self.performance_analyzer = performance_analyzer
+        self.cache = cache or ReportCache()
+        self.poll_interval_seconds = poll_interval_seconds
+        self.schedules: Dict[str, ScheduledReport] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # Rendering
+
+    def _window(self, days: int) -> Tuple[datetime, str]:
+        """Window start aligned to midnight, so keys are stable within a day"""
+        start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+        return start, start.date().isoformat()
+
+    def _cache_key(self, workflow_id: str, template_id: str, fmt: str, days: int) -> CacheKey:
+        _, window_start = self._window(days)
+        version = self.metrics_collector.get_workflow_version(workflow_id)
+        return (template_id, workflow_id, fmt, days, window_start, version)
+
+    def stream(
+        self,
+        workflow_id: str,
+        template_id: str,
+        fmt: str = "csv",
+        days: int = 30
+    ) -> Iterator[str]:
+        """Yield the report as text chunks without materializing the history"""
+        start_date, _ = self._window(days)
+        metrics = self.metrics_collector.get_workflow_metrics(
+            workflow_id, start_date=start_date, include_executions=False
+        )
+        executions = self.metrics_collector.iter_executions(workflow_id, start_date=start_date)
+
+        if fmt == "csv":
+            return self.report_generator.iter_csv_report(metrics, template_id, executions=executions)
+        if fmt == "json":
+            return self.report_generator.iter_json_report(
+                metrics, template_id, self._additional_data(workflow_id, start_date), executions=executions
+            )
+        return iter([self.report_generator.generate_text_report(
+            metrics, template_id, self._additional_data(workflow_id, start_date)
+        )])
+
+    def _additional_data(self, workflow_id: str, start_date: datetime) -> Dict[str, Any]:
+        if self.performance_analyzer is None:
+            return {}
+        executions = [
+            e.to_dict() for e in self.metrics_collector.iter_executions(workflow_id, start_date=start_date)
+            if e.steps
+        ]
+        analysis = self.performance_analyzer.bottleneck_detector.analyze_workflow(executions)
+        return {
+            "bottlenecks": analysis.get("bottlenecks", []),
+            "recommendations": analysis.get("recommendations", [])
+        }
+
+    def render(
+        self,
+        workflow_id: str,
+        template_id: str,
+        fmt: str = "csv",
+        days: int = 30
+    ) -> Path:
+        """Return a report file, rendering it only if not already cached (blocking)"""
+        self.report_generator.get_template(template_id)
+        key = self._cache_key(workflow_id, template_id, fmt, days)
+        path = self.cache.get(key)
+        if path is not None:
+            return path
+        return self.cache.write(
+            key, self.stream(workflow_id, template_id, fmt, days), FILE_EXTENSIONS.get(fmt, "txt")
+        )
+
+    async def render_async(
+        self,
+        workflow_id: str,
+        template_id: str,
+        fmt: str = "csv",
+        days: int = 30
+    ) -> Path:
+        """render() in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.render, workflow_id, template_id, fmt, days)
+
+    # Scheduling
+
+    def add_schedule(self, schedule: ScheduledReport):
+        """Add (or replace) a scheduled report"""
+        self.schedules[schedule.schedule_id] = schedule
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def remove_schedule(self, schedule_id: str) -> bool:
+        """Remove a scheduled report"""
+        return self.schedules.pop(schedule_id, None) is not None
+
+    def get_schedules(self) -> List[ScheduledReport]:
+        """All scheduled reports"""
+        return list(self.schedules.values())
+
+    async def run_schedule(self, schedule: ScheduledReport) -> Optional[Path]:
+        """Render one scheduled report now and advance its next run"""
+        fmt = schedule.format.value
+        try:
+            path = await self.render_async(
+                schedule.workflow_id, schedule.template_id, fmt, schedule.window_days
+            )
+        except Exception as e:
+            logger.error(f"Scheduled report {schedule.schedule_id} failed: {e}")
+            schedule.mark_run(error=str(e))
+            return None
+
+        schedule.mark_run(output=str(path))
+        logger.info(
+            f"Scheduled report {schedule.schedule_id} written to {path} "
+            f"(recipients: {', '.join(schedule.recipients) or 'none'})"
+        )
+        return path
+
+    async def _run_loop(self):
+        while True:
+            now = datetime.now()
+            for schedule in list(self.schedules.values()):
+                if schedule.is_due(now):
+                    await self.run_schedule(schedule)
+
+            pending = [
+                s.next_run for s in self.schedules.values()
+                if s.enabled and s.next_run is not None
+            ]
+            timeout = self.poll_interval_seconds
+            if pending:
+                timeout = max(0.0, min(timeout, (min(pending) - datetime.now()).total_seconds()))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the background loop on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run_loop())
+
+    async def stop(self):
+        """Cancel the background loop"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "schedules": len(self.schedules),
+            "cache": self.cache.get_stats()
+        }
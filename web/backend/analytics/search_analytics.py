@@ -1,17 +1,24 @@
 """
 Enhancement 6: Search Analytics Query Functions
 Provides analytics data for dashboard visualization
+
+Dashboard queries read the daily rollup tables maintained by SearchLogger
+(see SearchLogger._migrate_v1_add_rollups), so their cost scales with the
+number of days and distinct queries, not with the number of logged searches.
 """
 
-import sqlite3
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Dict, List
 import logging
 
+from .search_logger import get_connection
+
 logger = logging.getLogger(__name__)
 
-DB_PATH = Path("web/backend/database/search_logs.db")
+
+def _since_day(days: int) -> str:
+    """First UTC day (YYYY-MM-DD) included in a trailing window of `days` days"""
+    return (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
 
 
 class SearchAnalytics:
@@ -27,33 +34,17 @@ class SearchAnalytics:
             Dict with total_searches, click_through_rate, zero_results, etc.
         """
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
-            # Total searches
             cursor.execute("""
-                SELECT COUNT(*) FROM search_queries
-                WHERE timestamp >= ?
-            """, (since_date,))
-            total_searches = cursor.fetchone()[0]
-
-            # Zero-result searches
-            cursor.execute("""
-                SELECT COUNT(*) FROM zero_results
-                WHERE timestamp >= ?
-            """, (since_date,))
-            zero_results = cursor.fetchone()[0]
-
-            # Total clicks
-            cursor.execute("""
-                SELECT COUNT(*) FROM result_clicks
-                WHERE timestamp >= ?
-            """, (since_date,))
-            total_clicks = cursor.fetchone()[0]
-
-            conn.close()
+                SELECT
+                    COALESCE(SUM(search_count), 0),
+                    COALESCE(SUM(zero_result_count), 0),
+                    COALESCE(SUM(click_count), 0)
+                FROM daily_search_stats
+                WHERE day >= ?
+            """, (_since_day(days),))
+            total_searches, zero_results, total_clicks = cursor.fetchone()
 
             # Calculate rates
             ctr = (total_clicks / total_searches * 100) if total_searches > 0 else 0
@@ -80,27 +71,21 @@ class SearchAnalytics:
             }
 
     def get_popular_searches(self, limit: int = 20, days: int = 30) -> List[Dict]:
-        """Get most popular search queries"""
+        """Get most popular search queries (grouped by normalized fingerprint)"""
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
             cursor.execute("""
                 SELECT
-                    query,
-                    COUNT(*) as search_count,
-                    AVG(results_count) as avg_results
-                FROM search_queries
-                WHERE timestamp >= ?
-                GROUP BY query
-                ORDER BY search_count DESC
+                    MAX(sample_query) as query,
+                    SUM(search_count) as total_count,
+                    CAST(SUM(results_total) AS REAL) / SUM(search_count) as avg_results
+                FROM daily_query_stats
+                WHERE day >= ?
+                GROUP BY query_fingerprint
+                ORDER BY total_count DESC
                 LIMIT ?
-            """, (since_date, limit))
-
-            results = cursor.fetchall()
-            conn.close()
+            """, (_since_day(days), limit))
 
             return [
                 {
@@ -108,7 +93,7 @@ class SearchAnalytics:
                     'search_count': row[1],
                     'avg_results': round(row[2], 1) if row[2] else 0
                 }
-                for row in results
+                for row in cursor.fetchall()
             ]
 
         except Exception as e:
@@ -118,27 +103,21 @@ class SearchAnalytics:
     def get_popular_commands(self, limit: int = 20, days: int = 30) -> List[Dict]:
         """Get most clicked commands"""
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
             cursor.execute("""
                 SELECT
                     result_id,
-                    result_title,
-                    result_type,
-                    COUNT(*) as click_count,
-                    AVG(position) as avg_position
-                FROM result_clicks
-                WHERE timestamp >= ?
+                    MAX(result_title),
+                    MAX(result_type),
+                    SUM(click_count) as total_clicks,
+                    CAST(SUM(position_total) AS REAL) / SUM(click_count) as avg_position
+                FROM daily_click_stats
+                WHERE day >= ?
                 GROUP BY result_id
-                ORDER BY click_count DESC
+                ORDER BY total_clicks DESC
                 LIMIT ?
-            """, (since_date, limit))
-
-            results = cursor.fetchall()
-            conn.close()
+            """, (_since_day(days), limit))
 
             return [
                 {
@@ -148,7 +127,7 @@ class SearchAnalytics:
                     'click_count': row[3],
                     'avg_position': round(row[4], 1) if row[4] else 0
                 }
-                for row in results
+                for row in cursor.fetchall()
             ]
 
         except Exception as e:
@@ -162,31 +141,26 @@ class SearchAnalytics:
         These indicate areas where documentation should be added
         """
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
+            cursor = get_connection().cursor()
 
             cursor.execute("""
                 SELECT
-                    query,
-                    COUNT(*) as occurrence_count,
-                    MAX(timestamp) as last_searched
-                FROM zero_results
-                WHERE resolved = FALSE
-                GROUP BY query
-                ORDER BY occurrence_count DESC
+                    sample_query,
+                    unresolved_count,
+                    last_searched
+                FROM zero_result_rollup
+                WHERE unresolved_count > 0
+                ORDER BY unresolved_count DESC
                 LIMIT ?
             """, (limit,))
 
-            results = cursor.fetchall()
-            conn.close()
-
             return [
                 {
                     'query': row[0],
                     'occurrence_count': row[1],
                     'last_searched': row[2]
                 }
-                for row in results
+                for row in cursor.fetchall()
             ]
 
         except Exception as e:
@@ -196,24 +170,16 @@ class SearchAnalytics:
     def get_search_trends(self, days: int = 30) -> Dict:
         """Get daily search trends for charting"""
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
             cursor.execute("""
-                SELECT
-                    DATE(timestamp) as date,
-                    COUNT(*) as search_count,
-                    SUM(CASE WHEN results_count = 0 THEN 1 ELSE 0 END) as zero_results
-                FROM search_queries
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            """, (since_date,))
+                SELECT day, search_count, zero_result_count
+                FROM daily_search_stats
+                WHERE day >= ? AND search_count > 0
+                ORDER BY day
+            """, (_since_day(days),))
 
             results = cursor.fetchall()
-            conn.close()
 
             return {
                 'dates': [row[0] for row in results],
@@ -232,24 +198,19 @@ class SearchAnalytics:
     def get_intent_distribution(self, days: int = 30) -> Dict:
         """Get distribution of search intents"""
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
             cursor.execute("""
                 SELECT
                     intent,
-                    COUNT(*) as count
-                FROM search_queries
-                WHERE timestamp >= ? AND intent IS NOT NULL
+                    SUM(search_count) as total_count
+                FROM daily_intent_stats
+                WHERE day >= ?
                 GROUP BY intent
-                ORDER BY count DESC
-            """, (since_date,))
+                ORDER BY total_count DESC
+            """, (_since_day(days),))
 
             results = cursor.fetchall()
-            conn.close()
-
             total = sum(row[1] for row in results)
 
             return {
@@ -270,26 +231,20 @@ class SearchAnalytics:
     def get_command_usage_stats(self, days: int = 30) -> Dict:
         """Get command usage statistics"""
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            since_date = datetime.now() - timedelta(days=days)
+            cursor = get_connection().cursor()
 
             # Most used commands
             cursor.execute("""
                 SELECT
                     command_title,
-                    COUNT(*) as usage_count,
+                    SUM(usage_count) as total_usage,
                     action
-                FROM command_usage
-                WHERE timestamp >= ?
+                FROM daily_command_stats
+                WHERE day >= ?
                 GROUP BY command_title, action
-                ORDER BY usage_count DESC
+                ORDER BY total_usage DESC
                 LIMIT 20
-            """, (since_date,))
-
-            results = cursor.fetchall()
-            conn.close()
+            """, (_since_day(days),))
 
             return {
                 'top_commands': [
@@ -298,7 +253,7 @@ class SearchAnalytics:
                         'usage_count': row[1],
                         'action': row[2]
                     }
-                    for row in results
+                    for row in cursor.fetchall()
                 ]
             }
 
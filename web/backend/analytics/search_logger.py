@@ -3,16 +3,333 @@ Enhancement 6: Search Analytics Logging System
 Logs all search queries and user interactions for analytics
 """
 
+import re
+import time
+import atexit
 import sqlite3
-from datetime import datetime
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Database path
-DB_PATH = Path("web/backend/database/search_logs.db")
+# Database path - absolute, relative to backend/ (independent of the working directory)
+DB_PATH = Path(__file__).resolve().parent.parent / "database" / "search_logs.db"
+
+_PUNCTUATION_PATTERN = re.compile(r"[^\w\s]+", re.UNICODE)
+_NUMBER_PATTERN = re.compile(r"\d+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_thread_local = threading.local()
+
+
+def fingerprint_query(query: str) -> str:
+    """
+    Normalize a query so trivially different spellings group together
+
+    "How do I send SMS?" and "how do i  send sms" share a fingerprint;
+    numbers collapse to "#" so "wait 3 days" and "wait 5 days" group too.
+    """
+    normalized = _PUNCTUATION_PATTERN.sub(" ", (query or "").lower())
+    normalized = _NUMBER_PATTERN.sub("#", normalized)
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's shared connection to the search analytics database
+
+    Connections are reused per thread instead of opened per call.
+    """
+    conn = getattr(_thread_local, "conn", None)
+    if conn is None or getattr(_thread_local, "path", None) != str(DB_PATH):
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 30000")
+        _thread_local.conn = conn
+        _thread_local.path = str(DB_PATH)
+    return conn
+
+
+# Clicks without a result_id still count toward daily_search_stats, but are
+# left out of daily_click_stats (result_id is part of its key), as in _rebuild_rollups
+_CLICK_ROLLUP_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS result_clicks_rollup AFTER INSERT ON result_clicks BEGIN
+        INSERT INTO daily_search_stats (day, click_count)
+        VALUES (DATE(NEW.timestamp), 1)
+        ON CONFLICT(day) DO UPDATE SET click_count = click_count + 1;
+
+        INSERT INTO daily_click_stats (day, result_id, result_title, result_type, click_count, position_total)
+        SELECT DATE(NEW.timestamp), NEW.result_id, NEW.result_title, NEW.result_type, 1, COALESCE(NEW.position, 0)
+        WHERE NEW.result_id IS NOT NULL
+        ON CONFLICT(day, result_id) DO UPDATE SET
+            click_count = click_count + 1,
+            position_total = position_total + COALESCE(NEW.position, 0);
+    END;
+"""
+
+EVENT_SEARCH = 'search'
+EVENT_ZERO_RESULT = 'zero_result'
+EVENT_CLICK = 'click'
+EVENT_COMMAND = 'command'
+
+# What to do when the buffer is full
+OVERFLOW_DROP_NEWEST = 'drop_newest'   # discard the incoming event (never blocks)
+OVERFLOW_DROP_OLDEST = 'drop_oldest'   # discard the oldest buffered event
+OVERFLOW_FLUSH = 'flush'               # write synchronously on the caller (blocks)
+
+_INSERT_SQL = {
+    EVENT_SEARCH: """
+        INSERT INTO search_queries
+        (id, query, query_fingerprint, intent, results_count, user_id, session_id, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    EVENT_ZERO_RESULT: """
+        INSERT INTO zero_results (query, query_fingerprint, intent, timestamp)
+        VALUES (?, ?, ?, ?)
+    """,
+    EVENT_CLICK: """
+        INSERT INTO result_clicks
+        (query_id, result_id, result_title, result_type, position, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """,
+    EVENT_COMMAND: """
+        INSERT INTO command_usage (command_id, command_title, action, timestamp, context)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+}
+
+_timestamp_cache = [0, '']
+
+
+def _utc_timestamp() -> str:
+    """UTC 'YYYY-MM-DD HH:MM:SS' (CURRENT_TIMESTAMP format), cached per second"""
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now))
+    return _timestamp_cache[1]
+
+
+class _QueryIdAllocator:
+    """
+    Hands out search_queries IDs before the row is written
+
+    IDs are reserved from SQLite in blocks (one UPDATE per `block_size`
+    searches), so they stay small, unique across uvicorn workers and safe to
+    round-trip through JavaScript clients that later call log_click.
+    """
+
+    def __init__(self, block_size: int = 10000):
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                self._reserve_block()
+            query_id = self._next
+            self._next += 1
+            return query_id
+
+    def _reserve_block(self) -> None:
+        conn = get_connection()
+        with conn:
+            # MAX(id) keeps the block clear of rows written by other inserters
+            row = conn.execute("""
+                UPDATE id_allocator
+                SET next_id = MAX(next_id, (SELECT COALESCE(MAX(id), 0) + 1 FROM search_queries)) + ?
+                WHERE name = 'search_queries'
+                RETURNING next_id
+            """, (self.block_size,)).fetchone()
+        self._end = row[0]
+        self._next = self._end - self.block_size
+
+
+_query_ids = _QueryIdAllocator()
+
+
+class SearchEventBuffer:
+    """
+    In-memory ring buffer of analytics events, flushed in batches
+
+    A daemon thread flushes every `flush_events` events or every
+    `flush_interval_ms`, whichever comes first, using one connection and one
+    executemany per table inside a single transaction. Failed batches are
+    kept and retried on the next flush (e.g. while the database is locked);
+    batches rejected by a constraint are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        flush_events: int = 500,
+        flush_interval_ms: int = 250,
+        max_buffered_events: int = 50000,
+        overflow_policy: str = OVERFLOW_DROP_NEWEST
+    ):
+        self.flush_events = flush_events
+        self.flush_interval_s = flush_interval_ms / 1000
+        self.max_buffered_events = max_buffered_events
+        self.overflow_policy = overflow_policy
+
+        self._events: deque = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.events_flushed = 0
+        self.events_dropped = 0
+        self.flush_count = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    def add(self, kind: str, params: Tuple) -> None:
+        """Buffer one event (microseconds; never touches SQLite unless policy is 'flush')"""
+        with self._lock:
+            if len(self._events) >= self.max_buffered_events:
+                if self.overflow_policy == OVERFLOW_DROP_OLDEST:
+                    self._events.popleft()
+                    self.events_dropped += 1
+                elif self.overflow_policy == OVERFLOW_DROP_NEWEST:
+                    self.events_dropped += 1
+                    return
+            self._events.append((kind, params))
+            pending = len(self._events)
+
+        if self._thread is None and not self._closed:
+            self._start()
+        if pending >= self.max_buffered_events and self.overflow_policy == OVERFLOW_FLUSH:
+            self.flush()
+        elif pending >= self.flush_events:
+            self._wakeup.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='search-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval_s)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep the flusher alive; events stay buffered for the next attempt
+                logger.error(f"Search log flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write all buffered events in one transaction; returns rows written"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._events:
+                    return 0
+                batch = list(self._events)
+                self._events.clear()
+
+            start = time.perf_counter()
+            grouped: Dict[str, List[Tuple]] = {kind: [] for kind in _INSERT_SQL}
+            fingerprints: Dict[str, str] = {}
+            for kind, params in batch:
+                if kind == EVENT_SEARCH:
+                    query = params[1]
+                    fingerprint = fingerprints.get(query)
+                    if fingerprint is None:
+                        fingerprint = fingerprints[query] = fingerprint_query(query)
+                    params = params[:2] + (fingerprint,) + params[2:]
+                elif kind == EVENT_ZERO_RESULT:
+                    query = params[0]
+                    fingerprint = fingerprints.get(query)
+                    if fingerprint is None:
+                        fingerprint = fingerprints[query] = fingerprint_query(query)
+                    params = (query, fingerprint) + params[1:]
+                elif kind == EVENT_COMMAND:
+                    # (id, title, action, context, ts) -> column order
+                    params = (params[0], params[1], params[2], params[4], params[3])
+                grouped[kind].append(params)
+
+            dropped = 0
+            try:
+                conn = get_connection()
+                with conn:
+                    for kind, rows in grouped.items():
+                        if rows:
+                            dropped += self._insert_rows(conn, kind, rows)
+            except Exception:
+                self.flush_failures += 1
+                with self._lock:
+                    # Requeue ahead of newer events, respecting the buffer bound
+                    room = max(0, self.max_buffered_events - len(self._events))
+                    self._events.extendleft(reversed(batch[-room:] if room else []))
+                    self.events_dropped += len(batch) - min(room, len(batch))
+                raise
+
+            if dropped:
+                self.flush_failures += 1
+                self.events_dropped += dropped
+            self.events_flushed += len(batch) - dropped
+            self.flush_count += 1
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            return len(batch) - dropped
+
+    def _insert_rows(self, conn: sqlite3.Connection, kind: str, rows: List[Tuple]) -> int:
+        """
+        Insert one table's rows inside a savepoint; returns rows dropped
+
+        If the batch insert hits an IntegrityError, it is rolled back to the
+        savepoint and retried row by row, so only the rows that violate a
+        constraint are dropped (retrying them later would fail the same way).
+        """
+        conn.execute("SAVEPOINT flush_rows")
+        try:
+            conn.executemany(_INSERT_SQL[kind], rows)
+            return 0
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK TO flush_rows")
+
+        dropped = 0
+        for row in rows:
+            try:
+                conn.execute(_INSERT_SQL[kind], row)
+            except sqlite3.IntegrityError as e:
+                dropped += 1
+                error = e
+        if dropped:
+            logger.warning(f"Dropped {dropped} of {len(rows)} buffered {kind} events: {error}")
+        return dropped
+
+    def close(self) -> None:
+        """Stop the flusher thread and write whatever is still buffered"""
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Final search log flush failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer depth, throughput and drop counters"""
+        return {
+            'buffered_events': len(self._events),
+            'events_flushed': self.events_flushed,
+            'events_dropped': self.events_dropped,
+            'flush_count': self.flush_count,
+            'flush_failures': self.flush_failures,
+            'last_flush_ms': round(self.last_flush_ms, 2),
+            'overflow_policy': self.overflow_policy
+        }
 
 
 class SearchLogger:
@@ -26,18 +343,36 @@ class SearchLogger:
     - Command usage
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        flush_events: int = 500,
+        flush_interval_ms: int = 250,
+        max_buffered_events: int = 50000,
+        overflow_policy: str = OVERFLOW_DROP_NEWEST
+    ):
         self._init_database()
+        self.buffer = SearchEventBuffer(
+            flush_events=flush_events,
+            flush_interval_ms=flush_interval_ms,
+            max_buffered_events=max_buffered_events,
+            overflow_policy=overflow_policy
+        )
 
     def _init_database(self):
         """Initialize SQLite database with all required tables"""
         try:
-            # Create database directory
-            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-            conn = sqlite3.connect(str(DB_PATH))
+            conn = get_connection()
             cursor = conn.cursor()
 
+            # Migration tracking table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL,
+                    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
             # Search queries table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS search_queries (
@@ -105,7 +440,11 @@ class SearchLogger:
             """)
 
             conn.commit()
-            conn.close()
+
+            # Run pending migrations
+            self._migrate_v1_add_rollups(cursor, conn)
+            self._migrate_v2_add_id_allocator(cursor, conn)
+            self._migrate_v3_skip_null_result_clicks(cursor, conn)
 
             logger.info(f"Analytics database initialized at {DB_PATH}")
 
@@ -113,6 +452,260 @@ class SearchLogger:
             logger.error(f"Failed to initialize analytics database: {e}")
             raise
 
+    def _is_migration_applied(self, cursor, version: int) -> bool:
+        """Check if a migration has already been applied"""
+        cursor.execute("SELECT COUNT(*) FROM schema_migrations WHERE version = ?", (version,))
+        return cursor.fetchone()[0] > 0
+
+    def _column_exists(self, cursor, table: str, column: str) -> bool:
+        """Check if a column exists in a table (using PRAGMA table_info)"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+
+    def _migrate_v1_add_rollups(self, cursor, conn):
+        """
+        Migration V1: query fingerprints, composite indexes and daily rollups
+
+        Rollup tables are maintained by AFTER INSERT triggers, so dashboard
+        queries read a few rows per day instead of scanning raw events.
+        Days are UTC, matching CURRENT_TIMESTAMP on the raw tables.
+        """
+        version = 1
+        name = "add_fingerprints_and_daily_rollups"
+
+        if self._is_migration_applied(cursor, version):
+            return
+
+        try:
+            logger.info(f"Running migration V{version}: {name}")
+
+            # Fingerprint columns (backfilled below)
+            for table in ("search_queries", "zero_results"):
+                if not self._column_exists(cursor, table, "query_fingerprint"):
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN query_fingerprint TEXT")
+
+            conn.create_function("fingerprint_query", 1, fingerprint_query, deterministic=True)
+            cursor.execute("UPDATE search_queries SET query_fingerprint = fingerprint_query(query) WHERE query_fingerprint IS NULL")
+            cursor.execute("UPDATE zero_results SET query_fingerprint = fingerprint_query(query) WHERE query_fingerprint IS NULL")
+
+            # Composite / missing indexes on the raw tables
+            cursor.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_search_fingerprint_timestamp
+                    ON search_queries(query_fingerprint, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_clicks_timestamp
+                    ON result_clicks(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_clicks_result_timestamp
+                    ON result_clicks(result_id, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_command_usage_timestamp
+                    ON command_usage(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_zero_results_resolved_fingerprint
+                    ON zero_results(resolved, query_fingerprint);
+            """)
+
+            # Daily rollup tables
+            cursor.executescript("""
+                CREATE TABLE IF NOT EXISTS daily_search_stats (
+                    day TEXT PRIMARY KEY,
+                    search_count INTEGER NOT NULL DEFAULT 0,
+                    zero_result_count INTEGER NOT NULL DEFAULT 0,
+                    click_count INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE TABLE IF NOT EXISTS daily_query_stats (
+                    day TEXT NOT NULL,
+                    query_fingerprint TEXT NOT NULL,
+                    sample_query TEXT,
+                    search_count INTEGER NOT NULL DEFAULT 0,
+                    results_total INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, query_fingerprint)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS daily_intent_stats (
+                    day TEXT NOT NULL,
+                    intent TEXT NOT NULL,
+                    search_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, intent)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS daily_click_stats (
+                    day TEXT NOT NULL,
+                    result_id TEXT NOT NULL,
+                    result_title TEXT,
+                    result_type TEXT,
+                    click_count INTEGER NOT NULL DEFAULT 0,
+                    position_total INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, result_id)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS daily_command_stats (
+                    day TEXT NOT NULL,
+                    command_title TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    usage_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (day, command_title, action)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS zero_result_rollup (
+                    query_fingerprint TEXT PRIMARY KEY,
+                    sample_query TEXT,
+                    occurrence_count INTEGER NOT NULL DEFAULT 0,
+                    unresolved_count INTEGER NOT NULL DEFAULT 0,
+                    last_searched DATETIME
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_zero_rollup_unresolved
+                    ON zero_result_rollup(unresolved_count DESC);
+            """)
+
+            # Triggers keep the rollups current on every insert
+            cursor.executescript("""
+                CREATE TRIGGER IF NOT EXISTS search_queries_rollup AFTER INSERT ON search_queries BEGIN
+                    INSERT INTO daily_search_stats (day, search_count, zero_result_count)
+                    VALUES (DATE(NEW.timestamp), 1, NEW.results_count = 0)
+                    ON CONFLICT(day) DO UPDATE SET
+                        search_count = search_count + 1,
+                        zero_result_count = zero_result_count + (NEW.results_count = 0);
+
+                    INSERT INTO daily_query_stats (day, query_fingerprint, sample_query, search_count, results_total)
+                    VALUES (DATE(NEW.timestamp), COALESCE(NEW.query_fingerprint, NEW.query), NEW.query, 1, COALESCE(NEW.results_count, 0))
+                    ON CONFLICT(day, query_fingerprint) DO UPDATE SET
+                        search_count = search_count + 1,
+                        results_total = results_total + COALESCE(NEW.results_count, 0);
+
+                    INSERT INTO daily_intent_stats (day, intent, search_count)
+                    SELECT DATE(NEW.timestamp), NEW.intent, 1 WHERE NEW.intent IS NOT NULL
+                    ON CONFLICT(day, intent) DO UPDATE SET search_count = search_count + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS command_usage_rollup AFTER INSERT ON command_usage BEGIN
+                    INSERT INTO daily_command_stats (day, command_title, action, usage_count)
+                    VALUES (DATE(NEW.timestamp), COALESCE(NEW.command_title, NEW.command_id), COALESCE(NEW.action, ''), 1)
+                    ON CONFLICT(day, command_title, action) DO UPDATE SET usage_count = usage_count + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS zero_results_rollup AFTER INSERT ON zero_results BEGIN
+                    INSERT INTO zero_result_rollup (query_fingerprint, sample_query, occurrence_count, unresolved_count, last_searched)
+                    VALUES (COALESCE(NEW.query_fingerprint, NEW.query), NEW.query, 1, NOT COALESCE(NEW.resolved, 0), NEW.timestamp)
+                    ON CONFLICT(query_fingerprint) DO UPDATE SET
+                        occurrence_count = occurrence_count + 1,
+                        unresolved_count = unresolved_count + (NOT COALESCE(NEW.resolved, 0)),
+                        last_searched = MAX(last_searched, NEW.timestamp);
+                END;
+            """)
+            cursor.executescript(_CLICK_ROLLUP_TRIGGER)
+
+            self._rebuild_rollups(cursor)
+
+            cursor.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            conn.commit()
+            logger.info(f"Migration V{version} ({name}) completed successfully")
+
+        except Exception as e:
+            logger.error(f"Error applying migration V{version} ({name}): {e}")
+            conn.rollback()
+            raise
+
+    def _migrate_v2_add_id_allocator(self, cursor, conn):
+        """Migration V2: block allocator for search_queries IDs (buffered logging)"""
+        version = 2
+        name = "add_search_query_id_allocator"
+
+        if self._is_migration_applied(cursor, version):
+            return
+
+        try:
+            logger.info(f"Running migration V{version}: {name}")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS id_allocator (
+                    name TEXT PRIMARY KEY,
+                    next_id INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO id_allocator (name, next_id)
+                SELECT 'search_queries', COALESCE(MAX(id), 0) + 1 FROM search_queries
+            """)
+            cursor.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            conn.commit()
+            logger.info(f"Migration V{version} ({name}) completed successfully")
+
+        except Exception as e:
+            logger.error(f"Error applying migration V{version} ({name}): {e}")
+            conn.rollback()
+            raise
+
+    def _migrate_v3_skip_null_result_clicks(self, cursor, conn):
+        """
+        Migration V3: recreate the click rollup trigger so clicks without a
+        result_id are logged instead of aborting on daily_click_stats.result_id
+        """
+        version = 3
+        name = "skip_null_result_clicks_in_rollup"
+
+        if self._is_migration_applied(cursor, version):
+            return
+
+        try:
+            logger.info(f"Running migration V{version}: {name}")
+            cursor.execute("DROP TRIGGER IF EXISTS result_clicks_rollup")
+            cursor.executescript(_CLICK_ROLLUP_TRIGGER)
+            cursor.execute(
+                "INSERT OR IGNORE INTO schema_migrations (version, name) VALUES (?, ?)",
+                (version, name)
+            )
+            conn.commit()
+            logger.info(f"Migration V{version} ({name}) completed successfully")
+
+        except Exception as e:
+            logger.error(f"Error applying migration V{version} ({name}): {e}")
+            conn.rollback()
+            raise
+
+    def _rebuild_rollups(self, cursor):
+        """Recompute every rollup table from the raw event tables"""
+        cursor.executescript("""
+            DELETE FROM daily_search_stats;
+            DELETE FROM daily_query_stats;
+            DELETE FROM daily_intent_stats;
+            DELETE FROM daily_click_stats;
+            DELETE FROM daily_command_stats;
+            DELETE FROM zero_result_rollup;
+
+            INSERT INTO daily_search_stats (day, search_count, zero_result_count)
+            SELECT DATE(timestamp), COUNT(*), SUM(results_count = 0)
+            FROM search_queries GROUP BY DATE(timestamp);
+
+            INSERT INTO daily_search_stats (day, click_count)
+            SELECT DATE(timestamp), COUNT(*) FROM result_clicks WHERE 1 GROUP BY DATE(timestamp)
+            ON CONFLICT(day) DO UPDATE SET click_count = excluded.click_count;
+
+            INSERT INTO daily_query_stats (day, query_fingerprint, sample_query, search_count, results_total)
+            SELECT DATE(timestamp), COALESCE(query_fingerprint, query), MAX(query), COUNT(*), SUM(COALESCE(results_count, 0))
+            FROM search_queries GROUP BY DATE(timestamp), COALESCE(query_fingerprint, query);
+
+            INSERT INTO daily_intent_stats (day, intent, search_count)
+            SELECT DATE(timestamp), intent, COUNT(*)
+            FROM search_queries WHERE intent IS NOT NULL GROUP BY DATE(timestamp), intent;
+
+            INSERT INTO daily_click_stats (day, result_id, result_title, result_type, click_count, position_total)
+            SELECT DATE(timestamp), result_id, MAX(result_title), MAX(result_type), COUNT(*), SUM(COALESCE(position, 0))
+            FROM result_clicks WHERE result_id IS NOT NULL GROUP BY DATE(timestamp), result_id;
+
+            INSERT INTO daily_command_stats (day, command_title, action, usage_count)
+            SELECT DATE(timestamp), COALESCE(command_title, command_id), COALESCE(action, ''), COUNT(*)
+            FROM command_usage GROUP BY DATE(timestamp), COALESCE(command_title, command_id), COALESCE(action, '');
+
+            INSERT INTO zero_result_rollup (query_fingerprint, sample_query, occurrence_count, unresolved_count, last_searched)
+            SELECT COALESCE(query_fingerprint, query), MAX(query), COUNT(*), SUM(NOT COALESCE(resolved, 0)), MAX(timestamp)
+            FROM zero_results GROUP BY COALESCE(query_fingerprint, query);
+        """)
+
     def log_search(
         self,
         query: str,
@@ -124,6 +717,10 @@ class SearchLogger:
         """
         Log a search query
 
+        The event is buffered and written in a background batch; the
+        returned ID is allocated up front so clicks can be linked to it
+        before the row reaches the database.
+
         Args:
             query: The search query string
             intent: Classified intent (HOW_TO, WHAT_IS, etc.)
@@ -135,25 +732,13 @@ class SearchLogger:
             query_id for linking clicks
         """
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO search_queries (query, intent, results_count, user_id, session_id)
-                VALUES (?, ?, ?, ?, ?)
-            """, (query, intent, results_count, user_id, session_id))
-
-            query_id = cursor.lastrowid
+            query_id = _query_ids.next_id()
+            timestamp = _utc_timestamp()
+            self.buffer.add(EVENT_SEARCH, (query_id, query, intent, results_count, user_id, session_id, timestamp))
 
             # Log zero results for tracking documentation gaps
             if results_count == 0:
-                cursor.execute("""
-                    INSERT INTO zero_results (query, intent)
-                    VALUES (?, ?)
-                """, (query, intent))
-
-            conn.commit()
-            conn.close()
+                self.buffer.add(EVENT_ZERO_RESULT, (query, intent, timestamp))
 
             return query_id
 
@@ -180,18 +765,10 @@ class SearchLogger:
             position: Position in search results (1-based)
         """
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
-
-            cursor.execute("""
-                INSERT INTO result_clicks
-                (query_id, result_id, result_title, result_type, position)
-                VALUES (?, ?, ?, ?, ?)
-            """, (query_id, result_id, result_title, result_type, position))
-
-            conn.commit()
-            conn.close()
-
+            self.buffer.add(
+                EVENT_CLICK,
+                (query_id, result_id, result_title, result_type, position, _utc_timestamp())
+            )
         except Exception as e:
             logger.error(f"Failed to log click: {e}")
 
@@ -212,20 +789,28 @@ class SearchLogger:
             context: Optional context (workflow_builder, chat, etc.)
         """
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            cursor = conn.cursor()
+            self.buffer.add(
+                EVENT_COMMAND,
+                (command_id, command_title, action, context, _utc_timestamp())
+            )
+        except Exception as e:
+            logger.error(f"Failed to log command usage: {e}")
 
-            cursor.execute("""
-                INSERT INTO command_usage (command_id, command_title, action, context)
-                VALUES (?, ?, ?, ?)
-            """, (command_id, command_title, action, context))
+    def flush(self) -> int:
+        """Synchronously write all buffered events; returns rows written"""
+        return self.buffer.flush()
 
-            conn.commit()
-            conn.close()
+    def close(self) -> None:
+        """Flush remaining events and stop the background flusher"""
+        self.buffer.close()
 
-        except Exception as e:
-            logger.error(f"Failed to log command usage: {e}")
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Buffer depth, throughput and drop counters"""
+        return self.buffer.get_stats()
 
 
 # Singleton instance
 search_logger = SearchLogger()
+
+# Flush buffered events on interpreter shutdown (normal exit, SIGTERM via uvicorn)
+atexit.register(search_logger.close)
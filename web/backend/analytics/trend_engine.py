@@ -0,0 +1,506 @@
+"""
+Trend Analysis Engine - Epic 13: Story 13.2
+Vectorized time-bucketed trend analysis over columnar execution data
+
+Executions are held as parallel NumPy arrays (start time, duration, status,
+workflow index) instead of lists of dicts. Binning, per-period aggregation,
+rolling windows, regression slopes and anomaly scores are all computed with
+array operations, so a month of executions across thousands of workflows is
+analyzed in a handful of passes over the data.
+"""
+
+from typing import Dict, Any, List, Optional, Iterable
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Bucket width (seconds) of the base bin for each interval. Weekly periods are
+# formed from daily bins so their labels match the "%Y-W%W" convention.
+BASE_BIN_SECONDS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 86400,
+}
+
+PERIOD_FORMATS = {
+    "hourly": "%Y-%m-%d %H:00",
+    "daily": "%Y-%m-%d",
+    "weekly": "%Y-W%W",
+}
+
+STATUS_COMPLETED = 1
+STATUS_FAILED = 2
+
+_STATUS_CODES = {"completed": STATUS_COMPLETED, "failed": STATUS_FAILED}
+
+# Slope (per period) below which a trend is reported as "stable"
+TREND_SLOPE_THRESHOLD = 0.1
+
+# Robust z-score above which a period is flagged as anomalous
+ANOMALY_THRESHOLD = 3.5
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _parse_started_at(value: Any) -> datetime:
+    """Parse a startedAt value into a naive wall-clock datetime"""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def _to_epoch_seconds(started: List[datetime]) -> np.ndarray:
+    """Wall-clock datetimes -> float seconds since 1970-01-01 (no tz shifting)"""
+    if not started:
+        return np.empty(0, dtype=np.float64)
+    micros = np.array(started, dtype='datetime64[us]').astype(np.int64)
+    return micros / 1e6
+
+
+class ExecutionColumns:
+    """Columnar view of workflow executions"""
+
+    def __init__(
+        self,
+        started_at: np.ndarray,
+        duration_ms: np.ndarray,
+        status: np.ndarray,
+        workflow_index: Optional[np.ndarray] = None,
+        workflow_ids: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            started_at: Start times as wall-clock seconds since 1970-01-01
+            duration_ms: Durations in ms (NaN where unknown)
+            status: Status codes (STATUS_COMPLETED, STATUS_FAILED, 0 otherwise)
+            workflow_index: Index into workflow_ids for each execution
+            workflow_ids: Distinct workflow IDs
+        """
+        self.started_at = started_at
+        self.duration_ms = duration_ms
+        self.status = status
+        if workflow_index is None:
+            workflow_index = np.zeros(len(started_at), dtype=np.int32)
+        self.workflow_index = workflow_index
+        self.workflow_ids = workflow_ids or []
+
+    def __len__(self) -> int:
+        return len(self.started_at)
+
+    @classmethod
+    def _build(
+        cls,
+        started: List[datetime],
+        durations: List[Optional[float]],
+        statuses: List[str],
+        workflow_ids: List[str]
+    ) -> "ExecutionColumns":
+        index_by_id: Dict[str, int] = {}
+        workflow_index = np.fromiter(
+            (index_by_id.setdefault(w, len(index_by_id)) for w in workflow_ids),
+            dtype=np.int32,
+            count=len(workflow_ids)
+        )
+        return cls(
+            started_at=_to_epoch_seconds(started),
+            duration_ms=np.array(
+                [np.nan if d is None else d for d in durations], dtype=np.float64
+            ),
+            status=np.fromiter(
+                (_STATUS_CODES.get(s, 0) for s in statuses),
+                dtype=np.int8,
+                count=len(statuses)
+            ),
+            workflow_index=workflow_index,
+            workflow_ids=list(index_by_id)
+        )
+
+    @classmethod
+    def from_executions(cls, executions: Iterable[Any]) -> "ExecutionColumns":
+        """Build columns from WorkflowExecution objects (no to_dict() round trip)"""
+        executions = list(executions)
+        return cls._build(
+            [e.started_at.replace(tzinfo=None) for e in executions],
+            [e.duration_ms for e in executions],
+            [e.status.value for e in executions],
+            [e.workflow_id for e in executions]
+        )
+
+    @classmethod
+    def from_dicts(cls, executions: List[Dict[str, Any]]) -> "ExecutionColumns":
+        """Build columns from serialized execution dictionaries"""
+        return cls._build(
+            [_parse_started_at(e["startedAt"]) for e in executions],
+            [e.get("durationMs") for e in executions],
+            [e.get("status") for e in executions],
+            [e.get("workflowId", "") for e in executions]
+        )
+
+
+def _epoch_seconds(started_at: datetime) -> float:
+    return (started_at.replace(tzinfo=None) - _EPOCH).total_seconds()
+
+
+class ExecutionColumnStore:
+    """
+    Append-only columnar store of completed executions
+
+    Kept alongside MetricsCollector.execution_history so trend queries slice
+    ready-made arrays instead of converting thousands of objects per request.
+    Arrays grow by doubling; pruning compacts them in place.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._size = 0
+        self._started_at = np.empty(initial_capacity, dtype=np.float64)
+        self._duration_ms = np.empty(initial_capacity, dtype=np.float64)
+        self._status = np.empty(initial_capacity, dtype=np.int8)
+        self._workflow_index = np.empty(initial_capacity, dtype=np.int32)
+        self.workflow_ids: List[str] = []
+        self._index_by_id: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, needed: int) -> None:
+        capacity = len(self._started_at)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('_started_at', '_duration_ms', '_status', '_workflow_index'):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def _workflow_slot(self, workflow_id: str) -> int:
+        index = self._index_by_id.get(workflow_id)
+        if index is None:
+            index = self._index_by_id[workflow_id] = len(self.workflow_ids)
+            self.workflow_ids.append(workflow_id)
+        return index
+
+    def append(self, execution: Any) -> None:
+        """Record one WorkflowExecution"""
+        self._reserve(self._size + 1)
+        i = self._size
+        self._started_at[i] = _epoch_seconds(execution.started_at)
+        self._duration_ms[i] = np.nan if execution.duration_ms is None else execution.duration_ms
+        self._status[i] = _STATUS_CODES.get(execution.status.value, 0)
+        self._workflow_index[i] = self._workflow_slot(execution.workflow_id)
+        self._size += 1
+
+    def extend(self, executions: Iterable[Any]) -> None:
+        """Record many WorkflowExecutions"""
+        batch = ExecutionColumns.from_executions(executions)
+        count = len(batch)
+        self._reserve(self._size + count)
+        end = self._size + count
+        remap = np.array([self._workflow_slot(w) for w in batch.workflow_ids], dtype=np.int32)
+        self._started_at[self._size:end] = batch.started_at
+        self._duration_ms[self._size:end] = batch.duration_ms
+        self._status[self._size:end] = batch.status
+        if count:
+            self._workflow_index[self._size:end] = remap[batch.workflow_index]
+        self._size = end
+
+    def prune_before(self, cutoff: datetime) -> None:
+        """Drop executions that started before `cutoff`"""
+        n = self._size
+        if n == 0:
+            return
+        keep = self._started_at[:n] >= _epoch_seconds(cutoff)
+        if keep.all():
+            return
+        kept = int(keep.sum())
+        for name in ('_started_at', '_duration_ms', '_status', '_workflow_index'):
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self._size = kept
+
+    def select(
+        self,
+        workflow_id: str = None,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> "ExecutionColumns":
+        """Copy out the executions matching the filters as ExecutionColumns"""
+        n = self._size
+        started_at = self._started_at[:n]
+        mask = np.ones(n, dtype=bool)
+
+        if workflow_id is not None:
+            index = self._index_by_id.get(workflow_id)
+            if index is None:
+                mask[:] = False
+            else:
+                mask &= self._workflow_index[:n] == index
+        if start_date is not None:
+            mask &= started_at >= _epoch_seconds(start_date)
+        if end_date is not None:
+            mask &= started_at <= _epoch_seconds(end_date)
+
+        if workflow_id is not None:
+            return ExecutionColumns(
+                started_at=started_at[mask],
+                duration_ms=self._duration_ms[:n][mask],
+                status=self._status[:n][mask],
+                workflow_ids=[workflow_id]
+            )
+        return ExecutionColumns(
+            started_at=started_at[mask],
+            duration_ms=self._duration_ms[:n][mask],
+            status=self._status[:n][mask],
+            workflow_index=self._workflow_index[:n][mask],
+            workflow_ids=list(self.workflow_ids)
+        )
+
+
+def _period_labels(base_bins: np.ndarray, interval: str) -> List[str]:
+    """Format the label for each distinct base bin"""
+    width = BASE_BIN_SECONDS[interval]
+    fmt = PERIOD_FORMATS[interval]
+    return [
+        (_EPOCH + timedelta(seconds=int(b) * width)).strftime(fmt)
+        for b in base_bins
+    ]
+
+
+def _bin_periods(started_at: np.ndarray, interval: str):
+    """
+    Assign every execution to a period
+
+    Returns:
+        (period labels sorted chronologically, period start in period units,
+         period index per execution)
+    """
+    if interval not in BASE_BIN_SECONDS:
+        interval = "daily"
+
+    base = np.floor_divide(started_at, BASE_BIN_SECONDS[interval]).astype(np.int64)
+    unique_base, base_inverse = np.unique(base, return_inverse=True)
+
+    # Only distinct bins are formatted; for weekly, several days share a label
+    labels = np.array(_period_labels(unique_base, interval))
+    period_labels, first_base, label_inverse = np.unique(
+        labels, return_index=True, return_inverse=True
+    )
+
+    period_start = unique_base[first_base].astype(np.float64)
+    if interval == "weekly":
+        period_start = period_start / 7.0
+
+    return period_labels.tolist(), period_start, label_inverse[base_inverse]
+
+
+def _slope(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Least-squares slope of y over x along the last axis, using only masked points
+
+    Works on 1-D series or 2-D (one series per row); rows with fewer than two
+    points get a slope of 0.
+    """
+    w = mask.astype(np.float64)
+    n = w.sum(axis=-1)
+    sx = (w * x).sum(axis=-1)
+    sy = (w * np.where(mask, y, 0.0)).sum(axis=-1)
+    sxx = (w * x * x).sum(axis=-1)
+    sxy = (w * x * np.where(mask, y, 0.0)).sum(axis=-1)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = np.where(
+            (n >= 2) & (np.abs(denominator) > 1e-12),
+            (n * sxy - sx * sy) / denominator,
+            0.0
+        )
+    return slope
+
+
+def _trend_label(slope: float) -> str:
+    if slope > TREND_SLOPE_THRESHOLD:
+        return "increasing"
+    if slope < -TREND_SLOPE_THRESHOLD:
+        return "decreasing"
+    return "stable"
+
+
+def _rolling_ratio(numerator: np.ndarray, denominator: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window ratio sum(numerator) / sum(denominator) over `window` periods"""
+    num = np.cumsum(numerator)
+    den = np.cumsum(denominator)
+    if window < len(num):
+        num[window:] = num[window:] - num[:-window].copy()
+        den[window:] = den[window:] - den[:-window].copy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / den, 0.0)
+
+
+def _robust_zscores(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Median/MAD z-scores of the masked values (0 where unmasked or undefined)"""
+    scores = np.zeros(len(values), dtype=np.float64)
+    if mask.sum() < 3:
+        return scores
+    sample = values[mask]
+    median = np.median(sample)
+    mad = np.median(np.abs(sample - median)) * 1.4826
+    if mad == 0:
+        mad = np.mean(np.abs(sample - median)) * 1.2533
+    if mad == 0:
+        return scores
+    scores[mask] = (sample - median) / mad
+    return scores
+
+
+class TrendEngine:
+    """Computes time-bucketed performance trends from ExecutionColumns"""
+
+    def __init__(self, rolling_window: int = 7, anomaly_threshold: float = ANOMALY_THRESHOLD):
+        """
+        Args:
+            rolling_window: Number of periods in the trailing rolling window
+            anomaly_threshold: Robust z-score above which a period is anomalous
+        """
+        self.rolling_window = max(1, rolling_window)
+        self.anomaly_threshold = anomaly_threshold
+
+    def analyze(self, columns: ExecutionColumns, interval: str = "daily") -> Dict[str, Any]:
+        """Per-period trends and summary for all executions in `columns`"""
+        if len(columns) == 0:
+            return {"trends": [], "summary": {}}
+
+        labels, period_start, period = _bin_periods(columns.started_at, interval)
+        n_periods = len(labels)
+
+        has_duration = ~np.isnan(columns.duration_ms) & (columns.duration_ms != 0)
+        durations = np.where(has_duration, columns.duration_ms, 0.0)
+
+        total = np.bincount(period, minlength=n_periods)
+        successful = np.bincount(
+            period, weights=columns.status == STATUS_COMPLETED, minlength=n_periods
+        ).astype(np.int64)
+        failed = np.bincount(
+            period, weights=columns.status == STATUS_FAILED, minlength=n_periods
+        ).astype(np.int64)
+        duration_sum = np.bincount(period, weights=durations, minlength=n_periods)
+        duration_count = np.bincount(period, weights=has_duration, minlength=n_periods)
+
+        success_rate = np.where(total > 0, successful / np.maximum(total, 1) * 100, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_duration = np.where(duration_count > 0, duration_sum / duration_count, 0.0)
+        avg_duration_int = avg_duration.astype(np.int64)
+
+        rolling_duration = _rolling_ratio(duration_sum, duration_count, self.rolling_window)
+        rolling_success = _rolling_ratio(
+            successful.astype(np.float64), total.astype(np.float64), self.rolling_window
+        ) * 100
+
+        duration_mask = avg_duration_int > 0
+        anomaly_scores = _robust_zscores(avg_duration, duration_mask)
+        is_anomaly = np.abs(anomaly_scores) > self.anomaly_threshold
+
+        trends = [
+            {
+                "period": labels[i],
+                "totalExecutions": int(total[i]),
+                "successfulExecutions": int(successful[i]),
+                "failedExecutions": int(failed[i]),
+                "successRate": float(success_rate[i]),
+                "averageDurationMs": int(avg_duration_int[i]),
+                "rollingSuccessRate": round(float(rolling_success[i]), 2),
+                "rollingAverageDurationMs": int(rolling_duration[i]),
+                "anomalyScore": round(float(anomaly_scores[i]), 2),
+                "isAnomaly": bool(is_anomaly[i])
+            }
+            for i in range(n_periods)
+        ]
+
+        success_slope = float(_slope(period_start, success_rate, np.ones(n_periods, dtype=bool)))
+        duration_slope = float(_slope(period_start, avg_duration, duration_mask))
+
+        summary = {
+            "averageSuccessRate": float(success_rate.mean()),
+            "successRateTrend": _trend_label(success_slope),
+            "successRateSlope": round(success_slope, 4),
+            "averageDuration": int(avg_duration_int[duration_mask].mean()) if duration_mask.any() else 0,
+            "durationTrend": _trend_label(duration_slope),
+            "durationSlopeMs": round(duration_slope, 2),
+            "rollingWindow": self.rolling_window,
+            "anomalousPeriods": [labels[i] for i in np.flatnonzero(is_anomaly)]
+        }
+
+        return {"trends": trends, "summary": summary}
+
+    def analyze_by_workflow(
+        self,
+        columns: ExecutionColumns,
+        interval: str = "daily"
+    ) -> Dict[str, Any]:
+        """
+        Trend summary for every workflow in `columns` in one vectorized pass
+
+        Aggregates into a (workflow x period) grid, then computes regression
+        slopes for all workflows at once.
+        """
+        if len(columns) == 0:
+            return {"workflows": [], "periods": 0}
+
+        labels, period_start, period = _bin_periods(columns.started_at, interval)
+        n_periods = len(labels)
+        n_workflows = len(columns.workflow_ids)
+        cell = columns.workflow_index.astype(np.int64) * n_periods + period
+        size = n_workflows * n_periods
+
+        has_duration = ~np.isnan(columns.duration_ms) & (columns.duration_ms != 0)
+        durations = np.where(has_duration, columns.duration_ms, 0.0)
+
+        grid_shape = (n_workflows, n_periods)
+        total = np.bincount(cell, minlength=size).reshape(grid_shape)
+        successful = np.bincount(
+            cell, weights=columns.status == STATUS_COMPLETED, minlength=size
+        ).reshape(grid_shape)
+        failed = np.bincount(
+            cell, weights=columns.status == STATUS_FAILED, minlength=size
+        ).reshape(grid_shape)
+        duration_sum = np.bincount(cell, weights=durations, minlength=size).reshape(grid_shape)
+        duration_count = np.bincount(cell, weights=has_duration, minlength=size).reshape(grid_shape)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            success_rate = np.where(total > 0, successful / total * 100, 0.0)
+            avg_duration = np.where(duration_count > 0, duration_sum / duration_count, 0.0)
+
+        x = np.broadcast_to(period_start, grid_shape)
+        success_slope = _slope(x, success_rate, total > 0)
+        duration_slope = _slope(x, avg_duration, duration_count > 0)
+
+        totals = total.sum(axis=1)
+        successes = successful.sum(axis=1)
+        failures = failed.sum(axis=1)
+        all_duration_count = duration_count.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overall_duration = np.where(
+                all_duration_count > 0, duration_sum.sum(axis=1) / all_duration_count, 0.0
+            )
+
+        workflows = [
+            {
+                "workflowId": columns.workflow_ids[w],
+                "totalExecutions": int(totals[w]),
+                "successfulExecutions": int(successes[w]),
+                "failedExecutions": int(failures[w]),
+                "successRate": float(successes[w] / totals[w] * 100) if totals[w] else 0,
+                "averageDurationMs": int(overall_duration[w]),
+                "successRateTrend": _trend_label(success_slope[w]),
+                "successRateSlope": round(float(success_slope[w]), 4),
+                "durationTrend": _trend_label(duration_slope[w]),
+                "durationSlopeMs": round(float(duration_slope[w]), 2)
+            }
+            for w in np.flatnonzero(totals)
+        ]
+
+        return {
+            "workflows": workflows,
+            "periods": n_periods,
+            "firstPeriod": labels[0],
+            "lastPeriod": labels[-1]
+        }
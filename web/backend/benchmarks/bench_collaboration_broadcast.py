@@ -0,0 +1,171 @@
+"""
+Load test: cursor broadcast in one collaboration session
+
+N users join one workflow session and each sends cursor moves at a fixed
+rate. Most clients read instantly; once everyone has joined, a few become
+slow (every send takes SLOW_SEND_SECONDS, like a congested mobile link) and
+one stops reading (its sends fail after STALL_SECONDS, like a proxy's write
+timeout). Compares:
+
+- sequential: the previous broadcast (send_json awaited on each
+  connection in turn, encoding per recipient)
+- queued: CollaborationManager (encode once, per-connection send queues
+  and writer tasks, slow clients dropped)
+
+Reports cursor moves handled, delivery latency to the fast clients, slow
+clients dropped and "user_left" notices the others received.
+
+Usage:
+    python benchmarks/bench_collaboration_broadcast.py [users] [seconds] [moves_per_second]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from websocket.collaboration_server import CollaborationManager
+
+SLOW_CLIENTS = 5
+SLOW_SEND_SECONDS = 0.1
+STALL_SECONDS = 10
+# Fast clients decode every Nth message to measure latency
+SAMPLE_EVERY = 10
+
+
+class FakeWebSocket:
+    """Client end of a connection: records deliveries; slow or stalled clients make sends wait"""
+
+    def __init__(self):
+        self.send_delay = 0.0
+        self.stalled = False
+        self.received = 0
+        self.user_left = 0
+        self.latencies = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ''):
+        self.closed = True
+
+    async def _deliver(self, text: str):
+        if self.stalled:
+            await asyncio.sleep(STALL_SECONDS)
+            raise ConnectionError('write timed out')
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.received += 1
+        if '"user_left"' in text:
+            self.user_left += 1
+        elif self.received % SAMPLE_EVERY == 0 and '"cursor_update"' in text:
+            self.latencies.append(time.perf_counter() - json.loads(text)['position']['x'])
+
+    async def send_text(self, text: str):
+        await self._deliver(text)
+
+    async def send_json(self, data: dict):
+        # Starlette encodes on every send_json call
+        await self._deliver(json.dumps(data))
+
+
+class SequentialManager(CollaborationManager):
+    """The previous broadcast: await each connection in turn"""
+
+    async def send(self, websocket, message):
+        await websocket.send_json(message)
+
+    async def broadcast(self, workflow_id, message, exclude=None):
+        if workflow_id not in self.active_connections:
+            return
+        dead_connections = set()
+        for connection in list(self.active_connections[workflow_id]):
+            if connection == exclude:
+                continue
+            try:
+                await connection.send_json(message)
+            except Exception:
+                dead_connections.add(connection)
+        for dead in dead_connections:
+            self.disconnect(dead)
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run(manager: CollaborationManager, users: int, seconds: float, rate: float) -> dict:
+    rng = random.Random(3)
+    sockets = [FakeWebSocket() for _ in range(users)]
+    for i, ws in enumerate(sockets):
+        await manager.connect(ws, 'wf-load', f"user-{i}", f"User {i}")
+
+    # Links degrade once everyone has joined
+    for ws in sockets[:SLOW_CLIENTS]:
+        ws.send_delay = SLOW_SEND_SECONDS
+    sockets[SLOW_CLIENTS].stalled = True
+
+    handled = 0
+    deadline = time.perf_counter() + seconds
+
+    async def user_loop(ws):
+        nonlocal handled
+        await asyncio.sleep(rng.random() / rate)
+        while time.perf_counter() < deadline:
+            if ws not in manager.connection_metadata:
+                return
+            await manager.handle_message(ws, {'type': 'cursor_move', 'data': {'x': time.perf_counter(), 'y': 0}})
+            handled += 1
+            await asyncio.sleep(1 / rate)
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(user_loop(ws)) for ws in sockets]
+    await asyncio.wait(tasks, timeout=seconds + STALL_SECONDS * 2)
+    for task in tasks:
+        task.cancel()
+    # Let queued messages drain
+    while manager.get_stats()['queued'] and time.perf_counter() - started < seconds + STALL_SECONDS * 2:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    fast = sockets[SLOW_CLIENTS + 1:]
+    latencies = [latency for ws in fast for latency in ws.latencies]
+    result = {
+        'handled': handled,
+        'elapsed': elapsed,
+        'p50': percentile(latencies, 50) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'max': max(latencies, default=float('nan')) * 1000,
+        'dropped': sum(1 for ws in sockets[:SLOW_CLIENTS + 1] if ws not in manager.connection_metadata),
+        'user_left': sum(ws.user_left for ws in fast) / len(fast)
+    }
+    for ws in list(manager.connection_metadata):
+        manager.disconnect(ws)
+    return result
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    print(f"{users} users in one session, {rate:g} cursor moves/sec each for {seconds:g}s; "
+          f"{SLOW_CLIENTS} clients take {SLOW_SEND_SECONDS * 1000:.0f} ms per message, 1 stops reading")
+    print(f"{'broadcast':<12}{'moves':>8}{'wall s':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'dropped':>9}{'user_left':>11}")
+    for label, manager in (('sequential', SequentialManager()), ('queued', CollaborationManager())):
+        r = asyncio.run(run(manager, users, seconds, rate))
+        print(f"{label:<12}{r['handled']:>8,}{r['elapsed']:>8.1f}{r['p50']:>10.1f}{r['p99']:>10.1f}{r['max']:>10.1f}"
+              f"{r['dropped']:>9}{r['user_left']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
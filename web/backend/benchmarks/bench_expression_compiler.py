@@ -0,0 +1,142 @@
+"""
+Benchmark: condition and template evaluation throughput
+
+Evaluates typical condition groups (3-6 rules over contact/opportunity
+fields, AND/OR) and message templates against generated contexts, and
+reports evaluations per second for:
+
+- compile every call: a fresh CompiledConditionGroup / CompiledTemplate per
+  evaluation (the cost of interpreting the expression each time)
+- cached: evaluate_condition_group / resolve_variables_in_text, which look
+  the compiled expression up in the LRU by condition JSON / template text
+- precompiled: calling a compiled group or template held by the caller (as
+  triggers, transforms and the simulator do)
+- batch: evaluate_batch over 1000 contexts at a time (column by column, as
+  /evaluate-condition/batch does)
+
+Usage:
+    python benchmarks/bench_expression_compiler.py [evaluations]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workflow_features.batch_conditions import evaluate_batch
+from workflow_features.conditions import evaluate_condition_group
+from workflow_features.expressions import (
+    CompiledConditionGroup,
+    CompiledTemplate,
+    compile_condition_group,
+    compile_template,
+    get_cache_stats
+)
+from workflow_features.variables import resolve_variables_in_text
+
+RULES = [
+    {'field': 'contact.email', 'operator': 'contains', 'value': '@gmail.com'},
+    {'field': 'contact.tags', 'operator': 'contains', 'value': 'vip'},
+    {'field': 'contact.source', 'operator': 'equals', 'value': 'facebook'},
+    {'field': 'contact.firstName', 'operator': 'is_not_empty', 'value': ''},
+    {'field': 'opportunity.value', 'operator': 'greater_than', 'value': '500'},
+    {'field': 'opportunity.stage', 'operator': 'not_equals', 'value': 'lost'},
+    {'field': 'contact.phone', 'operator': 'starts_with', 'value': '+1'},
+    {'field': 'contact.email', 'operator': 'matches_regex', 'value': r'^[a-z]+\d*@'}
+]
+
+TEMPLATES = [
+    'Hi {{contact.firstName}}, thanks for reaching out!',
+    'Hello {{ contact.firstName }} {{contact.lastName}}, your {{opportunity.stage}} deal '
+    'worth ${{opportunity.value}} is waiting. Reply STOP to opt out.',
+    '{{contact.firstName}}, we saved your spot. Questions? Call {{contact.phone}}. {{unknown.field}}'
+]
+
+
+def build_groups(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [
+        (rng.sample(RULES, rng.randint(3, 6)), rng.choice(['and', 'or']))
+        for _ in range(count)
+    ]
+
+
+def build_contexts(count: int, seed: int = 9) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            'contact': {
+                'email': f"user{i}@{rng.choice(['gmail.com', 'example.com'])}",
+                'firstName': rng.choice(['Ana', 'Ben', '']),
+                'lastName': 'Doe',
+                'phone': rng.choice(['+15550100', '+445550100']),
+                'tags': rng.sample(['vip', 'lead', 'customer'], rng.randint(0, 2)),
+                'source': rng.choice(['facebook', 'google', 'referral'])
+            },
+            'opportunity': {'value': rng.randint(0, 2000), 'stage': rng.choice(['open', 'won', 'lost'])}
+        }
+        for i in range(count)
+    ]
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>14,.0f}"
+
+
+def main() -> None:
+    evaluations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    groups = build_groups(20)
+    contexts = build_contexts(1000)
+    precompiled_groups = [compile_condition_group(conditions, logic) for conditions, logic in groups]
+    precompiled_templates = [compile_template(text) for text in TEMPLATES]
+
+    print(f"{'expression':<12}{'mode':<20}{'evals/sec':>14}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        conditions, logic = groups[i % len(groups)]
+        CompiledConditionGroup(conditions, logic)(contexts[i % len(contexts)])
+    print(f"{'condition':<12}{'compile every call':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        conditions, logic = groups[i % len(groups)]
+        evaluate_condition_group(conditions, logic, contexts[i % len(contexts)])
+    print(f"{'condition':<12}{'cached (JSON key)':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        precompiled_groups[i % len(groups)](contexts[i % len(contexts)])
+    print(f"{'condition':<12}{'precompiled':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    batches = max(1, evaluations // len(contexts))
+    start = time.perf_counter()
+    for i in range(batches):
+        evaluate_batch(precompiled_groups[i % len(groups)], contexts)
+    print(f"{'condition':<12}{'batch':<20}{rate(batches * len(contexts), time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        CompiledTemplate(TEMPLATES[i % len(TEMPLATES)]).render(contexts[i % len(contexts)])
+    print(f"{'template':<12}{'compile every call':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        resolve_variables_in_text(TEMPLATES[i % len(TEMPLATES)], contexts[i % len(contexts)])
+    print(f"{'template':<12}{'cached (text key)':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    start = time.perf_counter()
+    for i in range(evaluations):
+        precompiled_templates[i % len(TEMPLATES)].render(contexts[i % len(contexts)])
+    print(f"{'template':<12}{'precompiled':<20}{rate(evaluations, time.perf_counter() - start)}")
+
+    print()
+    for name, stats in get_cache_stats().items():
+        print(f"{name:<12}size={stats['size']} hits={stats['hits']} misses={stats['misses']}")
+
+
+if __name__ == '__main__':
+    main()
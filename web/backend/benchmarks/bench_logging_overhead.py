@@ -0,0 +1,128 @@
+"""
+Benchmark: per-request structured logging overhead
+
+Simulates the two log records LoggingMiddleware emits per request and
+compares the synchronous handler path against the queue-based pipeline.
+
+Usage:
+    python benchmarks/bench_logging_overhead.py [requests]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils import error_logger
+from utils.error_logger import StructuredLogger, configure_logging, shutdown_logging, log_sampler
+
+
+def _simulate_requests(logger: StructuredLogger, n: int) -> float:
+    """Return mean microseconds spent in logging per simulated request"""
+    body = {'query': 'how do I build a workflow', 'conversation_history': [{'role': 'user', 'content': 'x' * 200}] * 5}
+    start = time.perf_counter()
+    for i in range(n):
+        logger.info(
+            "Request received: POST /api/chat",
+            context={'method': 'POST', 'path': '/api/chat', 'body': body, 'query_params': {}}
+        )
+        logger.info(
+            "Response sent: POST /api/chat - 200",
+            context=lambda: {'method': 'POST', 'path': '/api/chat', 'status_code': 200, 'duration_ms': 12.5}
+        )
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _simulate_legacy(logger: StructuredLogger, n: int) -> float:
+    """Previous behaviour: eager json.dumps of the full context on every call"""
+    body = {'query': 'how do I build a workflow', 'conversation_history': [{'role': 'user', 'content': 'x' * 200}] * 5}
+    start = time.perf_counter()
+    for i in range(n):
+        logger.logger.info(json.dumps(logger._build_log_context(
+            "Request received: POST /api/chat",
+            context={'method': 'POST', 'path': '/api/chat', 'body': body, 'query_params': {}}
+        )))
+        logger.logger.info(json.dumps(logger._build_log_context(
+            "Response sent: POST /api/chat - 200",
+            context={'method': 'POST', 'path': '/api/chat', 'status_code': 200, 'duration_ms': 12.5}
+        )))
+    return (time.perf_counter() - start) / n * 1e6
+
+
+class SlowFileHandler(logging.FileHandler):
+    """File handler that simulates a slow sink (e.g. blocked stdout pipe)"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        time.sleep(0.0005)
+        super().emit(record)
+
+
+def _reset_root(log_path: str, handler_cls=logging.FileHandler) -> None:
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = handler_cls(log_path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+
+
+def _restart_pipeline(log_path: str, n: int, handler_cls=logging.FileHandler) -> None:
+    shutdown_logging()
+    _reset_root(log_path, handler_cls)
+    configure_logging('INFO', use_queue=True, queue_size=n * 2 + 10)
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logger = StructuredLogger('bench')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, 'bench.log')
+
+        # 1. Previous behaviour: eager json.dumps + write on the calling thread
+        _reset_root(log_path)
+        legacy_us = _simulate_legacy(logger, n)
+
+        # 2. Lazy serialization, synchronous handler
+        _reset_root(log_path)
+        sync_us = _simulate_requests(logger, n)
+
+        # 3. Queue pipeline: enqueue only, listener thread does the rest
+        _restart_pipeline(log_path, n)
+        queued_us = _simulate_requests(logger, n)
+
+        # 4. Queue pipeline with 10% route sampling
+        _restart_pipeline(log_path, n)
+        log_sampler.configure(route_rates={'/api/chat': 0.1})
+        error_logger.request_path_var.set('/api/chat')
+        sampled_us = _simulate_requests(logger, n)
+        log_sampler.configure(route_rates={})
+
+        # 5. Slow sink (0.5 ms per write): synchronous vs queue
+        n_slow = min(n, 500)
+        shutdown_logging()
+        _reset_root(log_path, SlowFileHandler)
+        slow_sync_us = _simulate_requests(logger, n_slow)
+        _restart_pipeline(log_path, n_slow, SlowFileHandler)
+        slow_queued_us = _simulate_requests(logger, n_slow)
+        shutdown_logging()
+
+    print(f"Requests simulated:          {n}")
+    print(f"Serializer:                  {'orjson' if error_logger.ORJSON_AVAILABLE else 'json'}")
+    print(f"Eager json.dumps (previous): {legacy_us:8.2f} us/request")
+    print(f"Lazy, synchronous handler:   {sync_us:8.2f} us/request")
+    print(f"Queue pipeline:              {queued_us:8.2f} us/request")
+    print(f"Queue pipeline + 10% sample: {sampled_us:8.2f} us/request")
+    print(f"Slow sink, synchronous:      {slow_sync_us:8.2f} us/request")
+    print(f"Slow sink, queue pipeline:   {slow_queued_us:8.2f} us/request")
+
+
+if __name__ == '__main__':
+    main()
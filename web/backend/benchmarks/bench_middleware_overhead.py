@@ -0,0 +1,112 @@
+"""
+Benchmark: per-request overhead of LoggingMiddleware + PerformanceMiddleware
+
+Drives the ASGI stack in-process (no sockets) with a /api/chat-style JSON
+body and reports the time added on top of the bare application.
+
+Usage:
+    python benchmarks/bench_middleware_overhead.py [requests] [body_kb]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from middleware.logging_middleware import LoggingMiddleware
+from middleware.performance_middleware import PerformanceMiddleware
+
+
+async def chat_endpoint(request: Request) -> JSONResponse:
+    payload = await request.json()
+    return JSONResponse({'success': True, 'messages': len(payload.get('conversation_history', []))})
+
+
+def _build_body(body_kb: int) -> bytes:
+    message = {'role': 'user', 'content': 'x' * 1000}
+    history = [message] * max(1, body_kb)
+    return json.dumps({'query': 'how do I build a workflow', 'conversation_history': history}).encode()
+
+
+async def _drive(app, body: bytes, n: int) -> float:
+    """Return mean microseconds per request through the given ASGI app"""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/api/chat',
+        'raw_path': b'/api/chat',
+        'query_string': b'',
+        'root_path': '',
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'user-agent', b'bench'),
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('127.0.0.1', 8000),
+    }
+    chunk_size = 64 * 1024
+
+    async def run_once():
+        chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+        index = 0
+
+        async def receive():
+            nonlocal index
+            if index < len(chunks):
+                chunk = chunks[index]
+                index += 1
+                return {'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks)}
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            pass
+
+        await app(dict(scope), receive, send)
+
+    for _ in range(min(50, n)):
+        await run_once()
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await run_once()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    body_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+
+    # Measure middleware cost, not log sink I/O
+    logging.getLogger().handlers = [logging.NullHandler()]
+    logging.getLogger().setLevel(logging.INFO)
+
+    bare = Starlette(routes=[Route('/api/chat', chat_endpoint, methods=['POST'])])
+    stacked = LoggingMiddleware(PerformanceMiddleware(bare))
+    body = _build_body(body_kb)
+
+    bare_us = asyncio.run(_drive(bare, body, n))
+    stacked_us = asyncio.run(_drive(stacked, body, n))
+
+    print(f"Requests:               {n}")
+    print(f"Body size:              {len(body) / 1024:.0f} KB")
+    print(f"Bare app:               {bare_us:10.2f} us/request")
+    print(f"With middleware stack:  {stacked_us:10.2f} us/request")
+    print(f"Middleware overhead:    {stacked_us - bare_us:10.2f} us/request")
+
+
+if __name__ == '__main__':
+    main()
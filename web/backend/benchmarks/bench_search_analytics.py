@@ -0,0 +1,117 @@
+"""
+Benchmark: search analytics dashboard queries over a large search log
+
+Loads N synthetic searches (spread over 90 days) into a temporary
+search_logs.db, then times each SearchAnalytics dashboard query against
+the rollup tables and, for comparison, the equivalent raw-table scan.
+
+Usage:
+    python benchmarks/bench_search_analytics.py [searches]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics import search_logger as search_logger_module
+from analytics.search_logger import SearchLogger, fingerprint_query, get_connection
+from analytics.search_analytics import SearchAnalytics
+
+QUERIES = [
+    "how to send sms", "create workflow", "add tag to contact", "webhook trigger",
+    "appointment reminder", "pipeline stage", "email campaign", "form submission",
+    "custom field", "calendar booking", "missed call text back", "review request",
+]
+INTENTS = ["HOW_TO", "WHAT_IS", "TROUBLESHOOT", "COMMAND", None]
+
+
+def _load(n: int) -> None:
+    conn = get_connection()
+    now = datetime.utcnow()
+    batch = []
+    for i in range(n):
+        base = random.choice(QUERIES)
+        query = f"{base} {random.randint(0, 500)}" if random.random() < 0.5 else base.title() + "?"
+        ts = (now - timedelta(seconds=random.randint(0, 90 * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+        batch.append((query, fingerprint_query(query), random.choice(INTENTS), random.choice([0, 3, 5, 10]), ts))
+        if len(batch) == 50000:
+            conn.executemany(
+                "INSERT INTO search_queries (query, query_fingerprint, intent, results_count, timestamp) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+            conn.executemany(
+                "INSERT INTO result_clicks (query_id, result_id, result_title, result_type, position, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+                [(0, f"cmd-{random.randint(0, 300)}", "Command", "command", random.randint(1, 10), row[4]) for row in batch[::5]]
+            )
+            conn.commit()
+            batch = []
+    if batch:
+        conn.executemany(
+            "INSERT INTO search_queries (query, query_fingerprint, intent, results_count, timestamp) VALUES (?, ?, ?, ?, ?)",
+            batch
+        )
+        conn.commit()
+
+
+def _time_ms(fn, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        search_logger_module.DB_PATH = Path(tmp) / "search_logs.db"
+        SearchLogger()
+        analytics = SearchAnalytics()
+
+        start = time.perf_counter()
+        _load(n)
+        load_s = time.perf_counter() - start
+
+        cursor = get_connection().cursor()
+        since = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
+
+        rollup = {
+            'overview': _time_ms(lambda: analytics.get_overview_stats(30)),
+            'popular_searches': _time_ms(lambda: analytics.get_popular_searches(20, 30)),
+            'popular_commands': _time_ms(lambda: analytics.get_popular_commands(20, 30)),
+            'trends': _time_ms(lambda: analytics.get_search_trends(30)),
+            'intents': _time_ms(lambda: analytics.get_intent_distribution(30)),
+        }
+        raw = {
+            'overview': _time_ms(lambda: cursor.execute(
+                "SELECT COUNT(*) FROM search_queries WHERE timestamp >= ?", (since,)).fetchone()),
+            'popular_searches': _time_ms(lambda: cursor.execute(
+                "SELECT query, COUNT(*) c FROM search_queries WHERE timestamp >= ? GROUP BY query ORDER BY c DESC LIMIT 20",
+                (since,)).fetchall()),
+            'popular_commands': _time_ms(lambda: cursor.execute(
+                "SELECT result_id, COUNT(*) c FROM result_clicks WHERE timestamp >= ? GROUP BY result_id ORDER BY c DESC LIMIT 20",
+                (since,)).fetchall()),
+            'trends': _time_ms(lambda: cursor.execute(
+                "SELECT DATE(timestamp), COUNT(*) FROM search_queries WHERE timestamp >= ? GROUP BY DATE(timestamp)",
+                (since,)).fetchall()),
+            'intents': _time_ms(lambda: cursor.execute(
+                "SELECT intent, COUNT(*) FROM search_queries WHERE timestamp >= ? AND intent IS NOT NULL GROUP BY intent",
+                (since,)).fetchall()),
+        }
+
+    print(f"Searches logged: {n} ({load_s:.1f}s load, {n / load_s:,.0f} rows/s with rollup triggers)")
+    print(f"{'query':<20}{'rollup ms':>12}{'raw scan ms':>14}")
+    for name in rollup:
+        print(f"{name:<20}{rollup[name]:>12.2f}{raw[name]:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
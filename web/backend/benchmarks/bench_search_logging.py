@@ -0,0 +1,70 @@
+"""
+Benchmark: cost of SearchLogger calls on the request path
+
+Compares a synchronous insert + commit per event (the previous behaviour)
+against the buffered logger, and reports background flush throughput.
+
+Usage:
+    python benchmarks/bench_search_logging.py [events]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics import search_logger as search_logger_module
+from analytics.search_logger import SearchLogger, fingerprint_query, get_connection
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        search_logger_module.DB_PATH = Path(tmp) / "search_logs.db"
+        logger = SearchLogger(max_buffered_events=n * 2 + 10)
+        conn = get_connection()
+
+        # Previous behaviour: one INSERT + COMMIT per event on the caller
+        sync_n = min(n, 2000)
+        start = time.perf_counter()
+        for i in range(sync_n):
+            query = f"how to send sms {i % 50}"
+            conn.execute(
+                "INSERT INTO search_queries (query, query_fingerprint, intent, results_count) VALUES (?, ?, ?, ?)",
+                (query, fingerprint_query(query), 'HOW_TO', i % 7)
+            )
+            conn.commit()
+        sync_us = (time.perf_counter() - start) / sync_n * 1e6
+
+        # Buffered: caller only appends to the ring buffer
+        latencies = []
+        for i in range(n):
+            t0 = time.perf_counter()
+            query_id = logger.log_search(f"how to send sms {i % 50}", 'HOW_TO', i % 7)
+            if i % 4 == 0:
+                logger.log_click(query_id, f"cmd-{i % 30}", "Send SMS", "command", 1)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+
+        start = time.perf_counter()
+        logger.close()
+        drain_s = time.perf_counter() - start
+        stats = logger.get_buffer_stats()
+
+        latencies.sort()
+        rows = conn.execute("SELECT COUNT(*) FROM search_queries").fetchone()[0]
+
+    print(f"Synchronous insert+commit:  {sync_us:10.2f} us/event")
+    print(f"Buffered log_search (mean): {sum(latencies) / len(latencies):10.2f} us/event")
+    print(f"Buffered log_search (p50):  {latencies[len(latencies) // 2]:10.2f} us/event")
+    print(f"Buffered log_search (p99):  {latencies[int(len(latencies) * 0.99)]:10.2f} us/event")
+    print(f"Background flushes:         {stats['flush_count']} ({stats['events_flushed']} events, "
+          f"{stats['events_dropped']} dropped, final drain {drain_s * 1000:.1f} ms)")
+    print(f"Rows in search_queries:     {rows}")
+
+
+if __name__ == '__main__':
+    main()
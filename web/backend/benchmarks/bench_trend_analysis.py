@@ -0,0 +1,92 @@
+"""
+Benchmark: workflow performance trend analysis
+
+Fills a MetricsCollector with N synthetic executions spread over 30 days and
+W workflows, then times:
+  - legacy path: get_workflow_metrics() dicts + per-period Python grouping
+  - columnar path: get_execution_columns() + vectorized TrendEngine
+  - all-workflow summary: one TrendEngine pass over every workflow
+
+Usage:
+    python benchmarks/bench_trend_analysis.py [executions] [workflows]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from analytics.metrics_collector import MetricsCollector, WorkflowExecution, ExecutionStatus
+from analytics.performance_analyzer import PerformanceAnalyzer
+
+
+def _load(collector: MetricsCollector, n: int, workflows: int) -> None:
+    now = datetime.now()
+    history = []
+    for i in range(n):
+        execution = WorkflowExecution(f"exec-{i}", f"wf-{i % workflows}", f"Workflow {i % workflows}")
+        execution.started_at = now - timedelta(seconds=random.randint(0, 30 * 86400))
+        execution.status = ExecutionStatus.COMPLETED if random.random() < 0.9 else ExecutionStatus.FAILED
+        execution.duration_ms = int(random.lognormvariate(6, 0.8))
+        history.append(execution)
+    history.sort(key=lambda e: e.started_at)
+    collector.execution_history = history
+    collector.execution_columns.extend(history)
+
+
+def _time_ms(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    workflows = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    collector = MetricsCollector()
+    _load(collector, n, workflows)
+
+    analyzer = PerformanceAnalyzer()
+    legacy = PerformanceAnalyzer()
+    legacy.trend_engine = None
+
+    def legacy_single():
+        executions = collector.get_workflow_metrics("wf-0")["executions"]
+        return legacy.analyze_trends(executions, interval="hourly")
+
+    def columnar_single():
+        return analyzer.analyze_trends(collector.get_execution_columns("wf-0"), interval="hourly")
+
+    # Legacy has no all-workflow API; approximate with the per-workflow loop over a sample
+    sample = min(workflows, 50)
+
+    def legacy_sample():
+        for w in range(sample):
+            legacy.analyze_trends(collector.get_workflow_metrics(f"wf-{w}")["executions"], interval="daily")
+
+    def columnar_all():
+        return analyzer.analyze_workflow_trends(collector.get_execution_columns(), interval="daily")
+
+    legacy_single_ms = _time_ms(legacy_single)
+    columnar_single_ms = _time_ms(columnar_single)
+    legacy_sample_ms = _time_ms(legacy_sample, repeat=1)
+    columnar_all_ms = _time_ms(columnar_all)
+
+    print(f"Executions:                        {n} over 30 days, {workflows} workflows")
+    print(f"Single workflow, hourly (legacy):   {legacy_single_ms:10.2f} ms")
+    print(f"Single workflow, hourly (columnar): {columnar_single_ms:10.2f} ms")
+    print(f"All workflows, daily (legacy est.): {legacy_sample_ms / sample * workflows:10.2f} ms "
+          f"(extrapolated from {sample})")
+    print(f"All workflows, daily (columnar):    {columnar_all_ms:10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: routing inbound events to workflow triggers
+
+Registers N triggers spread over the trigger types (most with an equals
+filter on a form id, tag name or custom event name, some with only
+contains/starts_with filters or none) and routes generated events,
+reporting events per second for:
+
+- linear scan: matches_event on every trigger of the event's type
+- router: TriggerRouter.route (type + equals-filter index)
+
+Usage:
+    python benchmarks/bench_trigger_router.py [triggers] [events]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workflow_features.triggers import Trigger, TriggerRouter, TriggerType
+
+# Event type -> field its triggers usually filter on
+KEY_FIELDS = {
+    TriggerType.FORM_SUBMISSION: 'form.id',
+    TriggerType.TAG_ADDED: 'tag',
+    TriggerType.TAG_REMOVED: 'tag',
+    TriggerType.WEBHOOK: 'webhook.path',
+    TriggerType.CUSTOM_EVENT: 'event.name',
+    TriggerType.APPOINTMENT_BOOKED: 'calendar.id',
+    TriggerType.OPPORTUNITY_CREATED: 'pipeline.id',
+    TriggerType.CONTACT_CREATED: 'contact.source'
+}
+SOURCES = ['facebook', 'google', 'referral', 'website', 'import']
+
+
+def build_triggers(count: int, keys: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    types = list(KEY_FIELDS)
+    triggers = []
+    for i in range(count):
+        trigger_type = rng.choice(types)
+        roll = rng.random()
+        if roll < 0.85:
+            filters = [{'field': KEY_FIELDS[trigger_type], 'operator': 'equals', 'value': f"key-{rng.randrange(keys)}"}]
+            if rng.random() < 0.3:
+                filters.append({'field': 'contact.source', 'operator': 'equals', 'value': rng.choice(SOURCES)})
+        elif roll < 0.95:
+            filters = [{'field': 'contact.email', 'operator': 'contains', 'value': f"@domain{rng.randrange(50)}.com"}]
+        else:
+            filters = []
+        triggers.append((f"trigger-{i}", Trigger(trigger_type.value, {}, filters)))
+    return triggers
+
+
+def build_events(count: int, keys: int, seed: int = 13) -> list:
+    rng = random.Random(seed)
+    types = list(KEY_FIELDS)
+    events = []
+    for _ in range(count):
+        trigger_type = rng.choice(types)
+        data = {
+            'contact': {'email': f"user@domain{rng.randrange(50)}.com", 'source': rng.choice(SOURCES)},
+            'tag': f"key-{rng.randrange(keys)}",
+            'form': {'id': f"key-{rng.randrange(keys)}"},
+            'webhook': {'path': f"key-{rng.randrange(keys)}"},
+            'event': {'name': f"key-{rng.randrange(keys)}"},
+            'calendar': {'id': f"key-{rng.randrange(keys)}"},
+            'pipeline': {'id': f"key-{rng.randrange(keys)}"}
+        }
+        events.append((trigger_type, data))
+    return events
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    event_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    keys = max(1, count // 10)
+    triggers = build_triggers(count, keys)
+    events = build_events(event_count, keys)
+
+    router = TriggerRouter()
+    for trigger_id, trigger in triggers:
+        router.add(trigger_id, trigger)
+
+    linear_events = max(1, event_count // 20)
+    start = time.perf_counter()
+    linear_matches = 0
+    for trigger_type, data in events[:linear_events]:
+        linear_matches += sum(
+            1 for _, trigger in triggers
+            if trigger.type == trigger_type and trigger.matches_event(data)
+        )
+    linear = linear_events / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    routed_matches = 0
+    for i, (trigger_type, data) in enumerate(events):
+        matched = router.route(trigger_type, data)
+        if i < linear_events:
+            routed_matches += len(matched)
+    routed = event_count / (time.perf_counter() - start)
+
+    assert linear_matches == routed_matches, (linear_matches, routed_matches)
+
+    print(f"{count:,} triggers, {event_count:,} events")
+    print(f"{'mode':<16}{'events/sec':>14}")
+    print(f"{'linear scan':<16}{linear:>14,.0f}")
+    print(f"{'router':<16}{routed:>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
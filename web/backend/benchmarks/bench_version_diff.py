@@ -0,0 +1,111 @@
+"""
+Benchmark: commit diff size and latency
+
+A workflow with N nodes gets commits that each move a batch of nodes and
+retitle a few. For consecutive commit pairs, compares:
+
+- previous: both snapshots parsed from JSON, whole node bodies compared
+  with != and returned as before/after
+- structural: calculate_diff (per-field JSON Patch changes, moved nodes
+  separated), first view and repeat view (cached by commit pair)
+
+Reports response size (JSON bytes) and latency.
+
+Usage:
+    python benchmarks/bench_version_diff.py [nodes] [commits]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from version_control.workflow_versions import WorkflowVersionControl
+
+
+def build_workflow(nodes: int) -> dict:
+    return {
+        'name': 'Lead Nurture - Main',
+        'nodes': [
+            {
+                'id': f"node-{i}",
+                'type': 'action',
+                'position': {'x': i * 40, 'y': 0},
+                'data': {
+                    'title': f"Step {i}",
+                    'config': {'template': f"Hi {{{{contact.firstName}}}}, this is message {i} of the sequence", 'delayMinutes': 60}
+                }
+            }
+            for i in range(nodes)
+        ],
+        'connections': [
+            {'id': f"edge-{i}", 'source': f"node-{i - 1}", 'target': f"node-{i}", 'label': 'next'}
+            for i in range(1, nodes)
+        ]
+    }
+
+
+def previous_diff(text_a: str, text_b: str) -> dict:
+    """The previous calculate_diff, starting from both snapshots' JSON"""
+    workflow_a = json.loads(text_a)
+    workflow_b = json.loads(text_b)
+    nodes_a = {node['id']: node for node in workflow_a.get('nodes', [])}
+    nodes_b = {node['id']: node for node in workflow_b.get('nodes', [])}
+    modified = [
+        {'id': node_id, 'before': nodes_a[node_id], 'after': nodes_b[node_id]}
+        for node_id in nodes_a if node_id in nodes_b and nodes_a[node_id] != nodes_b[node_id]
+    ]
+    conns_a = set((c.get('source'), c.get('target')) for c in workflow_a.get('connections', []))
+    conns_b = set((c.get('source'), c.get('target')) for c in workflow_b.get('connections', []))
+    return {
+        'success': True,
+        'added_nodes': [nodes_b[n] for n in nodes_b if n not in nodes_a],
+        'removed_nodes': [nodes_a[n] for n in nodes_a if n not in nodes_b],
+        'modified_nodes': modified,
+        'added_connections': list(conns_b - conns_a),
+        'removed_connections': list(conns_a - conns_b)
+    }
+
+
+def main() -> None:
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    commits = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(17)
+
+    vc = WorkflowVersionControl(os.path.join(tempfile.mkdtemp(), 'diff.db'))
+    vc.create_workflow('wf-1', 'Lead Nurture')
+    workflow = build_workflow(nodes)
+    commit_ids, snapshots = [], []
+    for step in range(commits):
+        for node in rng.sample(workflow['nodes'], 20):
+            node['position'] = {'x': rng.randint(0, 2000), 'y': rng.randint(0, 2000)}
+        for node in rng.sample(workflow['nodes'], 3):
+            node['data']['title'] = f"{node['id']} v{step}"
+        commit_ids.append(vc.commit('wf-1', workflow, f"Edit {step}", 'bench')['commit_id'])
+        snapshots.append(json.dumps(workflow, sort_keys=True))
+    pairs = list(zip(range(commits - 1), range(1, commits)))
+
+    results = {}
+    started = time.perf_counter()
+    sizes = [len(json.dumps(previous_diff(snapshots[a], snapshots[b]))) for a, b in pairs]
+    results['previous'] = ((time.perf_counter() - started) * 1000 / len(pairs), sum(sizes) / len(sizes))
+
+    for label in ('structural (first)', 'structural (repeat)'):
+        started = time.perf_counter()
+        sizes = [len(json.dumps(vc.calculate_diff(commit_ids[a], commit_ids[b]))) for a, b in pairs]
+        results[label] = ((time.perf_counter() - started) * 1000 / len(pairs), sum(sizes) / len(sizes))
+
+    print(f"{nodes} nodes, {len(pairs)} diffs of consecutive commits (20 nodes moved, 3 retitled each)")
+    print(f"{'diff':<22}{'ms/diff':>10}{'response KB':>14}")
+    for label, (ms, size) in results.items():
+        print(f"{label:<22}{ms:>10.2f}{size / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: commit history pages and repeated checkouts
+
+Builds a workflow with N commits on main and reports:
+
+- history page latency: walking the parent chain with one SELECT per commit
+  (the previous get_history) vs the single recursive-CTE query, for the
+  first page and for a page starting deep in the history (from_commit)
+- get_commit latency for recently viewed commits, with the snapshot cache
+  disabled vs enabled
+
+Usage:
+    python benchmarks/bench_version_history.py [commits] [page_size]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from version_control.workflow_versions import WorkflowVersionControl
+
+
+def build_workflow(nodes: int) -> dict:
+    return {
+        'name': 'Lead Nurture - Main',
+        'nodes': [
+            {'id': f"node-{i}", 'type': 'action', 'position': {'x': i * 40, 'y': 0}, 'data': {'title': f"Step {i}"}}
+            for i in range(nodes)
+        ],
+        'connections': [{'id': f"edge-{i}", 'source': f"node-{i - 1}", 'target': f"node-{i}"} for i in range(1, nodes)]
+    }
+
+
+def walk_history(db_path: str, workflow_id: str, branch: str, limit: int, start: str = None) -> list:
+    """The previous get_history: one query per commit"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    try:
+        if start is None:
+            cursor.execute("SELECT head_commit_id FROM branches WHERE workflow_id = ? AND name = ?", (workflow_id, branch))
+            start = cursor.fetchone()[0]
+        history = []
+        current = start
+        while current and len(history) < limit:
+            cursor.execute("""
+                SELECT id, commit_message, author, timestamp, parent_commit_id, metadata
+                FROM commits WHERE id = ?
+            """, (current,))
+            row = cursor.fetchone()
+            if not row:
+                break
+            history.append(row[0])
+            current = row[4]
+        return history
+    finally:
+        conn.close()
+
+
+def timed_ms(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeats
+
+
+def main() -> None:
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rng = random.Random(5)
+    db_path = os.path.join(tempfile.mkdtemp(), 'history.db')
+
+    vc = WorkflowVersionControl(db_path)
+    vc.create_workflow('wf-1', 'Lead Nurture')
+    workflow = build_workflow(150)
+    commit_ids = []
+    for step in range(commits):
+        node = rng.choice(workflow['nodes'])
+        node['position'] = {'x': rng.randint(0, 2000), 'y': rng.randint(0, 2000)}
+        commit_ids.append(vc.commit('wf-1', workflow, f"Edit {step}", 'bench')['commit_id'])
+
+    deep = commit_ids[len(commit_ids) // 10]
+    assert walk_history(db_path, 'wf-1', 'main', page_size) == [c['commit_id'] for c in vc.get_history('wf-1', 'main', page_size)]
+
+    print(f"{commits:,} commits, page size {page_size}")
+    print(f"{'history page':<26}{'walk ms':>10}{'CTE ms':>10}")
+    for label, start in (('head', None), ('deep (from_commit)', deep)):
+        walk = timed_ms(lambda: walk_history(db_path, 'wf-1', 'main', page_size, start), 50)
+        cte = timed_ms(lambda: vc.get_history('wf-1', 'main', page_size, from_commit=start), 50)
+        print(f"{label:<26}{walk:>10.2f}{cte:>10.2f}")
+    full_walk = timed_ms(lambda: walk_history(db_path, 'wf-1', 'main', commits), 3)
+    full_cte = timed_ms(lambda: vc.get_history('wf-1', 'main', commits), 3)
+    print(f"{'entire history':<26}{full_walk:>10.2f}{full_cte:>10.2f}")
+
+    # Reviewers flipping between recent commits
+    recent = commit_ids[-100:]
+    views = [rng.choice(recent) for _ in range(1000)]
+    print(f"\n{'get_commit (recent 100)':<26}{'ms/call':>10}")
+    for label, cache_size in (('no cache', 0), ('snapshot cache', 256)):
+        reader = WorkflowVersionControl(db_path, cache_size=cache_size)
+        started = time.perf_counter()
+        for commit_id in views:
+            reader.get_commit(commit_id)
+        print(f"{label:<26}{(time.perf_counter() - started) * 1000 / len(views):>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark: merge-base search and three-way merges
+
+1. Merge base on a long history: main gets N commits; branches fork from
+   it near the head, half way back, and near the root (the last one merges
+   main in every 500 commits). Compares merge_base (generation-ordered
+   walk, ancestry fetched in windows) with collecting one branch's whole
+   ancestry one SELECT per commit and walking the other until it hits.
+
+2. Merge of two branches that edit different fields of the same nodes (one
+   moves nodes, the other retitles them and relabels connections): conflicts
+   reported by the previous two-way diff (every modified node) vs the
+   three-way merge, and merge_branches latency.
+
+Usage:
+    python benchmarks/bench_version_merge.py [commits] [nodes]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from version_control.workflow_versions import WorkflowVersionControl
+
+
+def build_workflow(nodes: int) -> dict:
+    return {
+        'name': 'Lead Nurture - Main',
+        'nodes': [
+            {'id': f"node-{i}", 'type': 'action', 'position': {'x': i * 40, 'y': 0}, 'data': {'title': f"Step {i}"}}
+            for i in range(nodes)
+        ],
+        'connections': [
+            {'id': f"edge-{i}", 'source': f"node-{i - 1}", 'target': f"node-{i}", 'label': 'next'}
+            for i in range(1, nodes)
+        ]
+    }
+
+
+def head(vc: WorkflowVersionControl, workflow_id: str, branch: str) -> str:
+    return next(b['head_commit'] for b in vc.list_branches(workflow_id) if b['name'] == branch)
+
+
+def ancestry_walk(db_path: str, commit_a: str, commit_b: str) -> str:
+    """Every ancestor of commit_a, then commit_b's ancestry until one is found (one query per commit)"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    def parents(commit_id):
+        cursor.execute("SELECT parent_commit_id, merge_parent_id FROM commits WHERE id = ?", (commit_id,))
+        return [p for p in cursor.fetchone() if p]
+
+    try:
+        seen = {commit_a}
+        stack = [commit_a]
+        while stack:
+            for parent in parents(stack.pop()):
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        queue = [commit_b]
+        visited = {commit_b}
+        while queue:
+            commit_id = queue.pop(0)
+            if commit_id in seen:
+                return commit_id
+            for parent in parents(commit_id):
+                if parent not in visited:
+                    visited.add(parent)
+                    queue.append(parent)
+        return None
+    finally:
+        conn.close()
+
+
+def timed_ms(fn, repeats: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeats
+
+
+def bench_merge_base(commits: int) -> None:
+    db_path = os.path.join(tempfile.mkdtemp(), 'merge_base.db')
+    vc = WorkflowVersionControl(db_path)
+    vc.create_workflow('wf-1', 'Lead Nurture')
+    forks = {100: 'long-lived', commits // 2: 'half-way', commits - 20: 'recent'}
+
+    started = time.perf_counter()
+    for step in range(commits):
+        vc.commit('wf-1', {'nodes': [{'id': 'node-0', 'data': {'step': step}}]}, f"Edit {step}", 'bench')
+        if step in forks:
+            vc.create_branch('wf-1', forks[step])
+            for i in range(10):
+                vc.commit('wf-1', {'nodes': [{'id': 'node-0', 'data': {'branch': i}}]}, f"Branch edit {i}", 'bench', forks[step])
+        if step > 100 and step % 500 == 0:
+            vc.merge_branches('wf-1', 'main', 'long-lived', 'bench', strategy='theirs')
+    print(f"{commits:,} commits on main (built in {time.perf_counter() - started:.0f}s)")
+
+    main_head = head(vc, 'wf-1', 'main')
+    print(f"{'merge base with main':<24}{'distance':>10}{'walk ms':>12}{'new ms':>10}")
+    for branch in ('recent', 'half-way', 'long-lived'):
+        branch_head = head(vc, 'wf-1', branch)
+        base = vc.merge_base('wf-1', main_head, branch_head)
+        assert ancestry_walk(db_path, main_head, branch_head) == base
+        distance = vc.get_commit(main_head)['generation'] - vc.get_commit(base)['generation']
+        walk = timed_ms(lambda: ancestry_walk(db_path, main_head, branch_head), 1)
+        new = timed_ms(lambda: vc.merge_base('wf-1', main_head, branch_head), 20)
+        print(f"{branch:<24}{distance:>10,}{walk:>12.1f}{new:>10.2f}")
+
+
+def bench_merge(nodes: int) -> None:
+    rng = random.Random(9)
+    vc = WorkflowVersionControl(os.path.join(tempfile.mkdtemp(), 'merge.db'))
+    vc.create_workflow('wf-1', 'Lead Nurture')
+    workflow = build_workflow(nodes)
+    vc.commit('wf-1', workflow, 'Initial', 'bench')
+    vc.create_branch('wf-1', 'layout')
+    vc.create_branch('wf-1', 'copy')
+
+    touched = rng.sample(range(nodes), nodes // 2)
+    layout = json.loads(json.dumps(workflow))
+    copy = json.loads(json.dumps(workflow))
+    for i in touched:
+        layout['nodes'][i]['position'] = {'x': rng.randint(0, 2000), 'y': rng.randint(0, 2000)}
+        copy['nodes'][i]['data']['title'] = f"Step {i} (reviewed)"
+        if i:
+            copy['connections'][i - 1]['label'] = 'reviewed'
+    vc.commit('wf-1', layout, 'Rearrange', 'bench', 'layout')
+    vc.commit('wf-1', copy, 'Copy edits', 'bench', 'copy')
+
+    # The previous merge flagged every node modified between the two heads
+    previous = vc.calculate_diff(head(vc, 'wf-1', 'copy'), head(vc, 'wf-1', 'layout'))['summary']['nodes_modified']
+
+    vc.merge_branches('wf-1', 'layout', 'main', 'bench')
+    started = time.perf_counter()
+    result = vc.merge_branches('wf-1', 'copy', 'main', 'bench')
+    merge_ms = (time.perf_counter() - started) * 1000
+    merged = vc.get_commit(result['commit_id'])['workflow']
+    kept = sum(
+        1 for i in touched
+        if merged['nodes'][i]['position'] == layout['nodes'][i]['position']
+        and merged['nodes'][i]['data']['title'] == copy['nodes'][i]['data']['title']
+    )
+
+    print(f"\n{nodes} nodes, both branches edit the same {len(touched)} nodes (different fields)")
+    print(f"conflicts: previous two-way {previous}, three-way {len(result.get('conflicts', []))}")
+    print(f"nodes keeping both edits: {kept}/{len(touched)}, "
+          f"connection labels kept: {sum(1 for c in merged['connections'] if c.get('label') == 'reviewed')}")
+    print(f"merge_branches: {merge_ms:.1f} ms")
+
+
+def main() -> None:
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    bench_merge_base(commits)
+    bench_merge(nodes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: workflow version storage size and checkout latency
+
+Commits N edits of a workflow that starts with 100 nodes (each edit moves
+or retitles a few nodes, occasionally adds or removes a node and its
+connection) and compares:
+
+- full JSON: every commit's complete snapshot as TEXT (the previous format)
+- delta: compressed keyframes every KEYFRAME_INTERVAL commits plus
+  compressed parent deltas
+
+Reports database size, and get_commit latency for random commits.
+
+Usage:
+    python benchmarks/bench_version_storage.py [commits] [checkouts]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from version_control.delta_storage import KEYFRAME_INTERVAL
+from version_control.workflow_versions import WorkflowVersionControl
+
+NODE_TYPES = ['trigger', 'action', 'condition', 'delay', 'email', 'sms']
+
+
+def build_workflow(nodes: int, rng: random.Random) -> dict:
+    workflow = {
+        'name': 'Lead Nurture - Main',
+        'settings': {'timezone': 'America/New_York', 'allowReentry': False},
+        'nodes': [],
+        'connections': []
+    }
+    for i in range(nodes):
+        workflow['nodes'].append({
+            'id': f"node-{i}",
+            'type': rng.choice(NODE_TYPES),
+            'position': {'x': rng.randint(0, 2000), 'y': rng.randint(0, 4000)},
+            'data': {
+                'title': f"Step {i}",
+                'config': {'template': f"Hi {{{{contact.firstName}}}}, message {i}", 'delayMinutes': rng.randint(0, 1440)}
+            }
+        })
+        if i:
+            workflow['connections'].append({'id': f"edge-{i}", 'source': f"node-{i - 1}", 'target': f"node-{i}"})
+    return workflow
+
+
+def edit(workflow: dict, step: int, rng: random.Random) -> dict:
+    workflow = json.loads(json.dumps(workflow))
+    nodes = workflow['nodes']
+    for node in rng.sample(nodes, min(len(nodes), rng.randint(1, 3))):
+        if rng.random() < 0.7:
+            node['position'] = {'x': rng.randint(0, 2000), 'y': rng.randint(0, 4000)}
+        else:
+            node['data']['title'] = f"Step {node['id']} v{step}"
+    roll = rng.random()
+    if roll < 0.05:
+        node_id = f"node-new-{step}"
+        nodes.append({'id': node_id, 'type': rng.choice(NODE_TYPES), 'position': {'x': 0, 'y': 0},
+                      'data': {'title': 'New step', 'config': {}}})
+        workflow['connections'].append({'id': f"edge-new-{step}", 'source': nodes[-2]['id'], 'target': node_id})
+    elif roll < 0.08 and len(nodes) > 10:
+        removed = nodes.pop(rng.randrange(1, len(nodes)))
+        workflow['connections'] = [
+            c for c in workflow['connections'] if removed['id'] not in (c['source'], c['target'])
+        ]
+    return workflow
+
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main() -> None:
+    commits = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    checkouts = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(21)
+    directory = tempfile.mkdtemp()
+
+    vc = WorkflowVersionControl(os.path.join(directory, 'delta.db'))
+    vc.create_workflow('wf-1', 'Lead Nurture')
+    legacy = sqlite3.connect(os.path.join(directory, 'full.db'))
+    legacy.execute("CREATE TABLE commits (id TEXT PRIMARY KEY, workflow_snapshot TEXT NOT NULL)")
+
+    workflow = build_workflow(100, rng)
+    commit_ids = []
+    started = time.perf_counter()
+    for step in range(commits):
+        workflow = edit(workflow, step, rng)
+        result = vc.commit('wf-1', workflow, f"Edit {step}", 'bench')
+        commit_ids.append(result['commit_id'])
+        legacy.execute("INSERT INTO commits VALUES (?, ?)", (result['commit_id'], json.dumps(workflow, sort_keys=True)))
+    commit_seconds = time.perf_counter() - started
+    legacy.commit()
+
+    sample = rng.sample(commit_ids, min(checkouts, len(commit_ids)))
+    delta_ms = []
+    for commit_id in sample:
+        started = time.perf_counter()
+        vc.get_commit(commit_id)
+        delta_ms.append((time.perf_counter() - started) * 1000)
+
+    full_ms = []
+    for commit_id in sample:
+        started = time.perf_counter()
+        row = legacy.execute("SELECT workflow_snapshot FROM commits WHERE id = ?", (commit_id,)).fetchone()
+        json.loads(row[0])
+        full_ms.append((time.perf_counter() - started) * 1000)
+    legacy.close()
+
+    stats = vc.storage_stats('wf-1')
+    full_size = file_size(os.path.join(directory, 'full.db'))
+    delta_size = file_size(os.path.join(directory, 'delta.db'))
+
+    print(f"{commits:,} commits (workflow ends at {len(workflow['nodes'])} nodes), keyframe every {KEYFRAME_INTERVAL}")
+    print(f"commit throughput (delta): {commits / commit_seconds:,.0f}/sec")
+    for storage, counts in stats['by_storage'].items():
+        print(f"  {storage:<9}{counts['commits']:>8,} commits {counts['bytes'] / 1024:>10,.0f} KB")
+    print(f"\n{'storage':<12}{'db size':>12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, size, latencies in (('full JSON', full_size, full_ms), ('delta', delta_size, delta_ms)):
+        print(f"{name:<12}{size / 1024 / 1024:>9.1f} MB"
+              f"{percentile(latencies, 50):>10.2f}{percentile(latencies, 95):>10.2f}{max(latencies):>10.2f}")
+    print(f"\nreduction: {full_size / delta_size:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
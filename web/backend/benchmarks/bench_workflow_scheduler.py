@@ -0,0 +1,95 @@
+"""
+Benchmark: workflow scheduler with many schedules
+
+Loads N schedules (mixed cron / recurring / once, several timezones) into a
+ScheduleManager and reports:
+
+- cron next-fire computations per second
+- bulk load (heapify) time
+- per-tick cost of finding due workflows, one tick per simulated minute:
+  the previous linear scan over every schedule vs the heap (pop due +
+  re-arm), and the heap cost per fired schedule
+
+Usage:
+    python benchmarks/bench_workflow_scheduler.py [schedules] [ticks]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workflow_features.scheduler import Schedule, ScheduleManager
+
+CRONS = ['*/5 * * * *', '0 9 * * MON-FRI', '30 2 * * *', '0 0 1 * *', '15,45 8-18 * * *', '0 12 * * 0']
+TIMEZONES = ['UTC', 'America/New_York', 'Europe/London', 'Asia/Tokyo', 'Australia/Sydney']
+
+
+def build_schedules(count: int, start: datetime, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    schedules = []
+    for i in range(count):
+        kind = rng.random()
+        last_run = (start - timedelta(minutes=rng.randint(0, 1440))).isoformat()
+        if kind < 0.6:
+            schedule = Schedule('cron', {'cron': rng.choice(CRONS), 'lastRun': last_run}, rng.choice(TIMEZONES))
+        elif kind < 0.9:
+            schedule = Schedule('recurring', {'interval': rng.randint(60, 10080), 'lastRun': last_run})
+        else:
+            run_at = start + timedelta(minutes=rng.randint(0, 10080))
+            schedule = Schedule('once', {'runAt': run_at.isoformat()})
+        schedules.append((f"wf-{i}", schedule))
+    return schedules
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    schedules = build_schedules(count, start)
+
+    began = time.perf_counter()
+    next_runs = [(workflow_id, schedule, schedule.next_run_at(start)) for workflow_id, schedule in schedules]
+    elapsed = time.perf_counter() - began
+    print(f"next-fire computations: {count / elapsed:,.0f}/sec")
+
+    manager = ScheduleManager()
+    began = time.perf_counter()
+    manager.load([
+        (workflow_id, schedule, next_run.timestamp() if next_run else None)
+        for workflow_id, schedule, next_run in next_runs
+    ])
+    print(f"load {count:,} schedules: {(time.perf_counter() - began) * 1000:.1f} ms")
+
+    now = start
+    linear_ticks = max(1, min(ticks, 5))
+    began = time.perf_counter()
+    for i in range(linear_ticks):
+        tick = now + timedelta(minutes=i)
+        [workflow_id for workflow_id, schedule in schedules
+         if schedule.enabled and (schedule.next_run_at(tick) or tick + timedelta(days=1)) <= tick]
+    linear = (time.perf_counter() - began) / linear_ticks
+
+    fired = 0
+    began = time.perf_counter()
+    for i in range(ticks):
+        tick = now + timedelta(minutes=i)
+        for workflow_id, _ in manager.pop_due(tick):
+            manager.get_schedule(workflow_id).mark_run(tick)
+            manager.rearm(workflow_id, tick)
+            fired += 1
+    heap = (time.perf_counter() - began) / ticks
+
+    print(f"\n{'per tick':<28}{'ms':>10}")
+    print(f"{'linear scan':<28}{linear * 1000:>10.2f}")
+    print(f"{'heap pop + re-arm':<28}{heap * 1000:>10.2f}   ({fired / ticks:.0f} due/tick)")
+    if fired:
+        print(f"{'heap per fired schedule':<28}{heap * ticks / fired * 1000:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: WorkflowSimulator per-step cost vs workflow size
+
+Builds workflows with N nodes where the simulated path (trigger -> actions
+and conditions with personalized messages, 40 steps) runs through nodes
+scattered across the node and connection lists, surrounded by unrelated
+branches. Reports compile time and the cost per simulated step; with the
+compiled workflow the per-step cost should not depend on N.
+
+Usage:
+    python benchmarks/bench_workflow_simulator.py [sizes...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.workflow_simulator import WorkflowSimulator
+
+PATH_LENGTH = 40
+
+MOCK_CONTACT = {
+    'name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'phone': '+15550100',
+    'tags': ['vip'],
+    'email_engagement_rate': 0.6,
+    'engagement_level': 'high'
+}
+
+
+def build_workflow(n: int, seed: int = 3) -> dict:
+    rng = random.Random(seed)
+    nodes = [{'id': f'n{i}', 'type': 'action', 'data': {
+        'title': f'Filler {i}', 'action_type': 'update_field'
+    }} for i in range(n)]
+    nodes[0] = {'id': 'n0', 'type': 'trigger', 'data': {'title': 'Start', 'trigger_type': 'form_submitted'}}
+
+    # Simulated path through random positions of the node list
+    path = ['n0'] + [f'n{i}' for i in rng.sample(range(1, n), min(PATH_LENGTH, n - 1))]
+    for step, node_id in enumerate(path[1:], start=1):
+        index = int(node_id[1:])
+        if step % 4 == 0:
+            nodes[index] = {'id': node_id, 'type': 'condition', 'data': {
+                'title': f'Check {step}', 'condition_type': 'has_tag', 'tag': 'vip'
+            }}
+        else:
+            nodes[index] = {'id': node_id, 'type': 'action', 'data': {
+                'title': f'Email {step}',
+                'action_type': 'send_email',
+                'subject': 'Hi {{contact.first_name}}',
+                'message': 'Hello {{ contact.name }} from {{contact.company}}. {{unsubscribe_link}}'
+            }}
+
+    on_path = set(path)
+    connections = [
+        {'source': f'n{i}', 'target': f'n{rng.randrange(n)}'}
+        for i in range(1, n) if f'n{i}' not in on_path and rng.random() < 0.8
+    ]
+    for source, target in zip(path, path[1:]):
+        label = 'yes' if nodes[int(source[1:])]['type'] == 'condition' else ''
+        connections.append({'source': source, 'target': target, 'label': label})
+    rng.shuffle(connections)
+
+    return {'nodes': nodes, 'connections': connections}
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000]
+    simulator = WorkflowSimulator()
+
+    print(f"{'nodes':>8}{'edges':>8}{'steps':>7}{'compile ms':>12}{'us/step':>10}{'us/step (incl. compile)':>25}")
+    for n in sizes:
+        workflow = build_workflow(n)
+
+        start = time.perf_counter()
+        compiled = simulator.compile(workflow)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        repeat = 20
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = simulator.simulate(compiled, MOCK_CONTACT)
+        steps = result['nodes_executed']
+        per_step_us = (time.perf_counter() - start) / repeat / steps * 1e6
+
+        start = time.perf_counter()
+        simulator.simulate(workflow, MOCK_CONTACT)
+        total_us = (time.perf_counter() - start) / steps * 1e6
+
+        print(f"{n:>8}{len(workflow['connections']):>8}{steps:>7}{compile_ms:>12.2f}{per_step_us:>10.1f}{total_us:>25.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: WorkflowValidator.validate on large workflows
+
+Builds synthetic workflows (trigger -> chains of email/sms/tag actions,
+delays and conditions with success/failure branches, plus a few back edges
+so cycle detection has work to do) and reports validation time per size:
+full validation, and an incremental ValidationSession applying typical
+editor diffs (edit a node's text, append a connected node, delete an edge).
+
+Usage:
+    python benchmarks/bench_workflow_validator.py [sizes...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.workflow_validator import WorkflowValidator
+from utils.incremental_validator import ValidationSession
+
+ACTION_TYPES = ['send_email', 'send_sms', 'add_tag', 'update_field', 'http_request']
+
+
+def build_workflow(n: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    nodes = [{'id': 'n0', 'type': 'trigger', 'data': {'title': 'Form Submitted'}}]
+    connections = []
+
+    for i in range(1, n):
+        kind = rng.random()
+        if kind < 0.6:
+            node = {'id': f'n{i}', 'type': 'action', 'data': {
+                'title': f'Action {i}',
+                'action_type': rng.choice(ACTION_TYPES),
+                'message': 'Hi {{contact.first_name}}, unsubscribe anytime'
+            }}
+        elif kind < 0.8:
+            node = {'id': f'n{i}', 'type': 'delay', 'data': {'title': f'Wait {i}', 'duration': 60}}
+        else:
+            node = {'id': f'n{i}', 'type': 'condition', 'data': {'title': f'Check {i}'}}
+        nodes.append(node)
+
+        parent = rng.randint(max(0, i - 5), i - 1)
+        label = rng.choice(['', '', 'success', 'failure'])
+        connections.append({'source': f'n{parent}', 'target': f'n{i}', 'label': label})
+
+    # A handful of back edges (loops)
+    for _ in range(max(1, n // 200)):
+        a = rng.randint(1, n - 1)
+        b = rng.randint(0, a)
+        connections.append({'source': f'n{a}', 'target': f'n{b}'})
+
+    return {'nodes': nodes, 'connections': connections, 'metadata': {}}
+
+
+def build_edits(workflow: dict, count: int, seed: int = 11) -> list:
+    """Editor-style diffs: text edits, appended connected nodes, deleted edges"""
+    rng = random.Random(seed)
+    node_ids = [node['id'] for node in workflow['nodes']]
+    connections = [dict(conn) for conn in workflow['connections']]
+    edits = []
+
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            node_id = rng.choice(node_ids[1:])
+            edits.append({'modified_nodes': [{'id': node_id, 'type': 'action', 'data': {
+                'title': f'Edited {i}', 'action_type': 'send_email', 'message': f'Draft {i}'
+            }}]})
+        elif kind == 1:
+            node_id = f'new{i}'
+            conn = {'source': rng.choice(node_ids), 'target': node_id, 'label': ''}
+            node_ids.append(node_id)
+            connections.append(conn)
+            edits.append({
+                'added_nodes': [{'id': node_id, 'type': 'delay', 'data': {'title': f'Wait {i}', 'duration': 60}}],
+                'added_connections': [conn]
+            })
+        else:
+            conn = connections.pop(rng.randrange(len(connections)))
+            edits.append({'removed_connections': [conn]})
+
+    return edits
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    validator = WorkflowValidator()
+
+    print(f"{'nodes':>8}{'edges':>8}{'validate ms':>14}{'issues':>8}{'edit ms (p50)':>16}{'edit ms (max)':>16}")
+    for n in sizes:
+        workflow = build_workflow(n)
+        repeat = 5 if n <= 1000 else 1
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = validator.validate(workflow)
+            best = min(best, (time.perf_counter() - start) * 1000)
+
+        session = ValidationSession('bench', validator)
+        session.load(workflow)
+        edit_times = []
+        for diff in build_edits(workflow, 300):
+            start = time.perf_counter()
+            session.apply(diff)
+            edit_times.append((time.perf_counter() - start) * 1000)
+        edit_times.sort()
+
+        print(
+            f"{n:>8}{len(workflow['connections']):>8}{best:>14.2f}{len(result['issues']):>8}"
+            f"{edit_times[len(edit_times) // 2]:>16.3f}{edit_times[-1]:>16.3f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Equivalence check: incremental ValidationSession vs full WorkflowValidator.validate
+
+Builds random small workflows (all node types, actions with and without
+personalization / unsubscribe text, duplicate and missing titles, both
+connection formats, labels, ids, dangling endpoints and self loops) and
+applies random editor diffs: removed and modified nodes, added nodes,
+removed connections (by key or by value), added connections and metadata
+changes. After the load and after every diff, checks that:
+
+- the session's report (score, stats, issues and their order) equals a
+  full validate() of the session's workflow
+- applying the returned added/resolved changes to the previous issue list,
+  as a client does, gives the session's issue ids
+
+Run it after changing WorkflowGraph, WorkflowValidator rules or the
+incremental session. Exits with status 1 on the first mismatches.
+
+Usage:
+    python benchmarks/check_incremental_validator.py [trials] [steps]
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.workflow_validator import WorkflowValidator
+from utils.incremental_validator import ValidationSession
+
+NODE_TYPES = ['action', 'delay', 'condition', 'trigger']
+ACTION_TYPES = ['send_email', 'send_sms', 'add_tag', 'update_field', 'email_sms']
+TITLES = ['A', 'B', 'C', 'send', 'abtest', 'Action 1', None]
+MESSAGES = ['hi', '{{contact.first_name}} unsubscribe', 'unsubscribe', '']
+LABELS = ['failure', 'success', '', 'Error']
+
+MAX_MISMATCHES = 3
+
+
+def random_node(rng: random.Random, node_id: str) -> dict:
+    node_type = rng.choice(NODE_TYPES)
+    data = {'title': rng.choice(TITLES)}
+    if rng.random() < 0.1:
+        del data['title']
+    if node_type == 'action':
+        data['action_type'] = rng.choice(ACTION_TYPES)
+        if rng.random() < 0.7:
+            data['message'] = rng.choice(MESSAGES)
+    return {'id': node_id, 'type': node_type, 'data': data}
+
+
+def random_connection(rng: random.Random, node_ids: list, connection_id: str) -> dict:
+    # 'ghost' is a dangling endpoint; picking the same id twice makes a self loop
+    source = rng.choice(node_ids + ['ghost'])
+    target = rng.choice(node_ids + ['ghost'])
+    conn = {'source': source, 'target': target} if rng.random() < 0.5 else {'from': source, 'to': target}
+    if rng.random() < 0.5:
+        conn['label'] = rng.choice(LABELS)
+    if rng.random() < 0.3:
+        conn['id'] = connection_id
+    return conn
+
+
+def random_diff(rng: random.Random, session: ValidationSession, next_id: int, step: int) -> dict:
+    node_ids = list(session.nodes)
+    diff = {}
+    if node_ids and rng.random() < 0.3:
+        diff['removed_nodes'] = rng.sample(node_ids, rng.randint(1, min(2, len(node_ids))))
+    if node_ids and rng.random() < 0.5:
+        diff['modified_nodes'] = [random_node(rng, rng.choice(node_ids))]
+    if rng.random() < 0.4:
+        diff['added_nodes'] = [random_node(rng, f"n{next_id + k}") for k in range(rng.randint(1, 2))]
+    if session.connections and rng.random() < 0.4:
+        key = rng.choice(list(session.connections))
+        diff['removed_connections'] = [key if rng.random() < 0.5 else session.connections[key]]
+    all_ids = node_ids + [node['id'] for node in diff.get('added_nodes', [])]
+    if all_ids and rng.random() < 0.5:
+        diff['added_connections'] = [
+            random_connection(rng, all_ids, f"c{1000 + step * 3 + k}") for k in range(rng.randint(1, 2))
+        ]
+    if rng.random() < 0.1:
+        diff['metadata'] = {'goal': 'y'} if rng.random() < 0.5 else {}
+    return diff
+
+
+def comparable(report: dict) -> dict:
+    """Report without fields only one side has (timestamp, session fields, issue ids)"""
+    report = {k: v for k, v in report.items() if k not in ('timestamp', 'workflow_id', 'revision', 'changes')}
+    report['issues'] = [{k: v for k, v in issue.items() if k != 'id'} for issue in report['issues']]
+    return report
+
+
+def first_difference(incremental: dict, full: dict) -> str:
+    a, b = comparable(incremental), comparable(full)
+    only_incremental = [issue for issue in a['issues'] if issue not in b['issues']]
+    only_full = [issue for issue in b['issues'] if issue not in a['issues']]
+    if only_incremental or only_full:
+        return f"only incremental: {only_incremental[:2]}\n    only full: {only_full[:2]}"
+    if a['issues'] != b['issues']:
+        return "same issues, different order"
+    return f"incremental {json.dumps({k: v for k, v in a.items() if k != 'issues'})}\n" \
+           f"    full        {json.dumps({k: v for k, v in b.items() if k != 'issues'})}"
+
+
+def run_trial(trial: int, steps: int, validator: WorkflowValidator) -> list:
+    """Mismatch descriptions for one random workflow and edit sequence"""
+    rng = random.Random(trial)
+    count = rng.randint(0, 25)
+    nodes = [random_node(rng, f"n{i}") for i in range(count)]
+    node_ids = [node['id'] for node in nodes]
+    workflow = {
+        'nodes': nodes,
+        'connections': [random_connection(rng, node_ids, f"c{j}") for j in range(rng.randint(0, count + 2))],
+        'metadata': {'goal': 'x'} if rng.random() < 0.3 else {}
+    }
+
+    session = ValidationSession('check', validator)
+    report = session.load(workflow)
+    full = validator.validate(session.to_workflow())
+    if comparable(report) != comparable(full):
+        return [f"trial {trial}, load: {first_difference(report, full)}"]
+
+    client = {issue['id'] for issue in report['issues']}
+    next_id = count
+    for step in range(steps):
+        diff = random_diff(rng, session, next_id, step)
+        next_id += 2
+        report = session.apply(diff, include_issues=True)
+        full = validator.validate(session.to_workflow())
+        if comparable(report) != comparable(full):
+            return [f"trial {trial}, step {step} ({json.dumps(diff)[:200]}): {first_difference(report, full)}"]
+
+        client -= set(report['changes']['resolved'])
+        client |= {issue['id'] for issue in report['changes']['added']}
+        if client != {issue['id'] for issue in report['issues']}:
+            return [f"trial {trial}, step {step}: added/resolved changes do not reproduce the issue list"]
+    return []
+
+
+def main() -> None:
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    validator = WorkflowValidator()
+
+    started = time.perf_counter()
+    mismatches = []
+    for trial in range(trials):
+        mismatches += run_trial(trial, steps, validator)
+        if len(mismatches) >= MAX_MISMATCHES:
+            break
+
+    elapsed = time.perf_counter() - started
+    print(f"{trial + 1} workflows x {steps} edits checked against validate() in {elapsed:.1f}s")
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch}")
+    if mismatches:
+        sys.exit(1)
+    print("incremental reports match full validation")
+
+
+if __name__ == '__main__':
+    main()
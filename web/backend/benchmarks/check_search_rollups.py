@@ -0,0 +1,112 @@
+"""
+Consistency check: trigger-maintained search rollups vs _rebuild_rollups
+
+Logs random searches (with and without intent, some with zero results),
+clicks (some without a result_id) and command usage (a few without the
+required command_id) through SearchLogger, flushes, then checks that:
+
+- every valid event was written and only the invalid ones were dropped
+- the rollup tables the triggers maintained equal a full rebuild from the
+  raw event tables
+
+Run it after changing the rollup triggers, _rebuild_rollups or the event
+buffer. Exits with status 1 on a mismatch.
+
+Usage:
+    python benchmarks/check_search_rollups.py [events]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import analytics.search_logger as search_logger_module
+from analytics.search_logger import SearchLogger, get_connection
+
+# Keys and counters; sample_query / result_title are representative text
+# (the triggers keep the first seen, the rebuild MAX) and are not compared
+ROLLUP_TABLES = {
+    'daily_search_stats': 'day, search_count, zero_result_count, click_count',
+    'daily_query_stats': 'day, query_fingerprint, search_count, results_total',
+    'daily_intent_stats': 'day, intent, search_count',
+    'daily_click_stats': 'day, result_id, click_count, position_total',
+    'daily_command_stats': 'day, command_title, action, usage_count',
+    'zero_result_rollup': 'query_fingerprint, occurrence_count, unresolved_count, last_searched'
+}
+QUERIES = ['send sms', 'Send SMS?', 'wait 3 days', 'wait 5 days', 'tag contact', 'webhook']
+INTENTS = ['HOW_TO', 'WHAT_IS', None]
+RESULT_IDS = ['cmd-1', 'cmd-2', 'doc-1', 'example-1', None]
+ACTIONS = ['viewed', 'added_to_workflow', 'executed', None]
+
+
+def snapshot(cursor) -> dict:
+    return {
+        table: sorted(cursor.execute(f"SELECT {columns} FROM {table}").fetchall(), key=repr)
+        for table, columns in ROLLUP_TABLES.items()
+    }
+
+
+def main() -> None:
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        search_logger_module.DB_PATH = Path(tmp) / "search_logs.db"
+        logger = SearchLogger(max_buffered_events=events * 2 + 10)
+
+        started = time.perf_counter()
+        logged = 0
+        invalid = 0
+        query_ids = []
+        for _ in range(events):
+            roll = rng.random()
+            if roll < 0.5 or not query_ids:
+                results = 0 if rng.random() < 0.2 else rng.randint(1, 20)
+                query_ids.append(logger.log_search(rng.choice(QUERIES), rng.choice(INTENTS), results))
+                logged += 2 if results == 0 else 1
+            elif roll < 0.85:
+                result_id = rng.choice(RESULT_IDS)
+                logger.log_click(rng.choice(query_ids), result_id, f"title {result_id}", 'command', rng.randint(1, 10))
+                logged += 1
+            elif roll < 0.99:
+                logger.log_command_usage(f"cmd-{rng.randint(1, 4)}", None, rng.choice(ACTIONS), 'chat')
+                logged += 1
+            else:
+                # command_usage.command_id is NOT NULL: the flush drops this row, not its batch
+                logger.log_command_usage(None, 'broken', 'viewed')
+                invalid += 1
+        logger.close()
+
+        stats = logger.get_buffer_stats()
+        cursor = get_connection().cursor()
+        live = snapshot(cursor)
+        logger._rebuild_rollups(cursor)
+        rebuilt = snapshot(cursor)
+        null_clicks = cursor.execute("SELECT COUNT(*) FROM result_clicks WHERE result_id IS NULL").fetchone()[0]
+        elapsed = time.perf_counter() - started
+
+    print(f"{logged + invalid:,} events ({null_clicks:,} clicks without a result_id, {invalid:,} invalid) "
+          f"logged and checked in {elapsed:.1f}s")
+    failed = False
+    if stats['events_flushed'] != logged or stats['events_dropped'] != invalid:
+        print(f"MISMATCH {stats['events_flushed']:,} of {logged:,} valid events written, "
+              f"{stats['events_dropped']:,} dropped (expected {invalid:,})")
+        failed = True
+    for table in ROLLUP_TABLES:
+        if live[table] != rebuilt[table]:
+            only_live = [row for row in live[table] if row not in rebuilt[table]]
+            only_rebuilt = [row for row in rebuilt[table] if row not in live[table]]
+            print(f"MISMATCH {table}: triggers {only_live[:3]}\n    rebuild {only_rebuilt[:3]}")
+            failed = True
+    if failed:
+        sys.exit(1)
+    print("trigger rollups match a full rebuild")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional
 import uuid
 import logging
 
+from utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Database path - use absolute path relative to module location
@@ -331,6 +333,7 @@ class ConversationManager:
             return f'"{sanitized}"'
         return ""
 
+    @traced('sqlite.conversations.search_conversations')
     def search_conversations(
         self,
         session_id: str,
@@ -422,6 +425,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.create_conversation')
     def create_conversation(
         self,
         session_id: str,
@@ -469,6 +473,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.get_conversations')
     def get_conversations(
         self,
         session_id: str,
@@ -563,6 +568,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.get_conversation')
     def get_conversation(self, conversation_id: str) -> Dict[str, Any]:
         """
         Get a conversation with all its messages
@@ -641,6 +647,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.update_conversation')
     def update_conversation(
         self,
         conversation_id: str,
@@ -717,6 +724,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.delete_conversation')
     def delete_conversation(self, conversation_id: str) -> Dict[str, Any]:
         """
         Delete a conversation and all its messages
@@ -752,6 +760,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.add_message')
     def add_message(
         self,
         conversation_id: str,
@@ -814,6 +823,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.get_messages')
     def get_messages(
         self,
         conversation_id: str,
@@ -885,6 +895,7 @@ class ConversationManager:
         finally:
             conn.close()
 
+    @traced('sqlite.conversations.set_conversation_pinned')
     def set_conversation_pinned(
         self,
         conversation_id: str,
@@ -902,6 +913,7 @@ class ConversationManager:
         """
         return self.update_conversation(conversation_id, pinned=pinned)
 
+    @traced('sqlite.conversations.set_conversation_backend')
     def set_conversation_backend(
         self,
         conversation_id: str,
@@ -11,6 +11,8 @@ from typing import Optional, Dict, Any, List
 import traceback
 import logging
 
+from utils.tracing import traced
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,7 @@ class GeminiFileSearchService:
         """Check if service is properly configured"""
         return self.client is not None and self.store_id is not None
     
+    @traced('gemini.query')
     def query(
         self, 
         question: str, 
@@ -192,6 +195,7 @@ STYLE:
 
         return citations
 
+    @traced('gemini.count_tokens')
     def count_tokens(
         self,
         messages: List[Dict[str, str]],
@@ -254,6 +258,7 @@ STYLE:
                 total_chars += len(system_prompt)
             return total_chars // 4
 
+    @traced('gemini.summarize_conversation')
     def summarize_conversation(
         self,
         messages: List[Dict[str, str]],
@@ -393,6 +398,7 @@ Keep under 500 tokens while retaining ALL critical information."""
 
         return follow_ups[:2]  # Return top 2 follow-up questions
 
+    @traced('gemini.chat')
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -7,6 +7,8 @@ import httpx
 from typing import Dict, Any, Optional, List
 import logging
 
+from utils.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 class GHLClient:
@@ -23,6 +25,7 @@ class GHLClient:
             "Content-Type": "application/json"
         }
 
+    @traced('ghl.test_connection')
     async def test_connection(self) -> Dict[str, Any]:
         """Test API key and connection"""
         try:
@@ -71,6 +74,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.create_workflow')
     async def create_workflow(self, workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Deploy workflow to GHL"""
         try:
@@ -106,6 +110,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.get_workflows')
     async def get_workflows(self, limit: int = 100) -> Dict[str, Any]:
         """Get workflows from GHL"""
         try:
@@ -138,6 +143,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.get_workflow')
     async def get_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Get single workflow from GHL"""
         try:
@@ -165,6 +171,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.update_workflow')
     async def update_workflow(self, workflow_id: str, workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Update existing workflow in GHL"""
         try:
@@ -196,6 +203,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.delete_workflow')
     async def delete_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """Delete workflow from GHL"""
         try:
@@ -223,6 +231,7 @@ class GHLClient:
                 'message': str(e)
             }
 
+    @traced('ghl.get_workflow_executions')
     async def get_workflow_executions(self, workflow_id: str, limit: int = 50) -> Dict[str, Any]:
         """Get workflow execution history"""
         try:
@@ -10,6 +10,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal, Dict, Any
 from datetime import datetime
+import asyncio
 import sys
 import os
 import logging
@@ -32,7 +33,9 @@ logger = logging.getLogger(__name__)
 # Import middleware components
 from middleware.logging_middleware import LoggingMiddleware
 from middleware.performance_middleware import PerformanceMiddleware
-from utils.error_logger import StructuredLogger as ErrorLogger, configure_logging
+from middleware.tracing_middleware import TracingMiddleware
+from utils.error_logger import StructuredLogger as ErrorLogger, configure_logging, shutdown_logging
+from utils.tracing import trace_span
 
 # Configure structured error logging
 configure_logging(log_level=os.getenv('LOG_LEVEL', 'INFO'))
@@ -55,6 +58,8 @@ from routes.version_control_routes import router as version_control_router
 from routes.gemini_routes import router as gemini_router
 # Import Conversation/Chat History routes
 from routes.conversation_routes import router as conversation_router
+# Import Tracing routes
+from routes.tracing_routes import router as tracing_router
 # Import Collaboration WebSocket (Enhancement 9)
 from websocket.collaboration_server import collaboration_manager
 from fastapi import WebSocket, WebSocketDisconnect
@@ -164,6 +169,8 @@ app.add_middleware(
 
 # Register middleware stack (order matters - LIFO for request processing)
 # Performance tracking should be before logging to capture accurate timing
+# Tracing is innermost so the root span sees the correlation ID set by logging
+app.add_middleware(TracingMiddleware)
 app.add_middleware(PerformanceMiddleware)
 app.add_middleware(LoggingMiddleware)
 
@@ -194,6 +201,9 @@ app.include_router(gemini_router)
 # Register Conversation/Chat History routes
 app.include_router(conversation_router)
 
+# Register Tracing routes (slowest/recent request traces)
+app.include_router(tracing_router)
+
 # Initialize Claude API client (Gemini File Search initialized in gemini_routes)
 claude_client: Optional[Anthropic] = None
 
@@ -308,6 +318,13 @@ async def startup_event():
         claude_client = None
 
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush the background log queue before the process exits"""
+    shutdown_logging()
+
+
 # Health check endpoint with sampling to reduce logging noise
 # Track health check calls to implement sampling
 import random
@@ -580,119 +597,120 @@ async def chat(request: Request, chat_request: ChatRequest):
         # Add conversation history if provided
         # CRITICAL FIX: Handle tool_use/tool_result blocks properly
         if chat_request.conversation_history:
-            # We need to validate the entire conversation for tool_use/tool_result pairing
-            validated_messages = []
-
-            for i, msg in enumerate(chat_request.conversation_history):
-                # Skip messages with media
-                if 'image' in msg or 'images' in msg or 'media' in msg:
-                    logger.warning(f"Skipping message {i} that contains image/media field")
-                    continue
-
-                role = msg.get("role", "user")
-                if role not in ("user", "assistant"):
-                    logger.warning(f"Invalid role '{role}' in message {i}, defaulting to 'user'")
-                    role = "user"
-
-                content = msg.get("content", "")
-
-                # Handle both string content and array content (for tool use/results)
-                if isinstance(content, str):
-                    # Simple string content - clean it
-                    content = content.strip()
-                    if not content:
-                        logger.warning(f"Empty content in message {i}, skipping")
+            with trace_span('chat.validate_history', message_count=len(chat_request.conversation_history)):
+                # We need to validate the entire conversation for tool_use/tool_result pairing
+                validated_messages = []
+
+                for i, msg in enumerate(chat_request.conversation_history):
+                    # Skip messages with media
+                    if 'image' in msg or 'images' in msg or 'media' in msg:
+                        logger.warning(f"Skipping message {i} that contains image/media field")
                         continue
 
-                    # Size check: 1MB per message max
-                    content_size = len(content.encode('utf-8'))
-                    if content_size > 1000000:
-                        logger.warning(f"Message {i} too large ({content_size} bytes), truncating")
-                        content = content[:500000]
-                    
-                    validated_messages.append({
-                        "role": role,
-                        "content": content
-                    })
-                    
-                elif isinstance(content, list):
-                    # Array content - likely has tool_use or tool_result blocks
-                    
-                    # FORCE TEXT ONLY MODE: Strip all tool blocks if enabled
-                    if FORCE_TEXT_ONLY:
-                        text_only_content = strip_tool_blocks_from_message(content)
-                        if text_only_content:
-                            validated_messages.append({
-                                "role": role,
-                                "content": text_only_content
-                            })
-                        continue
+                    role = msg.get("role", "user")
+                    if role not in ("user", "assistant"):
+                        logger.warning(f"Invalid role '{role}' in message {i}, defaulting to 'user'")
+                        role = "user"
+
+                    content = msg.get("content", "")
+
+                    # Handle both string content and array content (for tool use/results)
+                    if isinstance(content, str):
+                        # Simple string content - clean it
+                        content = content.strip()
+                        if not content:
+                            logger.warning(f"Empty content in message {i}, skipping")
+                            continue
+
+                        # Size check: 1MB per message max
+                        content_size = len(content.encode('utf-8'))
+                        if content_size > 1000000:
+                            logger.warning(f"Message {i} too large ({content_size} bytes), truncating")
+                            content = content[:500000]
                     
-                    # CRITICAL: We need to check if tool_result blocks have matching tool_use
+                        validated_messages.append({
+                            "role": role,
+                            "content": content
+                        })
                     
-                    # Check for tool_result blocks without checking for tool_use in previous message
-                    has_tool_result = any(
-                        isinstance(block, dict) and block.get("type") == "tool_result"
-                        for block in content
-                    )
+                    elif isinstance(content, list):
+                        # Array content - likely has tool_use or tool_result blocks
                     
-                    if has_tool_result and role == "user":
-                        # This is a tool_result message - we need to verify previous message has tool_use
-                        if not validated_messages or validated_messages[-1]["role"] != "assistant":
-                            logger.error(f"Message {i} has tool_result but previous message is not from assistant")
-                            logger.error(f"Stripping tool_use/tool_result blocks and converting to text-only")
-
-                            # Extract only text content, skip tool blocks
-                            text_only = []
-                            for block in content:
-                                if isinstance(block, dict) and block.get("type") == "text":
-                                    text_only.append(block.get("text", ""))
-
-                            if text_only:
+                        # FORCE TEXT ONLY MODE: Strip all tool blocks if enabled
+                        if FORCE_TEXT_ONLY:
+                            text_only_content = strip_tool_blocks_from_message(content)
+                            if text_only_content:
                                 validated_messages.append({
                                     "role": role,
-                                    "content": " ".join(text_only).strip()
+                                    "content": text_only_content
                                 })
                             continue
+                    
+                        # CRITICAL: We need to check if tool_result blocks have matching tool_use
+                    
+                        # Check for tool_result blocks without checking for tool_use in previous message
+                        has_tool_result = any(
+                            isinstance(block, dict) and block.get("type") == "tool_result"
+                            for block in content
+                        )
+                    
+                        if has_tool_result and role == "user":
+                            # This is a tool_result message - we need to verify previous message has tool_use
+                            if not validated_messages or validated_messages[-1]["role"] != "assistant":
+                                logger.error(f"Message {i} has tool_result but previous message is not from assistant")
+                                logger.error(f"Stripping tool_use/tool_result blocks and converting to text-only")
+
+                                # Extract only text content, skip tool blocks
+                                text_only = []
+                                for block in content:
+                                    if isinstance(block, dict) and block.get("type") == "text":
+                                        text_only.append(block.get("text", ""))
+
+                                if text_only:
+                                    validated_messages.append({
+                                        "role": role,
+                                        "content": " ".join(text_only).strip()
+                                    })
+                                continue
 
-                        # Check if previous assistant message has matching tool_use
-                        prev_content = validated_messages[-1]["content"]
-                        if isinstance(prev_content, list):
-                            tool_use_ids = {
-                                block.get("id")
-                                for block in prev_content
-                                if isinstance(block, dict) and block.get("type") == "tool_use"
-                            }
-
-                            tool_result_ids = {
-                                block.get("tool_use_id")
-                                for block in content
-                                if isinstance(block, dict) and block.get("type") == "tool_result"
-                            }
-
-                            if not tool_result_ids.issubset(tool_use_ids):
-                                logger.error(f"Message {i} has tool_result IDs that don't match previous tool_use IDs")
-                                logger.error(f"  tool_use IDs: {tool_use_ids}")
-                                logger.error(f"  tool_result IDs: {tool_result_ids}")
-                                logger.error(f"Removing BOTH messages to break the invalid chain")
+                            # Check if previous assistant message has matching tool_use
+                            prev_content = validated_messages[-1]["content"]
+                            if isinstance(prev_content, list):
+                                tool_use_ids = {
+                                    block.get("id")
+                                    for block in prev_content
+                                    if isinstance(block, dict) and block.get("type") == "tool_use"
+                                }
+
+                                tool_result_ids = {
+                                    block.get("tool_use_id")
+                                    for block in content
+                                    if isinstance(block, dict) and block.get("type") == "tool_result"
+                                }
+
+                                if not tool_result_ids.issubset(tool_use_ids):
+                                    logger.error(f"Message {i} has tool_result IDs that don't match previous tool_use IDs")
+                                    logger.error(f"  tool_use IDs: {tool_use_ids}")
+                                    logger.error(f"  tool_result IDs: {tool_result_ids}")
+                                    logger.error(f"Removing BOTH messages to break the invalid chain")
                                 
-                                # Remove the previous assistant message too since they're a broken pair
-                                if validated_messages:
-                                    validated_messages.pop()
-                                continue
+                                    # Remove the previous assistant message too since they're a broken pair
+                                    if validated_messages:
+                                        validated_messages.pop()
+                                    continue
                     
-                    # If we get here, the message structure looks valid
-                    validated_messages.append({
-                        "role": role,
-                        "content": content
-                    })
-                else:
-                    logger.warning(f"Message {i} has invalid content type: {type(content)}, skipping")
-                    continue
-
-            # Use the validated messages
-            messages = validated_messages
-            logger.info(f"Validated {len(messages)} messages from conversation history")
+                        # If we get here, the message structure looks valid
+                        validated_messages.append({
+                            "role": role,
+                            "content": content
+                        })
+                    else:
+                        logger.warning(f"Message {i} has invalid content type: {type(content)}, skipping")
+                        continue
+
+                # Use the validated messages
+                messages = validated_messages
+                logger.info(f"Validated {len(messages)} messages from conversation history")
 
         # Add current query with Gemini File Search context
         # Gemini already provided relevant context, Claude will refine and expand on it
@@ -738,12 +756,16 @@ Focus on practical, implementable advice that users can apply immediately to the
         model = "claude-sonnet-4-5-20250929" if use_sonnet else "claude-haiku-4-5-20250929"
         max_tokens = 12000 if use_sonnet else 6000
 
-        response = await claude_client.messages.create(
-            model=model,
-            max_tokens=max_tokens,
-            system=system_prompt,
-            messages=messages
-        )
+        with trace_span('claude.messages.create', model=model, message_count=len(messages)) as span:
+            response = await claude_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                system=system_prompt,
+                messages=messages
+            )
+            if span and getattr(response, 'usage', None):
+                span.set_attribute('input_tokens', response.usage.input_tokens)
+                span.set_attribute('output_tokens', response.usage.output_tokens)
 
         generation_time_ms = (time.time() - generation_start) * 1000
 
@@ -990,7 +1012,7 @@ async def websocket_collaborate(
             pass
         return
 
-    try:
+    async def receive_messages():
         while True:
             # Receive message from client
             message = await websocket.receive_json()
@@ -998,7 +1020,20 @@ async def websocket_collaborate(
             # Handle the message
             await collaboration_manager.handle_message(websocket, message)
 
-    except WebSocketDisconnect:
+    # A separate task, so the manager can cancel it if it evicts this connection
+    receiver = asyncio.create_task(receive_messages())
+    collaboration_manager.attach_receiver(websocket, receiver)
+    try:
+        await asyncio.wait({receiver})
+    finally:
+        receiver.cancel()
+
+    if receiver.cancelled():
+        # Evicted: already removed, and its peers were told it left
+        return
+
+    error = receiver.exception()
+    if isinstance(error, WebSocketDisconnect):
         # Handle disconnect
         disconnect_info = collaboration_manager.disconnect(websocket)
 
@@ -1012,6 +1047,8 @@ async def websocket_collaborate(
                     'locks_released': disconnect_info['locks_released']
                 }
             )
+    elif error is not None:
+        raise error
 
 
 if __name__ == "__main__":
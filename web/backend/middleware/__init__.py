@@ -4,5 +4,6 @@ Middleware modules for request/response processing and monitoring
 
 from .logging_middleware import LoggingMiddleware
 from .performance_middleware import PerformanceMiddleware, get_performance_stats
+from .tracing_middleware import TracingMiddleware
 
-__all__ = ['LoggingMiddleware', 'PerformanceMiddleware', 'get_performance_stats']
+__all__ = ['LoggingMiddleware', 'PerformanceMiddleware', 'TracingMiddleware', 'get_performance_stats']
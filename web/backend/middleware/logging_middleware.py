@@ -1,19 +1,49 @@
 """
 Request/Response Logging Middleware
 Provides comprehensive request and response logging with performance tracking
+
+Implemented as pure ASGI middleware: the request body is never buffered or
+re-parsed here. When body logging is enabled, a size-capped preview is
+captured from the chunks as the endpoint itself consumes them.
 """
 
-import time
+import os
+import re
 import json
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from utils.error_logger import StructuredLogger, StructuredLogger as CorrLogger
-import logging
+import time
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.error_logger import StructuredLogger, StructuredLogger as CorrLogger, request_path_var
 
 logger = StructuredLogger('logging_middleware')
 
+SENSITIVE_FIELDS = ('password', 'token', 'api_key', 'secret')
+
+# Redacts "field": "value" pairs in truncated (unparseable) JSON previews
+_SENSITIVE_PATTERN = re.compile(
+    r'("(?:' + '|'.join(SENSITIVE_FIELDS) + r')"\s*:\s*)"(?:[^"\\]|\\.)*"?'
+)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+
+def _redact_body_preview(preview: bytes, truncated: bool, content_type: str):
+    """Turn a captured body prefix into a loggable, redacted value"""
+    text = preview.decode('utf-8', errors='replace')
+    if not truncated and 'json' in content_type:
+        try:
+            body_data = json.loads(text)
+            if isinstance(body_data, dict):
+                for field in SENSITIVE_FIELDS:
+                    if field in body_data:
+                        body_data[field] = '***REDACTED***'
+            return body_data
+        except json.JSONDecodeError:
+            pass
+    text = _SENSITIVE_PATTERN.sub(r'\1"***REDACTED***"', text)
+    return text + '...[truncated]' if truncated else text
+
+
+class LoggingMiddleware:
     """
     Middleware for logging all requests and responses with correlation IDs
     """
@@ -26,86 +56,123 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         '/favicon.ico'
     }
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_bodies: Optional[bool] = None,
+        max_body_log_bytes: int = 2048
+    ):
         """
-        Process request and response with comprehensive logging
+        Args:
+            app: Downstream ASGI application
+            log_bodies: Capture a redacted request body preview (opt-in;
+                defaults to the LOG_REQUEST_BODIES environment variable)
+            max_body_log_bytes: Maximum number of body bytes captured
         """
-        # Generate or extract correlation ID
-        correlation_id = request.headers.get('X-Correlation-ID') or CorrLogger.generate_correlation_id()
-        CorrLogger.set_correlation_id(correlation_id)
+        self.app = app
+        if log_bodies is None:
+            log_bodies = os.getenv('LOG_REQUEST_BODIES', 'false').lower() == 'true'
+        self.log_bodies = log_bodies
+        self.max_body_log_bytes = max_body_log_bytes
 
-        # Skip logging for health checks and documentation
-        if request.url.path in self.EXCLUDED_PATHS:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-        # Extract request info
-        request_start = time.time()
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params)
+        # Generate or extract correlation ID
+        correlation_id = None
+        user_agent = 'unknown'
+        content_type = ''
+        for name, value in scope['headers']:
+            if name == b'x-correlation-id':
+                correlation_id = value.decode('latin-1')
+            elif name == b'user-agent':
+                user_agent = value.decode('latin-1')
+            elif name == b'content-type':
+                content_type = value.decode('latin-1')
+        correlation_id = correlation_id or CorrLogger.generate_correlation_id()
+        CorrLogger.set_correlation_id(correlation_id)
 
-        # Log request start
-        try:
-            body = await request.body()
-            body_str = body.decode('utf-8') if body else None
-
-            # Sanitize sensitive data from body
-            body_data = None
-            if body_str:
-                try:
-                    body_data = json.loads(body_str)
-                    # Remove sensitive fields
-                    if isinstance(body_data, dict):
-                        sensitive_fields = {'password', 'token', 'api_key', 'secret'}
-                        for field in sensitive_fields:
-                            if field in body_data:
-                                body_data[field] = '***REDACTED***'
-                except json.JSONDecodeError:
-                    body_data = body_str[:200]  # Truncate if not JSON
+        path = scope['path']
+        request_path_var.set(path)
 
-            logger.info(
-                f"Request received: {method} {path}",
-                context={
-                    'correlation_id': correlation_id,
-                    'method': method,
-                    'path': path,
-                    'query_params': query_params,
-                    'body': body_data,
-                    'client_ip': request.client.host if request.client else 'unknown',
-                    'user_agent': request.headers.get('user-agent', 'unknown')
-                }
-            )
-        except Exception as e:
-            logger.error(
-                f"Failed to log request body: {str(e)}",
-                error_type='LOG_ERROR',
-                context={'path': path, 'method': method},
-                exc_info=True
-            )
-
-        # Call the endpoint
-        response = await call_next(request)
+        # Skip logging for health checks and documentation
+        if path in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        # Calculate request duration
-        request_duration = time.time() - request_start
+        request_start = time.perf_counter()
+        method = scope['method']
+        client = scope.get('client')
 
-        # Log response
         logger.info(
-            f"Response sent: {method} {path} - {response.status_code}",
-            context={
+            f"Request received: {method} {path}",
+            context=lambda: {
                 'correlation_id': correlation_id,
                 'method': method,
                 'path': path,
-                'status_code': response.status_code,
-                'duration_ms': round(request_duration * 1000, 2),
-                'content_length': response.headers.get('content-length', 'unknown')
+                'query_string': scope.get('query_string', b'').decode('latin-1'),
+                'client_ip': client[0] if client else 'unknown',
+                'user_agent': user_agent
             }
         )
 
-        # Add correlation ID to response headers
-        response.headers['X-Correlation-ID'] = correlation_id
+        # Streaming body peek: copy at most max_body_log_bytes as chunks pass through
+        body_preview = bytearray()
+        body_truncated = False
+
+        if self.log_bodies:
+            limit = self.max_body_log_bytes
+
+            async def receive_wrapper() -> Message:
+                nonlocal body_truncated
+                message = await receive()
+                if message['type'] == 'http.request':
+                    chunk = message.get('body', b'')
+                    room = limit - len(body_preview)
+                    if room > 0:
+                        body_preview.extend(chunk[:room])
+                    if len(chunk) > room:
+                        body_truncated = True
+                return message
+        else:
+            receive_wrapper = receive
+
+        status_code = 500
+        content_length = 'unknown'
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, content_length
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = MutableHeaders(scope=message)
+                content_length = headers.get('content-length', 'unknown')
+                # Add correlation ID and timing headers
+                headers['X-Correlation-ID'] = correlation_id
+                headers['X-Response-Time'] = str(time.perf_counter() - request_start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            request_duration = time.perf_counter() - request_start
 
-        # Add timing header
-        response.headers['X-Response-Time'] = str(request_duration)
+            def response_context():
+                context = {
+                    'correlation_id': correlation_id,
+                    'method': method,
+                    'path': path,
+                    'status_code': status_code,
+                    'duration_ms': round(request_duration * 1000, 2),
+                    'content_length': content_length
+                }
+                if body_preview:
+                    context['body'] = _redact_body_preview(bytes(body_preview), body_truncated, content_type)
+                return context
 
-        return response
+            # Log response (context is built lazily, only if the record is kept)
+            logger.info(
+                f"Response sent: {method} {path} - {status_code}",
+                context=response_context
+            )
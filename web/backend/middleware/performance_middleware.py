@@ -3,10 +3,13 @@ Performance Monitoring Middleware
 Tracks response times, identifies slow endpoints, and monitors resource usage
 """
 
+import asyncio
+import threading
 import time
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from utils.error_logger import StructuredLogger
+from utils.metrics_store import get_connection as get_metrics_connection, shared_metrics_enabled
 from collections import defaultdict
 from datetime import datetime, timedelta
 
@@ -79,13 +82,154 @@ class PerformanceMetrics:
         self.last_report = datetime.now()
 
 
-# Global metrics instance
-metrics = PerformanceMetrics()
+class SharedPerformanceMetrics(PerformanceMetrics):
+    """
+    PerformanceMetrics stored in the shared metrics database (multi-worker)
+
+    Each worker buffers samples and writes them in one batched insert per
+    flush interval; statistics are computed over the samples of all workers.
+    Flushes triggered by requests run in a worker thread, never on the event
+    loop (the write may wait up to busy_timeout on other workers' locks). A
+    batch that fails to write is put back and retried with the next flush;
+    past max_pending buffered samples the oldest are dropped.
+    """
+
+    MAX_SAMPLES_PER_ENDPOINT = 1000
+
+    def __init__(self, flush_interval: float = 1.0, flush_size: int = 200, max_pending: int = 10000):
+        super().__init__()
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_pending = max_pending
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_task = None
+        self.samples_dropped = 0
+        self.flush_failures = 0
+
+    def record_request(self, endpoint: str, duration_ms: float) -> None:
+        """Buffer a request duration; flushed in batches in the background"""
+        with self._lock:
+            self._pending.append((endpoint, duration_ms, time.time()))
+            if len(self._pending) > self.max_pending:
+                del self._pending[0]
+                self.samples_dropped += 1
+            due = (len(self._pending) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self._flush_in_background()
 
+    def _flush_in_background(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._last_flush = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, worker threads): nothing to block
+            self._flush_logged()
+            return
+        self._flush_task = loop.create_task(asyncio.to_thread(self._flush_logged))
+
+    def _flush_logged(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(
+                "Request metrics flush failed",
+                error_type='METRICS_FLUSH_ERROR',
+                context={'error': str(e), 'pending': len(self._pending)}
+            )
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
+    def flush(self) -> None:
+        """Write buffered samples and trim each touched endpoint to its newest samples"""
+        with self._flush_lock:
+            with self._lock:
+                self._last_flush = time.monotonic()
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, []
+
+            try:
+                conn = get_metrics_connection()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(
+                        "INSERT INTO request_samples (endpoint, duration_ms, timestamp) VALUES (?, ?, ?)",
+                        pending
+                    )
+                    for endpoint in {sample[0] for sample in pending}:
+                        conn.execute(
+                            """
+                            DELETE FROM request_samples
+                            WHERE endpoint = ? AND id <= (
+                                SELECT id FROM request_samples WHERE endpoint = ?
+                                ORDER BY id DESC LIMIT 1 OFFSET ?
+                            )
+                            """,
+                            (endpoint, endpoint, self.MAX_SAMPLES_PER_ENDPOINT)
+                        )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            except Exception:
+                self.flush_failures += 1
+                with self._lock:
+                    # Put the batch back ahead of newer samples, within max_pending
+                    self._pending[:0] = pending
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        self.samples_dropped += overflow
+                raise
+
+    def get_endpoint_stats(self, endpoint: str) -> dict:
+        """Get performance statistics for an endpoint across all workers"""
+        self._flush_logged()
+        rows = get_metrics_connection().execute(
+            "SELECT duration_ms FROM request_samples WHERE endpoint = ? ORDER BY id DESC LIMIT ?",
+            (endpoint, self.MAX_SAMPLES_PER_ENDPOINT)
+        ).fetchall()
+        if not rows:
+            return {}
+
+        durations = [row[0] for row in rows]
+        slow_count = sum(1 for d in durations if d > self.slow_request_threshold)
+
+        return {
+            'endpoint': endpoint,
+            'request_count': len(durations),
+            'avg_duration_ms': round(sum(durations) / len(durations), 2),
+            'min_duration_ms': min(durations),
+            'max_duration_ms': max(durations),
+            'p95_duration_ms': self._percentile(durations, 0.95),
+            'p99_duration_ms': self._percentile(durations, 0.99),
+            'slow_request_count': slow_count,
+            'slow_request_percentage': round((slow_count / len(durations)) * 100, 2)
+        }
+
+    def get_all_stats(self) -> list:
+        """Get statistics for all endpoints across all workers"""
+        self._flush_logged()
+        endpoints = get_metrics_connection().execute(
+            "SELECT DISTINCT endpoint FROM request_samples"
+        ).fetchall()
+        return [self.get_endpoint_stats(row[0]) for row in endpoints]
+
+
+# Global metrics instance (shared across workers with METRICS_BACKEND=sqlite)
+metrics = SharedPerformanceMetrics() if shared_metrics_enabled() else PerformanceMetrics()
+
+
+class PerformanceMiddleware:
     """
     Middleware for tracking endpoint performance and identifying bottlenecks
+
+    Pure ASGI: times the full request (including streamed response bodies)
+    without wrapping the request or response objects.
     """
 
     EXCLUDED_PATHS = {
@@ -96,58 +240,35 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
         '/favicon.ico'
     }
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Track performance of all requests
         """
-        # Skip performance tracking for health checks
-        if request.url.path in self.EXCLUDED_PATHS:
-            return await call_next(request)
+        # Skip performance tracking for health checks and non-HTTP traffic
+        if scope['type'] != 'http' or scope['path'] in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        start_time = time.time()
-        endpoint_key = f"{request.method} {request.url.path}"
+        start_time = time.perf_counter()
+        endpoint_key = f"{scope['method']} {scope['path']}"
+        status_code = 500
 
-        try:
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Record metrics
-            metrics.record_request(endpoint_key, duration_ms)
-
-            # Log slow requests
-            if duration_ms > metrics.slow_request_threshold:
-                logger.warning(
-                    f"Slow request detected: {endpoint_key}",
-                    error_type='SLOW_REQUEST',
-                    context={
-                        'endpoint': endpoint_key,
-                        'duration_ms': round(duration_ms, 2),
-                        'threshold_ms': metrics.slow_request_threshold,
-                        'status_code': response.status_code
-                    }
-                )
-
-            # Log periodic metrics if interval exceeded
-            if metrics.should_report():
-                stats = metrics.get_all_stats()
-                logger.info(
-                    "Performance report",
-                    context={
-                        'metrics': {
-                            'endpoints': stats,
-                            'report_timestamp': datetime.now().isoformat()
-                        }
-                    }
-                )
-                metrics.reset_reports()
-
-            # Add performance headers
-            response.headers['X-Response-Time'] = str(round(duration_ms, 2))
-
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                # Add performance headers
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                MutableHeaders(scope=message)['X-Response-Time'] = str(round(duration_ms, 2))
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
             logger.error(
                 f"Error in request: {endpoint_key}",
                 error_type='REQUEST_ERROR',
@@ -160,6 +281,48 @@ class PerformanceMiddleware(BaseHTTPMiddleware):
             )
             raise
 
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        # Record metrics
+        metrics.record_request(endpoint_key, duration_ms)
+
+        # Log slow requests
+        if duration_ms > metrics.slow_request_threshold:
+            logger.warning(
+                f"Slow request detected: {endpoint_key}",
+                error_type='SLOW_REQUEST',
+                context={
+                    'endpoint': endpoint_key,
+                    'duration_ms': round(duration_ms, 2),
+                    'threshold_ms': metrics.slow_request_threshold,
+                    'status_code': status_code
+                }
+            )
+
+        # Log periodic metrics if interval exceeded
+        if metrics.should_report():
+            metrics.reset_reports()
+            if isinstance(metrics, SharedPerformanceMetrics):
+                # Reads the shared database; keep it off the event loop
+                asyncio.get_running_loop().run_in_executor(None, _log_performance_report)
+            else:
+                _log_performance_report()
+
+
+def _log_performance_report() -> None:
+    try:
+        logger.info(
+            "Performance report",
+            context=lambda: {
+                'metrics': {
+                    'endpoints': metrics.get_all_stats(),
+                    'report_timestamp': datetime.now().isoformat()
+                }
+            }
+        )
+    except Exception as e:
+        logger.error("Performance report failed", error_type='REPORT_ERROR', context={'error': str(e)})
+
 
 def get_performance_stats():
     """
@@ -0,0 +1,49 @@
+"""
+Request Tracing Middleware
+Opens the root span for each HTTP request so nested spans share one trace
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.tracing import tracer
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware creating an 'http.request' root span.
+
+    Must run inside LoggingMiddleware so the correlation ID (and therefore
+    the trace ID) is already set when the span starts.
+    """
+
+    EXCLUDED_PATHS = {
+        '/health',
+        '/api/health',
+        '/docs',
+        '/openapi.json',
+        '/favicon.ico'
+    }
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['path'] in self.EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        span, token = tracer.start_span(
+            'http.request',
+            {'http.method': scope['method'], 'http.route': scope['path']}
+        )
+
+        async def send_wrapper(message: Message) -> None:
+            if span is not None and message['type'] == 'http.response.start':
+                span.set_attribute('http.status_code', message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            tracer.end_span(span, token, error=e)
+            raise
+        tracer.end_span(span, token)
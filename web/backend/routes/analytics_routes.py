@@ -4,22 +4,73 @@ FastAPI endpoints for workflow analytics and performance monitoring
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import logging
 
-from analytics.metrics_collector import MetricsCollector, ExecutionStatus
-from analytics.performance_analyzer import PerformanceAnalyzer
-from analytics.alert_manager import AlertManager, AlertType, AlertSeverity
-from analytics.report_generator import ReportGenerator, ReportFormat
+from analytics.metrics_collector import MetricsCollector, SharedMetricsCollector, ExecutionStatus
+from analytics.performance_analyzer import PerformanceAnalyzer, NUMPY_AVAILABLE
+from analytics.alert_manager import AlertManager, AlertType, AlertSeverity, SharedAlertStore
+from analytics.report_generator import ReportGenerator, ReportFormat, ScheduledReport
+from analytics.report_scheduler import ReportScheduler, MEDIA_TYPES, FILE_EXTENSIONS
+from utils.metrics_store import shared_metrics_enabled
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
-# Initialize managers
-metrics_collector = MetricsCollector(retention_days=90)
+# Initialize managers (METRICS_BACKEND=sqlite shares their state across workers)
+if shared_metrics_enabled():
+    metrics_collector = SharedMetricsCollector(retention_days=90)
+    alert_manager = AlertManager(store=SharedAlertStore())
+else:
+    metrics_collector = MetricsCollector(retention_days=90)
+    alert_manager = AlertManager()
 performance_analyzer = PerformanceAnalyzer()
-alert_manager = AlertManager()
 report_generator = ReportGenerator()
+report_scheduler = ReportScheduler(metrics_collector, report_generator, performance_analyzer)
+
+# Collector and alert manager calls run on one thread, in order: with the
+# shared backend they are SQLite transactions (BEGIN IMMEDIATE, 30 s busy
+# timeout) that must not block the event loop, and the in-memory state behind
+# them is not shared with other threads
+metrics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics")
+
+
+async def run_metrics(func, *args, **kwargs):
+    """Await a metrics_collector / alert_manager call on the metrics thread"""
+    return await asyncio.get_running_loop().run_in_executor(metrics_executor, partial(func, *args, **kwargs))
+
+
+def _observe_execution(execution, local: bool):
+    try:
+        alert_manager.observe_execution(execution, evaluate=local)
+    except Exception as e:
+        logger.error(f"Alert evaluation failed for execution {execution.execution_id}: {e}")
+
+
+# Every completed execution updates the alert windows; only the worker that
+# completed it evaluates the rules. Listeners also fire from sync() on report
+# worker threads, so the alert manager is always handed to the metrics thread.
+metrics_collector.add_listener(
+    lambda execution, local: metrics_executor.submit(_observe_execution, execution, local)
+)
+
+
+@router.on_event("startup")
+async def start_report_scheduler():
+    report_scheduler.start()
+
+
+@router.on_event("shutdown")
+async def stop_report_scheduler():
+    await report_scheduler.stop()
+    metrics_executor.shutdown(wait=False)
 
 
 # Pydantic models
@@ -63,7 +114,8 @@ class MetricsResponse(BaseModel):
 async def start_execution(request: StartExecutionRequest):
     """Start tracking a workflow execution"""
     try:
-        execution = metrics_collector.start_execution(
+        execution = await run_metrics(
+            metrics_collector.start_execution,
             execution_id=request.executionId,
             workflow_id=request.workflowId,
             workflow_name=request.workflowName,
@@ -83,7 +135,8 @@ async def start_execution(request: StartExecutionRequest):
 async def start_step(request: StartStepRequest):
     """Start tracking a step execution"""
     try:
-        step = metrics_collector.start_step(
+        step = await run_metrics(
+            metrics_collector.start_step,
             execution_id=request.executionId,
             step_id=request.stepId,
             step_name=request.stepName,
@@ -109,7 +162,8 @@ async def complete_step(request: CompleteStepRequest):
     """Mark a step as completed"""
     try:
         status = ExecutionStatus(request.status)
-        success = metrics_collector.complete_step(
+        success = await run_metrics(
+            metrics_collector.complete_step,
             execution_id=request.executionId,
             step_id=request.stepId,
             status=status,
@@ -135,7 +189,8 @@ async def complete_execution(request: CompleteExecutionRequest):
     """Mark an execution as completed"""
     try:
         status = ExecutionStatus(request.status)
-        success = metrics_collector.complete_execution(
+        success = await run_metrics(
+            metrics_collector.complete_execution,
             execution_id=request.executionId,
             status=status,
             error=request.error
@@ -144,12 +199,6 @@ async def complete_execution(request: CompleteExecutionRequest):
         if not success:
             raise HTTPException(status_code=404, detail="Execution not found")
 
-        # Check for alerts
-        execution = metrics_collector.get_execution(request.executionId)
-        if execution:
-            workflow_metrics = metrics_collector.get_workflow_metrics(execution.workflow_id)
-            new_alerts = alert_manager.check_metrics(workflow_metrics)
-
         return MetricsResponse(
             success=True,
             data={"message": "Execution completed"}
@@ -164,7 +213,7 @@ async def complete_execution(request: CompleteExecutionRequest):
 async def get_execution(execution_id: str):
     """Get execution details"""
     try:
-        execution = metrics_collector.get_execution(execution_id)
+        execution = await run_metrics(metrics_collector.get_execution, execution_id)
 
         if not execution:
             raise HTTPException(status_code=404, detail="Execution not found")
@@ -190,7 +239,8 @@ async def get_global_metrics(
         start = datetime.fromisoformat(start_date) if start_date else None
         end = datetime.fromisoformat(end_date) if end_date else None
 
-        metrics = metrics_collector.get_global_metrics(
+        metrics = await run_metrics(
+            metrics_collector.get_global_metrics,
             start_date=start,
             end_date=end
         )
@@ -214,7 +264,8 @@ async def get_workflow_metrics(
         start = datetime.fromisoformat(start_date) if start_date else None
         end = datetime.fromisoformat(end_date) if end_date else None
 
-        metrics = metrics_collector.get_workflow_metrics(
+        metrics = await run_metrics(
+            metrics_collector.get_workflow_metrics,
             workflow_id=workflow_id,
             start_date=start,
             end_date=end
@@ -235,7 +286,8 @@ async def get_step_metrics(
 ):
     """Get metrics for workflow steps"""
     try:
-        metrics = metrics_collector.get_step_metrics(
+        metrics = await run_metrics(
+            metrics_collector.get_step_metrics,
             workflow_id=workflow_id,
             step_type=step_type
         )
@@ -253,7 +305,7 @@ async def get_step_metrics(
 async def detect_bottlenecks(workflow_id: str):
     """Detect performance bottlenecks in a workflow"""
     try:
-        metrics = metrics_collector.get_workflow_metrics(workflow_id)
+        metrics = await run_metrics(metrics_collector.get_workflow_metrics, workflow_id)
         executions = metrics.get("executions", [])
 
         analysis = performance_analyzer.bottleneck_detector.analyze_workflow(executions)
@@ -266,6 +318,29 @@ async def detect_bottlenecks(workflow_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/performance/trends", response_model=MetricsResponse)
+async def analyze_all_workflow_trends(
+    interval: str = Query("daily", pattern="^(hourly|daily|weekly)$"),
+    days: int = Query(30, ge=1, le=90)
+):
+    """Summarize success-rate and duration trends for every workflow"""
+    if not NUMPY_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Trend analysis across workflows requires numpy")
+    try:
+        columns = await run_metrics(
+            metrics_collector.get_execution_columns,
+            start_date=datetime.now() - timedelta(days=days)
+        )
+        trends = performance_analyzer.analyze_workflow_trends(columns, interval=interval)
+
+        return MetricsResponse(
+            success=True,
+            data=trends
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/performance/trends/{workflow_id}", response_model=MetricsResponse)
 async def analyze_trends(
     workflow_id: str,
@@ -273,8 +348,11 @@ async def analyze_trends(
 ):
     """Analyze performance trends for a workflow"""
     try:
-        metrics = metrics_collector.get_workflow_metrics(workflow_id)
-        executions = metrics.get("executions", [])
+        if NUMPY_AVAILABLE:
+            executions = await run_metrics(metrics_collector.get_execution_columns, workflow_id)
+        else:
+            metrics = await run_metrics(metrics_collector.get_workflow_metrics, workflow_id)
+            executions = metrics.get("executions", [])
 
         trends = performance_analyzer.analyze_trends(executions, interval=interval)
 
@@ -290,7 +368,7 @@ async def analyze_trends(
 async def detect_error_patterns(workflow_id: str):
     """Detect error patterns in a workflow"""
     try:
-        metrics = metrics_collector.get_workflow_metrics(workflow_id)
+        metrics = await run_metrics(metrics_collector.get_workflow_metrics, workflow_id)
         executions = metrics.get("executions", [])
 
         patterns = performance_analyzer.detect_error_patterns(executions)
@@ -310,7 +388,7 @@ async def get_slow_steps(
 ):
     """Get slowest workflow steps"""
     try:
-        metrics = metrics_collector.get_workflow_metrics(workflow_id)
+        metrics = await run_metrics(metrics_collector.get_workflow_metrics, workflow_id)
         executions = metrics.get("executions", [])
 
         slow_steps = performance_analyzer.identify_slow_steps(executions, top_n=top_n)
@@ -333,7 +411,8 @@ async def get_alerts(
     """Get alerts with optional filtering"""
     try:
         severity_enum = AlertSeverity(severity) if severity else None
-        alerts = alert_manager.get_alerts(
+        alerts = await run_metrics(
+            alert_manager.get_alerts,
             workflow_id=workflow_id,
             acknowledged=acknowledged,
             severity=severity_enum
@@ -350,11 +429,23 @@ async def get_alerts(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/alerts/stats", response_model=MetricsResponse)
+async def get_alert_stats():
+    """Get alert store size and dedup/cooldown counters"""
+    try:
+        return MetricsResponse(
+            success=True,
+            data=await run_metrics(alert_manager.get_stats)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/alerts/{alert_id}/acknowledge", response_model=MetricsResponse)
 async def acknowledge_alert(alert_id: str):
     """Acknowledge an alert"""
     try:
-        success = alert_manager.acknowledge_alert(alert_id)
+        success = await run_metrics(alert_manager.acknowledge_alert, alert_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Alert not found")
@@ -378,7 +469,10 @@ async def get_alert_rules():
                 "ruleId": rule.rule_id,
                 "alertType": rule.alert_type.value,
                 "severity": rule.severity.value,
-                "enabled": rule.enabled
+                "enabled": rule.enabled,
+                "windowMinutes": rule.window_minutes,
+                "minExecutions": rule.min_executions,
+                "cooldownSeconds": rule.cooldown_seconds
             }
             for rule in alert_manager.rules.values()
         ]
@@ -395,7 +489,7 @@ async def get_alert_rules():
 async def enable_alert_rule(rule_id: str):
     """Enable an alert rule"""
     try:
-        success = alert_manager.enable_rule(rule_id)
+        success = await run_metrics(alert_manager.enable_rule, rule_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Rule not found")
@@ -414,7 +508,7 @@ async def enable_alert_rule(rule_id: str):
 async def disable_alert_rule(rule_id: str):
     """Disable an alert rule"""
     try:
-        success = alert_manager.disable_rule(rule_id)
+        success = await run_metrics(alert_manager.disable_rule, rule_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Rule not found")
@@ -457,7 +551,7 @@ async def generate_report(request: GenerateReportRequest):
     """Generate a report for a workflow"""
     try:
         # Fetch workflow metrics
-        workflow_metrics = metrics_collector.get_workflow_metrics(request.workflowId)
+        workflow_metrics = await run_metrics(metrics_collector.get_workflow_metrics, request.workflowId)
 
         # Prepare additional data
         additional_data = {}
@@ -508,3 +602,119 @@ async def generate_report(request: GenerateReportRequest):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reports/download")
+async def download_report(
+    workflowId: str,
+    templateId: str = "detailed_performance",
+    format: str = Query("csv", pattern="^(csv|json|text)$"),
+    days: int = Query(30, ge=1, le=365),
+    cache: bool = True
+):
+    """
+    Download a full report file for a workflow
+
+    Cached reports are served from disk; with cache=false the report is
+    streamed straight into the response.
+    """
+    if templateId not in report_generator.templates:
+        raise HTTPException(status_code=400, detail=f"Invalid template: {templateId}")
+
+    filename = f"{templateId}_{workflowId}.{FILE_EXTENSIONS[format]}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    try:
+        if not cache:
+            return StreamingResponse(
+                await run_metrics(report_scheduler.stream, workflowId, templateId, format, days),
+                media_type=MEDIA_TYPES[format],
+                headers=headers
+            )
+
+        path = await report_scheduler.render_async(workflowId, templateId, format, days)
+        return FileResponse(path, media_type=MEDIA_TYPES[format], headers=headers)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class ScheduleReportRequest(BaseModel):
+    scheduleId: str
+    workflowId: str
+    templateId: str
+    format: str = "csv"
+    frequency: str = "daily"
+    recipients: List[str] = []
+    enabled: bool = True
+
+
+@router.get("/reports/schedules", response_model=MetricsResponse)
+async def get_report_schedules():
+    """Get all scheduled reports and scheduler status"""
+    try:
+        return MetricsResponse(
+            success=True,
+            data={
+                "schedules": [s.to_dict() for s in report_scheduler.get_schedules()],
+                "scheduler": report_scheduler.get_stats()
+            }
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/reports/schedules", response_model=MetricsResponse)
+async def create_report_schedule(request: ScheduleReportRequest):
+    """Create or replace a scheduled report"""
+    try:
+        if request.templateId not in report_generator.templates:
+            raise HTTPException(status_code=400, detail=f"Invalid template: {request.templateId}")
+
+        schedule = ScheduledReport(
+            schedule_id=request.scheduleId,
+            workflow_id=request.workflowId,
+            template_id=request.templateId,
+            format=ReportFormat(request.format),
+            frequency=request.frequency,
+            recipients=request.recipients,
+            enabled=request.enabled
+        )
+        report_scheduler.add_schedule(schedule)
+
+        return MetricsResponse(
+            success=True,
+            data=schedule.to_dict()
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/reports/schedules/{schedule_id}", response_model=MetricsResponse)
+async def delete_report_schedule(schedule_id: str):
+    """Delete a scheduled report"""
+    if not report_scheduler.remove_schedule(schedule_id):
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    return MetricsResponse(
+        success=True,
+        data={"message": "Schedule deleted"}
+    )
+
+
+@router.post("/reports/schedules/{schedule_id}/run", response_model=MetricsResponse)
+async def run_report_schedule(schedule_id: str):
+    """Run a scheduled report immediately"""
+    schedule = report_scheduler.schedules.get(schedule_id)
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    await report_scheduler.run_schedule(schedule)
+
+    return MetricsResponse(
+        success=schedule.last_error is None,
+        data=schedule.to_dict()
+    )
@@ -152,3 +152,16 @@ async def log_result_click(request: ClickLogRequest):
     except Exception as e:
         logger.error(f"Click logging error: {e}")
         return {"success": False, "error": str(e)}
+
+
+@router.get("/api/search-analytics/logger-stats")
+async def get_logger_stats():
+    """Get search event buffer statistics (depth, flushes, dropped events)"""
+    try:
+        if not search_logger:
+            return {"success": False, "error": "Logger not available"}
+
+        return {"success": True, "data": search_logger.get_buffer_stats()}
+    except Exception as e:
+        logger.error(f"Logger stats error: {e}")
+        return {"success": False, "error": str(e)}
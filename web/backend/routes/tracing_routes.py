@@ -0,0 +1,48 @@
+"""
+Tracing API Routes
+In-process trace inspection for debugging request latency
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from utils.tracing import tracer
+
+router = APIRouter(prefix="/api/tracing", tags=["analytics"])
+
+
+@router.get("/slowest")
+async def get_slowest_traces(
+    limit: int = Query(20, ge=1, le=100),
+    include_spans: bool = Query(True)
+):
+    """Get the slowest retained request traces, slowest first"""
+    return {
+        "success": True,
+        "data": {
+            "traces": tracer.get_slowest_traces(limit=limit, include_spans=include_spans),
+            "stats": tracer.get_stats()
+        }
+    }
+
+
+@router.get("/recent")
+async def get_recent_traces(
+    limit: int = Query(20, ge=1, le=200),
+    include_spans: bool = Query(False)
+):
+    """Get the most recently finished request traces"""
+    return {
+        "success": True,
+        "data": {
+            "traces": tracer.get_recent_traces(limit=limit, include_spans=include_spans)
+        }
+    }
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """Get a retained trace by trace ID or correlation ID"""
+    trace = tracer.get_trace(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found (not sampled or no longer retained)")
+    return {"success": True, "data": trace}
@@ -87,13 +87,14 @@ async def create_commit(request: CommitRequest):
         raise HTTPException(status_code=500, detail=f"Error creating commit: {str(e)}")
 
 @router.get("/api/version-control/history/{workflow_id}")
-async def get_history(workflow_id: str, branch: str = 'main', limit: int = 50):
-    """Get commit history for a branch"""
+async def get_history(workflow_id: str, branch: str = 'main', limit: int = 50, from_commit: Optional[str] = None):
+    """Get commit history for a branch (pass next_commit back as from_commit for the next page)"""
     try:
         history = version_control.get_history(
             workflow_id=workflow_id,
             branch=branch,
-            limit=limit
+            limit=limit,
+            from_commit=from_commit
         )
 
         return {
@@ -101,7 +102,8 @@ async def get_history(workflow_id: str, branch: str = 'main', limit: int = 50):
             "data": {
                 "branch": branch,
                 "commits": history,
-                "total": len(history)
+                "total": len(history),
+                "next_commit": history[-1]['parent'] if history and len(history) == limit else None
             }
         }
 
@@ -238,6 +240,18 @@ async def list_tags(workflow_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing tags: {str(e)}")
 
+@router.get("/api/version-control/storage/{workflow_id}")
+async def get_storage_stats(workflow_id: str):
+    """Commits and stored snapshot bytes by storage kind (keyframe / delta / json)"""
+    try:
+        return {
+            "success": True,
+            "data": version_control.storage_stats(workflow_id)
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading storage stats: {str(e)}")
+
 @router.get("/api/version-control/restore/{commit_id}")
 async def restore_commit(commit_id: str):
     """Get workflow snapshot from a specific commit (for restoration)"""
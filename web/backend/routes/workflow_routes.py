@@ -3,14 +3,27 @@ Workflow Routes - Epic 12
 Advanced workflow endpoints for conditions, variables, triggers, etc.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, validator
-from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, validator
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import asyncio
+import itertools
+import json
 import logging
 import html
-
-from workflow_features.conditions import evaluate_condition_group
+import tempfile
+import time
+
+from workflow_features.expressions import compile_condition_group
+from workflow_features.batch_conditions import (
+    BATCH_CHUNK_SIZE,
+    MAX_BATCH_CONTEXTS,
+    MAX_STREAM_CONTEXTS,
+    BatchConditionEvaluator
+)
 from workflow_features.variables import resolve_variables_in_text, Variable, VariableManager
+from workflow_features.actions import TransformPipeline, iter_ndjson
 from workflow_features.templates import TemplateManager
 from workflow_features.testing import WorkflowTester, TestResult
 
@@ -23,10 +36,9 @@ template_manager = TemplateManager()
 
 
 # Request/Response Models
-class EvaluateConditionRequest(BaseModel):
+class ConditionGroupModel(BaseModel):
     conditions: List[Dict[str, Any]] = Field(..., max_items=100, description="Maximum 100 conditions allowed")
     logicOperator: str = Field("and", pattern="^(and|or)$", description="Logic operator: 'and' or 'or'")
-    context: Dict[str, Any] = Field(..., description="Context data for condition evaluation")
 
     @validator('conditions')
     def validate_conditions(cls, v):
@@ -41,6 +53,10 @@ class EvaluateConditionRequest(BaseModel):
                 raise ValueError(f"Condition {i} must have 'field', 'operator', and 'value' keys")
         return v
 
+
+class EvaluateConditionRequest(ConditionGroupModel):
+    context: Dict[str, Any] = Field(..., description="Context data for condition evaluation")
+
     @validator('context')
     def validate_context(cls, v):
         """Validate context data"""
@@ -75,11 +91,9 @@ async def evaluate_condition_endpoint(request: EvaluateConditionRequest):
     }
     """
     try:
-        result = evaluate_condition_group(
-            request.conditions,
-            request.logicOperator,
-            request.context
-        )
+        # Compiled once per distinct condition group (LRU keyed by its JSON)
+        condition_group = compile_condition_group(request.conditions, request.logicOperator)
+        result = condition_group(request.context)
 
         return EvaluateConditionResponse(
             success=True,
@@ -96,6 +110,255 @@ async def evaluate_condition_endpoint(request: EvaluateConditionRequest):
         )
 
 
+class BatchConditionOptions(ConditionGroupModel):
+    output: str = Field("ids", pattern="^(ids|indexes|bitmap)$", description="Result format: 'ids', 'indexes' or 'bitmap'")
+    idField: str = Field("id", max_length=200, description="Dot path of the ID returned for output='ids'")
+
+
+class BatchEvaluateConditionRequest(BatchConditionOptions):
+    contexts: List[Any] = Field(..., max_items=MAX_BATCH_CONTEXTS, description=f"Maximum {MAX_BATCH_CONTEXTS} contexts")
+
+
+class BatchEvaluateConditionResponse(BaseModel):
+    success: bool
+    total: int = 0
+    matched: int = 0
+    output: Optional[str] = None
+    ids: Optional[List[Any]] = None
+    indexes: Optional[List[int]] = None
+    bitmap: Optional[str] = None
+    elapsed_ms: float = 0
+    message: str = Field(..., max_length=500)
+    error: Optional[str] = Field(None, max_length=500)
+
+
+def _batch_response(evaluator: BatchConditionEvaluator, started: float) -> BatchEvaluateConditionResponse:
+    result = evaluator.result()
+    return BatchEvaluateConditionResponse(
+        success=True,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        message=f"{result['matched']} of {result['total']} contexts matched",
+        **result
+    )
+
+
+@router.post("/evaluate-condition/batch", response_model=BatchEvaluateConditionResponse)
+async def evaluate_condition_batch(request: BatchEvaluateConditionRequest):
+    """
+    Evaluate one condition group against many contexts (e.g. segmenting contacts)
+
+    The group is compiled once and evaluated column by column. Output:
+    - ids: idField of every matching context (null where missing)
+    - indexes: zero-based positions of the matching contexts
+    - bitmap: base64, bit i (little-endian within each byte) set if context i matched
+
+    Example request:
+    {
+        "conditions": [{"field": "contact.email", "operator": "contains", "value": "@gmail.com"}],
+        "logicOperator": "and",
+        "contexts": [{"id": "c1", "contact": {"email": "user@gmail.com"}}],
+        "output": "ids",
+        "idField": "id"
+    }
+    """
+    started = time.perf_counter()
+    try:
+        condition_group = compile_condition_group(request.conditions, request.logicOperator)
+        evaluator = BatchConditionEvaluator(condition_group, request.output, request.idField)
+        await asyncio.to_thread(evaluator.add_all, request.contexts)
+        return _batch_response(evaluator, started)
+
+    except Exception as e:
+        logger.error(f"Batch condition evaluation error: {e}")
+        return BatchEvaluateConditionResponse(
+            success=False,
+            message="Batch condition evaluation failed",
+            error=str(e)
+        )
+
+
+# Longest NDJSON line (the options object or one context / row) and largest
+# NDJSON body accepted by /evaluate-condition/batch/stream
+NDJSON_MAX_LINE_BYTES = 1024 * 1024
+BATCH_STREAM_MAX_BYTES = 512 * 1024 * 1024
+
+
+async def _ndjson_lines(
+    request: Request,
+    max_bytes: int,
+    max_line_bytes: int = NDJSON_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    (line number, line) of every non-blank line of a streamed NDJSON body
+
+    Each chunk is scanned for newlines once, starting where the previous scan
+    stopped, so the cost is linear in the body size. Past max_bytes of body,
+    or on a line longer than max_line_bytes, raises 413.
+    """
+    buffer = bytearray()
+    line_number = 0
+    received = 0
+    async for data in request.stream():
+        received += len(data)
+        if received > max_bytes:
+            raise HTTPException(status_code=413, detail=f"Request body is larger than {max_bytes} bytes")
+        scan = len(buffer)
+        buffer += data
+        start = 0
+        while True:
+            end = buffer.find(b'\n', scan)
+            if end < 0:
+                break
+            line_number += 1
+            if end - start > max_line_bytes:
+                raise HTTPException(status_code=413, detail=f"Line {line_number} is longer than {max_line_bytes} bytes")
+            line = bytes(buffer[start:end])
+            if line.strip():
+                yield line_number, line
+            start = scan = end + 1
+        if start:
+            del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise HTTPException(status_code=413, detail=f"Line {line_number + 1} is longer than {max_line_bytes} bytes")
+    if buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+@router.post("/evaluate-condition/batch/stream", response_model=BatchEvaluateConditionResponse)
+async def evaluate_condition_batch_stream(request: Request):
+    """
+    Batch condition evaluation over an NDJSON (application/x-ndjson) body
+
+    The first line is the options object (conditions, logicOperator, output,
+    idField, as for /evaluate-condition/batch); every following line is one
+    context. Contexts are read and evaluated in chunks as they arrive, so
+    large uploads are never held in memory at once. Bodies over
+    BATCH_STREAM_MAX_BYTES, or lines over NDJSON_MAX_LINE_BYTES, get 413.
+    """
+    started = time.perf_counter()
+    evaluator: Optional[BatchConditionEvaluator] = None
+    chunk: List[Any] = []
+
+    async for line_number, line in _ndjson_lines(request, BATCH_STREAM_MAX_BYTES):
+        try:
+            item = json.loads(line)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Line {line_number}: invalid JSON")
+
+        if evaluator is None:
+            if not isinstance(item, dict):
+                raise HTTPException(status_code=422, detail="First line must be the options object")
+            try:
+                options = BatchConditionOptions(**item)
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            condition_group = compile_condition_group(options.conditions, options.logicOperator)
+            evaluator = BatchConditionEvaluator(condition_group, options.output, options.idField)
+            continue
+
+        chunk.append(item)
+        if evaluator.total + len(chunk) > MAX_STREAM_CONTEXTS:
+            raise HTTPException(status_code=413, detail=f"Too many contexts (max {MAX_STREAM_CONTEXTS})")
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            await asyncio.to_thread(evaluator.add, chunk)
+            chunk = []
+
+    if evaluator is None:
+        raise HTTPException(status_code=422, detail="Missing options line")
+    if chunk:
+        await asyncio.to_thread(evaluator.add, chunk)
+
+    return _batch_response(evaluator, started)
+
+
+# Rows transformed per worker-thread hop / request body kept in memory before spilling to disk
+TRANSFORM_CHUNK_SIZE = 1000
+TRANSFORM_SPOOL_BYTES = 8 * 1024 * 1024
+# Body bytes collected before each spool write
+TRANSFORM_WRITE_BYTES = 1024 * 1024
+# Largest request body accepted (spooled to disk in full before the response starts)
+TRANSFORM_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TransformStreamOptions(BaseModel):
+    transformations: List[Dict[str, Any]] = Field(..., max_items=50)
+
+
+def _transform_chunk(rows) -> str:
+    """Next TRANSFORM_CHUNK_SIZE transformed rows as NDJSON ('' when exhausted)"""
+    return ''.join(json.dumps(row) + '\n' for row in itertools.islice(rows, TRANSFORM_CHUNK_SIZE))
+
+
+@router.post("/transform/stream")
+async def transform_data_stream(request: Request):
+    """
+    Run transform_data transformations over an NDJSON (application/x-ndjson) body
+
+    The first line is {"transformations": [...]}; every following line is one
+    row. The response is NDJSON with one line per transformed row (filtered
+    rows are dropped). If a row fails, a final {"type": "error"} line is
+    written.
+
+    The body is spooled (to disk past TRANSFORM_SPOOL_BYTES) before the
+    response starts, then rows are read, transformed and written out chunk by
+    chunk, so memory stays bounded whatever the upload size. Bodies over
+    TRANSFORM_MAX_BYTES, or lines over NDJSON_MAX_LINE_BYTES, get 413.
+
+    "format" templates only take plain {name} fields (see compile_format).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=TRANSFORM_SPOOL_BYTES)
+    pipeline: Optional[TransformPipeline] = None
+    pending = bytearray()
+
+    try:
+        async for line_number, line in _ndjson_lines(request, TRANSFORM_MAX_BYTES):
+            if pipeline is not None:
+                pending += line + b'\n'
+                if len(pending) >= TRANSFORM_WRITE_BYTES:
+                    # The spool rolls over to disk; write in a worker thread
+                    await asyncio.to_thread(spool.write, bytes(pending))
+                    pending.clear()
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Line {line_number}: invalid JSON")
+            if not isinstance(item, dict):
+                raise HTTPException(status_code=422, detail="First line must be the options object")
+            try:
+                options = TransformStreamOptions(**item)
+                pipeline = TransformPipeline(options.transformations, plain_format_fields=True)
+            except (ValidationError, ValueError) as e:
+                raise HTTPException(status_code=422, detail=str(e))
+        if pending:
+            await asyncio.to_thread(spool.write, bytes(pending))
+    except BaseException:
+        spool.close()
+        raise
+
+    if pipeline is None:
+        spool.close()
+        raise HTTPException(status_code=422, detail="Missing options line")
+
+    spool.seek(0)
+
+    async def transformed_rows():
+        try:
+            rows = pipeline(iter_ndjson(spool))
+            while True:
+                text = await asyncio.to_thread(_transform_chunk, rows)
+                if not text:
+                    break
+                yield text
+        except Exception as e:
+            logger.error(f"Transform stream error: {e}")
+            yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+        finally:
+            spool.close()
+
+    return StreamingResponse(transformed_rows(), media_type='application/x-ndjson')
+
+
 # Variable Resolution Models
 class ResolveVariablesRequest(BaseModel):
     text: str
@@ -199,20 +462,33 @@ async def validate_variable_endpoint(request: ValidateVariableRequest):
 async def list_templates(
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    include_workflow: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0)
 ):
-    """List workflow templates with optional filtering"""
+    """
+    List workflow templates with optional filtering
+
+    Search results are ranked; facets holds template counts per category and
+    difficulty for the current search. Templates are summaries unless
+    include_workflow is set (GET /templates/{id} returns the workflow).
+    """
     try:
-        templates = template_manager.list_templates(
+        result = template_manager.search_templates(
             category=category,
             difficulty=difficulty,
-            search=search
+            search=search,
+            include_workflow=include_workflow,
+            limit=limit,
+            offset=offset
         )
 
         return {
             "success": True,
-            "templates": templates,
-            "count": len(templates)
+            "templates": result["templates"],
+            "count": result["total"],
+            "facets": result["facets"]
         }
 
     except Exception as e:
@@ -606,10 +882,14 @@ def _get_category_icon(category: str) -> str:
 
 # Enhancement 4: Workflow Validation
 from utils.workflow_validator import WorkflowValidator
+from utils.incremental_validator import ValidationSessionStore
 
 # Initialize validator
 workflow_validator = WorkflowValidator()
 
+# Live-editing sessions, keyed by workflow ID
+validation_sessions = ValidationSessionStore()
+
 
 class WorkflowValidationRequest(BaseModel):
     nodes: List[Dict[str, Any]]
@@ -674,3 +954,265 @@ async def validate_workflow(request: WorkflowValidationRequest):
                 'best_practices_met': 0
             }
         }
+
+
+class ValidationSessionRequest(WorkflowValidationRequest):
+    workflow_id: str = Field(..., min_length=1, max_length=200)
+
+
+class IncrementalValidationRequest(BaseModel):
+    workflow_id: str = Field(..., min_length=1, max_length=200)
+    revision: int = Field(..., description="Session revision this diff was made against")
+    added_nodes: List[Dict[str, Any]] = []
+    removed_nodes: List[str] = []
+    modified_nodes: List[Dict[str, Any]] = []
+    added_connections: List[Dict[str, Any]] = []
+    removed_connections: List[Any] = Field([], description="Connection objects or connection ids")
+    metadata: Optional[Dict[str, Any]] = None
+    include_issues: bool = False
+
+
+@router.post("/validate/session")
+async def start_validation_session(request: ValidationSessionRequest):
+    """
+    Start (or reset) an incremental validation session for live editing
+
+    Validates the full workflow and keeps its state on the server. Send later
+    edits to /validate/incremental as diffs against the returned revision.
+    Every issue carries a stable `id`.
+    """
+    try:
+        workflow = {
+            'nodes': request.nodes,
+            'connections': request.connections,
+            'metadata': request.metadata
+        }
+        return {
+            "success": True,
+            "data": validation_sessions.start(request.workflow_id, workflow)
+        }
+
+    except Exception as e:
+        logger.error(f"Validation session error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/validate/incremental")
+async def validate_workflow_incremental(request: IncrementalValidationRequest):
+    """
+    Apply an editor diff to a validation session
+
+    Only the rules whose inputs the diff touches are re-evaluated, so latency
+    stays flat as workflows grow. Returns the updated score and stats plus
+    `changes`: issues added or changed (`added`, full issue objects) and the
+    ids of issues that no longer apply (`resolved`). Set include_issues to
+    also get the full issue list.
+
+    Responds 409 when the session is unknown (expired, or another worker) or
+    the revision does not match; the client should resync through
+    /validate/session.
+
+    Example:
+    {
+        "workflow_id": "wf-123",
+        "revision": 4,
+        "modified_nodes": [{"id": "n3", "type": "action", "data": {...}}],
+        "added_connections": [{"source": "n3", "target": "n4", "label": "failure"}]
+    }
+    """
+    session = validation_sessions.get(request.workflow_id)
+    if session is None:
+        raise HTTPException(status_code=409, detail="No validation session for this workflow; resync required")
+    if session.revision != request.revision:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Revision mismatch (session is at {session.revision}); resync required"
+        )
+
+    try:
+        diff = {
+            'added_nodes': request.added_nodes,
+            'removed_nodes': request.removed_nodes,
+            'modified_nodes': request.modified_nodes,
+            'added_connections': request.added_connections,
+            'removed_connections': request.removed_connections
+        }
+        if request.metadata is not None:
+            diff['metadata'] = request.metadata
+
+        return {
+            "success": True,
+            "data": session.apply(diff, include_issues=request.include_issues)
+        }
+
+    except Exception as e:
+        logger.error(f"Incremental validation error: {e}")
+        # The session may be half-updated; drop it so the client resyncs
+        validation_sessions.end(request.workflow_id)
+        raise HTTPException(status_code=409, detail=f"Incremental validation failed; resync required: {e}")
+
+
+@router.delete("/validate/session/{workflow_id}")
+async def end_validation_session(workflow_id: str):
+    """Discard a workflow's validation session"""
+    return {"success": True, "ended": validation_sessions.end(workflow_id)}
+
+
+# Story 12.7: Workflow Scheduling
+from workflow_features.scheduler import Schedule, ScheduleStore, WorkflowScheduler, parse_schedule_description
+
+# No workflow runner exists in this backend yet (workflows execute in
+# GoHighLevel), so due runs are only logged: "dispatched" counts log lines
+workflow_scheduler = WorkflowScheduler(ScheduleStore())
+
+DISPATCH_NOTICE = "Schedules are stored and tracked, but due runs are only logged; no workflow is executed"
+
+
+@router.on_event("startup")
+async def start_workflow_scheduler():
+    workflow_scheduler.start()
+
+
+@router.on_event("shutdown")
+async def stop_workflow_scheduler():
+    await workflow_scheduler.stop()
+
+
+class ScheduleRequest(BaseModel):
+    workflow_id: str
+    type: str = Field(..., description="once, recurring or cron")
+    config: Dict[str, Any] = {}
+    timezone: str = "UTC"
+    enabled: bool = True
+
+
+def _schedule_response(workflow_id: str, schedule: Schedule) -> Dict[str, Any]:
+    data = schedule.to_dict()
+    data["workflow_id"] = workflow_id
+    data["description"] = parse_schedule_description(schedule)
+    if not workflow_scheduler.runs_workflows:
+        data["notice"] = DISPATCH_NOTICE
+    return data
+
+
+@router.post("/schedules")
+async def create_schedule(request: ScheduleRequest):
+    """Create or replace a workflow's schedule"""
+    try:
+        schedule = Schedule(request.type, request.config, request.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    schedule.enabled = request.enabled
+
+    workflow_scheduler.add_schedule(request.workflow_id, schedule)
+    return {"success": True, "data": _schedule_response(request.workflow_id, schedule)}
+
+
+@router.get("/schedules")
+async def list_schedules():
+    """All workflow schedules"""
+    schedules = workflow_scheduler.manager.schedules
+    return {
+        "success": True,
+        "data": [_schedule_response(workflow_id, schedule) for workflow_id, schedule in list(schedules.items())]
+    }
+
+
+@router.get("/schedules/{workflow_id}")
+async def get_schedule(workflow_id: str):
+    schedule = workflow_scheduler.get_schedule(workflow_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"success": True, "data": _schedule_response(workflow_id, schedule)}
+
+
+@router.delete("/schedules/{workflow_id}")
+async def delete_schedule(workflow_id: str):
+    if not workflow_scheduler.remove_schedule(workflow_id):
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"success": True}
+
+
+@router.post("/schedules/{workflow_id}/enable")
+async def enable_schedule(workflow_id: str):
+    if not workflow_scheduler.enable_schedule(workflow_id):
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"success": True, "data": _schedule_response(workflow_id, workflow_scheduler.get_schedule(workflow_id))}
+
+
+@router.post("/schedules/{workflow_id}/disable")
+async def disable_schedule(workflow_id: str):
+    if not workflow_scheduler.disable_schedule(workflow_id):
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"success": True, "data": _schedule_response(workflow_id, workflow_scheduler.get_schedule(workflow_id))}
+
+
+@router.get("/scheduler/stats")
+async def get_scheduler_stats():
+    stats = workflow_scheduler.get_stats()
+    if not workflow_scheduler.runs_workflows:
+        stats["notice"] = DISPATCH_NOTICE
+    return {"success": True, "data": stats}
+
+
+# Story 12.4: HTTP Request Actions
+from workflow_features.actions import Action
+from workflow_features.http_actions import DestinationNotAllowed, HttpActionExecutor
+from routes.analytics_routes import metrics_collector, metrics_executor
+
+http_action_executor = HttpActionExecutor(metrics_collector, metrics_executor=metrics_executor)
+
+
+@router.on_event("shutdown")
+async def close_http_action_executor():
+    await http_action_executor.aclose()
+
+
+class ExecuteHttpActionRequest(BaseModel):
+    config: Dict[str, Any]
+    name: str = ""
+    context: Optional[Dict[str, Any]] = None
+    workflowId: str = ""
+    executionId: Optional[str] = None
+    stepId: Optional[str] = None
+
+
+@router.post("/actions/http/execute")
+async def execute_http_action(request: ExecuteHttpActionRequest):
+    """
+    Run an http_request action
+
+    With executionId (of an execution started through /api/analytics), the
+    request is recorded as a step of that execution. Only public addresses
+    (and HTTP_ACTION_ALLOWED_HOSTS, when set) can be called; others get 403.
+
+    Example request:
+    {
+        "config": {"url": "https://api.example.com/contacts/{{contact.id}}", "method": "GET", "cacheTtl": 60},
+        "context": {"contact": {"id": "c1"}},
+        "workflowId": "wf-1"
+    }
+    """
+    action = Action("http_request", request.config, request.name)
+    try:
+        result = await http_action_executor.execute(
+            action,
+            context=request.context,
+            workflow_id=request.workflowId,
+            execution_id=request.executionId,
+            step_id=request.stepId
+        )
+    except DestinationNotAllowed as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"HTTP action error: {e}")
+        raise HTTPException(status_code=502, detail=f"{type(e).__name__}: {e}")
+
+    return {"success": True, "data": result}
+
+
+@router.get("/actions/http/stats")
+async def get_http_action_stats():
+    return {"success": True, "data": http_action_executor.get_stats()}
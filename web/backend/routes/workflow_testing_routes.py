@@ -4,21 +4,29 @@ API endpoints for testing workflows with mock contact data
 """
 
 from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
 import json
 import logging
 from pathlib import Path
 from utils.workflow_simulator import WorkflowSimulator
+from utils.batch_simulator import BatchSimulator, MAX_BATCH_CONTACTS, generate_contacts
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize simulator
 workflow_simulator = WorkflowSimulator()
+batch_simulator = BatchSimulator()
 MOCK_CONTACTS_FILE = Path('web/backend/data/mock_contacts.json')
 
 
+@router.on_event("shutdown")
+async def stop_batch_simulator():
+    batch_simulator.shutdown()
+
+
 class TestWorkflowRequest(BaseModel):
     nodes: List[Dict[str, Any]]
     connections: List[Dict[str, Any]] = []
@@ -27,6 +35,20 @@ class TestWorkflowRequest(BaseModel):
     speed_multiplier: int = 1000
 
 
+class BatchTestWorkflowRequest(BaseModel):
+    nodes: List[Dict[str, Any]]
+    connections: List[Dict[str, Any]] = []
+    metadata: Dict[str, Any] = {}
+    contacts: Optional[List[Dict[str, Any]]] = Field(
+        None, max_items=MAX_BATCH_CONTACTS, description="Uploaded contacts; generated from personas when omitted"
+    )
+    count: int = Field(1000, ge=1, le=MAX_BATCH_CONTACTS, description="Contacts to generate")
+    persona_ids: List[str] = Field([], description="Personas to generate from (default: all)")
+    seed: Optional[int] = None
+    speed_multiplier: int = 1000
+    stream: bool = True
+
+
 @router.get('/api/workflows/mock-contacts')
 async def get_mock_contacts():
     """
@@ -138,3 +160,88 @@ async def test_workflow(request: TestWorkflowRequest):
                 'execution_time_actual': '0s'
             }
         }
+
+
+@router.post('/api/workflows/test/batch')
+async def test_workflow_batch(request: BatchTestWorkflowRequest):
+    """
+    Enhancement 5: Monte-Carlo test of a workflow across many contacts
+
+    Simulates the workflow for every uploaded contact, or for `count`
+    contacts generated around the mock personas (reproducible with `seed`),
+    in parallel on a process pool. Delays are not slept through.
+
+    Returns aggregated statistics:
+    - coverage: runs reaching each node, overall node coverage
+    - paths: distinct paths and the most common ones
+    - branches: TRUE/FALSE probability per condition node
+    - time_to_completion: simulated minutes (percentiles, histogram)
+    - outcomes: completed / loop_detected / step_limit / error
+
+    With stream=true (default) the response is NDJSON: one
+    {"type": "progress", "completed", "total"} line per finished chunk, then
+    {"type": "result", "data": {...}}.
+    """
+    workflow = {
+        'nodes': request.nodes,
+        'connections': request.connections,
+        'metadata': request.metadata
+    }
+
+    if not request.nodes:
+        return {
+            'success': False,
+            'error': 'Workflow has no nodes'
+        }
+
+    contacts = request.contacts
+    if contacts is None:
+        if not MOCK_CONTACTS_FILE.exists():
+            return {
+                'success': False,
+                'error': 'Mock contacts file not found'
+            }
+
+        with open(MOCK_CONTACTS_FILE, 'r', encoding='utf-8') as f:
+            personas = json.load(f)
+        if request.persona_ids:
+            personas = [p for p in personas if p['id'] in request.persona_ids]
+        if not personas:
+            return {
+                'success': False,
+                'error': f'No mock personas match: {", ".join(request.persona_ids)}'
+            }
+
+        contacts = generate_contacts(personas, request.count, request.seed)
+
+    if not contacts:
+        return {
+            'success': False,
+            'error': 'No contacts to simulate'
+        }
+
+    logger.info(f'Batch testing workflow ({len(request.nodes)} nodes) with {len(contacts)} contacts')
+
+    if not request.stream:
+        try:
+            summary = await batch_simulator.run_to_completion(workflow, contacts, request.speed_multiplier)
+            return {
+                'success': True,
+                'data': summary
+            }
+        except Exception as e:
+            logger.error(f'Batch test error: {e}', exc_info=True)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    async def events():
+        try:
+            async for event in batch_simulator.run(workflow, contacts, request.speed_multiplier):
+                yield json.dumps(event) + '\n'
+        except Exception as e:
+            logger.error(f'Batch test error: {e}', exc_info=True)
+            yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+
+    return StreamingResponse(events(), media_type='application/x-ndjson')
@@ -0,0 +1,352 @@
+"""
+Batch Workflow Simulation - Enhancement 5
+Monte-Carlo runs of one workflow across many mock contacts
+
+Contacts (uploaded, or generated around the mock personas) are split into
+chunks and simulated on a process pool. Each worker compiles the workflow
+once per chunk and returns a BatchAggregate of its runs rather than full
+execution logs, so only small summaries cross the process boundary. The
+merged result reports:
+
+- path coverage: how many runs reached each node, and the most common paths
+- branch probabilities: TRUE/FALSE split of every condition node
+- time to completion: distribution of simulated delay time per completed run
+- outcomes: completed, stopped by loop detection, or hit the step limit
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from utils.workflow_simulator import WorkflowSimulator
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for batch simulation (0 = run in a thread in this process)
+SIMULATION_WORKERS = int(os.getenv('SIMULATION_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+CHUNK_SIZE = 250
+MAX_BATCH_CONTACTS = 20000
+
+# Matches WorkflowSimulator.simulate's iteration cap
+MAX_STEPS = 50
+
+TOP_PATHS = 20
+HISTOGRAM_BUCKETS = 10
+PERCENTILES = (50, 90, 95, 99)
+
+
+def generate_contacts(personas: List[Dict], count: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Mock contacts varied around persona templates
+
+    Each contact copies a random persona, keeps each of its tags with 80%
+    probability, jitters the email/SMS engagement rates (sd 0.15) and derives
+    its engagement level from the new email rate.
+    """
+    if not personas:
+        return []
+
+    rng = random.Random(seed)
+    contacts = []
+
+    for i in range(count):
+        persona = rng.choice(personas)
+        contact = dict(persona)
+        contact['id'] = f"{persona.get('id', 'mock')}-gen-{i + 1}"
+        contact['tags'] = [tag for tag in persona.get('tags', []) if rng.random() < 0.8]
+
+        for key in ('email_engagement_rate', 'sms_reply_rate'):
+            rate = rng.gauss(persona.get(key, 0.5), 0.15)
+            contact[key] = round(min(1.0, max(0.0, rate)), 3)
+
+        rate = contact['email_engagement_rate']
+        contact['engagement_level'] = 'high' if rate > 0.66 else 'low' if rate < 0.33 else 'medium'
+        if rng.random() < 0.1:
+            contact['purchased'] = not persona.get('purchased', False)
+
+        contacts.append(contact)
+
+    return contacts
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+class BatchAggregate:
+    """Mergeable summary of many simulation runs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.outcomes: Counter = Counter()
+        self.errors: Counter = Counter()
+        # Runs that reached each node
+        self.node_visits: Counter = Counter()
+        # Full paths (tuples of node ids)
+        self.paths: Counter = Counter()
+        # Condition node id -> Counter of 'TRUE' / 'FALSE'
+        self.branches: Dict[str, Counter] = {}
+        # Simulated minutes of delays, per completed run
+        self.minutes: List[float] = []
+
+    def add_run(self, result: Dict):
+        """Fold one WorkflowSimulator.simulate() result into the aggregate"""
+        self.runs += 1
+        if not result.get('success'):
+            self.outcomes['failed'] += 1
+            self.errors[result.get('error', 'Simulation failed')] += 1
+            return
+
+        log = result.get('execution_log', [])
+        path = tuple(step['node_id'] for step in log)
+        minutes = 0
+
+        for step in log:
+            if step['status'] == 'failed':
+                continue
+            if step['node_type'] == 'condition':
+                self.branches.setdefault(step['node_id'], Counter())[step['details'].get('result')] += 1
+            elif step['node_type'] == 'delay':
+                minutes += step['details'].get('duration', 0) or 0
+
+        self.paths[path] += 1
+        self.node_visits.update(set(path))
+
+        if log and log[-1]['status'] == 'failed':
+            self.outcomes['loop_detected'] += 1
+        elif len(log) >= MAX_STEPS:
+            self.outcomes['step_limit'] += 1
+        else:
+            self.outcomes['completed'] += 1
+            self.minutes.append(minutes)
+
+    def add_error(self, message: str):
+        self.runs += 1
+        self.outcomes['error'] += 1
+        self.errors[message] += 1
+
+    def merge(self, other: 'BatchAggregate'):
+        self.runs += other.runs
+        self.outcomes.update(other.outcomes)
+        self.errors.update(other.errors)
+        self.node_visits.update(other.node_visits)
+        self.paths.update(other.paths)
+        for node_id, counts in other.branches.items():
+            self.branches.setdefault(node_id, Counter()).update(counts)
+        self.minutes.extend(other.minutes)
+
+    def summary(self, workflow: Dict) -> Dict[str, Any]:
+        """Coverage, branch and timing statistics for the API"""
+        nodes = workflow.get('nodes', [])
+        runs = self.runs or 1
+
+        coverage = [
+            {
+                'node_id': node['id'],
+                'title': node.get('data', {}).get('title', 'Unknown'),
+                'type': node.get('type', 'unknown'),
+                'runs': self.node_visits.get(node['id'], 0),
+                'rate': round(self.node_visits.get(node['id'], 0) / runs, 4)
+            }
+            for node in nodes
+        ]
+        covered = sum(1 for entry in coverage if entry['runs'])
+
+        titles = {node['id']: node.get('data', {}).get('title', 'Unknown') for node in nodes}
+        branches = []
+        for node_id, counts in self.branches.items():
+            total = counts['TRUE'] + counts['FALSE']
+            branches.append({
+                'node_id': node_id,
+                'title': titles.get(node_id, 'Unknown'),
+                'evaluations': total,
+                'true': counts['TRUE'],
+                'false': counts['FALSE'],
+                'true_probability': round(counts['TRUE'] / total, 4) if total else 0
+            })
+
+        return {
+            'runs': self.runs,
+            'outcomes': dict(self.outcomes),
+            'errors': [{'error': error, 'count': count} for error, count in self.errors.most_common(10)],
+            'coverage': {
+                'covered_nodes': covered,
+                'total_nodes': len(nodes),
+                'coverage_rate': round(covered / len(nodes), 4) if nodes else 0,
+                'nodes': coverage
+            },
+            'paths': {
+                'distinct': len(self.paths),
+                'top': [
+                    {'path': list(path), 'runs': count, 'share': round(count / runs, 4)}
+                    for path, count in self.paths.most_common(TOP_PATHS)
+                ]
+            },
+            'branches': branches,
+            'time_to_completion': self._time_distribution()
+        }
+
+    def _time_distribution(self) -> Dict[str, Any]:
+        values = sorted(self.minutes)
+        if not values:
+            return {'unit': 'minutes', 'count': 0}
+
+        distribution = {
+            'unit': 'minutes',
+            'count': len(values),
+            'min': values[0],
+            'max': values[-1],
+            'mean': round(sum(values) / len(values), 2)
+        }
+        for pct in PERCENTILES:
+            distribution[f'p{pct}'] = _percentile(values, pct)
+
+        low, high = values[0], values[-1]
+        width = (high - low) / HISTOGRAM_BUCKETS if high > low else 1
+        buckets = [0] * (HISTOGRAM_BUCKETS if high > low else 1)
+        for value in values:
+            buckets[min(len(buckets) - 1, int((value - low) / width))] += 1
+        distribution['histogram'] = [
+            {'from': round(low + i * width, 2), 'to': round(low + (i + 1) * width, 2), 'count': count}
+            for i, count in enumerate(buckets)
+        ]
+        return distribution
+
+
+def simulate_chunk(workflow: Dict, contacts: List[Dict], speed_multiplier: int = 1000) -> BatchAggregate:
+    """Simulate one chunk of contacts (runs inside a pool worker)"""
+    simulator = WorkflowSimulator()
+    compiled = simulator.compile(workflow)
+    aggregate = BatchAggregate()
+
+    for contact in contacts:
+        try:
+            result = simulator.simulate(compiled, contact, speed_multiplier, wait=False)
+        except Exception as e:
+            aggregate.add_error(f"{type(e).__name__}: {e}")
+            continue
+        aggregate.add_run(result)
+
+    return aggregate
+
+
+class BatchSimulator:
+    """Runs batch simulations on a shared process pool"""
+
+    def __init__(self, max_workers: int = SIMULATION_WORKERS, chunk_size: int = CHUNK_SIZE):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            # Spawned workers do not inherit the server's threads, locks or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Drop a broken pool (once, however many chunks saw it break)"""
+        if self._executor is executor:
+            logger.warning("Batch simulation pool broke (a worker died); replacing it")
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_chunk(self, workflow: Dict, chunk: List[Dict], speed_multiplier: int) -> BatchAggregate:
+        """
+        Simulate one chunk on the pool
+
+        A worker that dies (killed for memory, crashed) breaks the whole pool;
+        the pool is replaced and the chunk retried once on the new one.
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(simulate_chunk, workflow, chunk, speed_multiplier)
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, simulate_chunk, workflow, chunk, speed_multiplier)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, simulate_chunk, workflow, chunk, speed_multiplier)
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            raise
+
+    async def run(
+        self,
+        workflow: Dict,
+        contacts: List[Dict],
+        speed_multiplier: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Simulate `workflow` for every contact
+
+        Yields a {'type': 'progress'} event as each chunk finishes, then one
+        {'type': 'result', 'data': summary} event. Chunks still queued are
+        cancelled if the consumer stops early (e.g. the client disconnects).
+        """
+        chunks = [contacts[i:i + self.chunk_size] for i in range(0, len(contacts), self.chunk_size)]
+        futures = [
+            asyncio.ensure_future(self._run_chunk(workflow, chunk, speed_multiplier))
+            for chunk in chunks
+        ]
+
+        aggregate = BatchAggregate()
+        started = time.perf_counter()
+
+        try:
+            for next_done in asyncio.as_completed(futures):
+                aggregate.merge(await next_done)
+                yield {
+                    'type': 'progress',
+                    'completed': aggregate.runs,
+                    'total': len(contacts),
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+                }
+        finally:
+            for future in futures:
+                future.cancel()
+
+        summary = aggregate.summary(workflow)
+        summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        summary['workers'] = self.max_workers
+        yield {'type': 'result', 'data': summary}
+
+    async def run_to_completion(
+        self,
+        workflow: Dict,
+        contacts: List[Dict],
+        speed_multiplier: int = 1000
+    ) -> Dict[str, Any]:
+        """run() without progress events; returns the summary"""
+        summary = {}
+        async for event in self.run(workflow, contacts, speed_multiplier):
+            if event['type'] == 'result':
+                summary = event['data']
+        return summary
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
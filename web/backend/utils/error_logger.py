@@ -1,19 +1,152 @@
 """
 Structured Error Logging Utility
 Provides centralized error logging with correlation IDs and context
+
+Log records are handed to a QueueHandler on the request path; JSON
+serialization and handler I/O happen on a background QueueListener thread.
 """
 
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import traceback
 import json
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Union
 from datetime import datetime
 from contextvars import ContextVar
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Context variable for correlation ID (thread-safe)
 correlation_id_var: ContextVar[str] = ContextVar('correlation_id', default='')
 
+# Context variable for the current request path (used for per-route sampling)
+request_path_var: ContextVar[str] = ContextVar('request_path', default='')
+
+# Context may be passed as a dict or as a zero-arg callable that builds it.
+# The callable is only invoked when the record is actually going to be emitted.
+LogContext = Union[Dict[str, Any], Callable[[], Dict[str, Any]], None]
+
+
+def fast_dumps(payload: Dict[str, Any]) -> str:
+    """Serialize a log payload to compact JSON (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(payload, separators=(',', ':'), default=str)
+
+
+class _LazyJSON:
+    """
+    Deferred JSON message. str() is called by the formatter on the
+    listener thread, so serialization cost never lands on the request.
+    """
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return fast_dumps(self.payload)
+
+
+class LogSampler:
+    """
+    Per-route and per-level log sampling.
+
+    Rates are probabilities in [0, 1]. Route rates match by path prefix
+    (longest prefix wins). ERROR and CRITICAL records are never sampled out.
+    """
+
+    def __init__(
+        self,
+        route_rates: Optional[Dict[str, float]] = None,
+        level_rates: Optional[Dict[str, float]] = None
+    ):
+        self.route_rates: Dict[str, float] = {}
+        self.level_rates: Dict[int, float] = {}
+        self._route_cache: Dict[str, float] = {}
+        self.configure(route_rates, level_rates)
+
+    def configure(
+        self,
+        route_rates: Optional[Dict[str, float]] = None,
+        level_rates: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Replace the sampling configuration"""
+        if route_rates is not None:
+            self.route_rates = {
+                route: max(0.0, min(1.0, float(rate)))
+                for route, rate in route_rates.items()
+            }
+        if level_rates is not None:
+            self.level_rates = {
+                logging.getLevelName(level.upper()): max(0.0, min(1.0, float(rate)))
+                for level, rate in level_rates.items()
+            }
+        self._route_cache = {}
+
+    def _rate_for_route(self, path: str) -> float:
+        rate = self._route_cache.get(path)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, prefix_rate in self.route_rates.items():
+                if path.startswith(prefix) and len(prefix) > best:
+                    rate, best = prefix_rate, len(prefix)
+            # Bound the cache so path params can't grow it indefinitely
+            if len(self._route_cache) < 1024:
+                self._route_cache[path] = rate
+        return rate
+
+    def should_log(self, level: int) -> bool:
+        """Decide whether a record at this level on the current route is kept"""
+        if level >= logging.ERROR:
+            return True
+        if not self.route_rates and not self.level_rates:
+            return True
+
+        rate = self.level_rates.get(level, 1.0)
+        path = request_path_var.get()
+        if path and self.route_rates:
+            rate *= self._rate_for_route(path)
+
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        return random.random() < rate
+
+    @staticmethod
+    def parse_rates(spec: str) -> Dict[str, float]:
+        """Parse 'key=rate,key=rate' (e.g. from an environment variable)"""
+        rates: Dict[str, float] = {}
+        for item in (spec or '').split(','):
+            if '=' not in item:
+                continue
+            key, _, value = item.rpartition('=')
+            try:
+                rates[key.strip()] = float(value)
+            except ValueError:
+                continue
+        return rates
+
+
+# Global sampler shared by all structured loggers
+log_sampler = LogSampler()
+
+
 class StructuredLogger:
     """
     Structured logger with correlation ID tracking and context capture
@@ -68,92 +201,212 @@ class StructuredLogger:
 
         return log_entry
 
-    def info(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+    def _enabled(self, level: int) -> bool:
+        """Cheap pre-check: level filter first, then sampling"""
+        return self.logger.isEnabledFor(level) and log_sampler.should_log(level)
+
+    def _emit(
+        self,
+        level: int,
+        message: str,
+        error_type: Optional[str] = None,
+        status_code: Optional[int] = None,
+        context: LogContext = None,
+        stack_trace: Optional[str] = None
+    ) -> None:
+        if callable(context):
+            context = context()
+        log_context = self._build_log_context(
+            message,
+            error_type=error_type,
+            status_code=status_code,
+            context=context,
+            stack_trace=stack_trace
+        )
+        self.logger.log(level, _LazyJSON(log_context))
+
+    def info(self, message: str, context: LogContext = None) -> None:
         """Log info message with context"""
-        log_context = self._build_log_context(message, context=context)
-        self.logger.info(json.dumps(log_context))
+        if self._enabled(logging.INFO):
+            self._emit(logging.INFO, message, context=context)
+
+    def debug(self, message: str, context: LogContext = None) -> None:
+        """Log debug message with context"""
+        if self._enabled(logging.DEBUG):
+            self._emit(logging.DEBUG, message, context=context)
 
-    def warning(self, message: str, error_type: Optional[str] = None, context: Optional[Dict[str, Any]] = None) -> None:
+    def warning(self, message: str, error_type: Optional[str] = None, context: LogContext = None) -> None:
         """Log warning message with context"""
-        log_context = self._build_log_context(message, error_type=error_type, context=context)
-        self.logger.warning(json.dumps(log_context))
+        if self._enabled(logging.WARNING):
+            self._emit(logging.WARNING, message, error_type=error_type, context=context)
 
     def error(
         self,
         message: str,
         error_type: Optional[str] = None,
         status_code: Optional[int] = None,
-        context: Optional[Dict[str, Any]] = None,
+        context: LogContext = None,
         exc_info: bool = False
     ) -> None:
         """Log error message with context and optional stack trace"""
+        if not self._enabled(logging.ERROR):
+            return
         stack_trace = None
         if exc_info:
             stack_trace = traceback.format_exc()
 
-        log_context = self._build_log_context(
+        self._emit(
+            logging.ERROR,
             message,
             error_type=error_type,
             status_code=status_code,
             context=context,
             stack_trace=stack_trace
         )
-        self.logger.error(json.dumps(log_context))
 
     def critical(
         self,
         message: str,
         error_type: Optional[str] = None,
         status_code: Optional[int] = None,
-        context: Optional[Dict[str, Any]] = None,
+        context: LogContext = None,
         exc_info: bool = False
     ) -> None:
         """Log critical error with context and optional stack trace"""
+        if not self._enabled(logging.CRITICAL):
+            return
         stack_trace = None
         if exc_info:
             stack_trace = traceback.format_exc()
 
-        log_context = self._build_log_context(
+        self._emit(
+            logging.CRITICAL,
             message,
             error_type=error_type,
             status_code=status_code,
             context=context,
             stack_trace=stack_trace
         )
-        self.logger.critical(json.dumps(log_context))
 
     def exception(
         self,
         message: str,
         error_type: Optional[str] = None,
         status_code: Optional[int] = None,
-        context: Optional[Dict[str, Any]] = None
+        context: LogContext = None
     ) -> None:
         """Log exception with full context"""
-        stack_trace = traceback.format_exc()
-        log_context = self._build_log_context(
+        if not self._enabled(logging.ERROR):
+            return
+        self._emit(
+            logging.ERROR,
             message,
             error_type=error_type,
             status_code=status_code,
             context=context,
-            stack_trace=stack_trace
+            stack_trace=traceback.format_exc()
         )
-        self.logger.error(json.dumps(log_context))
 
 
-def configure_logging(log_level: str = 'INFO') -> None:
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that defers message formatting to the listener thread.
+
+    The stock QueueHandler formats every record on the calling thread; here
+    only %-style args and exception text (which depend on caller state) are
+    resolved eagerly. Structured payloads stay as _LazyJSON until emitted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block the request path on logging; drop and count instead
+            _queue_stats['dropped'] += 1
+
+
+_queue_stats: Dict[str, int] = {'dropped': 0}
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(
+    log_level: str = 'INFO',
+    use_queue: bool = True,
+    queue_size: int = 10000
+) -> None:
     """
     Configure structured logging for the application
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        use_queue: Route records through a background QueueListener so
+            formatting and handler I/O never run on the request thread
+        queue_size: Max records buffered before new records are dropped
     """
+    global _queue_listener
+
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
         format='%(message)s',  # We're using JSON structured logging
         datefmt='%Y-%m-%dT%H:%M:%SZ'
     )
 
+    log_sampler.configure(
+        route_rates=LogSampler.parse_rates(os.getenv('LOG_SAMPLE_ROUTES', '')),
+        level_rates=LogSampler.parse_rates(os.getenv('LOG_SAMPLE_LEVELS', ''))
+    )
+
+    if not use_queue or _queue_listener is not None:
+        return
+
+    root = logging.getLogger()
+    # Existing handlers keep their formatters; they just run on the listener thread
+    target_handlers = [h for h in root.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    for handler in target_handlers:
+        root.removeHandler(handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    root.addHandler(NonBlockingQueueHandler(log_queue))
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        *target_handlers,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background listener"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    logging.shutdown()
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Return log pipeline statistics (queue depth, dropped records)"""
+    depth = 0
+    if _queue_listener is not None:
+        depth = _queue_listener.queue.qsize()
+    return {
+        'async_pipeline': _queue_listener is not None,
+        'queue_depth': depth,
+        'dropped_records': _queue_stats['dropped'],
+        'serializer': 'orjson' if ORJSON_AVAILABLE else 'json'
+    }
+
 
 # Convenience function to get logger
 def get_logger(name: str) -> StructuredLogger:
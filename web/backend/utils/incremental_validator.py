@@ -0,0 +1,686 @@
+"""
+Incremental Workflow Validation
+Per-session validation state for live editing
+
+The editor sends the full workflow once, then only diffs (added, removed and
+modified nodes and connections). Each session keeps the issue set of its
+workflow, indexed by the inputs every rule reads, and an edit re-runs only the
+rules those inputs feed:
+
+- per-node rules (SMS timing, personalization, unsubscribe, quiet hours,
+  names, contact validation, error paths) for the touched nodes
+- consecutive-node rules for the touched nodes' list neighbours
+- missing-delay for the touched nodes' connections
+- duplicate-action for the title groups the touched nodes enter or leave
+- orphaned-node for connection endpoints and the first node
+- workflow-wide rules from running feature counts, in O(1)
+- infinite-loop from the cyclic strongly connected components, kept up to
+  date per edge: a new edge s->t merges everything in desc(t) & anc(s) into
+  one component, and removing an edge or node re-runs Tarjan only on the
+  component it belonged to
+
+Results are identical to WorkflowValidator.validate on the same workflow
+(benchmarks/check_incremental_validator.py checks this on random edits).
+Every issue has a stable id (rule id plus node/connection key) so clients can
+apply the returned added/resolved changes to their issue list.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+from utils.workflow_graph import WorkflowGraph, connection_endpoints
+from utils.workflow_validator import (
+    FEATURE_KEYS, ValidationIssue, WorkflowValidator, node_features
+)
+
+# Rule ids in WorkflowValidator.validate order; issues are reported in this order
+RULE_ORDER = [
+    'missing-error-handling', 'no-follow-up', 'missing-tracking', 'sms-timing',
+    'duplicate-action', 'infinite-loop', 'orphaned-node', 'missing-personalization',
+    'no-unsubscribe', 'rapid-emails', 'sms-quiet-hours', 'missing-conditions',
+    'too-many-emails', 'no-ab-testing', 'missing-delay', 'unclear-name',
+    'complex-workflow', 'missing-goal', 'no-fallback-channel', 'missing-validation'
+]
+RULE_INDEX = {rule_id: i for i, rule_id in enumerate(RULE_ORDER)}
+
+# Rules that read a single node, with the WorkflowValidator check they reuse
+NODE_RULES = [
+    ('sms-timing', '_check_timing_issues'),
+    ('missing-personalization', '_check_missing_personalization'),
+    ('no-unsubscribe', '_check_no_unsubscribe_link'),
+    ('sms-quiet-hours', '_check_sms_quiet_hours'),
+    ('unclear-name', '_check_unclear_node_names'),
+    ('missing-validation', '_check_missing_contact_validation'),
+]
+
+SEVERITY_STATS = {'error': 'errors', 'warning': 'warnings', 'suggestion': 'suggestions'}
+
+
+def connection_key(conn: Any) -> str:
+    """Stable key of a connection: its id, or source->target[:label]"""
+    if isinstance(conn, str):
+        return conn
+    if conn.get('id'):
+        return str(conn['id'])
+    source, target = connection_endpoints(conn)
+    label = conn.get('label')
+    return f"{source}->{target}:{label}" if label else f"{source}->{target}"
+
+
+class ValidationSession:
+    """Validation state of one workflow, updated one diff at a time"""
+
+    def __init__(self, workflow_id: str, validator: WorkflowValidator = None):
+        self.workflow_id = workflow_id
+        self.validator = validator or WorkflowValidator()
+        self.revision = 0
+        self.last_used = time.time()
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self):
+        # Nodes in list order (dict insertion order) with a position stamp,
+        # plus a linked list for list-order neighbours
+        self.nodes: Dict[str, Dict] = {}
+        self.positions: Dict[str, int] = {}
+        self.prev_node: Dict[str, Optional[str]] = {}
+        self.next_node: Dict[str, Optional[str]] = {}
+        self.head: Optional[str] = None
+        self.tail: Optional[str] = None
+        self._next_position = 0
+
+        # Connections in list order, indexed by endpoint (known or not)
+        self.connections: Dict[str, Dict] = {}
+        self.conn_positions: Dict[str, int] = {}
+        self.out_edges: Dict[str, Dict[str, None]] = {}
+        self.in_edges: Dict[str, Dict[str, None]] = {}
+        self.ref_counts: Dict[str, int] = {}
+        self._next_conn_position = 0
+        # Missing-delay follows list order only while there are no connections
+        self.list_order_delays = True
+
+        self.metadata: Dict[str, Any] = {}
+        self.features: Dict[str, Tuple[str, ...]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(FEATURE_KEYS, 0)
+        self.counts['nodes'] = 0
+        # Action title -> member node ids
+        self.title_groups: Dict[Any, Dict[str, None]] = {}
+        self.action_titles: Dict[str, Any] = {}
+        # Cyclic strongly connected components: id -> members, node -> id
+        self.cycle_members: Dict[int, set] = {}
+        self.cycle_of: Dict[str, int] = {}
+        self.cycle_min: Dict[int, int] = {}
+        self._next_cycle = 0
+        self._cycles_changed = False
+
+        # issue id -> (sort key, issue)
+        self.issues: Dict[str, Tuple[tuple, ValidationIssue]] = {}
+        self.stats = {'errors': 0, 'warnings': 0, 'suggestions': 0}
+        self._changes: Dict[str, Optional[Dict]] = {}
+
+    # Public API
+
+    def load(self, workflow: Dict) -> Dict:
+        """Replace the session's workflow and validate it in full"""
+        with self._lock:
+            self._reset_state()
+            self.metadata = dict(workflow.get('metadata') or {})
+            for node in workflow.get('nodes', []):
+                self._insert_node(node)
+            for conn in workflow.get('connections', []):
+                self._insert_connection(conn)
+            self.list_order_delays = not self.connections
+
+            for node_id in self.nodes:
+                self._evaluate_node(node_id)
+                self._evaluate_pair(node_id)
+                self._evaluate_orphan(node_id)
+            for title in self.title_groups:
+                self._evaluate_duplicates(title)
+            for key in self.connections:
+                self._evaluate_edge(key)
+            self._load_cycles()
+            self._evaluate_aggregates()
+
+            self.revision += 1
+            self.last_used = time.time()
+            self._changes = {}
+            return self.report(include_issues=True)
+
+    def apply(self, diff: Dict, include_issues: bool = False) -> Dict:
+        """
+        Apply an edit and re-evaluate the rules it affects
+
+        Args:
+            diff: {
+                'added_nodes': [node], 'removed_nodes': [node id],
+                'modified_nodes': [node (full replacement, matched by id)],
+                'added_connections': [connection],
+                'removed_connections': [connection or connection id],
+                'metadata': {...} (optional, replaces the metadata)
+            }
+            include_issues: Also return the full, ordered issue list
+
+        Returns:
+            Report with the issues added (or changed) and resolved by this edit
+        """
+        with self._lock:
+            self._changes = {}
+            old_head = self.head
+            self._cycles_changed = False
+
+            for conn in diff.get('removed_connections', []):
+                self._remove_connection(connection_key(conn))
+
+            for node_id in diff.get('removed_nodes', []):
+                self._remove_node(node_id)
+
+            for node in diff.get('modified_nodes', []) + diff.get('added_nodes', []):
+                if node['id'] in self.nodes:
+                    self._update_node(node)
+                else:
+                    self._add_node(node)
+
+            for conn in diff.get('added_connections', []):
+                self._add_connection(conn)
+
+            if 'metadata' in diff:
+                self.metadata = dict(diff['metadata'] or {})
+
+            # Missing-delay switches between connection and list order
+            if self.list_order_delays == bool(self.connections):
+                self.list_order_delays = not self.connections
+                self._reevaluate_delays()
+
+            if self.head != old_head:
+                for node_id in (old_head, self.head):
+                    if node_id in self.nodes:
+                        self._evaluate_orphan(node_id)
+
+            if self._cycles_changed:
+                self._evaluate_loop_issue()
+            self._evaluate_aggregates()
+
+            self.revision += 1
+            self.last_used = time.time()
+            report = self.report(include_issues=include_issues)
+            report['changes'] = self._collect_changes()
+            return report
+
+    def report(self, include_issues: bool = True) -> Dict:
+        """Current validation report (same shape as WorkflowValidator.validate)"""
+        stats = self.stats
+        report = self.validator.summarize(
+            stats['errors'], stats['warnings'], stats['suggestions'], len(self.issues)
+        )
+        report['workflow_id'] = self.workflow_id
+        report['revision'] = self.revision
+        if include_issues:
+            report['issues'] = [
+                self._issue_dict(issue_id, issue)
+                for issue_id, (_, issue) in sorted(self.issues.items(), key=lambda item: item[1][0])
+            ]
+        return report
+
+    def to_workflow(self) -> Dict:
+        """The session's current workflow"""
+        return {
+            'nodes': list(self.nodes.values()),
+            'connections': list(self.connections.values()),
+            'metadata': self.metadata
+        }
+
+    # Structure
+
+    def _insert_node(self, node: Dict):
+        node_id = node['id']
+        self.nodes[node_id] = node
+        self.positions[node_id] = self._next_position
+        self._next_position += 1
+
+        self.prev_node[node_id] = self.tail
+        self.next_node[node_id] = None
+        if self.tail is not None:
+            self.next_node[self.tail] = node_id
+        else:
+            self.head = node_id
+        self.tail = node_id
+
+        self._index_node(node)
+
+    def _index_node(self, node: Dict):
+        node_id = node['id']
+        features = node_features(node)
+        self.features[node_id] = features
+        self.counts['nodes'] += 1
+        for feature in features:
+            self.counts[feature] += 1
+
+        if node.get('type') == 'action':
+            title = node.get('data', {}).get('title', '')
+            self.action_titles[node_id] = title
+            self.title_groups.setdefault(title, {})[node_id] = None
+
+    def _unindex_node(self, node_id: str) -> Any:
+        """Drop a node's feature counts and title group; returns its action title"""
+        self.counts['nodes'] -= 1
+        for feature in self.features.pop(node_id, ()):
+            self.counts[feature] -= 1
+
+        if node_id not in self.action_titles:
+            return None
+        title = self.action_titles.pop(node_id)
+        group = self.title_groups[title]
+        del group[node_id]
+        if not group:
+            del self.title_groups[title]
+        return title
+
+    def _insert_connection(self, conn: Dict) -> str:
+        key = connection_key(conn)
+        if key in self.connections:
+            if conn.get('id'):
+                # Same id: the new connection replaces the old one
+                self._remove_connection(key)
+            else:
+                # Parallel edge without an id
+                base, n = key, 2
+                while key in self.connections:
+                    key = f"{base}#{n}"
+                    n += 1
+        self.connections[key] = conn
+        self.conn_positions[key] = self._next_conn_position
+        self._next_conn_position += 1
+
+        source, target = connection_endpoints(conn)
+        if source:
+            self.out_edges.setdefault(source, {})[key] = None
+            self.ref_counts[source] = self.ref_counts.get(source, 0) + 1
+        if target:
+            self.in_edges.setdefault(target, {})[key] = None
+            self.ref_counts[target] = self.ref_counts.get(target, 0) + 1
+        return key
+
+    def _add_node(self, node: Dict):
+        """Append a node; connections already referring to it become edges"""
+        node_id = node['id']
+        previous = self.tail
+        self._insert_node(node)
+
+        self._evaluate_node(node_id)
+        self._evaluate_orphan(node_id)
+        if node_id in self.action_titles:
+            self._evaluate_duplicates(self.action_titles[node_id])
+        if previous is not None:
+            self._evaluate_pair(previous)
+        self._evaluate_pair(node_id)
+
+        for key in self._incident_edges(node_id):
+            self._evaluate_edge(key)
+            self._edge_added(*connection_endpoints(self.connections[key]))
+
+    def _update_node(self, node: Dict):
+        node_id = node['id']
+        was_action = node_id in self.action_titles
+        old_title = self._unindex_node(node_id)
+        self.nodes[node_id] = node
+        self._index_node(node)
+
+        self._evaluate_node(node_id)
+        self._evaluate_orphan(node_id)
+        if was_action:
+            self._evaluate_duplicates(old_title, node_id)
+        if node_id in self.action_titles and (not was_action or self.action_titles[node_id] != old_title):
+            self._evaluate_duplicates(self.action_titles[node_id])
+        if self.prev_node[node_id] is not None:
+            self._evaluate_pair(self.prev_node[node_id])
+        self._evaluate_pair(node_id)
+        for key in self._incident_edges(node_id):
+            self._evaluate_edge(key)
+
+    def _remove_node(self, node_id: str):
+        if node_id not in self.nodes:
+            return
+
+        was_action = node_id in self.action_titles
+        old_title = self._unindex_node(node_id)
+        del self.nodes[node_id]
+        del self.positions[node_id]
+
+        prev_id = self.prev_node.pop(node_id)
+        next_id = self.next_node.pop(node_id)
+        if prev_id is not None:
+            self.next_node[prev_id] = next_id
+        else:
+            self.head = next_id
+        if next_id is not None:
+            self.prev_node[next_id] = prev_id
+        else:
+            self.tail = prev_id
+
+        for rule_id in RULE_ORDER:
+            self._set_issue(f"{rule_id}:{node_id}", None)
+        if was_action:
+            self._evaluate_duplicates(old_title)
+        if prev_id is not None:
+            self._evaluate_pair(prev_id)
+        for key in self._incident_edges(node_id):
+            self._evaluate_edge(key)
+        if node_id in self.cycle_of:
+            self._split_cycle(self.cycle_of[node_id])
+
+    def _add_connection(self, conn: Dict):
+        key = self._insert_connection(conn)
+        source, target = connection_endpoints(conn)
+
+        self._evaluate_edge(key)
+        for node_id in (source, target):
+            if node_id in self.nodes:
+                self._evaluate_orphan(node_id)
+        if source in self.nodes:
+            self._evaluate_node(source)
+        self._edge_added(source, target)
+
+    def _remove_connection(self, key: str):
+        conn = self.connections.pop(key, None)
+        if conn is None:
+            return
+        del self.conn_positions[key]
+
+        source, target = connection_endpoints(conn)
+        for node_id, edges in ((source, self.out_edges), (target, self.in_edges)):
+            if not node_id:
+                continue
+            edges[node_id].pop(key, None)
+            if not edges[node_id]:
+                del edges[node_id]
+            self.ref_counts[node_id] -= 1
+            if not self.ref_counts[node_id]:
+                del self.ref_counts[node_id]
+
+        self._set_issue(f"missing-delay:{key}", None)
+        for node_id in (source, target):
+            if node_id in self.nodes:
+                self._evaluate_orphan(node_id)
+        if source in self.nodes:
+            self._evaluate_node(source)
+        cycle = self.cycle_of.get(source)
+        if cycle is not None and cycle == self.cycle_of.get(target):
+            self._split_cycle(cycle)
+
+    def _incident_edges(self, node_id: str) -> List[str]:
+        return list(self.out_edges.get(node_id, ())) + list(self.in_edges.get(node_id, ()))
+
+    # Rule evaluation
+
+    def _evaluate_node(self, node_id: str):
+        """Rules that read one node (and its outgoing labels)"""
+        node = self.nodes[node_id]
+        position = self.positions[node_id]
+        validator = self.validator
+
+        labels = {
+            str(self.connections[key].get('label', '')).lower()
+            for key in self.out_edges.get(node_id, ())
+        }
+        self._set_issue(
+            f"missing-error-handling:{node_id}", validator._missing_error_handling_issue(node, labels), (position,)
+        )
+
+        for rule_id, check in NODE_RULES:
+            found = getattr(validator, check)([node])
+            self._set_issue(f"{rule_id}:{node_id}", found[0] if found else None, (position,))
+
+    def _evaluate_pair(self, node_id: str):
+        """Rules over a node and the next node in list order"""
+        next_id = self.next_node[node_id]
+        position = (self.positions[node_id],)
+        if next_id is None:
+            self._set_issue(f"rapid-emails:{node_id}", None)
+            if self.list_order_delays:
+                self._set_issue(f"missing-delay:{node_id}", None)
+            return
+
+        curr, next_node = self.nodes[node_id], self.nodes[next_id]
+        found = self.validator._check_poor_email_timing([curr, next_node])
+        self._set_issue(f"rapid-emails:{node_id}", found[0] if found else None, position)
+        if self.list_order_delays:
+            self._set_issue(
+                f"missing-delay:{node_id}", self.validator._missing_delay_issue(curr, next_node), position
+            )
+
+    def _evaluate_edge(self, key: str):
+        """Missing-delay for one connection (connection mode only)"""
+        conn = self.connections.get(key)
+        if conn is None:
+            return
+        source, target = connection_endpoints(conn)
+        issue = None
+        if source in self.nodes and target in self.nodes:
+            issue = self.validator._missing_delay_issue(self.nodes[source], self.nodes[target])
+        sort_key = (self.positions.get(source, -1), self.conn_positions[key])
+        self._set_issue(f"missing-delay:{key}", issue, sort_key)
+
+    def _reevaluate_delays(self):
+        for issue_id in [i for i in self.issues if i.startswith('missing-delay:')]:
+            self._set_issue(issue_id, None)
+        if not self.list_order_delays:
+            for key in self.connections:
+                self._evaluate_edge(key)
+        else:
+            for node_id in self.nodes:
+                self._evaluate_pair(node_id)
+
+    def _evaluate_orphan(self, node_id: str):
+        node = self.nodes[node_id]
+        issue = None
+        if node_id != self.head and not self.ref_counts.get(node_id):
+            issue = self.validator._orphaned_node_issue(node)
+        self._set_issue(f"orphaned-node:{node_id}", issue, (self.positions[node_id],))
+
+    def _evaluate_duplicates(self, title: Any, leaving: str = None):
+        """Duplicate-action issues of one title group; `leaving` was just re-indexed"""
+        if leaving is not None and leaving not in self.title_groups.get(title, ()):
+            self._set_issue(f"duplicate-action:{leaving}", None)
+        members = self.title_groups.get(title)
+        if not members:
+            return
+
+        ordered = sorted(members, key=self.positions.__getitem__)
+        first = ordered[0]
+        self._set_issue(f"duplicate-action:{first}", None)
+        for node_id in ordered[1:]:
+            self._set_issue(
+                f"duplicate-action:{node_id}",
+                self.validator._duplicate_action_issue(self.nodes[node_id], first),
+                (self.positions[node_id],)
+            )
+
+    def _evaluate_aggregates(self):
+        """Workflow-wide rules, from the running feature counts"""
+        validator = self.validator
+        counts = self.counts
+        single = [self.nodes[self.head]] if counts['nodes'] == 1 else []
+
+        for rule_id, found in (
+            ('no-follow-up', validator._check_no_follow_up_actions(single, [])),
+            ('missing-tracking', validator._check_missing_tracking(counts)),
+            ('missing-conditions', validator._check_missing_conditions(counts)),
+            ('too-many-emails', validator._check_too_many_emails(counts)),
+            ('no-ab-testing', validator._check_no_ab_testing(counts)),
+            ('complex-workflow', validator._check_complex_workflow(counts)),
+            ('missing-goal', validator._check_missing_goal_tracking(self.metadata, counts)),
+            ('no-fallback-channel', validator._check_no_fallback_channel(counts)),
+        ):
+            self._set_issue(rule_id, found[0] if found else None)
+
+    # Cycles
+
+    def _load_cycles(self):
+        """Cyclic components of the whole graph (Tarjan over a WorkflowGraph)"""
+        workflow = self.to_workflow()
+        graph = WorkflowGraph(workflow['nodes'], workflow['connections'])
+        for component in graph.cycles():
+            self._add_cycle([graph.node_ids[i] for i in component])
+        self._evaluate_loop_issue()
+
+    def _add_cycle(self, members: List[str]):
+        cycle = self._next_cycle
+        self._next_cycle += 1
+        self.cycle_members[cycle] = set(members)
+        self.cycle_min[cycle] = min(self.positions[node_id] for node_id in members)
+        for node_id in members:
+            self.cycle_of[node_id] = cycle
+        self._cycles_changed = True
+
+    def _drop_cycle(self, cycle: int) -> set:
+        members = self.cycle_members.pop(cycle)
+        del self.cycle_min[cycle]
+        for node_id in members:
+            del self.cycle_of[node_id]
+        self._cycles_changed = True
+        return members
+
+    def _edge_added(self, source: str, target: str):
+        """
+        Merge components closed by a new edge source -> target
+
+        With the edge in place, the component containing it is exactly the
+        nodes reachable from target that also reach source.
+        """
+        if source not in self.nodes or target not in self.nodes:
+            return
+        cycle = self.cycle_of.get(source)
+        if cycle is not None and cycle == self.cycle_of.get(target):
+            return
+
+        descendants = self._reachable(target, self.out_edges, 1)
+        if source not in descendants:
+            return
+        component = self._reachable(source, self.in_edges, 0, within=descendants)
+
+        for cycle in {self.cycle_of[node_id] for node_id in component if node_id in self.cycle_of}:
+            self._drop_cycle(cycle)
+        self._add_cycle(list(component))
+
+    def _split_cycle(self, cycle: int):
+        """Re-run Tarjan on one component after an edge or node left it"""
+        members = sorted(
+            (node_id for node_id in self._drop_cycle(cycle) if node_id in self.nodes),
+            key=self.positions.__getitem__
+        )
+        member_set = set(members)
+        connections = [
+            self.connections[key]
+            for node_id in members
+            for key in self.out_edges.get(node_id, ())
+            if connection_endpoints(self.connections[key])[1] in member_set
+        ]
+        graph = WorkflowGraph([self.nodes[node_id] for node_id in members], connections)
+        for component in graph.cycles():
+            self._add_cycle([graph.node_ids[i] for i in component])
+
+    def _reachable(self, start: str, edges: Dict[str, Dict[str, None]], end: int, within: set = None) -> set:
+        """Nodes reachable from `start` along `edges` (out_edges: end=1, in_edges: end=0)"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            node_id = stack.pop()
+            for key in edges.get(node_id, ()):
+                other = connection_endpoints(self.connections[key])[end]
+                if other in self.nodes and other not in seen and (within is None or other in within):
+                    seen.add(other)
+                    stack.append(other)
+        return seen
+
+    def _evaluate_loop_issue(self):
+        """Infinite-loop issue for the component holding the earliest node"""
+        issue = None
+        if self.cycle_min:
+            cycle = min(self.cycle_min, key=self.cycle_min.__getitem__)
+            members = sorted(self.cycle_members[cycle], key=self.positions.__getitem__)
+            issue = self.validator._infinite_loop_issue(members)
+        self._set_issue('infinite-loop', issue)
+
+    # Issue bookkeeping
+
+    def _set_issue(self, issue_id: str, issue: Optional[ValidationIssue], sort_key: tuple = ()):
+        current = self.issues.get(issue_id)
+        if current is None and issue is None:
+            return
+
+        if issue_id not in self._changes:
+            self._changes[issue_id] = current[1].to_dict() if current else None
+
+        if current is not None:
+            self.stats[SEVERITY_STATS[current[1].severity]] -= 1
+        if issue is None:
+            del self.issues[issue_id]
+            return
+
+        self.issues[issue_id] = ((RULE_INDEX[issue.rule_id],) + sort_key, issue)
+        self.stats[SEVERITY_STATS[issue.severity]] += 1
+
+    def _collect_changes(self) -> Dict[str, List]:
+        added, resolved = [], []
+        for issue_id, before in self._changes.items():
+            current = self.issues.get(issue_id)
+            if current is None:
+                if before is not None:
+                    resolved.append(issue_id)
+            elif current[1].to_dict() != before:
+                added.append(self._issue_dict(issue_id, current[1]))
+        self._changes = {}
+        return {'added': added, 'resolved': resolved}
+
+    @staticmethod
+    def _issue_dict(issue_id: str, issue: ValidationIssue) -> Dict:
+        data = issue.to_dict()
+        data['id'] = issue_id
+        return data
+
+
+class ValidationSessionStore:
+    """LRU of validation sessions keyed by workflow ID, with idle expiry"""
+
+    def __init__(self, max_sessions: int = 256, ttl_seconds: int = 3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, ValidationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.validator = WorkflowValidator()
+
+    def get(self, workflow_id: str) -> Optional[ValidationSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(workflow_id)
+            if session is not None:
+                self._sessions.move_to_end(workflow_id)
+            return session
+
+    def start(self, workflow_id: str, workflow: Dict) -> Dict:
+        """Create (or reset) the session for a workflow and validate it in full"""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(workflow_id)
+            if session is None:
+                session = ValidationSession(workflow_id, self.validator)
+                self._sessions[workflow_id] = session
+            self._sessions.move_to_end(workflow_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session.load(workflow)
+
+    def end(self, workflow_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(workflow_id, None) is not None
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        for workflow_id in [w for w, s in self._sessions.items() if s.last_used < cutoff]:
+            del self._sessions[workflow_id]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
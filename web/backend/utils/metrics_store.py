@@ -0,0 +1,110 @@
+"""
+Shared Metrics Store
+SQLite (WAL) database that lets multiple uvicorn workers share metrics state
+
+With METRICS_BACKEND=sqlite, workflow executions, alerts and request latency
+samples are written to one database file that every worker reads, so any
+worker answers dashboard queries with the same, global numbers. WAL mode lets
+readers proceed while a writer commits; writers only hold the lock for short
+single-statement or batched transactions.
+
+The default backend ("memory") keeps the original per-process objects.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+METRICS_BACKEND = os.getenv('METRICS_BACKEND', 'memory').lower()
+
+DB_PATH = Path(os.getenv(
+    'METRICS_DB_PATH',
+    str(Path(__file__).resolve().parent.parent / 'database' / 'metrics.db')
+))
+
+_thread_local = threading.local()
+_schema_lock = threading.Lock()
+_initialized_paths = set()
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS active_executions (
+        execution_id TEXT PRIMARY KEY,
+        payload TEXT NOT NULL
+    );
+
+    -- Append-only log of completed executions; workers tail it by seq
+    CREATE TABLE IF NOT EXISTS execution_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        execution_id TEXT NOT NULL,
+        workflow_id TEXT NOT NULL,
+        started_at TEXT NOT NULL,
+        payload TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_execution_log_started ON execution_log(started_at);
+
+    CREATE TABLE IF NOT EXISTS alerts (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        rule_id TEXT,
+        fingerprint TEXT NOT NULL,
+        alert_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        message TEXT NOT NULL,
+        workflow_id TEXT,
+        workflow_name TEXT,
+        metadata TEXT,
+        created_at TEXT NOT NULL,
+        acknowledged INTEGER NOT NULL DEFAULT 0,
+        acknowledged_at TEXT,
+        occurrences INTEGER NOT NULL DEFAULT 1,
+        last_seen_at TEXT NOT NULL
+    );
+    -- At most one open alert per fingerprint, across all workers
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_open_fingerprint
+        ON alerts(fingerprint) WHERE acknowledged = 0;
+    CREATE INDEX IF NOT EXISTS idx_alerts_workflow ON alerts(workflow_id, seq);
+    CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts(severity, seq);
+    CREATE INDEX IF NOT EXISTS idx_alerts_acknowledged ON alerts(acknowledged, seq);
+    CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts(created_at);
+
+    CREATE TABLE IF NOT EXISTS alert_fires (
+        fingerprint TEXT PRIMARY KEY,
+        last_fired REAL NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS request_samples (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        endpoint TEXT NOT NULL,
+        duration_ms REAL NOT NULL,
+        timestamp REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_request_samples_endpoint ON request_samples(endpoint, id);
+"""
+
+
+def shared_metrics_enabled() -> bool:
+    """Whether metrics state should live in the shared database"""
+    return METRICS_BACKEND == 'sqlite'
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's connection to the shared metrics database
+
+    Connections are reused per thread; the schema is created once per process.
+    """
+    conn = getattr(_thread_local, 'conn', None)
+    if conn is None or getattr(_thread_local, 'path', None) != str(DB_PATH):
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 30000")
+        with _schema_lock:
+            if str(DB_PATH) not in _initialized_paths:
+                conn.executescript(SCHEMA)
+                _initialized_paths.add(str(DB_PATH))
+        _thread_local.conn = conn
+        _thread_local.path = str(DB_PATH)
+    return conn
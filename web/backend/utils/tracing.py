@@ -0,0 +1,393 @@
+"""
+Request-Scoped Tracing
+Lightweight nested spans keyed by the request correlation ID
+
+Spans are tracked with contextvars, so nesting works across sync code and
+async tasks without passing span objects around. The trace ID is derived
+from correlation_id_var, which LoggingMiddleware sets for every request.
+Finished traces are kept in-process (recent + slowest) and optionally
+exported as OTLP/JSON to a local NDJSON file or an OTLP HTTP collector.
+"""
+
+import os
+import json
+import time
+import uuid
+import heapq
+import queue
+import random
+import hashlib
+import logging
+import functools
+import threading
+import inspect
+from pathlib import Path
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Callable
+
+from utils.error_logger import correlation_id_var
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'brobro-backend'
+
+
+class Span:
+    """A single timed operation within a trace"""
+
+    __slots__ = (
+        'name', 'trace', 'span_id', 'parent_id', 'attributes',
+        'start_ns', 'end_ns', 'error'
+    )
+
+    def __init__(self, name: str, trace: 'Trace', parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'startTime': self.start_ns / 1e9,
+            'durationMs': round(self.duration_ms, 3),
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON span"""
+        otlp = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or self.start_ns),
+            'attributes': [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            'status': {'code': 2, 'message': self.error} if self.error else {'code': 1}
+        }
+        if self.parent_id:
+            otlp['parentSpanId'] = self.parent_id
+        return otlp
+
+
+class Trace:
+    """All spans recorded for one request / correlation ID"""
+
+    __slots__ = ('trace_id', 'correlation_id', 'spans', 'root')
+
+    def __init__(self, correlation_id: str):
+        self.correlation_id = correlation_id
+        self.trace_id = _trace_id_for(correlation_id)
+        self.spans: List[Span] = []
+        self.root: Optional[Span] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms if self.root else 0.0
+
+    def to_dict(self, include_spans: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        result = {
+            'traceId': self.trace_id,
+            'correlationId': self.correlation_id,
+            'name': self.root.name if self.root else None,
+            'attributes': self.root.attributes if self.root else {},
+            'durationMs': round(self.duration_ms, 3),
+            'spanCount': len(self.spans)
+        }
+        if include_spans:
+            result['spans'] = [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start_ns)]
+        return result
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON ExportTraceServiceRequest"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', SERVICE_NAME)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'brobro.tracing'},
+                    'spans': [span.to_otlp() for span in self.spans]
+                }]
+            }]
+        }
+
+
+def _trace_id_for(correlation_id: str) -> str:
+    """Map a correlation ID to a 32-hex-char OTLP trace ID"""
+    compact = correlation_id.replace('-', '').lower()
+    if len(compact) == 32 and all(c in '0123456789abcdef' for c in compact):
+        return compact
+    return hashlib.md5(correlation_id.encode('utf-8')).hexdigest()
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class FileSpanExporter:
+    """Append one OTLP/JSON document per finished trace to an NDJSON file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, traces: List[Trace]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for trace in traces:
+                f.write(json.dumps(trace.to_otlp(), separators=(',', ':')) + '\n')
+
+
+class OTLPHttpExporter:
+    """POST finished traces to an OTLP/HTTP collector (JSON encoding)"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+        self.endpoint = endpoint.rstrip('/')
+        if not self.endpoint.endswith('/v1/traces'):
+            self.endpoint += '/v1/traces'
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, traces: List[Trace]) -> None:
+        resource_spans = []
+        for trace in traces:
+            resource_spans.extend(trace.to_otlp()['resourceSpans'])
+        self.client.post(self.endpoint, json={'resourceSpans': resource_spans})
+
+
+class _BackgroundExporter:
+    """Batches finished traces and hands them to an exporter on a daemon thread"""
+
+    def __init__(self, exporter, max_queue: int = 2048, batch_size: int = 64, interval_s: float = 1.0):
+        self.exporter = exporter
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.interval_s = interval_s
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+        self._thread.start()
+
+    def submit(self, trace: Trace) -> None:
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = []
+            try:
+                batch.append(self.queue.get(timeout=self.interval_s))
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                continue
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                logger.warning(f"Trace export failed ({len(batch)} traces): {e}")
+
+
+# Marker stored in the context when the current trace was not sampled
+_NOT_SAMPLED = object()
+
+_current_span_var: ContextVar[Any] = ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """
+    Creates spans, applies head sampling and retains finished traces
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        max_recent: int = 200,
+        max_slowest: int = 50,
+        exporter=None
+    ):
+        self.sample_rate = sample_rate
+        self.max_slowest = max_slowest
+        self.recent: deque = deque(maxlen=max_recent)
+        self._slowest: List[tuple] = []  # min-heap of (duration_ms, seq, trace)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._exporter = _BackgroundExporter(exporter) if exporter else None
+        self.traces_finished = 0
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Start a span as a child of the current one; returns (span, token)"""
+        parent = _current_span_var.get()
+        if parent is _NOT_SAMPLED:
+            return None, None
+
+        if parent is None:
+            # New root span: head-based sampling decision for the whole trace
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return None, _current_span_var.set(_NOT_SAMPLED)
+            correlation_id = correlation_id_var.get() or uuid.uuid4().hex
+            trace = Trace(correlation_id)
+            span = Span(name, trace, None, dict(attributes or {}))
+            trace.root = span
+        else:
+            span = Span(name, parent.trace, parent.span_id, dict(attributes or {}))
+
+        span.trace.spans.append(span)
+        return span, _current_span_var.set(span)
+
+    def end_span(self, span: Optional[Span], token, error: Optional[BaseException] = None) -> None:
+        """End a span started with start_span and restore the parent"""
+        if token is not None:
+            _current_span_var.reset(token)
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if span.trace.root is span:
+            self._finish_trace(span.trace)
+
+    def _finish_trace(self, trace: Trace) -> None:
+        with self._lock:
+            self.traces_finished += 1
+            self.recent.append(trace)
+            self._seq += 1
+            entry = (trace.duration_ms, self._seq, trace)
+            if len(self._slowest) < self.max_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+        if self._exporter:
+            self._exporter.submit(trace)
+
+    def get_slowest_traces(self, limit: int = 20, include_spans: bool = True) -> List[Dict[str, Any]]:
+        """Slowest finished traces, slowest first"""
+        with self._lock:
+            entries = sorted(self._slowest, key=lambda e: e[0], reverse=True)[:limit]
+        return [trace.to_dict(include_spans) for _, _, trace in entries]
+
+    def get_recent_traces(self, limit: int = 20, include_spans: bool = False) -> List[Dict[str, Any]]:
+        """Most recently finished traces, newest first"""
+        with self._lock:
+            traces = list(self.recent)[-limit:]
+        return [trace.to_dict(include_spans) for trace in reversed(traces)]
+
+    def get_trace(self, trace_or_correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a retained trace by trace ID or correlation ID"""
+        with self._lock:
+            candidates = list(self.recent) + [entry[2] for entry in self._slowest]
+        for trace in candidates:
+            if trace_or_correlation_id in (trace.trace_id, trace.correlation_id):
+                return trace.to_dict()
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tracer configuration and counters"""
+        return {
+            'sample_rate': self.sample_rate,
+            'traces_finished': self.traces_finished,
+            'retained_recent': len(self.recent),
+            'retained_slowest': len(self._slowest),
+            'exporter': type(self._exporter.exporter).__name__ if self._exporter else None,
+            'export_dropped': self._exporter.dropped if self._exporter else 0
+        }
+
+
+@contextmanager
+def trace_span(name: str, **attributes):
+    """
+    Context manager recording a span around a block.
+
+    Usage:
+        with trace_span('claude.messages.create', model=model) as span:
+            ...
+            if span: span.set_attribute('output_tokens', n)
+    """
+    span, token = tracer.start_span(name, attributes)
+    try:
+        yield span
+    except BaseException as e:
+        tracer.end_span(span, token, error=e)
+        raise
+    else:
+        tracer.end_span(span, token)
+
+
+def traced(name: Optional[str] = None, **attributes) -> Callable:
+    """Decorator recording a span around a sync or async function"""
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """Return the active span, if any"""
+    span = _current_span_var.get()
+    return None if span is _NOT_SAMPLED else span
+
+
+def _build_tracer() -> Tracer:
+    """Create the global tracer from environment configuration"""
+    try:
+        sample_rate = float(os.getenv('TRACE_SAMPLE_RATE', '1.0'))
+    except ValueError:
+        sample_rate = 1.0
+
+    exporter = None
+    export_mode = os.getenv('TRACE_EXPORT', 'none').lower()
+    try:
+        if export_mode == 'file':
+            default_path = Path(__file__).parent.parent / 'logs' / 'traces.ndjson'
+            exporter = FileSpanExporter(os.getenv('TRACE_EXPORT_PATH', str(default_path)))
+        elif export_mode == 'otlp':
+            exporter = OTLPHttpExporter(os.getenv('TRACE_OTLP_ENDPOINT', 'http://localhost:4318'))
+    except Exception as e:
+        logger.warning(f"Trace exporter '{export_mode}' unavailable: {e}")
+
+    return Tracer(sample_rate=max(0.0, min(1.0, sample_rate)), exporter=exporter)
+
+
+# Global tracer instance
+tracer = _build_tracer()
@@ -0,0 +1,163 @@
+"""
+Workflow Graph Index
+Adjacency, degree, topological order and strongly connected components for a
+workflow's nodes/connections, built once and shared by validation rules
+
+Connections may use either 'source'/'target' or 'from'/'to' keys. Edges that
+reference unknown node IDs are kept in the raw endpoint sets (so "is this node
+mentioned by any connection" still works) but are left out of the adjacency.
+All traversals are iterative, so very long chains do not hit Python's
+recursion limit.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def connection_endpoints(conn: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """(source, target) of a connection in either key format"""
+    return (conn.get('from') or conn.get('source'), conn.get('to') or conn.get('target'))
+
+
+class WorkflowGraph:
+    """Indexed view of a workflow graph; O(V + E) to build"""
+
+    def __init__(self, nodes: List[Dict], connections: List[Dict]):
+        self.nodes = nodes
+        self.connections = connections
+        self.node_ids: List[str] = [node['id'] for node in nodes]
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+
+        n = len(nodes)
+        self.successors: List[List[int]] = [[] for _ in range(n)]
+        self.predecessors: List[List[int]] = [[] for _ in range(n)]
+        # Lower-cased connection labels leaving each node
+        self.out_labels: List[Set[str]] = [set() for _ in range(n)]
+        self.in_degree: List[int] = [0] * n
+        # Every node ID mentioned as an endpoint, known or not
+        self.referenced: Set[str] = set()
+
+        for conn in connections:
+            source, target = connection_endpoints(conn)
+            if source:
+                self.referenced.add(source)
+            if target:
+                self.referenced.add(target)
+
+            s = self.index.get(source)
+            if s is None:
+                continue
+            self.out_labels[s].add(str(conn.get('label', '')).lower())
+
+            t = self.index.get(target)
+            if t is None:
+                continue
+            self.successors[s].append(t)
+            self.predecessors[t].append(s)
+            self.in_degree[t] += 1
+
+        self._topological_order: Optional[List[int]] = None
+        self._sccs: Optional[List[List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def node(self, i: int) -> Dict:
+        return self.nodes[i]
+
+    def out_degree(self, i: int) -> int:
+        return len(self.successors[i])
+
+    @property
+    def topological_order(self) -> List[int]:
+        """
+        Kahn's algorithm over node indexes
+
+        Nodes on cycles (and anything only reachable through them) are
+        missing, so len(order) < len(graph) means the graph is cyclic.
+        """
+        if self._topological_order is None:
+            in_degree = list(self.in_degree)
+            order = [i for i, d in enumerate(in_degree) if d == 0]
+            head = 0
+            while head < len(order):
+                for t in self.successors[order[head]]:
+                    in_degree[t] -= 1
+                    if in_degree[t] == 0:
+                        order.append(t)
+                head += 1
+            self._topological_order = order
+        return self._topological_order
+
+    @property
+    def is_acyclic(self) -> bool:
+        return len(self.topological_order) == len(self.node_ids)
+
+    @property
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's SCC algorithm (iterative); components in reverse topological order"""
+        if self._sccs is None:
+            self._sccs = self._tarjan()
+        return self._sccs
+
+    def _tarjan(self) -> List[List[int]]:
+        n = len(self.node_ids)
+        index_of = [-1] * n
+        lowlink = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index_of[root] != -1:
+                continue
+
+            # Work stack of (node, position in its successor list)
+            work = [(root, 0)]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                v, pos = work[-1]
+                successors = self.successors[v]
+
+                if pos < len(successors):
+                    work[-1] = (v, pos + 1)
+                    w = successors[pos]
+                    if index_of[w] == -1:
+                        index_of[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w] and index_of[w] < lowlink[v]:
+                        lowlink[v] = index_of[w]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[v] < lowlink[parent]:
+                        lowlink[parent] = lowlink[v]
+
+                if lowlink[v] == index_of[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+
+        return components
+
+    def cycles(self) -> List[List[int]]:
+        """SCCs that contain a cycle (size > 1, or a self-loop), each sorted by node order"""
+        return [
+            sorted(component)
+            for component in self.strongly_connected_components
+            if len(component) > 1 or component[0] in self.successors[component[0]]
+        ]
@@ -1,35 +1,172 @@
 """
 Workflow Simulator - Enhancement 5
 Simulates workflow execution with mock contact data for testing
+
+Workflows are compiled once into a CompiledWorkflow (node-id map, outgoing
+edge lists, pre-parsed condition labels; message templates and condition
+builder rules from the shared expression compiler), so
+each simulated step is a constant number of dict lookups regardless of how
+many nodes and connections the workflow has.
 """
 
 import re
 import time
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+from workflow_features.expressions import (
+    CompiledConditionGroup,
+    CompiledTemplate,
+    compile_condition_group,
+    compile_template
+)
+
+# {{ variable }} token; names are case-insensitive
+TEMPLATE_VARIABLE = re.compile(r'\{\{\s*([\w.]+)\s*\}\}')
+
+# Condition connection labels for the TRUE / FALSE branches
+TRUE_LABEL_WORDS = ('yes', 'true', 'success', 'valid')
+FALSE_LABEL_WORDS = ('no', 'false', 'fail', 'invalid')
+
+
+def compile_node_conditions(node: Dict) -> Optional[CompiledConditionGroup]:
+    """
+    Rule list of a condition node built with the condition builder
+
+    Rules ({"field": "contact.email", "operator": ..., "value": ...}) and
+    logicOperator may sit on the node or in its data. None if the node has no
+    rules and uses a built-in condition_type instead.
+    """
+    node_data = node.get('data', {})
+    rules = node_data.get('conditions', node.get('conditions'))
+    if not isinstance(rules, list) or not rules:
+        return None
+    logic = node_data.get('logicOperator', node.get('logicOperator', 'and'))
+    return compile_condition_group(rules, logic)
+
+
+class CompiledWorkflow:
+    """
+    A workflow indexed for simulation
+
+    Built once per workflow definition (O(nodes + connections)); reuse it
+    across simulate() calls to skip recompiling.
+    """
+
+    def __init__(self, workflow: Dict):
+        self.workflow = workflow
+        self.nodes: List[Dict] = workflow.get('nodes', [])
+        self.start: Optional[Dict] = self.nodes[0] if self.nodes else None
+
+        # First node wins for duplicate ids
+        self.node_map: Dict[str, Dict] = {}
+        for node in self.nodes:
+            self.node_map.setdefault(node['id'], node)
+
+        # node id -> targets of its outgoing connections, in connection order
+        self.outgoing: Dict[str, List[Optional[str]]] = {}
+        # node id -> target of its first TRUE / FALSE labeled connection
+        self.true_targets: Dict[str, Optional[str]] = {}
+        self.false_targets: Dict[str, Optional[str]] = {}
+
+        for conn in workflow.get('connections', []):
+            target = conn.get('to') or conn.get('target')
+            label = str(conn.get('label', '')).lower()
+            is_true = bool(label) and any(word in label for word in TRUE_LABEL_WORDS)
+            is_false = bool(label) and any(word in label for word in FALSE_LABEL_WORDS)
+
+            sources = (conn.get('from'), conn.get('source'))
+            for i, source in enumerate(sources):
+                if source is None or (i == 1 and source == sources[0]):
+                    continue
+                self.outgoing.setdefault(source, []).append(target)
+                if is_true:
+                    self.true_targets.setdefault(source, target)
+                if is_false:
+                    self.false_targets.setdefault(source, target)
+
+        # Action node id -> (message, subject) templates, tokenized on first use
+        self.templates: Dict[str, Tuple[CompiledTemplate, CompiledTemplate]] = {}
+        # Condition node id -> compiled rule group (None: built-in condition_type)
+        self.condition_groups: Dict[str, Optional[CompiledConditionGroup]] = {}
+
+        self.total_time_simulated: Optional[str] = None
+
+    def templates_for(self, node: Dict) -> Tuple[CompiledTemplate, CompiledTemplate]:
+        """(message, subject) templates of an action node"""
+        templates = self.templates.get(node['id'])
+        if templates is None:
+            node_data = node.get('data', {})
+            templates = (
+                compile_template(node_data.get('message', ''), ignore_case=True, token=TEMPLATE_VARIABLE),
+                compile_template(node_data.get('subject', ''), ignore_case=True, token=TEMPLATE_VARIABLE)
+            )
+            self.templates[node['id']] = templates
+        return templates
+
+    def condition_group_for(self, node: Dict) -> Optional[CompiledConditionGroup]:
+        """Compiled rules of a condition node, if it has any"""
+        node_id = node['id']
+        if node_id not in self.condition_groups:
+            self.condition_groups[node_id] = compile_node_conditions(node)
+        return self.condition_groups[node_id]
+
+    def next_node_id(self, node: Dict, condition_result: Optional[bool] = None) -> Optional[str]:
+        """
+        Next node after `node`
+
+        Condition nodes follow the first connection labeled for their result;
+        without one, TRUE takes the first connection and FALSE the second (or
+        the first, if there is only one). Other nodes follow their first
+        connection.
+        """
+        node_id = node['id']
+        targets = self.outgoing.get(node_id)
+        if not targets:
+            return None
+
+        if node.get('type') == 'condition':
+            labeled = self.true_targets if condition_result else self.false_targets
+            if node_id in labeled:
+                return labeled[node_id]
+            if not condition_result and len(targets) > 1:
+                return targets[1]
+
+        return targets[0]
+
 
 class WorkflowSimulator:
     """
     Simulates workflow execution step-by-step with mock contact data
+
+    simulate() keeps its state in locals, so one instance can serve
+    concurrent requests; execution_log holds the most recent run's log.
     """
 
     def __init__(self):
         self.execution_log = []
 
+    def compile(self, workflow: Dict) -> CompiledWorkflow:
+        """Index a workflow once for repeated simulation"""
+        return CompiledWorkflow(workflow)
+
     def simulate(
         self,
-        workflow: Dict,
+        workflow: Union[Dict, CompiledWorkflow],
         mock_contact: Dict,
-        speed_multiplier: int = 1000  # 1000x = 1 day → 86 seconds
+        speed_multiplier: int = 1000,  # 1000x = 1 day → 86 seconds
+        wait: bool = True
     ) -> Dict:
         """
         Simulate workflow execution step-by-step
 
         Args:
-            workflow: Workflow definition with nodes and connections
+            workflow: Workflow definition with nodes and connections, or a
+                CompiledWorkflow from compile()
             mock_contact: Mock contact persona data
             speed_multiplier: Time acceleration (1000 = 1 day → 86s)
+            wait: Actually sleep through (fast-forwarded) delays; batch runs
+                pass False
 
         Returns:
             {
@@ -39,18 +176,17 @@ class WorkflowSimulator:
                 'final_state': dict
             }
         """
-        self.execution_log = []
-        nodes = workflow.get('nodes', [])
-        connections = workflow.get('connections', [])
+        execution_log = []
+        compiled = workflow if isinstance(workflow, CompiledWorkflow) else CompiledWorkflow(workflow)
 
-        if not nodes:
+        if compiled.start is None:
             return {
                 'success': False,
                 'error': 'Workflow has no nodes'
             }
 
         # Start with trigger node (first node)
-        current_node = nodes[0]
+        current_node = compiled.start
         contact_state = mock_contact.copy()
         execution_start = time.time()
 
@@ -64,6 +200,7 @@ class WorkflowSimulator:
                 # Potential loop - check if we should continue
                 if iteration > 20:
                     self._log_step(
+                        execution_log,
                         current_node,
                         'failed',
                         'Infinite loop detected - stopping execution',
@@ -78,11 +215,14 @@ class WorkflowSimulator:
             result = self._execute_node(
                 current_node,
                 contact_state,
-                speed_multiplier
+                speed_multiplier,
+                compiled,
+                wait
             )
 
             # Log execution
             self._log_step(
+                execution_log,
                 current_node,
                 result['status'],
                 result['message'],
@@ -94,23 +234,22 @@ class WorkflowSimulator:
                 contact_state.update(result['state_changes'])
 
             # Find next node
-            next_node_id = self._get_next_node(
-                current_node,
-                connections,
-                result
-            )
+            next_node_id = compiled.next_node_id(current_node, result.get('condition_result', False))
 
             if not next_node_id:
                 break
 
-            current_node = next((n for n in nodes if n['id'] == next_node_id), None)
+            current_node = compiled.node_map.get(next_node_id)
 
         execution_time = time.time() - execution_start
-        total_simulated = self._calculate_total_time(workflow)
+        if compiled.total_time_simulated is None:
+            compiled.total_time_simulated = self._calculate_total_time(compiled.workflow)
+        total_simulated = compiled.total_time_simulated
+        self.execution_log = execution_log
 
         return {
             'success': True,
-            'execution_log': self.execution_log,
+            'execution_log': execution_log,
             'total_time_simulated': total_simulated,
             'execution_time_actual': f"{execution_time:.2f}s",
             'final_state': contact_state,
@@ -121,7 +260,9 @@ class WorkflowSimulator:
         self,
         node: Dict,
         contact: Dict,
-        speed_multiplier: int
+        speed_multiplier: int,
+        compiled: CompiledWorkflow = None,
+        wait: bool = True
     ) -> Dict:
         """Execute a single node and return result"""
         node_type = node.get('type', 'unknown')
@@ -129,11 +270,13 @@ class WorkflowSimulator:
         if node_type == 'trigger':
             return self._execute_trigger(node, contact)
         elif node_type == 'action':
-            return self._execute_action(node, contact)
+            templates = compiled.templates_for(node) if compiled else None
+            return self._execute_action(node, contact, templates)
         elif node_type == 'delay':
-            return self._execute_delay(node, contact, speed_multiplier)
+            return self._execute_delay(node, contact, speed_multiplier, wait)
         elif node_type == 'condition':
-            return self._execute_condition(node, contact)
+            group = compiled.condition_group_for(node) if compiled else compile_node_conditions(node)
+            return self._execute_condition(node, contact, group)
         else:
             return {
                 'status': 'skipped',
@@ -154,18 +297,30 @@ class WorkflowSimulator:
             }
         }
 
-    def _execute_action(self, node: Dict, contact: Dict) -> Dict:
+    def _execute_action(
+        self,
+        node: Dict,
+        contact: Dict,
+        templates: Tuple[CompiledTemplate, CompiledTemplate] = None
+    ) -> Dict:
         """Execute action node (email, SMS, tag, task, etc.)"""
         node_data = node.get('data', {})
         action_type = str(node_data.get('action_type', 'unknown')).lower()
         title = node_data.get('title', 'Action')
 
         # Substitute variables in message
-        message = node_data.get('message', '')
-        subject = node_data.get('subject', '')
+        if templates is None:
+            templates = (
+                compile_template(node_data.get('message', ''), ignore_case=True, token=TEMPLATE_VARIABLE),
+                compile_template(node_data.get('subject', ''), ignore_case=True, token=TEMPLATE_VARIABLE)
+            )
+        message_template, subject_template = templates
 
-        substituted_message = self._substitute_variables(message, contact)
-        substituted_subject = self._substitute_variables(subject, contact)
+        substitutions = None
+        if message_template.has_variables or subject_template.has_variables:
+            substitutions = self._substitutions(contact)
+        substituted_message = message_template.render_flat(substitutions)
+        substituted_subject = subject_template.render_flat(substitutions)
 
         # Simulate action execution based on type
         if 'email' in action_type or 'send_email' in action_type:
@@ -255,7 +410,8 @@ class WorkflowSimulator:
         self,
         node: Dict,
         contact: Dict,
-        speed_multiplier: int
+        speed_multiplier: int,
+        wait: bool = True
     ) -> Dict:
         """Execute delay node (fast-forwarded for testing)"""
         node_data = node.get('data', {})
@@ -275,7 +431,8 @@ class WorkflowSimulator:
 
         # Fast-forward (1000x = 1 day → 86 seconds)
         actual_wait = (duration_minutes * 60) / speed_multiplier
-        time.sleep(min(actual_wait, 1))  # Cap at 1 second for UX
+        if wait:
+            time.sleep(min(actual_wait, 1))  # Cap at 1 second for UX
 
         return {
             'status': 'success',
@@ -288,7 +445,12 @@ class WorkflowSimulator:
             }
         }
 
-    def _execute_condition(self, node: Dict, contact: Dict) -> Dict:
+    def _execute_condition(
+        self,
+        node: Dict,
+        contact: Dict,
+        condition_group: Optional[CompiledConditionGroup] = None
+    ) -> Dict:
         """Execute condition node and evaluate logic"""
         node_data = node.get('data', {})
         condition_type = str(node_data.get('condition_type', 'unknown')).lower()
@@ -298,7 +460,12 @@ class WorkflowSimulator:
         result = False
         reason = ''
 
-        if 'email' in condition_type and 'open' in condition_type:
+        if condition_group is not None:
+            # Condition builder rules, evaluated against {"contact": ...}
+            result = bool(condition_group({'contact': contact}))
+            reason = f'Rules {"matched" if result else "not matched"} ({len(condition_group.conditions)} rule(s))'
+
+        elif 'email' in condition_type and 'open' in condition_type:
             # Check if contact opened emails
             emails_received = contact.get('emails_received', 0)
             engagement_rate = contact.get('email_engagement_rate', 0)
@@ -354,11 +521,14 @@ class WorkflowSimulator:
 
     def _substitute_variables(self, text: str, contact: Dict) -> str:
         """Substitute {{variable}} tokens with contact data"""
-        if not text:
+        template = compile_template(text, ignore_case=True, token=TEMPLATE_VARIABLE)
+        if not template.has_variables:
             return text
+        return template.render_flat(self._substitutions(contact))
 
-        # Common substitutions
-        substitutions = {
+    def _substitutions(self, contact: Dict) -> Dict[str, Any]:
+        """Template variables (lower-cased names) available for a contact"""
+        return {
             'contact.name': contact.get('name', 'Friend'),
             'contact.first_name': contact.get('first_name', contact.get('name', 'Friend').split()[0]),
             'contact.last_name': contact.get('last_name', ''),
@@ -369,63 +539,16 @@ class WorkflowSimulator:
             'unsubscribe_link': '[Unsubscribe Link]'
         }
 
-        # Replace {{var}} with values
-        result = text
-        for var, value in substitutions.items():
-            pattern = r'\{\{\s*' + re.escape(var) + r'\s*\}\}'
-            result = re.sub(pattern, str(value), result, flags=re.IGNORECASE)
-
-        return result
-
-    def _get_next_node(
-        self,
-        current_node: Dict,
-        connections: List[Dict],
-        execution_result: Dict
-    ) -> Optional[str]:
-        """Determine next node based on current node and execution result"""
-
-        # If condition node, follow appropriate path based on result
-        if current_node.get('type') == 'condition':
-            condition_result = execution_result.get('condition_result', False)
-
-            # Find connections from this node
-            outgoing = [c for c in connections
-                       if c.get('from') == current_node['id'] or c.get('source') == current_node['id']]
-
-            # Look for labeled connections (yes/no, true/false, success/failure)
-            for conn in outgoing:
-                label = str(conn.get('label', '')).lower()
-                if condition_result and ('yes' in label or 'true' in label or 'success' in label or 'valid' in label):
-                    return conn.get('to') or conn.get('target')
-                elif not condition_result and ('no' in label or 'false' in label or 'fail' in label or 'invalid' in label):
-                    return conn.get('to') or conn.get('target')
-
-            # If no labeled connections, take first one if condition is true
-            if outgoing:
-                if condition_result:
-                    return outgoing[0].get('to') or outgoing[0].get('target')
-                elif len(outgoing) > 1:
-                    return outgoing[1].get('to') or outgoing[1].get('target')
-
-        # For other nodes, follow first connection
-        next_conn = next(
-            (c for c in connections
-             if c.get('from') == current_node['id'] or c.get('source') == current_node['id']),
-            None
-        )
-
-        return next_conn.get('to') or next_conn.get('target') if next_conn else None
-
     def _log_step(
         self,
+        execution_log: List[Dict],
         node: Dict,
         status: str,
         message: str,
         details: Dict
     ):
         """Add execution step to log"""
-        self.execution_log.append({
+        execution_log.append({
             'node_id': node['id'],
             'node_title': node.get('data', {}).get('title', 'Unknown'),
             'node_type': node.get('type', 'unknown'),
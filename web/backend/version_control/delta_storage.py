@@ -0,0 +1,121 @@
+"""
+Delta-compressed workflow snapshot storage for version control
+
+A commit's workflow is stored either as a keyframe (the whole workflow) or
+as a delta against its parent commit, both as zlib-compressed JSON. Every
+KEYFRAME_INTERVAL-th commit along a parent chain is a keyframe, so checking
+out any commit reads one keyframe and applies at most KEYFRAME_INTERVAL - 1
+deltas.
+
+A delta records, per top-level workflow key:
+- "set": keys whose value is new or replaced (stored whole)
+- "del": keys that were removed
+- "lists": keys whose list value changed (nodes, connections, ...), as a
+  sequence of ops against the parent's list: [start, end] copies a slice of
+  the parent list, {"+": [...]} inserts new elements. An edited node is one
+  replaced element; the rest of the list is referenced, not stored.
+
+Values are compared by their canonical JSON (sort_keys), so the workflow
+read back is exactly json.loads(json.dumps(workflow, sort_keys=True)).
+"""
+
+from typing import Any, Dict, List
+from difflib import SequenceMatcher
+import json
+import zlib
+
+# Commits per keyframe along a parent chain (bounds reconstruction to this many steps)
+KEYFRAME_INTERVAL = 32
+COMPRESSION_LEVEL = 6
+
+STORAGE_KEYFRAME = 'keyframe'
+STORAGE_DELTA = 'delta'
+
+
+def canonical(value: Any) -> str:
+    """Canonical JSON (the form commits are hashed and compared in)"""
+    return json.dumps(value, sort_keys=True)
+
+
+def pack(payload: Any) -> bytes:
+    return zlib.compress(json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def list_delta(old: List[Any], new: List[Any]) -> List[Any]:
+    """Ops rebuilding `new` from slices of `old` plus inserted elements"""
+    # Both lists come from canonical JSON (same key order everywhere), so
+    # repr() distinguishes exactly what canonical() does (1 / 1.0 / True), faster
+    matcher = SequenceMatcher(None, [repr(item) for item in old], [repr(item) for item in new], autojunk=False)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            if ops and isinstance(ops[-1], list) and ops[-1][1] == i1:
+                ops[-1][1] = i2
+            else:
+                ops.append([i1, i2])
+        elif j2 > j1:
+            if ops and isinstance(ops[-1], dict):
+                ops[-1]['+'].extend(new[j1:j2])
+            else:
+                ops.append({'+': new[j1:j2]})
+    return ops
+
+
+def apply_list_delta(old: List[Any], ops: List[Any]) -> List[Any]:
+    result: List[Any] = []
+    for op in ops:
+        if isinstance(op, list):
+            result.extend(old[op[0]:op[1]])
+        else:
+            result.extend(op['+'])
+    return result
+
+
+def make_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Delta turning workflow `old` into `new` (both in canonical form)"""
+    changed: Dict[str, Any] = {}
+    lists: Dict[str, Any] = {}
+
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+            continue
+        previous = old[key]
+        if isinstance(value, list) and isinstance(previous, list):
+            ops = list_delta(previous, value)
+            if len(value) != len(previous) or ops != ([[0, len(previous)]] if previous else []):
+                lists[key] = ops
+        elif canonical(previous) != canonical(value):
+            changed[key] = value
+
+    delta: Dict[str, Any] = {}
+    if changed:
+        delta['set'] = changed
+    if lists:
+        delta['lists'] = lists
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta['del'] = removed
+    return delta
+
+
+def apply_delta(old: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """New workflow dict (keys in canonical order); `old` is not modified"""
+    changed = delta.get('set', {})
+    lists = delta.get('lists', {})
+    removed = set(delta.get('del', ()))
+
+    keys = sorted((set(old) | set(changed)) - removed)
+    result = {}
+    for key in keys:
+        if key in changed:
+            result[key] = changed[key]
+        elif key in lists:
+            result[key] = apply_list_delta(old[key], lists[key])
+        else:
+            result[key] = old[key]
+    return result
@@ -0,0 +1,232 @@
+"""
+Three-way merge of workflow snapshots
+
+merge_workflows(base, ours, theirs) combines the changes each side made
+since their merge base:
+- top-level keys (name, settings, ...) and each field of a node or
+  connection merge independently, recursing into nested objects, so edits
+  to different fields of the same node combine
+- nodes are matched by id, connections by id (or source, target and
+  handles when they have none); additions and deletions on either side
+  apply, and connections keep all their attributes (labels, handles, ...)
+
+A conflict is a value both sides changed differently, an element one side
+deleted while the other modified it, an element both sides added with
+different content, or a connection left pointing at a node that was
+deleted. With prefer='ours' / 'theirs' conflicting values take that side
+(dangling connections are dropped); otherwise they are left as ours and
+reported for the caller to reject.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ELEMENT_LISTS = {
+    'nodes': 'node',
+    'connections': 'connection'
+}
+
+# Stands in for a key that is absent on one side
+MISSING = object()
+
+
+def _strict_equal(a: Any, b: Any) -> bool:
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(map(json_equal, a, b))
+    return a == b
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    """JSON equality (1, 1.0 and True differ; key order does not matter)"""
+    if a is b:
+        return True
+    if a != b:
+        return False
+    # Equal as Python values: repr tells 1 / 1.0 / True apart, unless key order differs
+    return repr(a) == repr(b) or _strict_equal(a, b)
+
+
+def _plain(value: Any) -> Any:
+    return None if value is MISSING else value
+
+
+def connection_key(connection: Dict[str, Any]) -> Optional[str]:
+    if connection.get('id') is not None:
+        return str(connection['id'])
+    if 'source' not in connection or 'target' not in connection:
+        return None
+    return (f"{connection['source']}:{connection.get('sourceHandle') or ''}"
+            f"->{connection['target']}:{connection.get('targetHandle') or ''}")
+
+
+def node_key(node: Dict[str, Any]) -> Optional[str]:
+    return str(node['id']) if node.get('id') is not None else None
+
+
+KEY_FUNCTIONS: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    'node': node_key,
+    'connection': connection_key
+}
+
+
+class _Merge:
+    def __init__(self, prefer: Optional[str]):
+        self.prefer = prefer
+        self.conflicts: List[Dict[str, Any]] = []
+
+    def conflict(self, conflict_type: str, description: str, base: Any, ours: Any, theirs: Any, **ids):
+        self.conflicts.append(dict(
+            ids,
+            type=conflict_type,
+            description=description,
+            base=_plain(base),
+            ours=_plain(ours),
+            theirs=_plain(theirs)
+        ))
+        return theirs if self.prefer == 'theirs' else ours
+
+    def value(self, base: Any, ours: Any, theirs: Any, path: List[str], element: Optional[Tuple[str, str]]) -> Any:
+        """Merged value (MISSING when deleted); element is (kind, key) inside a node or connection"""
+        if json_equal(ours, theirs) or json_equal(base, theirs):
+            return ours
+        if json_equal(base, ours):
+            return theirs
+        if isinstance(base, dict) and isinstance(ours, dict) and isinstance(theirs, dict):
+            return self.fields(base, ours, theirs, path, element)
+
+        location = '.'.join(path)
+        if element is None:
+            return self.conflict('workflow_field', f"Workflow field '{location}' was changed in both branches",
+                                 base, ours, theirs, path=location)
+        kind, element_key = element
+        return self.conflict(
+            f"{kind}_modification",
+            f"{kind.capitalize()} '{element_key}' field '{location}' was changed in both branches",
+            base, ours, theirs, path=location, **{f"{kind}_id": element_key}
+        )
+
+    def fields(self, base: Dict, ours: Dict, theirs: Dict, path: List[str], element: Optional[Tuple[str, str]]) -> Dict:
+        merged = {}
+        for key in list(ours) + [k for k in theirs if k not in ours]:
+            value = self.value(base.get(key, MISSING), ours.get(key, MISSING), theirs.get(key, MISSING), path + [key], element)
+            if value is not MISSING:
+                merged[key] = value
+        return merged
+
+    def elements(self, kind: str, base: List, ours: List, theirs: List) -> Optional[List]:
+        """Merged list, or None when the lists are not keyed objects (merged as plain values)"""
+        key = KEY_FUNCTIONS[kind]
+        indexed = []
+        for items in (base, ours, theirs):
+            by_key = {}
+            for item in items:
+                item_key = key(item) if isinstance(item, dict) else None
+                if item_key is None or item_key in by_key:
+                    return None
+                by_key[item_key] = item
+            indexed.append(by_key)
+        base_by, ours_by, theirs_by = indexed
+
+        id_field = f"{kind}_id"
+        merged = []
+        for item_key in list(ours_by) + [k for k in theirs_by if k not in ours_by]:
+            b = base_by.get(item_key, MISSING)
+            o = ours_by.get(item_key, MISSING)
+            t = theirs_by.get(item_key, MISSING)
+            where = {id_field: item_key}
+
+            if b is MISSING:
+                if o is MISSING or t is MISSING or json_equal(o, t):
+                    item = t if o is MISSING else o
+                else:
+                    item = self.conflict(f"{kind}_add", f"{kind.capitalize()} '{item_key}' was added differently in both branches",
+                                         b, o, t, **where)
+            elif o is MISSING or t is MISSING:
+                kept = t if o is MISSING else o
+                if json_equal(b, kept):
+                    item = MISSING
+                else:
+                    item = self.conflict(f"{kind}_delete_modify",
+                                         f"{kind.capitalize()} '{item_key}' was deleted in one branch and modified in the other",
+                                         b, o, t, **where)
+            else:
+                item = self.value(b, o, t, [], (kind, item_key))
+
+            if item is not MISSING:
+                merged.append(item)
+        return merged
+
+    def dangling(self, workflow: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any], known_nodes: set):
+        """Report (or with prefer, drop) connections to nodes the merge deleted"""
+        nodes = workflow.get('nodes')
+        connections = workflow.get('connections')
+        if not isinstance(nodes, list) or not isinstance(connections, list):
+            return
+        present = {node.get('id') for node in nodes if isinstance(node, dict)}
+        sides = [
+            {connection_key(c) for c in side['connections'] if isinstance(c, dict)}
+            if isinstance(side.get('connections'), list) else set()
+            for side in (ours, theirs)
+        ]
+        reported = {conflict.get('connection_id') for conflict in self.conflicts}
+        kept = []
+        for connection in connections:
+            endpoints = [connection.get(end) for end in ('source', 'target')] if isinstance(connection, dict) else []
+            deleted = [node_id for node_id in endpoints if node_id not in present and node_id in known_nodes]
+            if not deleted:
+                kept.append(connection)
+                continue
+            connection_id = connection_key(connection)
+            if self.prefer is None:
+                kept.append(connection)
+            if connection_id in reported:
+                continue
+            self.conflicts.append({
+                'type': 'dangling_connection',
+                'connection_id': connection_id,
+                'node_id': deleted[0],
+                'description': f"Connection '{connection_id}' points at node '{deleted[0]}', deleted in the other branch",
+                'base': None,
+                'ours': connection if connection_id in sides[0] else None,
+                'theirs': connection if connection_id in sides[1] else None
+            })
+        workflow['connections'] = kept
+
+
+def merge_workflows(
+    base: Dict[str, Any],
+    ours: Dict[str, Any],
+    theirs: Dict[str, Any],
+    prefer: Optional[str] = None
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Three-way merge; returns (merged workflow, conflicts)
+
+    Inputs are not modified (the merged workflow shares unchanged values
+    with them). Each conflict has type, description, path (for field
+    conflicts), node_id / connection_id, and the base, ours and theirs
+    values.
+    """
+    merge = _Merge(prefer)
+    merged = {}
+    for key in list(ours) + [k for k in theirs if k not in ours]:
+        b, o, t = base.get(key, MISSING), ours.get(key, MISSING), theirs.get(key, MISSING)
+        value = None
+        changed_both = not (json_equal(o, t) or json_equal(b, o) or json_equal(b, t))
+        if changed_both and key in ELEMENT_LISTS and isinstance(o, list) and isinstance(t, list):
+            value = merge.elements(ELEMENT_LISTS[key], b if isinstance(b, list) else [], o, t)
+        if value is None:
+            value = merge.value(b, o, t, [key], None)
+        if value is not MISSING:
+            merged[key] = value
+
+    known_nodes = {
+        node.get('id')
+        for workflow in (base, ours, theirs) if isinstance(workflow.get('nodes'), list)
+        for node in workflow['nodes'] if isinstance(node, dict)
+    }
+    merge.dangling(merged, ours, theirs, known_nodes)
+    return merged, merge.conflicts
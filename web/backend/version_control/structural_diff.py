@@ -0,0 +1,160 @@
+"""
+Structural diff between two workflow snapshots
+
+Nodes are matched by id, connections by id (or endpoints and handles, see
+merge.connection_key). A changed node or connection is described by JSON
+Patch (RFC 6902) operations relative to that element; "replace" and
+"remove" operations also carry the previous value under "old", which patch
+appliers ignore. Objects are compared key by key, lists index by index when
+their length is unchanged (otherwise replaced whole). A node whose only
+change is its position is reported as moved, not modified.
+
+Removed elements are listed by identity only (id, type, title), added ones
+in full. Other workflow fields (name, settings, ...) become operations
+relative to the workflow.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from version_control.merge import connection_key, json_equal, node_key
+
+POSITION_KEY = 'position'
+
+
+def _escape(key: Any) -> str:
+    """JSON Pointer (RFC 6901) token"""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _patch(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]):
+    if json_equal(old, new):
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key in old:
+                _patch(old[key], value, child, ops)
+            else:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+        for key, value in old.items():
+            if key not in new:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}", 'old': value})
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for index, (before, after) in enumerate(zip(old, new)):
+            _patch(before, after, f"{path}/{index}", ops)
+    else:
+        ops.append({'op': 'replace', 'path': path, 'value': new, 'old': old})
+
+
+def json_patch(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """Operations turning `old` into `new` (paths prefixed with `path`)"""
+    ops: List[Dict[str, Any]] = []
+    _patch(old, new, path, ops)
+    return ops
+
+
+def _keyed(items: Any, key: Callable[[Dict[str, Any]], Optional[str]]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Elements by key, or None when the list is missing or its elements cannot be keyed"""
+    if items is None:
+        return {}
+    if not isinstance(items, list):
+        return None
+    by_key = {}
+    for item in items:
+        item_key = key(item) if isinstance(item, dict) else None
+        if item_key is None or item_key in by_key:
+            return None
+        by_key[item_key] = item
+    return by_key
+
+
+def _title(node: Dict[str, Any]) -> Optional[str]:
+    data = node.get('data')
+    return data.get('title') if isinstance(data, dict) else None
+
+
+def _is_position(op: Dict[str, Any]) -> bool:
+    return op['path'] == f"/{POSITION_KEY}" or op['path'].startswith(f"/{POSITION_KEY}/")
+
+
+def diff_workflows(workflow_a: Dict[str, Any], workflow_b: Dict[str, Any]) -> Dict[str, Any]:
+    """Changes from workflow_a to workflow_b"""
+    nodes_a = _keyed(workflow_a.get('nodes'), node_key)
+    nodes_b = _keyed(workflow_b.get('nodes'), node_key)
+    conns_a = _keyed(workflow_a.get('connections'), connection_key)
+    conns_b = _keyed(workflow_b.get('connections'), connection_key)
+
+    # Lists that cannot be matched element by element are diffed as plain fields
+    element_keys = set()
+    if nodes_a is not None and nodes_b is not None:
+        element_keys.add('nodes')
+    else:
+        nodes_a = nodes_b = {}
+    if conns_a is not None and conns_b is not None:
+        element_keys.add('connections')
+    else:
+        conns_a = conns_b = {}
+
+    added_nodes, modified_nodes, moved_nodes = [], [], []
+    for node_id, node in nodes_b.items():
+        before = nodes_a.get(node_id)
+        if before is None:
+            added_nodes.append(node)
+            continue
+        changes = json_patch(before, node)
+        if not changes:
+            continue
+        moved = any(_is_position(op) for op in changes)
+        if moved and all(_is_position(op) for op in changes):
+            moved_nodes.append({
+                'id': node_id,
+                'title': _title(node),
+                'from': before.get(POSITION_KEY),
+                'to': node.get(POSITION_KEY)
+            })
+        else:
+            modified_nodes.append({'id': node_id, 'title': _title(node), 'moved': moved, 'changes': changes})
+    removed_nodes = [
+        {'id': node_id, 'type': node.get('type'), 'title': _title(node)}
+        for node_id, node in nodes_a.items() if node_id not in nodes_b
+    ]
+
+    added_connections, modified_connections = [], []
+    for conn_id, connection in conns_b.items():
+        before = conns_a.get(conn_id)
+        if before is None:
+            added_connections.append(connection)
+            continue
+        changes = json_patch(before, connection)
+        if changes:
+            modified_connections.append({'id': conn_id, 'changes': changes})
+    removed_connections = [
+        {'id': conn_id, 'source': connection.get('source'), 'target': connection.get('target')}
+        for conn_id, connection in conns_a.items() if conn_id not in conns_b
+    ]
+
+    workflow_changes = json_patch(
+        {k: v for k, v in workflow_a.items() if k not in element_keys},
+        {k: v for k, v in workflow_b.items() if k not in element_keys}
+    )
+
+    return {
+        'added_nodes': added_nodes,
+        'removed_nodes': removed_nodes,
+        'modified_nodes': modified_nodes,
+        'moved_nodes': moved_nodes,
+        'added_connections': added_connections,
+        'removed_connections': removed_connections,
+        'modified_connections': modified_connections,
+        'workflow_changes': workflow_changes,
+        'summary': {
+            'nodes_added': len(added_nodes),
+            'nodes_removed': len(removed_nodes),
+            'nodes_modified': len(modified_nodes),
+            'nodes_moved': len(moved_nodes),
+            'connections_added': len(added_connections),
+            'connections_removed': len(removed_connections),
+            'connections_modified': len(modified_connections),
+            'workflow_fields_changed': len(workflow_changes)
+        }
+    }
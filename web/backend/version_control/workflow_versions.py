@@ -5,10 +5,91 @@ Git-like version control for workflows with branches, commits, and merging
 import sqlite3
 import json
 import hashlib
+import heapq
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from version_control.delta_storage import (
+    KEYFRAME_INTERVAL,
+    STORAGE_DELTA,
+    STORAGE_KEYFRAME,
+    apply_delta,
+    make_delta,
+    pack,
+    unpack
+)
+from version_control.merge import merge_workflows
+from version_control.structural_diff import diff_workflows
+
+# Reconstructed commit workflows / commit-pair diffs kept in memory
+SNAPSHOT_CACHE_SIZE = 256
+DIFF_CACHE_SIZE = 512
+# Generations of commit ancestry fetched per query while searching for a merge base
+ANCESTRY_WINDOW = 512
+
+MERGE_STRATEGIES = ('auto', 'ours', 'theirs')
+
+
+class CommitCache:
+    """
+    LRU of values computed from commits, which never change once written
+    (workflow snapshots by commit id, diffs by commit pair)
+
+    Cached values are shared: read them, never modify them. copy() hands
+    out a private copy (decoded from JSON text kept next to the value).
+    """
+
+    def __init__(self, max_size: int = SNAPSHOT_CACHE_SIZE):
+        self.max_size = max_size
+        # key -> [value, its JSON or None until first copy()]
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key) -> Optional[Dict]:
+        """Like get() without counting or refreshing recency"""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def put(self, key, value: Dict):
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = [value, None]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def copy(self, key, value: Dict) -> Dict:
+        """Private copy of a cached value"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not value:
+            return json.loads(json.dumps(value))
+        if entry[1] is None:
+            entry[1] = json.dumps(value)
+        return json.loads(entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
 class WorkflowVersionControl:
     """
     Git-like version control system for workflows
@@ -20,10 +101,28 @@ class WorkflowVersionControl:
     - Version history
     - Tags/labels
     - Conflict detection
+
+    Snapshots are stored as compressed keyframes and parent deltas (see
+    delta_storage); commits written before that keep their plain JSON in
+    workflow_snapshot and are read as keyframes.
+
+    Each commit records its generation (longest distance from a root
+    commit), and reads walk parent chains with recursive CTEs, so a history
+    page or a checkout is one query. Merges are three-way against the
+    branches' merge base (see merge). Public methods open one connection
+    per call and pass its cursor to the underscore helpers.
     """
 
-    def __init__(self, db_path: str = "workflow_versions.db"):
+    def __init__(
+        self,
+        db_path: str = "workflow_versions.db",
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+        cache_size: int = SNAPSHOT_CACHE_SIZE
+    ):
         self.db_path = db_path
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.snapshots = CommitCache(cache_size)
+        self.diffs = CommitCache(DIFF_CACHE_SIZE)
         self._init_database()
 
     def _init_database(self):
@@ -46,6 +145,42 @@ class WorkflowVersionControl:
             )
         """)
 
+        # Columns added after the original schema (added to databases created before them):
+        # storage is 'keyframe' / 'delta' (NULL: plain JSON in workflow_snapshot),
+        # chain_depth the number of deltas between this commit and its keyframe,
+        # generation 0 for a root commit and otherwise 1 + its parents' highest,
+        # merge_parent_id the merged source branch head (merge commits only)
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(commits)")}
+        for column, definition in (
+            ("storage", "TEXT"),
+            ("snapshot_blob", "BLOB"),
+            ("chain_depth", "INTEGER NOT NULL DEFAULT 0"),
+            ("generation", "INTEGER"),
+            ("merge_parent_id", "TEXT")
+        ):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE commits ADD COLUMN {column} {definition}")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_workflow_branch ON commits (workflow_id, branch)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_parent ON commits (parent_commit_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_generation ON commits (workflow_id, generation)")
+
+        # Generation numbers for commits written before the column existed
+        # (root commits are 0, children their parent's + 1)
+        cursor.execute("SELECT 1 FROM commits WHERE generation IS NULL LIMIT 1")
+        if cursor.fetchone():
+            cursor.execute("""
+                WITH RECURSIVE numbered(id, generation) AS (
+                    SELECT id, 0 FROM commits WHERE parent_commit_id IS NULL
+                    UNION ALL
+                    SELECT c.id, numbered.generation + 1
+                    FROM commits c JOIN numbered ON c.parent_commit_id = numbered.id
+                )
+                SELECT generation, id FROM numbered
+            """)
+            cursor.executemany("UPDATE commits SET generation = ? WHERE id = ?", cursor.fetchall())
+
+
         # Branches table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS branches (
@@ -141,99 +276,206 @@ class WorkflowVersionControl:
         cursor = conn.cursor()
 
         try:
-            # Get current head of branch
-            cursor.execute(
-                "SELECT head_commit_id FROM branches WHERE workflow_id = ? AND name = ?",
-                (workflow_id, branch)
-            )
-            result = cursor.fetchone()
+            result, workflow = self._commit(cursor, workflow_id, workflow_data, message, author, branch)
+            if result['success']:
+                conn.commit()
+                self.snapshots.put(result['commit_id'], workflow)
+            return result
 
-            if not result:
-                return {'success': False, 'error': f'Branch {branch} not found'}
+        except Exception as e:
+            conn.rollback()
+            return {'success': False, 'error': str(e)}
 
-            parent_commit_id = result[0]
+        finally:
+            conn.close()
 
-            # Generate commit hash
-            now = datetime.utcnow().isoformat()
-            workflow_json = json.dumps(workflow_data, sort_keys=True)
-            commit_content = f"{workflow_id}{branch}{parent_commit_id}{message}{author}{now}{workflow_json}"
-            commit_id = hashlib.sha256(commit_content.encode()).hexdigest()[:12]
+    def _commit(
+        self,
+        cursor: sqlite3.Cursor,
+        workflow_id: str,
+        workflow_data: Dict,
+        message: str,
+        author: str,
+        branch: str,
+        merge_parent_id: Optional[str] = None
+    ) -> Tuple[Dict, Optional[Dict]]:
+        """Write a commit and move the branch head (the caller commits); returns (result, stored workflow)"""
+        # Get current head of branch
+        cursor.execute("""
+            SELECT b.head_commit_id, c.generation
+            FROM branches b LEFT JOIN commits c ON c.id = b.head_commit_id
+            WHERE b.workflow_id = ? AND b.name = ?
+        """, (workflow_id, branch))
+        result = cursor.fetchone()
+
+        if not result:
+            return {'success': False, 'error': f'Branch {branch} not found'}, None
+
+        parent_commit_id, parent_generation = result
+        parent_generations = [parent_generation] if parent_generation is not None else []
+        if merge_parent_id:
+            cursor.execute("SELECT generation FROM commits WHERE id = ?", (merge_parent_id,))
+            row = cursor.fetchone()
+            if not row:
+                return {'success': False, 'error': f'Commit {merge_parent_id} not found'}, None
+            if row[0] is not None:
+                parent_generations.append(row[0])
+        generation = max(parent_generations) + 1 if parent_generations else 0
+
+        # Generate commit hash
+        now = datetime.utcnow().isoformat()
+        workflow_json = json.dumps(workflow_data, sort_keys=True)
+        commit_content = f"{workflow_id}{branch}{parent_commit_id}{merge_parent_id or ''}{message}{author}{now}{workflow_json}"
+        commit_id = hashlib.sha256(commit_content.encode()).hexdigest()[:12]
 
-            # Create commit
-            cursor.execute("""
-                INSERT INTO commits (
-                    id, workflow_id, branch, parent_commit_id,
-                    commit_message, author, timestamp, workflow_snapshot
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (commit_id, workflow_id, branch, parent_commit_id, message, author, now, workflow_json))
+        workflow = json.loads(workflow_json)
+        storage, blob, depth = self._encode_snapshot(cursor, parent_commit_id, workflow)
 
-            # Update branch head
-            cursor.execute(
-                "UPDATE branches SET head_commit_id = ? WHERE workflow_id = ? AND name = ?",
-                (commit_id, workflow_id, branch)
-            )
+        # Create commit
+        cursor.execute("""
+            INSERT INTO commits (
+                id, workflow_id, branch, parent_commit_id,
+                commit_message, author, timestamp, workflow_snapshot,
+                storage, snapshot_blob, chain_depth, generation, merge_parent_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, '', ?, ?, ?, ?, ?)
+        """, (commit_id, workflow_id, branch, parent_commit_id, message, author, now,
+              storage, blob, depth, generation, merge_parent_id))
+
+        # Update branch head
+        cursor.execute(
+            "UPDATE branches SET head_commit_id = ? WHERE workflow_id = ? AND name = ?",
+            (commit_id, workflow_id, branch)
+        )
 
-            conn.commit()
-            return {
-                'success': True,
-                'commit_id': commit_id,
-                'branch': branch,
-                'timestamp': now
-            }
+        return {
+            'success': True,
+            'commit_id': commit_id,
+            'branch': branch,
+            'timestamp': now
+        }, workflow
 
-        except Exception as e:
-            conn.rollback()
-            return {'success': False, 'error': str(e)}
+    def get_history(
+        self,
+        workflow_id: str,
+        branch: str = 'main',
+        limit: int = 50,
+        from_commit: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get commit history for a branch, newest first (one query)
 
-        finally:
-            conn.close()
+        Follows first parents: a merge commit is listed, the merged branch's
+        own commits are not (their head is the commit's 'merge_parent').
+
+        from_commit starts the page at that commit instead of the branch head
+        (pass the last page's final 'parent' to page through long histories).
+        """
+        if limit <= 0:
+            return []
 
-    def get_history(self, workflow_id: str, branch: str = 'main', limit: int = 50) -> List[Dict]:
-        """Get commit history for a branch"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
         try:
-            # Get branch head
-            cursor.execute(
-                "SELECT head_commit_id FROM branches WHERE workflow_id = ? AND name = ?",
-                (workflow_id, branch)
-            )
-            result = cursor.fetchone()
+            cursor.execute("""
+                WITH RECURSIVE history(id, commit_message, author, timestamp, parent_commit_id, metadata, generation, merge_parent_id) AS (
+                    SELECT id, commit_message, author, timestamp, parent_commit_id, metadata, generation, merge_parent_id
+                    FROM commits
+                    WHERE workflow_id = ? AND id = COALESCE(
+                        ?, (SELECT head_commit_id FROM branches WHERE workflow_id = ? AND name = ?)
+                    )
+                    UNION ALL
+                    SELECT c.id, c.commit_message, c.author, c.timestamp, c.parent_commit_id, c.metadata, c.generation,
+                           c.merge_parent_id
+                    FROM commits c JOIN history ON c.id = history.parent_commit_id
+                    LIMIT ?
+                )
+                SELECT id, commit_message, author, timestamp, parent_commit_id, metadata, generation, merge_parent_id
+                FROM history
+            """, (workflow_id, from_commit, workflow_id, branch, limit))
+
+            return [
+                {
+                    'commit_id': row[0],
+                    'message': row[1],
+                    'author': row[2],
+                    'timestamp': row[3],
+                    'parent': row[4],
+                    'metadata': json.loads(row[5]) if row[5] else {},
+                    'generation': row[6],
+                    'merge_parent': row[7]
+                }
+                for row in cursor.fetchall()
+            ]
 
-            if not result or not result[0]:
-                return []
+        finally:
+            conn.close()
 
-            # Walk commit history
-            history = []
-            current_commit_id = result[0]
+    def _encode_snapshot(self, cursor: sqlite3.Cursor, parent_commit_id: Optional[str], workflow: Dict) -> Tuple[str, bytes, int]:
+        """(storage, blob, chain_depth) of a new commit's workflow"""
+        keyframe = pack(workflow)
+        if not parent_commit_id:
+            return STORAGE_KEYFRAME, keyframe, 0
 
-            while current_commit_id and len(history) < limit:
-                cursor.execute("""
-                    SELECT id, commit_message, author, timestamp, parent_commit_id, metadata
-                    FROM commits
-                    WHERE id = ?
-                """, (current_commit_id,))
-
-                commit = cursor.fetchone()
-                if not commit:
-                    break
-
-                history.append({
-                    'commit_id': commit[0],
-                    'message': commit[1],
-                    'author': commit[2],
-                    'timestamp': commit[3],
-                    'parent': commit[4],
-                    'metadata': json.loads(commit[5]) if commit[5] else {}
-                })
+        cursor.execute("SELECT chain_depth FROM commits WHERE id = ?", (parent_commit_id,))
+        row = cursor.fetchone()
+        if not row or row[0] + 1 >= self.keyframe_interval:
+            return STORAGE_KEYFRAME, keyframe, 0
 
-                current_commit_id = commit[4]
+        parent_workflow = self._load_workflow(cursor, parent_commit_id)
+        if parent_workflow is None:
+            return STORAGE_KEYFRAME, keyframe, 0
 
-            return history
+        delta = pack(make_delta(parent_workflow, workflow))
+        if len(delta) >= len(keyframe):
+            return STORAGE_KEYFRAME, keyframe, 0
+        return STORAGE_DELTA, delta, row[0] + 1
 
-        finally:
-            conn.close()
+    def _load_workflow(self, cursor: sqlite3.Cursor, commit_id: str) -> Optional[Dict]:
+        """
+        A commit's workflow (shared with the snapshot cache; do not modify)
+
+        Rebuilt from its keyframe plus the deltas after it (one query),
+        starting from the nearest cached commit on that chain if there is one.
+        """
+        workflow = self.snapshots.get(commit_id)
+        if workflow is not None:
+            return workflow
+
+        cursor.execute("""
+            WITH RECURSIVE chain(id, parent_commit_id, storage, snapshot_blob, workflow_snapshot, step) AS (
+                SELECT id, parent_commit_id, storage, snapshot_blob, workflow_snapshot, 0
+                FROM commits WHERE id = ?
+                UNION ALL
+                SELECT c.id, c.parent_commit_id, c.storage, c.snapshot_blob, c.workflow_snapshot, chain.step + 1
+                FROM commits c JOIN chain ON c.id = chain.parent_commit_id
+                WHERE chain.storage = ?
+            )
+            SELECT id, storage, snapshot_blob, workflow_snapshot FROM chain ORDER BY step DESC
+        """, (commit_id, STORAGE_DELTA))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+
+        # Nearest cached ancestor, else the keyframe at the start of the chain
+        start = 0
+        for i in range(len(rows) - 1, 0, -1):
+            workflow = self.snapshots.peek(rows[i][0])
+            if workflow is not None:
+                start = i
+                break
+        else:
+            _, storage, blob, snapshot = rows[0]
+            if storage == STORAGE_DELTA:
+                # Delta whose base is missing
+                return None
+            workflow = unpack(blob) if storage == STORAGE_KEYFRAME else json.loads(snapshot)
+
+        for _, _, blob, _ in rows[start + 1:]:
+            workflow = apply_delta(workflow, unpack(blob))
+
+        self.snapshots.put(commit_id, workflow)
+        return workflow
 
     def get_commit(self, commit_id: str) -> Optional[Dict]:
         """Get complete commit data including workflow snapshot"""
@@ -241,28 +483,68 @@ class WorkflowVersionControl:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                SELECT id, workflow_id, branch, parent_commit_id,
-                       commit_message, author, timestamp, workflow_snapshot, metadata
-                FROM commits
-                WHERE id = ?
-            """, (commit_id,))
+            commit = self._get_commit(cursor, commit_id)
+            if commit is not None:
+                commit['workflow'] = self.snapshots.copy(commit_id, commit['workflow'])
+            return commit
 
-            result = cursor.fetchone()
-            if not result:
-                return None
+        finally:
+            conn.close()
 
-            return {
-                'commit_id': result[0],
-                'workflow_id': result[1],
-                'branch': result[2],
-                'parent': result[3],
-                'message': result[4],
-                'author': result[5],
-                'timestamp': result[6],
-                'workflow': json.loads(result[7]),
-                'metadata': json.loads(result[8]) if result[8] else {}
-            }
+    def _get_commit(self, cursor: sqlite3.Cursor, commit_id: str) -> Optional[Dict]:
+        """Commit data; 'workflow' is the shared cached dict (see _load_workflow)"""
+        cursor.execute("""
+            SELECT id, workflow_id, branch, parent_commit_id,
+                   commit_message, author, timestamp, metadata, generation, merge_parent_id
+            FROM commits
+            WHERE id = ?
+        """, (commit_id,))
+
+        result = cursor.fetchone()
+        if not result:
+            return None
+
+        workflow = self._load_workflow(cursor, commit_id)
+        if workflow is None:
+            return None
+
+        return {
+            'commit_id': result[0],
+            'workflow_id': result[1],
+            'branch': result[2],
+            'parent': result[3],
+            'message': result[4],
+            'author': result[5],
+            'timestamp': result[6],
+            'workflow': workflow,
+            'metadata': json.loads(result[7]) if result[7] else {},
+            'generation': result[8],
+            'merge_parent': result[9]
+        }
+
+    def storage_stats(self, workflow_id: Optional[str] = None) -> Dict:
+        """Commit counts and stored snapshot bytes by storage kind"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        try:
+            query = """
+                SELECT COALESCE(storage, 'json'), COUNT(*),
+                       SUM(COALESCE(LENGTH(snapshot_blob), 0) + LENGTH(workflow_snapshot))
+                FROM commits
+            """
+            params: Tuple = ()
+            if workflow_id:
+                query += " WHERE workflow_id = ?"
+                params = (workflow_id,)
+            cursor.execute(query + " GROUP BY 1", params)
+
+            stats = {'commits': 0, 'bytes': 0, 'by_storage': {}}
+            for storage, count, size in cursor.fetchall():
+                stats['by_storage'][storage] = {'commits': count, 'bytes': size or 0}
+                stats['commits'] += count
+                stats['bytes'] += size or 0
+            return stats
 
         finally:
             conn.close()
@@ -340,55 +622,37 @@ class WorkflowVersionControl:
             conn.close()
 
     def calculate_diff(self, commit_id_a: str, commit_id_b: str) -> Dict:
-        """Calculate difference between two commits"""
-        commit_a = self.get_commit(commit_id_a)
-        commit_b = self.get_commit(commit_id_b)
-
-        if not commit_a or not commit_b:
-            return {'success': False, 'error': 'Commit not found'}
+        """
+        Calculate difference between two commits
 
-        workflow_a = commit_a['workflow']
-        workflow_b = commit_b['workflow']
+        Per-node and per-connection JSON Patch changes (see structural_diff).
+        Results are cached by commit pair.
+        """
+        key = (commit_id_a, commit_id_b)
+        diff = self.diffs.get(key)
+        if diff is None:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
 
-        # Calculate node differences
-        nodes_a = {node['id']: node for node in workflow_a.get('nodes', [])}
-        nodes_b = {node['id']: node for node in workflow_b.get('nodes', [])}
+            try:
+                diff = self._calculate_diff(cursor, commit_id_a, commit_id_b)
+            finally:
+                conn.close()
 
-        added_nodes = [nodes_b[nid] for nid in nodes_b if nid not in nodes_a]
-        removed_nodes = [nodes_a[nid] for nid in nodes_a if nid not in nodes_b]
-        modified_nodes = []
+            if not diff['success']:
+                return diff
+            self.diffs.put(key, diff)
 
-        for node_id in nodes_a:
-            if node_id in nodes_b:
-                if nodes_a[node_id] != nodes_b[node_id]:
-                    modified_nodes.append({
-                        'id': node_id,
-                        'before': nodes_a[node_id],
-                        'after': nodes_b[node_id]
-                    })
+        return self.diffs.copy(key, diff)
 
-        # Calculate connection differences
-        conns_a = set((c.get('source'), c.get('target')) for c in workflow_a.get('connections', []))
-        conns_b = set((c.get('source'), c.get('target')) for c in workflow_b.get('connections', []))
+    def _calculate_diff(self, cursor: sqlite3.Cursor, commit_id_a: str, commit_id_b: str) -> Dict:
+        workflow_a = self._load_workflow(cursor, commit_id_a)
+        workflow_b = self._load_workflow(cursor, commit_id_b)
 
-        added_connections = list(conns_b - conns_a)
-        removed_connections = list(conns_a - conns_b)
+        if workflow_a is None or workflow_b is None:
+            return {'success': False, 'error': 'Commit not found'}
 
-        return {
-            'success': True,
-            'added_nodes': added_nodes,
-            'removed_nodes': removed_nodes,
-            'modified_nodes': modified_nodes,
-            'added_connections': added_connections,
-            'removed_connections': removed_connections,
-            'summary': {
-                'nodes_added': len(added_nodes),
-                'nodes_removed': len(removed_nodes),
-                'nodes_modified': len(modified_nodes),
-                'connections_added': len(added_connections),
-                'connections_removed': len(removed_connections)
-            }
-        }
+        return {'success': True, 'commit_a': commit_id_a, 'commit_b': commit_id_b, **diff_workflows(workflow_a, workflow_b)}
 
     def merge_branches(
         self,
@@ -401,11 +665,19 @@ class WorkflowVersionControl:
         """
         Merge source branch into target branch
 
+        Three-way merge: the changes each branch made since their merge base
+        (lowest common ancestor) are combined node by node and field by field
+        (see version_control.merge). The merge commit records the source head
+        as its merge parent, so later merges start from there.
+
         Strategies:
-        - 'auto': Automatic merge if no conflicts
-        - 'ours': Keep target branch changes
-        - 'theirs': Take source branch changes
+        - 'auto': Merge if there are no conflicts, else return them
+        - 'ours': Resolve conflicts with the target branch's changes
+        - 'theirs': Resolve conflicts with the source branch's changes
         """
+        if strategy not in MERGE_STRATEGIES:
+            return {'success': False, 'error': f'Unknown merge strategy: {strategy}'}
+
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
@@ -422,99 +694,126 @@ class WorkflowVersionControl:
             if source_branch not in branches or target_branch not in branches:
                 return {'success': False, 'error': 'Branch not found'}
 
-            source_commit = self.get_commit(branches[source_branch])
-            target_commit = self.get_commit(branches[target_branch])
+            source_head = branches[source_branch]
+            target_head = branches[target_branch]
+            if not source_head:
+                return {'success': False, 'error': f'Branch {source_branch} has no commits'}
+
+            merge_base = self._merge_base(cursor, workflow_id, target_head, source_head) if target_head else None
+            if merge_base == source_head:
+                return {
+                    'success': True,
+                    'commit_id': target_head,
+                    'merge_base': merge_base,
+                    'message': f"Already up to date: '{source_branch}' is merged into '{target_branch}'"
+                }
 
-            # Calculate diff
-            diff = self.calculate_diff(branches[target_branch], branches[source_branch])
+            source_workflow = self._load_workflow(cursor, source_head)
+            target_workflow = self._load_workflow(cursor, target_head) if target_head else {}
+            base_workflow = self._load_workflow(cursor, merge_base) if merge_base else {}
+            if source_workflow is None or target_workflow is None or base_workflow is None:
+                return {'success': False, 'error': 'Commit not found'}
 
-            # Check for conflicts
-            conflicts = self._detect_conflicts(diff)
+            merged_workflow, conflicts = merge_workflows(
+                base_workflow, target_workflow, source_workflow,
+                prefer=None if strategy == 'auto' else strategy
+            )
 
             if conflicts and strategy == 'auto':
                 return {
                     'success': False,
                     'conflict': True,
                     'conflicts': conflicts,
+                    'merge_base': merge_base,
                     'message': 'Merge conflicts detected. Choose merge strategy.'
                 }
 
-            # Perform merge based on strategy
-            if strategy == 'theirs':
-                merged_workflow = source_commit['workflow']
-            elif strategy == 'ours':
-                merged_workflow = target_commit['workflow']
-            else:
-                # Auto merge (no conflicts)
-                merged_workflow = self._auto_merge(target_commit['workflow'], diff)
-
             # Create merge commit
             merge_message = f"Merge branch '{source_branch}' into '{target_branch}'"
-            commit_result = self.commit(
+            commit_result, stored_workflow = self._commit(
+                cursor,
                 workflow_id=workflow_id,
                 workflow_data=merged_workflow,
                 message=merge_message,
                 author=author,
-                branch=target_branch
+                branch=target_branch,
+                merge_parent_id=source_head
             )
 
             if commit_result['success']:
+                conn.commit()
+                self.snapshots.put(commit_result['commit_id'], stored_workflow)
                 return {
                     'success': True,
                     'commit_id': commit_result['commit_id'],
+                    'merge_base': merge_base,
+                    'resolved_conflicts': conflicts,
                     'message': merge_message
                 }
             else:
                 return commit_result
 
         except Exception as e:
+            conn.rollback()
             return {'success': False, 'error': str(e)}
 
         finally:
             conn.close()
 
-    def _detect_conflicts(self, diff: Dict) -> List[Dict]:
-        """Detect merge conflicts in diff"""
-        conflicts = []
-
-        # Modified nodes are potential conflicts
-        for modified in diff.get('modified_nodes', []):
-            conflicts.append({
-                'type': 'node_modification',
-                'node_id': modified['id'],
-                'description': f"Node '{modified['id']}' was modified in both branches"
-            })
-
-        return conflicts
-
-    def _auto_merge(self, base_workflow: Dict, diff: Dict) -> Dict:
-        """Automatically merge changes when no conflicts"""
-        merged = base_workflow.copy()
-
-        # Apply added nodes
-        nodes = {node['id']: node for node in merged.get('nodes', [])}
-        for added_node in diff.get('added_nodes', []):
-            nodes[added_node['id']] = added_node
-
-        # Remove deleted nodes
-        for removed_node in diff.get('removed_nodes', []):
-            nodes.pop(removed_node['id'], None)
-
-        merged['nodes'] = list(nodes.values())
+    def merge_base(self, workflow_id: str, commit_id_a: str, commit_id_b: str) -> Optional[str]:
+        """Lowest common ancestor of two commits (None if they share no history)"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
 
-        # Apply connection changes
-        connections = set((c.get('source'), c.get('target')) for c in merged.get('connections', []))
-        for added_conn in diff.get('added_connections', []):
-            connections.add(added_conn)
-        for removed_conn in diff.get('removed_connections', []):
-            connections.discard(removed_conn)
+        try:
+            return self._merge_base(cursor, workflow_id, commit_id_a, commit_id_b)
 
-        merged['connections'] = [
-            {'source': src, 'target': tgt}
-            for src, tgt in connections
-        ]
+        finally:
+            conn.close()
 
-        return merged
+    def _merge_base(self, cursor: sqlite3.Cursor, workflow_id: str, commit_id_a: str, commit_id_b: str) -> Optional[str]:
+        """
+        Lowest common ancestor, by generation-ordered walk
+
+        Walks both ancestries newest generation first, marking each commit with
+        the side(s) it is reachable from. A parent's generation is lower than
+        its children's, so when a commit is popped every path to it has been
+        walked: the first one reached from both sides is a common ancestor
+        with the highest generation (ties, possible after criss-cross merges,
+        go to the smaller id). Only commits newer than the merge base are
+        visited.
+        """
+        if commit_id_a == commit_id_b:
+            return commit_id_a
+
+        graph = _CommitGraph(cursor, workflow_id)
+        side_a, side_b, both = 1, 2, 3
+        flags = {}
+        heap = []
+        for commit_id, side in ((commit_id_a, side_a), (commit_id_b, side_b)):
+            generation = graph.generation(commit_id)
+            if generation is None:
+                return None
+            flags[commit_id] = side
+            heapq.heappush(heap, (-generation, commit_id))
+
+        while heap:
+            _, commit_id = heapq.heappop(heap)
+            side = flags[commit_id]
+            if side == both:
+                return commit_id
+            for parent_id in graph.parents(commit_id):
+                seen = flags.get(parent_id)
+                if seen is None:
+                    generation = graph.generation(parent_id)
+                    if generation is None:
+                        continue
+                    flags[parent_id] = side
+                    heapq.heappush(heap, (-generation, parent_id))
+                else:
+                    flags[parent_id] = seen | side
+
+        return None
 
     def create_tag(
         self,
@@ -572,5 +871,45 @@ class WorkflowVersionControl:
         finally:
             conn.close()
 
+class _CommitGraph:
+    """Commit parents and generations for a merge-base walk, fetched a window of generations at a time"""
+
+    def __init__(self, cursor: sqlite3.Cursor, workflow_id: str, window: Optional[int] = None):
+        self.cursor = cursor
+        self.workflow_id = workflow_id
+        self.window = window or ANCESTRY_WINDOW
+        # commit id -> (generation, parent ids)
+        self.commits: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+
+    def _add(self, rows):
+        for commit_id, parent_id, merge_parent_id, generation in rows:
+            parents = tuple(p for p in (parent_id, merge_parent_id) if p)
+            self.commits[commit_id] = (generation if generation is not None else 0, parents)
+
+    def _fetch(self, commit_id: str):
+        self.cursor.execute(
+            "SELECT id, parent_commit_id, merge_parent_id, generation FROM commits WHERE id = ? AND workflow_id = ?",
+            (commit_id, self.workflow_id)
+        )
+        rows = self.cursor.fetchall()
+        self._add(rows)
+        if rows and rows[0][3] is not None:
+            # The commits just below it are likely next
+            generation = rows[0][3]
+            self.cursor.execute("""
+                SELECT id, parent_commit_id, merge_parent_id, generation FROM commits
+                WHERE workflow_id = ? AND generation BETWEEN ? AND ?
+            """, (self.workflow_id, max(0, generation - self.window), generation - 1))
+            self._add(self.cursor.fetchall())
+
+    def generation(self, commit_id: str) -> Optional[int]:
+        if commit_id not in self.commits:
+            self._fetch(commit_id)
+        entry = self.commits.get(commit_id)
+        return entry[0] if entry else None
+
+    def parents(self, commit_id: str) -> Tuple[str, ...]:
+        return self.commits[commit_id][1]
+
 # Singleton instance
 version_control = WorkflowVersionControl()
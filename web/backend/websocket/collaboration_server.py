@@ -1,12 +1,72 @@
 """
 Enhancement 9: Real-time Collaboration WebSocket Server
 Handles real-time collaboration, presence, cursor sync, and node locking
+
+Every message to a client goes through that connection's bounded send
+queue, drained by its own writer task, so one slow client never delays
+the others. A broadcast is JSON-encoded once and queued for every
+recipient. A client whose queue fills up, or whose send stalls, is
+disconnected and its peers are told it left.
 """
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, Set, Optional, List
 from datetime import datetime
 import json
 import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Messages waiting for one client before it counts as too slow to keep up
+COLLAB_SEND_QUEUE_SIZE = int(os.getenv('COLLAB_SEND_QUEUE_SIZE', '256'))
+# Seconds a single send may take before the client is dropped (checked when queuing to it)
+COLLAB_SEND_TIMEOUT_SECONDS = float(os.getenv('COLLAB_SEND_TIMEOUT_SECONDS', '5'))
+
+SLOW_CONSUMER_CLOSE_CODE = 1008
+CLOSE_TIMEOUT_SECONDS = 1.0
+
+
+class _Outbox:
+    """Bounded send queue of one connection and the task writing it to the socket"""
+
+    def __init__(self, websocket: WebSocket, manager: 'CollaborationManager', size: int):
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        # Loop time the send in progress started (None between sends)
+        self.sending_since: Optional[float] = None
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, text: str, now: float) -> bool:
+        """Queue an encoded message; False if the client is not keeping up"""
+        if self.sending_since is not None and now - self.sending_since > COLLAB_SEND_TIMEOUT_SECONDS:
+            return False
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            text = await self.queue.get()
+            self.sending_since = loop.time()
+            try:
+                await self.websocket.send_text(text)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await self.manager.evict(self.websocket, 'connection lost', close=False)
+                return
+            self.sending_since = None
+            self.manager.messages_sent += 1
+
+    def stop(self):
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
 
 class CollaborationManager:
     """
@@ -20,7 +80,9 @@ class CollaborationManager:
     - Active users list
     """
 
-    def __init__(self):
+    def __init__(self, send_queue_size: int = COLLAB_SEND_QUEUE_SIZE):
+        self.send_queue_size = send_queue_size
+
         # workflow_id -> set of WebSocket connections
         self.active_connections: Dict[str, Set[WebSocket]] = {}
 
@@ -36,6 +98,16 @@ class CollaborationManager:
         # websocket -> user metadata
         self.connection_metadata: Dict[WebSocket, Dict] = {}
 
+        # websocket -> send queue and writer task
+        self.outboxes: Dict[WebSocket, _Outbox] = {}
+
+        # websocket -> task reading its messages (cancelled on eviction)
+        self.receivers: Dict[WebSocket, asyncio.Task] = {}
+
+        self.messages_broadcast = 0
+        self.messages_sent = 0
+        self.evictions = 0
+
     async def connect(
         self,
         websocket: WebSocket,
@@ -65,6 +137,7 @@ class CollaborationManager:
 
         # Add connection
         self.active_connections[workflow_id].add(websocket)
+        self.outboxes[websocket] = _Outbox(websocket, self, self.send_queue_size)
 
         # Store user info
         user_info = {
@@ -93,7 +166,7 @@ class CollaborationManager:
         )
 
         # Send current state to new user
-        await websocket.send_json({
+        await self.send(websocket, {
             'type': 'session_state',
             'data': {
                 'active_users': list(self.active_users[workflow_id].values()),
@@ -102,14 +175,34 @@ class CollaborationManager:
             }
         })
 
+    def attach_receiver(self, websocket: WebSocket, task: asyncio.Task):
+        """
+        Register the task reading a connection's messages
+
+        evict() cancels it, so the endpoint stops reading from a connection
+        it dropped even if the close handshake times out. A connection
+        already gone gets its task cancelled straight away.
+        """
+        if websocket in self.connection_metadata:
+            self.receivers[websocket] = task
+        else:
+            task.cancel()
+
     def disconnect(self, websocket: WebSocket):
         """Disconnect a user and cleanup"""
         if websocket not in self.connection_metadata:
             return
 
+        self.receivers.pop(websocket, None)
+
         metadata = self.connection_metadata[websocket]
         workflow_id = metadata['workflow_id']
         user_id = metadata['user_id']
+        locks_to_release = []
+
+        outbox = self.outboxes.pop(websocket, None)
+        if outbox is not None:
+            outbox.stop()
 
         # Remove connection
         if workflow_id in self.active_connections:
@@ -148,31 +241,73 @@ class CollaborationManager:
             'locks_released': locks_to_release
         }
 
+    async def send(self, websocket: WebSocket, message: Dict):
+        """Queue a message for one connection"""
+        outbox = self.outboxes.get(websocket)
+        if outbox is not None and not outbox.offer(json.dumps(message), asyncio.get_running_loop().time()):
+            await self.evict(websocket, 'too slow to keep up')
+
     async def broadcast(
         self,
         workflow_id: str,
         message: Dict,
         exclude: Optional[WebSocket] = None
     ):
-        """Broadcast message to all connections in a workflow"""
+        """Broadcast message to all connections in a workflow (encoded once, queued per connection)"""
         if workflow_id not in self.active_connections:
             return
 
-        # Remove dead connections
-        dead_connections = set()
+        text = json.dumps(message)
+        now = asyncio.get_running_loop().time()
+        self.messages_broadcast += 1
+
+        # Connections with a full send queue or a stalled send
+        slow_connections = []
 
         for connection in self.active_connections[workflow_id]:
-            if connection == exclude:
+            if connection is exclude:
                 continue
 
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead_connections.add(connection)
+            outbox = self.outboxes.get(connection)
+            if outbox is not None and not outbox.offer(text, now):
+                slow_connections.append(connection)
 
-        # Cleanup dead connections
-        for dead in dead_connections:
-            self.disconnect(dead)
+        for slow in slow_connections:
+            await self.evict(slow, 'too slow to keep up')
+
+    async def evict(self, websocket: WebSocket, reason: str, close: bool = True):
+        """Drop a connection that stopped keeping up (or failed), tell its peers it left and stop reading it"""
+        receiver = self.receivers.get(websocket)
+        disconnect_info = self.disconnect(websocket)
+        if not disconnect_info:
+            return
+
+        self.evictions += 1
+        logger.warning(
+            f"Dropped collaborator {disconnect_info['user_id']} from {disconnect_info['workflow_id']}: {reason}"
+        )
+        if close:
+            asyncio.create_task(self._close(websocket, reason))
+
+        await self.broadcast(
+            disconnect_info['workflow_id'],
+            {
+                'type': 'user_left',
+                'user_id': disconnect_info['user_id'],
+                'locks_released': disconnect_info['locks_released'],
+                'reason': reason
+            }
+        )
+
+        # Last: the receiver may be the task running this eviction
+        if receiver is not None:
+            receiver.cancel()
+
+    async def _close(self, websocket: WebSocket, reason: str):
+        try:
+            await asyncio.wait_for(websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason=reason), CLOSE_TIMEOUT_SECONDS)
+        except Exception:
+            pass
 
     async def handle_message(self, websocket: WebSocket, message: Dict):
         """
@@ -221,7 +356,7 @@ class CollaborationManager:
             node_id = message.get('node_id')
 
             if not node_id:
-                await websocket.send_json({
+                await self.send(websocket, {
                     'type': 'error',
                     'message': 'node_id required for node_lock'
                 })
@@ -232,7 +367,7 @@ class CollaborationManager:
                 locked_by = self.node_locks[workflow_id][node_id]
                 if locked_by != user_id:
                     # Already locked by someone else
-                    await websocket.send_json({
+                    await self.send(websocket, {
                         'type': 'lock_failed',
                         'node_id': node_id,
                         'locked_by': locked_by,
@@ -244,7 +379,7 @@ class CollaborationManager:
             self.node_locks[workflow_id][node_id] = user_id
 
             # Confirm to requester
-            await websocket.send_json({
+            await self.send(websocket, {
                 'type': 'lock_acquired',
                 'node_id': node_id
             })
@@ -304,7 +439,7 @@ class CollaborationManager:
                 self.active_users[workflow_id][user_id]['last_seen'] = datetime.utcnow().isoformat()
 
             # Send pong
-            await websocket.send_json({
+            await self.send(websocket, {
                 'type': 'pong',
                 'timestamp': datetime.utcnow().isoformat()
             })
@@ -334,5 +469,16 @@ class CollaborationManager:
         """Get all node locks for a workflow"""
         return self.node_locks.get(workflow_id, {}).copy()
 
+    def get_stats(self) -> Dict:
+        """Connections, queued and sent messages, and slow-consumer evictions"""
+        return {
+            'sessions': len(self.active_connections),
+            'connections': len(self.outboxes),
+            'queued': sum(outbox.queue.qsize() for outbox in self.outboxes.values()),
+            'sent': self.messages_sent,
+            'broadcasts': self.messages_broadcast,
+            'evictions': self.evictions
+        }
+
 # Singleton instance
 collaboration_manager = CollaborationManager()
@@ -4,5 +4,9 @@ Advanced workflow capabilities for GHL WHIZ
 """
 
 from .conditions import evaluate_condition, evaluate_condition_group, ConditionType, LogicOperator
+from .expressions import compile_condition_group, compile_template, compile_path, get_cache_stats
 
-__all__ = ['evaluate_condition', 'evaluate_condition_group', 'ConditionType', 'LogicOperator']
+__all__ = [
+    'evaluate_condition', 'evaluate_condition_group', 'ConditionType', 'LogicOperator',
+    'compile_condition_group', 'compile_template', 'compile_path', 'get_cache_stats'
+]
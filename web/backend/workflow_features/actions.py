@@ -3,9 +3,12 @@ Advanced Actions - Epic 12: Story 12.4
 HTTP requests, data transformations, and custom code execution
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from enum import Enum
 import json
+import string
+
+from .expressions import compile_path
 
 
 class ActionType(Enum):
@@ -94,9 +97,9 @@ class DataTransformer:
 
             elif operation == "filter":
                 # Filter array items
-                if isinstance(result, list):
-                    condition = transform.get("condition", {})
-                    result = [item for item in result if DataTransformer._check_condition(item, condition)]
+                if isinstance(result, list) and result:
+                    matches = DataTransformer._compile_condition(transform.get("condition", {}))
+                    result = [item for item in result if matches(item)]
 
             elif operation == "extract":
                 # Extract nested value
@@ -123,42 +126,183 @@ class DataTransformer:
 
         return result
 
+    @staticmethod
+    def stream(rows: Union[str, bytes, Iterable[Any]], transformations: List[Dict[str, Any]]) -> Iterator[Any]:
+        """Row by row, lazy transform of a large array or NDJSON (see TransformPipeline)"""
+        return stream_transform(rows, transformations)
+
     @staticmethod
     def _check_condition(item: Any, condition: Dict[str, Any]) -> bool:
         """Check if item matches condition"""
-        field = condition.get("field")
+        return DataTransformer._compile_condition(condition)(item)
+
+    @staticmethod
+    def _compile_condition(condition: Dict[str, Any]) -> Callable[[Any], bool]:
+        """Item predicate for a filter condition (equals / contains / greater_than; others match all)"""
+        get = DataTransformer._path_getter(condition.get("field"))
         operator = condition.get("operator")
         value = condition.get("value")
 
-        item_value = DataTransformer._get_nested_value(item, field)
-
         if operator == "equals":
-            return item_value == value
+            return lambda item: get(item) == value
         elif operator == "contains":
-            return value in str(item_value)
+            return lambda item: value in str(get(item))
         elif operator == "greater_than":
-            return float(item_value) > float(value)
+            try:
+                bound = float(value)
+            except (TypeError, ValueError):
+                return lambda item: float(get(item)) > float(value)
+            return lambda item: float(get(item)) > bound
 
-        return True
+        return lambda item: True
 
     @staticmethod
     def _get_nested_value(data: Any, path: str) -> Any:
         """Get nested value using dot notation"""
-        if not path:
-            return data
-
-        keys = path.split(".")
-        value = data
+        return DataTransformer._path_getter(path)(data)
 
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            elif isinstance(value, list) and key.isdigit():
-                value = value[int(key)]
+    @staticmethod
+    def _path_getter(path: str) -> Callable[[Any], Any]:
+        """Dot-notation getter with list indexes; an empty path is the data itself"""
+        if not path:
+            return lambda data: data
+        return compile_path(path, list_indexes=True)
+
+
+def compile_format(template: str, plain_fields_only: bool = False) -> Callable[[Dict[str, Any]], str]:
+    """
+    Row renderer for a "format" template (str.format syntax)
+
+    With plain_fields_only, only plain {name} fields are accepted: format
+    specs, conversions and attribute or index lookups raise ValueError when
+    compiling. Use it for templates from API clients, where "{a:>2000000000}"
+    or "{a.__class__}" would let them allocate gigabytes or walk attributes.
+    A missing field raises KeyError, as str.format does.
+    """
+    if not plain_fields_only:
+        return lambda values: template.format(**values)
+
+    parts: List[Tuple[str, Optional[str]]] = []
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid format template: {e}")
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append((literal, None))
+        if field is None:
+            continue
+        if spec or conversion or not field or field.isdigit() or '.' in field or '[' in field:
+            written = field + (f"!{conversion}" if conversion else '') + (f":{spec}" if spec else '')
+            raise ValueError(f"Unsupported format field '{{{written}}}': only {{name}} fields are allowed")
+        parts.append(('', field))
+
+    def render(values: Dict[str, Any]) -> str:
+        return ''.join(literal if field is None else str(values[field]) for literal, field in parts)
+
+    return render
+
+
+# A compiled per-row step: (is_filter, function). Filters return whether to
+# keep the row, other steps return the new row.
+TransformStep = Tuple[bool, Callable[[Any], Any]]
+
+
+def _compile_step(transform: Dict[str, Any], plain_format_fields: bool = False) -> Optional[TransformStep]:
+    """One transformation applied to a single row (None: leaves rows unchanged)"""
+    operation = transform.get("operation")
+
+    if operation == "map":
+        mapping = transform.get("mapping", {})
+        if not mapping:
+            return None
+        return False, lambda row: {mapping.get(k, k): v for k, v in row.items()} if isinstance(row, dict) else row
+
+    if operation == "filter":
+        return True, DataTransformer._compile_condition(transform.get("condition", {}))
+
+    if operation == "extract":
+        return False, DataTransformer._path_getter(transform.get("path", ""))
+
+    if operation == "format":
+        template = compile_format(transform.get("template", ""), plain_format_fields)
+        return False, lambda row: template(row) if isinstance(row, dict) else row
+
+    if operation == "split":
+        delimiter = transform.get("delimiter", ",")
+        return False, lambda row: row.split(delimiter) if isinstance(row, str) else row
+
+    if operation == "join":
+        delimiter = transform.get("delimiter", ",")
+        return False, lambda row: delimiter.join(str(x) for x in row) if isinstance(row, list) else row
+
+    return None
+
+
+class TransformPipeline:
+    """
+    Transformations applied lazily, row by row, to a stream of rows
+
+    Each row goes through every step in one pass (consecutive map/filter/...
+    steps are fused, no intermediate lists), and a filter that rejects a row
+    stops its remaining steps. Conditions and paths are compiled once, when
+    the pipeline is built. Rows are yielded as they are produced, so memory
+    does not grow with the input.
+
+    Every operation applies DataTransformer.transform's semantics to each
+    row, except filter, which drops the rows that do not match. With
+    plain_format_fields (untrusted transformations), "format" templates are
+    limited to plain {name} fields (see compile_format).
+    """
+
+    def __init__(self, transformations: List[Dict[str, Any]], plain_format_fields: bool = False):
+        self.transformations = transformations
+        self.steps: List[TransformStep] = [
+            step for step in (_compile_step(transform, plain_format_fields) for transform in transformations)
+            if step is not None
+        ]
+
+    def __call__(self, rows: Iterable[Any]) -> Iterator[Any]:
+        steps = self.steps
+        for row in rows:
+            for is_filter, step in steps:
+                if is_filter:
+                    if not step(row):
+                        break
+                else:
+                    row = step(row)
             else:
-                return None
-
-            if value is None:
-                return None
+                yield row
+
+
+def iter_ndjson(source: Union[str, bytes, Iterable[Union[str, bytes]]]) -> Iterator[Any]:
+    """
+    Parsed rows of NDJSON: a whole str/bytes document, or an iterable of lines
+    (e.g. an open file)
+
+    Blank lines are skipped; a line that is not JSON raises ValueError.
+    """
+    lines = source.splitlines() if isinstance(source, (str, bytes)) else source
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise ValueError(f"Line {line_number}: invalid JSON")
+
+
+def stream_transform(
+    rows: Union[str, bytes, Iterable[Any]],
+    transformations: List[Dict[str, Any]]
+) -> Iterator[Any]:
+    """
+    Lazily transform a stream of rows
+
+    rows is any iterable of rows (list, generator, iter_ndjson(...)); str or
+    bytes is parsed as NDJSON.
+    """
+    if isinstance(rows, (str, bytes)):
+        rows = iter_ndjson(rows)
+    return TransformPipeline(transformations)(rows)
 
-        return value
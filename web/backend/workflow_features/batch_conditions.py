@@ -0,0 +1,176 @@
+"""
+Batch Condition Evaluation - Epic 12
+Evaluates one compiled condition group over many contexts, column by column
+
+Each rule pulls its field out of every still-undecided context into a
+column and tests the whole column at once:
+- greater_than / less_than: the column is converted to a float64 array and
+  compared in numpy (missing or non-numeric values become NaN and fail)
+- equals / not_equals / contains / not_contains: one tight loop over the
+  column, no per-row rule dispatch or exception handling
+- anything else (or a column the fast path cannot handle): the rule's
+  compiled scalar test per value, which has exactly the single-context
+  semantics
+
+AND groups only look at rows that are still True, OR groups only at rows
+that are still False, so later rules touch fewer rows.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import base64
+
+import numpy as np
+
+from .expressions import CompiledCondition, CompiledConditionGroup, ConditionType, LogicOperator, compile_path
+
+# Contexts per evaluation chunk (bounds memory for streamed input)
+BATCH_CHUNK_SIZE = 5000
+
+# Contexts per request: JSON body / NDJSON stream
+MAX_BATCH_CONTEXTS = 100000
+MAX_STREAM_CONTEXTS = 1000000
+
+OUTPUT_FORMATS = ('ids', 'indexes', 'bitmap')
+
+
+def _to_float(value: Any) -> float:
+    """float(value), or NaN where float() fails (NaN compares False)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError, OverflowError):
+        return np.nan
+
+
+def _vector_column(rule: CompiledCondition, values: List[Any]) -> Optional[np.ndarray]:
+    """Vectorized test of a column, or None when the fast path does not apply"""
+    operator = rule.operator
+    expected = rule.expected
+    size = len(values)
+
+    if operator in (ConditionType.GREATER_THAN, ConditionType.LESS_THAN):
+        try:
+            bound = float(expected)
+        except (TypeError, ValueError, OverflowError):
+            return np.zeros(size, dtype=bool)
+        try:
+            numbers = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError, OverflowError):
+            numbers = None
+        if numbers is None or numbers.shape != (size,):
+            numbers = np.fromiter((_to_float(value) for value in values), dtype=np.float64, count=size)
+        with np.errstate(invalid='ignore'):
+            return numbers > bound if operator == ConditionType.GREATER_THAN else numbers < bound
+
+    if operator == ConditionType.EQUALS:
+        column = [value == expected for value in values]
+    elif operator == ConditionType.NOT_EQUALS:
+        column = [value != expected for value in values]
+    elif operator == ConditionType.CONTAINS and isinstance(expected, str):
+        column = [value is not None and expected in str(value) for value in values]
+    elif operator == ConditionType.NOT_CONTAINS and isinstance(expected, str):
+        column = [value is None or expected not in str(value) for value in values]
+    else:
+        return None
+
+    column = np.array(column, dtype=bool)
+    return column if column.shape == (size,) else None
+
+
+def evaluate_column(rule: CompiledCondition, contexts: List[Any]) -> np.ndarray:
+    """Boolean column of one rule over `contexts`"""
+    if rule.operator is None:
+        return np.zeros(len(contexts), dtype=bool)
+
+    get = rule.get
+    values = [get(context) for context in contexts]
+    try:
+        column = _vector_column(rule, values)
+    except Exception:
+        # e.g. a value whose == returns something without a truth value
+        column = None
+    if column is None:
+        test = rule.test
+        column = np.array([bool(test(value)) for value in values], dtype=bool)
+    return column
+
+
+def evaluate_batch(group: CompiledConditionGroup, contexts: List[Any]) -> np.ndarray:
+    """Boolean mask: row i is True if contexts[i] passes the group"""
+    size = len(contexts)
+    if not group.conditions:
+        return np.ones(size, dtype=bool)
+    if group.operator is None:
+        return np.zeros(size, dtype=bool)
+
+    is_or = group.operator == LogicOperator.OR
+    mask = np.zeros(size, dtype=bool) if is_or else np.ones(size, dtype=bool)
+
+    for rule in group.rules:
+        # Rows this rule can still change
+        rows = np.flatnonzero(~mask if is_or else mask)
+        if not len(rows):
+            break
+        if len(rows) == size:
+            mask = evaluate_column(rule, contexts) if is_or else mask & evaluate_column(rule, contexts)
+        else:
+            mask[rows] = evaluate_column(rule, [contexts[i] for i in rows])
+
+    return mask
+
+
+def encode_bitmap(mask: np.ndarray) -> str:
+    """Base64 of the mask packed 8 rows per byte; row i is bit (i % 8) of byte i // 8"""
+    return base64.b64encode(np.packbits(mask, bitorder='little').tobytes()).decode('ascii')
+
+
+class BatchConditionEvaluator:
+    """Accumulates matches of one condition group over chunks of contexts"""
+
+    def __init__(self, group: CompiledConditionGroup, output: str = 'ids', id_field: str = 'id'):
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"output must be one of {', '.join(OUTPUT_FORMATS)}")
+        self.group = group
+        self.output = output
+        self.get_id = compile_path(id_field)
+        self.total = 0
+        self.matched = 0
+        self._ids: List[Any] = []
+        self._indexes: List[np.ndarray] = []
+        self._masks: List[np.ndarray] = []
+
+    def add(self, contexts: List[Any]):
+        """Evaluate the next chunk of contexts"""
+        mask = evaluate_batch(self.group, contexts)
+        rows = np.flatnonzero(mask)
+
+        if self.output == 'ids':
+            get_id = self.get_id
+            self._ids.extend(get_id(contexts[i]) for i in rows)
+        elif self.output == 'indexes':
+            self._indexes.append(rows + self.total)
+        else:
+            self._masks.append(mask)
+
+        self.total += len(contexts)
+        self.matched += len(rows)
+
+    def add_all(self, contexts: Iterable[Any], chunk_size: int = BATCH_CHUNK_SIZE):
+        chunk = []
+        for context in contexts:
+            chunk.append(context)
+            if len(chunk) >= chunk_size:
+                self.add(chunk)
+                chunk = []
+        if chunk:
+            self.add(chunk)
+
+    def result(self) -> Dict[str, Any]:
+        result = {'total': self.total, 'matched': self.matched, 'output': self.output}
+        if self.output == 'ids':
+            result['ids'] = self._ids
+        elif self.output == 'indexes':
+            result['indexes'] = np.concatenate(self._indexes).tolist() if self._indexes else []
+        else:
+            mask = np.concatenate(self._masks) if self._masks else np.zeros(0, dtype=bool)
+            result['bitmap'] = encode_bitmap(mask)
+        return result
@@ -0,0 +1,412 @@
+"""
+Expression Compiler - Epic 12
+Compiles condition groups and {{variable}} templates into cached callables
+
+Conditions, triggers, data transforms, the workflow simulator and the
+/evaluate-condition endpoint all evaluate the same small expressions over
+and over. Compiling once resolves operators, pre-splits dot paths, converts
+numeric bounds and compiles regexes, so each evaluation is a handful of dict
+lookups and one comparison.
+
+Compiled objects live in LRU caches:
+- condition groups keyed by their canonical JSON (sort_keys)
+- templates keyed by their text
+- dot paths keyed by the path string
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from enum import Enum
+from functools import lru_cache
+import copy
+import json
+import re
+import threading
+
+CONDITION_CACHE_SIZE = 2048
+TEMPLATE_CACHE_SIZE = 2048
+PATH_CACHE_SIZE = 4096
+
+# {{ variable.path }} reference; the name is stripped of surrounding spaces
+TEMPLATE_TOKEN = re.compile(r'\{\{([^}]+)\}\}')
+
+Getter = Callable[[Any], Any]
+Predicate = Callable[[Any], bool]
+
+
+class ConditionType(Enum):
+    """Available condition operators"""
+    EQUALS = "equals"
+    NOT_EQUALS = "not_equals"
+    CONTAINS = "contains"
+    NOT_CONTAINS = "not_contains"
+    GREATER_THAN = "greater_than"
+    LESS_THAN = "less_than"
+    STARTS_WITH = "starts_with"
+    ENDS_WITH = "ends_with"
+    IS_EMPTY = "is_empty"
+    IS_NOT_EMPTY = "is_not_empty"
+    MATCHES_REGEX = "matches_regex"
+
+
+class LogicOperator(Enum):
+    """Logical operators for combining conditions"""
+    AND = "and"
+    OR = "or"
+
+
+def _none(data: Any) -> None:
+    return None
+
+
+def _always_false(context: Any) -> bool:
+    return False
+
+
+def _always_true(context: Any) -> bool:
+    return True
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _compile_keys(keys: Tuple[str, ...], list_indexes: bool) -> Getter:
+    """Getter walking `keys` through nested dicts (and lists, if enabled)"""
+    if len(keys) == 1 and not list_indexes:
+        key = keys[0]
+
+        def get_one(data: Any) -> Any:
+            return data.get(key) if isinstance(data, dict) else None
+        return get_one
+
+    def get(data: Any) -> Any:
+        value = data
+        for key in keys:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif list_indexes and isinstance(value, list) and key.isdigit():
+                value = value[int(key)]
+            else:
+                return None
+            if value is None:
+                return None
+        return value
+    return get
+
+
+def compile_path(path: Optional[str], list_indexes: bool = False) -> Getter:
+    """
+    Getter for a dot-notation path, e.g. "contact.email"
+
+    Missing keys, non-dict intermediates and an empty path yield None. With
+    list_indexes, numeric segments index into lists ("items.0.sku").
+    """
+    if not path:
+        return _none
+    return _compile_keys(tuple(path.split(".")), list_indexes)
+
+
+def _compile_test(operator: ConditionType, expected: Any) -> Predicate:
+    """Comparison of an actual value against `expected`"""
+    if operator == ConditionType.EQUALS:
+        return lambda actual: actual == expected
+
+    if operator == ConditionType.NOT_EQUALS:
+        return lambda actual: actual != expected
+
+    if operator == ConditionType.CONTAINS:
+        return lambda actual: False if actual is None else expected in str(actual)
+
+    if operator == ConditionType.NOT_CONTAINS:
+        return lambda actual: True if actual is None else expected not in str(actual)
+
+    if operator in (ConditionType.GREATER_THAN, ConditionType.LESS_THAN):
+        try:
+            bound = float(expected)
+        except (TypeError, ValueError):
+            return _always_false
+        greater = operator == ConditionType.GREATER_THAN
+
+        def compare(actual: Any) -> bool:
+            try:
+                number = float(actual)
+            except (TypeError, ValueError):
+                return False
+            return number > bound if greater else number < bound
+        return compare
+
+    if operator in (ConditionType.STARTS_WITH, ConditionType.ENDS_WITH):
+        affix = str(expected)
+        if operator == ConditionType.STARTS_WITH:
+            return lambda actual: False if actual is None else str(actual).startswith(affix)
+        return lambda actual: False if actual is None else str(actual).endswith(affix)
+
+    if operator == ConditionType.IS_EMPTY:
+        return lambda actual: not actual or actual == "" or actual == []
+
+    if operator == ConditionType.IS_NOT_EMPTY:
+        return lambda actual: bool(actual) and actual != "" and actual != []
+
+    if operator == ConditionType.MATCHES_REGEX:
+        try:
+            pattern = re.compile(str(expected))
+        except re.error:
+            return _always_false
+        return lambda actual: False if actual is None else bool(pattern.match(str(actual)))
+
+    return _always_false
+
+
+class CompiledCondition:
+    """
+    One {"field", "operator", "value"} condition, compiled
+
+    Unknown operators fall back to equals; any error while compiling or
+    evaluating makes the condition False. `operator` is None if the
+    condition could not be compiled.
+    """
+
+    def __init__(self, condition: Dict[str, Any]):
+        self.condition = condition
+        self.get: Getter = _none
+        self.operator: Optional[ConditionType] = None
+        self.expected: Any = None
+
+        try:
+            self.get = compile_path(condition.get("field", ""))
+            operator_str = condition.get("operator", "equals")
+            try:
+                operator = ConditionType(operator_str)
+            except ValueError:
+                operator = ConditionType.EQUALS
+            self.expected = condition.get("value")
+            compiled_test = _compile_test(operator, self.expected)
+            self.operator = operator
+        except Exception as e:
+            print(f"Error evaluating condition: {e}")
+            compiled_test = _always_false
+
+        get = self.get
+
+        def test(actual: Any) -> bool:
+            try:
+                return bool(compiled_test(actual))
+            except Exception as e:
+                print(f"Error evaluating condition: {e}")
+                return False
+
+        def evaluate(context: Any) -> bool:
+            try:
+                return bool(compiled_test(get(context)))
+            except Exception as e:
+                print(f"Error evaluating condition: {e}")
+                return False
+
+        # value -> bool and context -> bool
+        self.test: Predicate = test
+        self.evaluate: Predicate = evaluate
+
+    def __call__(self, context: Any) -> bool:
+        return self.evaluate(context)
+
+
+def compile_condition(condition: Dict[str, Any]) -> Predicate:
+    """Compile one condition into context -> bool"""
+    return CompiledCondition(condition).evaluate
+
+
+class CompiledConditionGroup:
+    """A list of conditions joined by AND/OR, ready to evaluate"""
+
+    def __init__(self, conditions: List[Dict[str, Any]], logic_operator: Any = "and"):
+        self.conditions = conditions
+        self.logic_operator = logic_operator
+        self.rules: List[CompiledCondition] = []
+        self.operator: Optional[LogicOperator] = None
+
+        if not conditions:
+            self._evaluate = _always_true
+            return
+
+        try:
+            try:
+                operator = LogicOperator(logic_operator.lower())
+            except ValueError:
+                operator = LogicOperator.AND
+            rules = [CompiledCondition(cond) for cond in conditions]
+        except Exception as e:
+            print(f"Error evaluating condition group: {e}")
+            self._evaluate = _always_false
+            return
+
+        self.operator = operator
+        self.rules = rules
+        predicates = [rule.evaluate for rule in self.rules]
+        if operator == LogicOperator.OR:
+            self._evaluate = lambda context: any(predicate(context) for predicate in predicates)
+        else:
+            self._evaluate = lambda context: all(predicate(context) for predicate in predicates)
+
+    def __call__(self, context: Any) -> bool:
+        return self._evaluate(context)
+
+
+class CompiledTemplate:
+    """Text split once into literal chunks and {{variable}} slots"""
+
+    def __init__(self, text: Optional[str], ignore_case: bool = False, token: re.Pattern = TEMPLATE_TOKEN):
+        self.text = text
+        # (raw text, variable name or None for literals, getter)
+        self.parts: List[Tuple[str, Optional[str], Optional[Getter]]] = []
+
+        if not text:
+            return
+        position = 0
+        for match in token.finditer(text):
+            name = match.group(1).strip()
+            if ignore_case:
+                name = name.lower()
+            self.parts.append((text[position:match.start()], None, None))
+            self.parts.append((match.group(0), name, compile_path(name)))
+            position = match.end()
+        if self.parts:
+            self.parts.append((text[position:], None, None))
+
+    @property
+    def has_variables(self) -> bool:
+        return bool(self.parts)
+
+    @property
+    def variables(self) -> List[str]:
+        return [name for _, name, _ in self.parts if name is not None]
+
+    def render(self, context: Any) -> Optional[str]:
+        """Fill variables from a nested context; unresolved {{tokens}} are left as written"""
+        if not self.parts:
+            return self.text
+        out = []
+        for raw, name, get in self.parts:
+            if name is None:
+                out.append(raw)
+                continue
+            value = get(context)
+            out.append(raw if value is None else str(value))
+        return ''.join(out)
+
+    def render_flat(self, values: Dict[str, Any]) -> Optional[str]:
+        """Fill variables from a flat {"contact.name": ...} mapping"""
+        if not self.parts:
+            return self.text
+        out = []
+        for raw, name, _ in self.parts:
+            out.append(raw if name is None or name not in values else str(values[name]))
+        return ''.join(out)
+
+
+class ExpressionCache:
+    """Thread-safe LRU of compiled expressions with hit/miss counters"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, key: Any, compile_fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = compile_fn()
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+_condition_cache = ExpressionCache(CONDITION_CACHE_SIZE)
+_template_cache = ExpressionCache(TEMPLATE_CACHE_SIZE)
+
+
+def _json_default(value: Any) -> str:
+    return f"<{type(value).__name__}:{value!r}>"
+
+
+def condition_group_key(conditions: List[Dict[str, Any]], logic_operator: Any = "and") -> str:
+    """Canonical JSON of a condition group (the compile cache key)"""
+    return json.dumps([logic_operator, conditions], sort_keys=True, default=_json_default)
+
+
+def compile_condition_group(conditions: List[Dict[str, Any]], logic_operator: Any = "and") -> CompiledConditionGroup:
+    """Compiled condition group, shared through the LRU cache"""
+    if not conditions:
+        return CompiledConditionGroup([], logic_operator)
+    try:
+        key = condition_group_key(conditions, logic_operator)
+    except (TypeError, ValueError):
+        # Unserializable (e.g. circular) input: compile without caching
+        return CompiledConditionGroup(conditions, logic_operator)
+
+    def compile_snapshot() -> CompiledConditionGroup:
+        # Cached entries must not see later mutations of the caller's dicts
+        try:
+            snapshot = copy.deepcopy(conditions)
+        except Exception:
+            snapshot = conditions
+        return CompiledConditionGroup(snapshot, logic_operator)
+
+    return _condition_cache.get_or_compile(key, compile_snapshot)
+
+
+def compile_template(
+    text: Optional[str],
+    ignore_case: bool = False,
+    token: re.Pattern = TEMPLATE_TOKEN
+) -> CompiledTemplate:
+    """
+    Compiled template, shared through the LRU cache
+
+    `token` must capture the variable name in group 1; ignore_case lower-cases
+    the names (for lookups against lower-cased keys).
+    """
+    if not text:
+        return CompiledTemplate(text, ignore_case, token)
+    return _template_cache.get_or_compile(
+        (text, ignore_case, token.pattern),
+        lambda: CompiledTemplate(text, ignore_case, token)
+    )
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Size and hit/miss counters of the expression caches"""
+    path_info = _compile_keys.cache_info()
+    return {
+        'conditions': _condition_cache.stats(),
+        'templates': _template_cache.stats(),
+        'paths': {
+            'size': path_info.currsize,
+            'max_size': path_info.maxsize,
+            'hits': path_info.hits,
+            'misses': path_info.misses
+        }
+    }
+
+
+def clear_caches():
+    _condition_cache.clear()
+    _template_cache.clear()
+    _compile_keys.cache_clear()
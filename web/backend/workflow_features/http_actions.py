@@ -0,0 +1,548 @@
+"""
+HTTP Request Actions - Epic 12: Story 12.4
+Executes http_request actions on a shared async HTTP client
+
+- One httpx.AsyncClient (keep-alive pool) for every action, plus a limit on
+  concurrent requests per host so one slow API cannot take every connection
+- A limit on concurrent requests per workflow
+- Retries with full-jitter exponential backoff on connection errors and
+  429/502/503/504 (idempotent methods only, unless the action opts in)
+- Optional TTL cache of GET responses, keyed by method, URL, headers and body
+- Step timings reported to a MetricsCollector when run inside an execution
+- Destinations limited to public addresses (checked for every connection,
+  after DNS resolution) and, optionally, to an allowlist of hosts
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Executor
+from functools import partial
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import os
+import random
+import socket
+import time
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+
+from .actions import Action, ActionType
+from .expressions import compile_template
+
+logger = logging.getLogger(__name__)
+
+# Connections kept by the shared client / concurrent requests per host and per workflow
+HTTP_ACTION_MAX_CONNECTIONS = int(os.getenv('HTTP_ACTION_MAX_CONNECTIONS', '100'))
+HTTP_ACTION_MAX_PER_HOST = int(os.getenv('HTTP_ACTION_MAX_PER_HOST', '10'))
+HTTP_ACTION_MAX_PER_WORKFLOW = int(os.getenv('HTTP_ACTION_MAX_PER_WORKFLOW', '20'))
+
+# Hosts actions may call ("api.example.com", "*.example.com"); empty allows any public host
+HTTP_ACTION_ALLOWED_HOSTS = [
+    host.strip().lower() for host in os.getenv('HTTP_ACTION_ALLOWED_HOSTS', '').split(',') if host.strip()
+]
+# Allow loopback, private, link-local and other non-public addresses (trusted deployments only)
+HTTP_ACTION_ALLOW_PRIVATE_NETWORKS = os.getenv('HTTP_ACTION_ALLOW_PRIVATE_NETWORKS', 'false').lower() == 'true'
+
+# Largest response body read into an action result (larger responses fail the action)
+HTTP_ACTION_MAX_RESPONSE_BYTES = int(os.getenv('HTTP_ACTION_MAX_RESPONSE_BYTES', str(10 * 1024 * 1024)))
+
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_RETRIES = 2
+# Action configs may lower these, never raise them
+MIN_TIMEOUT_SECONDS = 0.1
+MAX_TIMEOUT_SECONDS = 120.0
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 10.0
+
+RESPONSE_CACHE_SIZE = 1000
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+CACHEABLE_METHODS = ('GET', 'HEAD')
+RETRY_STATUSES = (429, 502, 503, 504)
+ALLOWED_SCHEMES = ('http', 'https')
+
+
+class DestinationNotAllowed(ValueError):
+    """The request would go to a host or address actions may not call"""
+
+
+class ResponseTooLarge(Exception):
+    """The response body is over the executor's max_response_bytes"""
+
+
+def _is_public(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    # Not global: loopback, private, link-local (cloud metadata), shared, reserved...
+    return ip.is_global and not ip.is_multicast
+
+
+def _host_allowed(host: str, allowed_hosts: Iterable[str]) -> bool:
+    for pattern in allowed_hosts:
+        if pattern.startswith('*.') and host.endswith(pattern[1:]):
+            return True
+        if host == pattern:
+            return True
+    return False
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """value limited to [low, high] (NaN gives low)"""
+    return min(high, max(low, value))
+
+
+class _PublicAddressBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that resolves each host itself and only connects to public addresses
+
+    The check happens when the connection is opened, to the address actually
+    connected to, so DNS answers that change between a check and the connect
+    (rebinding) cannot reach internal services.
+
+    httpx has no public option for a network backend, so _transport installs
+    this on the transport's httpcore pool (a private attribute). httpx and
+    httpcore are pinned in requirements.txt for that reason; _transport
+    refuses to build a client if the pool no longer has the attribute, rather
+    than connecting unchecked. Re-check both after upgrading either package.
+    """
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM),
+                timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise httpcore.ConnectError(f"Cannot resolve {host}: {e}")
+
+        addresses: List[str] = list(dict.fromkeys(info[4][0] for info in infos))
+        blocked = [address for address in addresses if not _is_public(address)]
+        if blocked or not addresses:
+            raise DestinationNotAllowed(f"{host} resolves to a non-public address ({', '.join(blocked)})")
+
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Iterable] = None):
+        raise DestinationNotAllowed("Unix sockets are not allowed")
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+class _KeyedLimiter:
+    """A semaphore per key (host, workflow id), dropped once nobody holds or waits on it"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        # key -> [semaphore, holders + waiters]
+        self._entries: Dict[str, list] = {}
+
+    async def acquire(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [asyncio.Semaphore(self.limit), 0]
+        entry[1] += 1
+        try:
+            await entry[0].acquire()
+        except BaseException:
+            self._done(key, entry)
+            raise
+
+    def release(self, key: str):
+        entry = self._entries[key]
+        entry[0].release()
+        self._done(key, entry)
+
+    def _done(self, key: str, entry: list):
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ResponseCache:
+    """LRU of action results with a per-entry TTL"""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> str:
+        """
+        Cache key of a request
+
+        Request headers are part of it: a response fetched with one caller's
+        Authorization (or cookie, API key, Accept...) is only served to
+        requests sending the same headers.
+        """
+        digest = hashlib.sha256()
+        for name, value in sorted((name.lower(), value) for name, value in headers.items()):
+            digest.update(f"{name}:{value}\n".encode('utf-8'))
+        digest.update(b'\n' + (body or b''))
+        return f"{method} {url} {digest.hexdigest()}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, result: Dict[str, Any], ttl_seconds: float):
+        self._entries[key] = (time.monotonic() + ttl_seconds, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+def _render(value: Any, context: Optional[Dict[str, Any]]) -> Any:
+    """Fill {{variables}} in strings (recursively in dicts and lists)"""
+    if context is None:
+        return value
+    if isinstance(value, str):
+        return compile_template(value).render(context)
+    if isinstance(value, dict):
+        return {k: _render(v, context) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, context) for v in value]
+    return value
+
+
+def _backoff_seconds(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Retry-After when the server sent one, else full jitter: uniform(0, base * 2^attempt)"""
+    if response is not None:
+        retry_after = response.headers.get('retry-after', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class HttpActionExecutor:
+    """Runs http_request actions; share one instance per process"""
+
+    def __init__(
+        self,
+        metrics_collector: Any = None,
+        max_connections: int = HTTP_ACTION_MAX_CONNECTIONS,
+        max_per_host: int = HTTP_ACTION_MAX_PER_HOST,
+        max_per_workflow: int = HTTP_ACTION_MAX_PER_WORKFLOW,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        allowed_hosts: Optional[Iterable[str]] = None,
+        allow_private_networks: bool = HTTP_ACTION_ALLOW_PRIVATE_NETWORKS,
+        metrics_executor: Optional[Executor] = None,
+        max_response_bytes: int = HTTP_ACTION_MAX_RESPONSE_BYTES
+    ):
+        """
+        Args:
+            metrics_collector: MetricsCollector receiving start_step/complete_step
+            max_connections: Connections kept by the shared client
+            max_per_host: Concurrent requests to one host
+            max_per_workflow: Concurrent requests from one workflow
+            transport: httpx transport override (e.g. httpx.MockTransport; skips the address check)
+            allowed_hosts: Hosts actions may call (None: HTTP_ACTION_ALLOWED_HOSTS; empty: any)
+            allow_private_networks: Also connect to non-public addresses
+            metrics_executor: Executor running the step metric calls, which may
+                write to SQLite (None: the loop's default executor)
+            max_response_bytes: Largest response body read; larger ones raise ResponseTooLarge
+        """
+        self.metrics_collector = metrics_collector
+        self.metrics_executor = metrics_executor
+        self.max_connections = max_connections
+        self.transport = transport
+        self.allowed_hosts = [host.lower() for host in (HTTP_ACTION_ALLOWED_HOSTS if allowed_hosts is None else allowed_hosts)]
+        self.allow_private_networks = allow_private_networks
+        self.max_response_bytes = max_response_bytes
+        self.cache = ResponseCache()
+        self._hosts = _KeyedLimiter(max_per_host)
+        self._workflows = _KeyedLimiter(max_per_workflow)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.blocked = 0
+
+    def _transport(self, limits: httpx.Limits) -> Optional[httpx.AsyncBaseTransport]:
+        if self.transport is not None or self.allow_private_networks:
+            return self.transport
+        transport = httpx.AsyncHTTPTransport(limits=limits)
+        # httpx has no option for a custom network backend; its pool takes one
+        # (private; see _PublicAddressBackend)
+        pool = getattr(transport, '_pool', None)
+        if not isinstance(pool, httpcore.AsyncConnectionPool) or not hasattr(pool, '_network_backend'):
+            raise RuntimeError(
+                "Cannot install the public-address check on this httpx/httpcore version; "
+                "use the versions pinned in requirements.txt"
+            )
+        pool._network_backend = _PublicAddressBackend()
+        return transport
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client, created on first use (inside the running event loop)"""
+        if self._client is None or self._client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                timeout=DEFAULT_TIMEOUT_SECONDS,
+                transport=self._transport(limits),
+                # Redirects are returned to the action, not followed
+                follow_redirects=False
+            )
+        return self._client
+
+    def _check_destination(self, url: str):
+        """Scheme and host allowlist; the address itself is checked when connecting"""
+        parsed = urlsplit(url)
+        if parsed.scheme.lower() not in ALLOWED_SCHEMES:
+            raise DestinationNotAllowed(f"Only http and https URLs are allowed: {url}")
+        host = (parsed.hostname or '').lower()
+        if not host:
+            raise DestinationNotAllowed(f"URL has no host: {url}")
+        if self.allowed_hosts and not _host_allowed(host, self.allowed_hosts):
+            raise DestinationNotAllowed(f"Host {host} is not in HTTP_ACTION_ALLOWED_HOSTS")
+
+    def _prepare(self, config: Dict[str, Any], context: Optional[Dict[str, Any]]) -> Tuple[str, str, Dict, Optional[bytes]]:
+        method = str(config.get('method', 'GET')).upper()
+        url = _render(config.get('url', ''), context)
+        params = config.get('params')
+        if params:
+            url = str(httpx.URL(url, params=_render(params, context)))
+        headers = {str(k): str(v) for k, v in _render(config.get('headers') or {}, context).items()}
+
+        body = config.get('body')
+        if body is None:
+            content = None
+        elif isinstance(body, (dict, list)):
+            content = json.dumps(_render(body, context)).encode('utf-8')
+            headers.setdefault('Content-Type', 'application/json')
+        else:
+            content = str(_render(body, context)).encode('utf-8')
+        return method, url, headers, content
+
+    @staticmethod
+    async def _read_body(response: httpx.Response, max_bytes: int) -> bytes:
+        """Read a streamed response body, aborting once it is over max_bytes"""
+        length = response.headers.get('content-length', '')
+        if length.isdigit() and int(length) > max_bytes:
+            raise ResponseTooLarge(f"Response body is {length} bytes (max {max_bytes})")
+        chunks = []
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > max_bytes:
+                raise ResponseTooLarge(f"Response body is over {max_bytes} bytes")
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def _result(response: httpx.Response, content: bytes, attempts: int, started: float) -> Dict[str, Any]:
+        text = content.decode(response.encoding or 'utf-8', errors='replace')
+        body: Any = text
+        if 'json' in response.headers.get('content-type', ''):
+            try:
+                body = json.loads(text)
+            except ValueError:
+                pass
+        return {
+            'status': response.status_code,
+            'ok': response.is_success,
+            'headers': dict(response.headers),
+            'body': body,
+            'attempts': attempts,
+            'cached': False,
+            'durationMs': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    async def _send(self, config: Dict[str, Any], method: str, url: str, headers: Dict, content: Optional[bytes]) -> Dict[str, Any]:
+        """Send with retries, holding a per-host slot for each attempt"""
+        host = urlsplit(url).netloc
+        retries = int(_clamp(int(config.get('retries', DEFAULT_RETRIES)), 0, MAX_RETRIES))
+        can_retry = method in IDEMPOTENT_METHODS or config.get('retryNonIdempotent', False)
+        timeout = _clamp(float(config.get('timeout', DEFAULT_TIMEOUT_SECONDS)), MIN_TIMEOUT_SECONDS, MAX_TIMEOUT_SECONDS)
+        started = time.perf_counter()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            response = None
+            body: Optional[bytes] = None
+            error: Optional[Exception] = None
+            await self._hosts.acquire(host)
+            try:
+                self.requests += 1
+                request = self.client.build_request(method, url, headers=headers, content=content, timeout=timeout)
+                response = await self.client.send(request, stream=True)
+                try:
+                    # A response that will be retried is discarded unread
+                    if not (can_retry and attempt <= retries and response.status_code in RETRY_STATUSES):
+                        body = await self._read_body(response, self.max_response_bytes)
+                finally:
+                    await response.aclose()
+            except httpx.TransportError as e:
+                error = e
+            finally:
+                self._hosts.release(host)
+
+            retryable = error is not None or body is None
+            if not retryable or not can_retry or attempt > retries:
+                if error is not None:
+                    raise error
+                return self._result(response, body, attempt, started)
+
+            self.retries += 1
+            await asyncio.sleep(_backoff_seconds(attempt - 1, response))
+
+    async def execute(
+        self,
+        action: Action,
+        context: Optional[Dict[str, Any]] = None,
+        workflow_id: str = '',
+        execution_id: Optional[str] = None,
+        step_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run an http_request action
+
+        Action config: url, method (GET), headers, params, body (dict/list is
+        sent as JSON), timeout (seconds, at most MAX_TIMEOUT_SECONDS), retries
+        (2, at most MAX_RETRIES), retryNonIdempotent, cacheTtl (seconds;
+        caches successful GET/HEAD responses). Strings may use {{variables}}
+        from `context`.
+
+        Returns status, ok, headers, body (parsed JSON when the response is
+        JSON), attempts, cached and durationMs. Raises httpx errors once
+        retries are exhausted, DestinationNotAllowed for URLs outside the
+        allowlist or resolving to non-public addresses, ResponseTooLarge for
+        bodies over max_response_bytes.
+        """
+        if action.type != ActionType.HTTP_REQUEST:
+            raise ValueError(f"Not an http_request action: {action.type.value}")
+        validation = action.validate()
+        if not validation['valid']:
+            raise ValueError('; '.join(validation['errors']))
+
+        config = action.config
+        method, url, headers, content = self._prepare(config, context)
+        try:
+            self._check_destination(url)
+        except DestinationNotAllowed:
+            self.blocked += 1
+            raise
+
+        step = None
+        if self.metrics_collector is not None and execution_id:
+            step = await self._record_step(
+                self.metrics_collector.start_step,
+                execution_id, step_id or action.name, action.name, action.type.value,
+                input_data={'method': method, 'url': url}
+            )
+
+        try:
+            result = await self._execute(config, workflow_id, method, url, headers, content)
+        except Exception as e:
+            if isinstance(e, DestinationNotAllowed):
+                self.blocked += 1
+            else:
+                self.failures += 1
+            if step is not None:
+                await self._complete_step(execution_id, step_id or action.name, False, {}, f"{type(e).__name__}: {e}")
+            raise
+
+        if step is not None:
+            await self._complete_step(
+                execution_id, step_id or action.name, result['ok'],
+                {'status': result['status'], 'attempts': result['attempts'], 'cached': result['cached']},
+                None if result['ok'] else f"HTTP {result['status']}"
+            )
+        return result
+
+    async def _execute(self, config: Dict[str, Any], workflow_id: str, method: str, url: str,
+                       headers: Dict, content: Optional[bytes]) -> Dict[str, Any]:
+        ttl = float(config.get('cacheTtl') or 0)
+        cache_key = None
+        if ttl > 0 and method in CACHEABLE_METHODS:
+            cache_key = ResponseCache.key(method, url, headers, content)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached, cached=True, attempts=0, durationMs=0)
+
+        await self._workflows.acquire(workflow_id)
+        try:
+            result = await self._send(config, method, url, headers, content)
+        finally:
+            self._workflows.release(workflow_id)
+
+        if cache_key is not None and result['ok']:
+            self.cache.put(cache_key, result, ttl)
+        return result
+
+    async def _record_step(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.metrics_executor, partial(func, *args, **kwargs))
+
+    async def _complete_step(self, execution_id: str, step_id: str, ok: bool, output: Dict[str, Any], error: Optional[str]):
+        # Imported here so workflow_features does not depend on analytics at import time
+        from analytics.metrics_collector import ExecutionStatus
+        await self._record_step(
+            self.metrics_collector.complete_step,
+            execution_id, step_id,
+            status=ExecutionStatus.COMPLETED if ok else ExecutionStatus.FAILED,
+            output_data=output,
+            error=error
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'blocked': self.blocked,
+            'activeHosts': len(self._hosts),
+            'activeWorkflows': len(self._workflows),
+            'cache': self.cache.stats()
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,12 +1,69 @@
 """
 Workflow Scheduler - Epic 12: Story 12.7
 Schedule workflows with cron expressions and timezone support
+
+- CronExpression: 5-field cron (minute hour day-of-month month day-of-week)
+  with lists, ranges, steps, month/day names and @macros. Next fire times
+  are found field by field, in the schedule's timezone.
+- ScheduleManager: schedules plus a min-heap of next fire times, so finding
+  due workflows costs O(k log n) for k due out of n schedules.
+- WorkflowScheduler: asyncio run loop that sleeps until the next fire time,
+  hands due workflows to a bounded pool of dispatch workers and persists
+  schedules (and their next fire times) in SQLite across restarts.
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta, timezone as dt_timezone
 from enum import Enum
-import re
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import asyncio
+import bisect
+import copy
+import heapq
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+SCHEDULES_DB_PATH = Path(os.getenv(
+    'SCHEDULES_DB_PATH',
+    str(Path(__file__).resolve().parent.parent / 'database' / 'schedules.db')
+))
+
+# Concurrent workflow dispatches
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '4'))
+# Due workflows waiting for a worker before the run loop stops popping more
+DISPATCH_QUEUE_SIZE = 1000
+# Wait before the run loop retries a failed tick (e.g. schedules database locked)
+TICK_RETRY_SECONDS = 5.0
+
+# How far ahead a cron expression is searched before it is considered never due
+# (Feb 29 on a given weekday can take 28 years)
+CRON_SEARCH_YEARS = 30
+
+# Longest recurring interval (timedelta overflows long before float does)
+MAX_INTERVAL_MINUTES = 60 * 24 * 366 * 100
+
+MONTH_NAMES = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+WEEKDAY_NAMES = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+
+CRON_MACROS = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *'
+}
 
 
 class ScheduleType(Enum):
@@ -16,6 +73,130 @@ class ScheduleType(Enum):
     CRON = "cron"
 
 
+def _parse_cron_field(field: str, low: int, high: int, names: Dict[str, int] = None) -> Tuple[Set[int], bool]:
+    """
+    Values allowed by one cron field, and whether it is unrestricted ("*")
+
+    Supports "*", "?", "a", "a-b", "*/n", "a-b/n", "a/n" (a to high) and
+    comma-separated lists of those; names (JAN, MON) where given.
+    """
+    def value(token: str) -> int:
+        token = token.strip().lower()
+        if names and token in names:
+            return names[token]
+        if not token.isdigit():
+            raise ValueError(f"invalid value '{token}'")
+        return int(token)
+
+    values: Set[int] = set()
+    for part in field.split(','):
+        if not part:
+            raise ValueError(f"empty list item in '{field}'")
+        base, _, step_text = part.partition('/')
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"invalid step '{step_text}'")
+            step = int(step_text)
+
+        if base in ('*', '?'):
+            start, end = low, high
+        elif '-' in base:
+            start_text, end_text = base.split('-', 1)
+            start, end = value(start_text), value(end_text)
+        else:
+            start = value(base)
+            end = high if step_text else start
+
+        if not (low <= start <= high and low <= end <= high):
+            raise ValueError(f"'{part}' is outside {low}-{high}")
+        if start > end:
+            raise ValueError(f"range '{part}' is reversed")
+        values.update(range(start, end + 1, step))
+
+    return values, field in ('*', '?')
+
+
+class CronExpression:
+    """Parsed 5-field cron expression"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        text = CRON_MACROS.get(expression.strip().lower(), expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError("Cron expression must have 5 parts: minute hour day month weekday")
+
+        minutes, _ = _parse_cron_field(parts[0], 0, 59)
+        hours, _ = _parse_cron_field(parts[1], 0, 23)
+        days, any_day = _parse_cron_field(parts[2], 1, 31)
+        months, _ = _parse_cron_field(parts[3], 1, 12, MONTH_NAMES)
+        weekdays, any_weekday = _parse_cron_field(parts[4], 0, 7, WEEKDAY_NAMES)
+
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.days = days
+        self.months = sorted(months)
+        # 7 is Sunday too
+        self.weekdays = {day % 7 for day in weekdays}
+        # Vixie cron: if both day fields are restricted, either may match
+        self.any_day = any_day
+        self.any_weekday = any_weekday
+
+    def _day_matches(self, day: datetime) -> bool:
+        day_ok = day.day in self.days
+        weekday_ok = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """
+        First matching wall-clock minute strictly after `after` (naive)
+
+        None if nothing matches within CRON_SEARCH_YEARS (e.g. "0 0 31 2 *").
+        """
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        last_year = t.year + CRON_SEARCH_YEARS
+
+        while t.year <= last_year:
+            if t.month not in self.months:
+                i = bisect.bisect_right(self.months, t.month)
+                if i < len(self.months):
+                    t = datetime(t.year, self.months[i], 1)
+                else:
+                    t = datetime(t.year + 1, self.months[0], 1)
+                continue
+
+            if not self._day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+
+            if t.hour not in self.hours:
+                i = bisect.bisect_right(self.hours, t.hour)
+                if i < len(self.hours):
+                    t = t.replace(hour=self.hours[i], minute=0)
+                else:
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+
+            if t.minute not in self.minutes:
+                i = bisect.bisect_right(self.minutes, t.minute)
+                if i < len(self.minutes):
+                    t = t.replace(minute=self.minutes[i])
+                else:
+                    t = t.replace(minute=0) + timedelta(hours=1)
+                continue
+
+            return t
+
+        return None
+
+
+def _utc_now() -> datetime:
+    return datetime.now(dt_timezone.utc)
+
+
 class Schedule:
     """Represents a workflow schedule"""
 
@@ -30,71 +211,197 @@ class Schedule:
         self.timezone = timezone
         self.enabled = True
 
-    def get_next_run(self) -> Optional[datetime]:
-        """Calculate next run time"""
+        try:
+            self.tz = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {timezone}")
+
+        self.cron: Optional[CronExpression] = None
+        if self.type == ScheduleType.CRON:
+            cron = self.config.get("cron", "0 * * * *")
+            if not isinstance(cron, str):
+                raise ValueError("cron must be a string")
+            self.cron = CronExpression(cron)
+        self._validate()
+
+    def _validate(self):
+        """Reject config the run loop could not compute fire times from"""
+        if self.type == ScheduleType.ONCE:
+            if not self.config.get("runAt"):
+                raise ValueError("runAt is required for a one-time schedule")
+            self._timestamp("runAt")
+        elif self.type == ScheduleType.RECURRING:
+            interval = self.config.get("interval", 60)
+            if isinstance(interval, bool) or not isinstance(interval, (int, float)) or not interval > 0:
+                raise ValueError("interval must be a positive number of minutes")
+            if interval > MAX_INTERVAL_MINUTES:
+                raise ValueError(f"interval must be at most {MAX_INTERVAL_MINUTES} minutes")
+        if self.config.get("lastRun") is not None:
+            self._timestamp("lastRun")
+        run_count = self.config.get("runCount", 0)
+        if isinstance(run_count, bool) or not isinstance(run_count, int):
+            raise ValueError("runCount must be an integer")
+
+    def _timestamp(self, key: str):
+        value = self.config[key]
+        if not isinstance(value, str):
+            raise ValueError(f"{key} must be an ISO 8601 timestamp")
+        try:
+            self._to_utc(value)
+        except (ValueError, OverflowError):
+            raise ValueError(f"{key} is not a valid ISO 8601 timestamp: {value}")
+
+    def _to_utc(self, value: str) -> datetime:
+        """ISO timestamp to UTC; naive timestamps are in the schedule's timezone"""
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=self.tz)
+        return parsed.astimezone(dt_timezone.utc)
+
+    def _cron_after(self, after: datetime) -> Optional[datetime]:
+        """Next cron fire time (UTC) strictly after `after` (UTC)"""
+        wall = after.astimezone(self.tz).replace(tzinfo=None)
+        while True:
+            wall = self.cron.next_after(wall)
+            if wall is None:
+                return None
+            fire = wall.replace(tzinfo=self.tz).astimezone(dt_timezone.utc)
+            # Skip wall times that do not exist (DST gap), and the second
+            # pass through a repeated hour (already fired on the first)
+            if fire.astimezone(self.tz).replace(tzinfo=None) != wall or fire <= after:
+                continue
+            return fire
+
+    def next_run_at(self, now: datetime = None) -> Optional[datetime]:
+        """
+        Next fire time (UTC)
+
+        Based on the last run, so a run missed while the scheduler was down is
+        due immediately (once, not once per missed slot).
+        """
         if not self.enabled:
             return None
+        now = now or _utc_now()
+        last_run = self.config.get("lastRun")
 
         if self.type == ScheduleType.ONCE:
             run_at = self.config.get("runAt")
-            if run_at:
-                return datetime.fromisoformat(run_at)
+            if run_at and not last_run:
+                return self._to_utc(run_at)
 
         elif self.type == ScheduleType.RECURRING:
             interval = self.config.get("interval", 60)  # minutes
-            last_run = self.config.get("lastRun")
-
             if last_run:
-                last_run_dt = datetime.fromisoformat(last_run)
-                return last_run_dt + timedelta(minutes=interval)
-            else:
-                return datetime.now()
+                return self._to_utc(last_run) + timedelta(minutes=interval)
+            return now
 
         elif self.type == ScheduleType.CRON:
-            # Parse cron expression (simplified)
-            cron = self.config.get("cron", "0 * * * *")
-            # For production, use a cron parsing library
-            return datetime.now() + timedelta(hours=1)
+            return self._cron_after(self._to_utc(last_run) if last_run else now)
 
         return None
 
+    def get_next_run(self) -> Optional[datetime]:
+        """Next run time in the schedule's timezone"""
+        next_run = self.next_run_at()
+        return next_run.astimezone(self.tz) if next_run else None
+
+    def mark_run(self, at: datetime = None):
+        """Record a run; the next fire time is computed from it"""
+        self.config["lastRun"] = (at or _utc_now()).isoformat()
+        self.config["runCount"] = self.config.get("runCount", 0) + 1
+
     def should_run_now(self) -> bool:
         """Check if schedule should run now"""
         if not self.enabled:
             return False
 
-        next_run = self.get_next_run()
+        next_run = self.next_run_at()
         if next_run:
-            return datetime.now() >= next_run
+            return _utc_now() >= next_run
 
         return False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
+        next_run = self.get_next_run()
         return {
             "type": self.type.value,
             "config": self.config,
             "timezone": self.timezone,
             "enabled": self.enabled,
-            "nextRun": self.get_next_run().isoformat() if self.get_next_run() else None
+            "nextRun": next_run.isoformat() if next_run else None
         }
 
 
 class ScheduleManager:
-    """Manages workflow schedules"""
+    """
+    Manages workflow schedules
+
+    Next fire times (UTC epoch seconds) are kept in a min-heap. Replaced,
+    disabled and removed schedules leave stale heap entries behind, which are
+    skipped when they surface and compacted away once they outnumber live ones.
+    """
 
     def __init__(self):
         self.schedules: Dict[str, Schedule] = {}
+        # workflow id -> (next fire timestamp, heap entry sequence)
+        self._armed: Dict[str, Tuple[float, int]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = 0
+
+    def _arm(self, workflow_id: str, next_run: Optional[float]):
+        self._armed.pop(workflow_id, None)
+        if next_run is None:
+            return
+        self._sequence += 1
+        self._armed[workflow_id] = (next_run, self._sequence)
+        heapq.heappush(self._heap, (next_run, self._sequence, workflow_id))
+        if len(self._heap) > 2 * len(self._armed) + 64:
+            self._heap = [(ts, seq, wid) for wid, (ts, seq) in self._armed.items()]
+            heapq.heapify(self._heap)
+
+    def _is_live(self, entry: Tuple[float, int, str]) -> bool:
+        return self._armed.get(entry[2]) == (entry[0], entry[1])
+
+    def rearm(self, workflow_id: str, now: datetime = None) -> Optional[float]:
+        """Recompute a schedule's next fire time; returns it (epoch seconds)"""
+        schedule = self.schedules.get(workflow_id)
+        next_run = schedule.next_run_at(now) if schedule else None
+        timestamp = next_run.timestamp() if next_run else None
+        self._arm(workflow_id, timestamp)
+        return timestamp
 
-    def add_schedule(self, workflow_id: str, schedule: Schedule) -> bool:
-        """Add a schedule"""
+    def next_run_timestamp(self, workflow_id: str) -> Optional[float]:
+        armed = self._armed.get(workflow_id)
+        return armed[0] if armed else None
+
+    def add_schedule(self, workflow_id: str, schedule: Schedule, next_run: Optional[float] = None) -> bool:
+        """Add a schedule (next_run, epoch seconds, skips recomputing it)"""
         self.schedules[workflow_id] = schedule
+        if next_run is None or not schedule.enabled:
+            self.rearm(workflow_id)
+        else:
+            self._arm(workflow_id, next_run)
         return True
 
+    def load(self, items: List[Tuple[str, Schedule, Optional[float]]]):
+        """Bulk add (workflow id, schedule, stored next run) in O(n)"""
+        for workflow_id, schedule, next_run in items:
+            self.schedules[workflow_id] = schedule
+            if next_run is None:
+                next_dt = schedule.next_run_at()
+                next_run = next_dt.timestamp() if next_dt else None
+            if next_run is not None and schedule.enabled:
+                self._sequence += 1
+                self._armed[workflow_id] = (next_run, self._sequence)
+        self._heap = [(ts, seq, wid) for wid, (ts, seq) in self._armed.items()]
+        heapq.heapify(self._heap)
+
     def remove_schedule(self, workflow_id: str) -> bool:
         """Remove a schedule"""
         if workflow_id in self.schedules:
             del self.schedules[workflow_id]
+            self._armed.pop(workflow_id, None)
             return True
         return False
 
@@ -102,21 +409,46 @@ class ScheduleManager:
         """Get a schedule"""
         return self.schedules.get(workflow_id)
 
-    def get_due_workflows(self) -> List[str]:
-        """Get workflows that are due to run"""
+    def get_due_workflows(self, now: datetime = None) -> List[str]:
+        """Get workflows that are due to run (visits only the due part of the heap)"""
+        limit = (now or _utc_now()).timestamp()
         due_workflows = []
+        stack = [0] if self._heap else []
 
-        for workflow_id, schedule in self.schedules.items():
-            if schedule.should_run_now():
-                due_workflows.append(workflow_id)
+        while stack:
+            i = stack.pop()
+            entry = self._heap[i]
+            if entry[0] > limit:
+                continue
+            if self._is_live(entry):
+                due_workflows.append(entry[2])
+            stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(self._heap))
 
         return due_workflows
 
+    def pop_due(self, now: datetime = None) -> List[Tuple[str, float]]:
+        """Remove and return (workflow id, fire timestamp) of every due schedule"""
+        limit = (now or _utc_now()).timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= limit:
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                del self._armed[entry[2]]
+                due.append((entry[2], entry[0]))
+        return due
+
+    def next_due_timestamp(self) -> Optional[float]:
+        """Earliest fire time of any enabled schedule"""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
     def enable_schedule(self, workflow_id: str) -> bool:
         """Enable a schedule"""
         schedule = self.schedules.get(workflow_id)
         if schedule:
             schedule.enabled = True
+            self.rearm(workflow_id)
             return True
         return False
 
@@ -125,19 +457,441 @@ class ScheduleManager:
         schedule = self.schedules.get(workflow_id)
         if schedule:
             schedule.enabled = False
+            self._armed.pop(workflow_id, None)
             return True
         return False
 
 
+class ScheduleStore:
+    """SQLite persistence for schedules and their next fire times"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS schedules (
+            workflow_id TEXT PRIMARY KEY,
+            schedule_type TEXT NOT NULL,
+            config TEXT NOT NULL,
+            timezone TEXT NOT NULL,
+            enabled INTEGER NOT NULL,
+            next_run REAL
+        );
+    """
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = Path(db_path or SCHEDULES_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA busy_timeout = 30000")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _row_to_schedule(row: Tuple) -> Tuple[str, Schedule, Optional[float]]:
+        workflow_id, schedule_type, config, tz, enabled, next_run = row
+        schedule = Schedule(schedule_type, json.loads(config), tz)
+        schedule.enabled = bool(enabled)
+        return workflow_id, schedule, next_run
+
+    def load(self) -> List[Tuple[str, Schedule, Optional[float]]]:
+        """All stored (workflow id, schedule, next run); unreadable rows are skipped"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT workflow_id, schedule_type, config, timezone, enabled, next_run FROM schedules"
+            ).fetchall()
+        items = []
+        for row in rows:
+            try:
+                items.append(self._row_to_schedule(row))
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping stored schedule {row[0]}: {e}")
+        return items
+
+    def get(self, workflow_id: str) -> Optional[Tuple[str, Schedule, Optional[float]]]:
+        """Stored (workflow id, schedule, next run); None if missing or unreadable"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT workflow_id, schedule_type, config, timezone, enabled, next_run "
+                "FROM schedules WHERE workflow_id = ?",
+                (workflow_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return self._row_to_schedule(row)
+        except (ValueError, TypeError) as e:
+            logger.error(f"Ignoring stored schedule {workflow_id}: {e}")
+            return None
+
+    def save(self, workflow_id: str, schedule: Schedule, next_run: Optional[float]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO schedules "
+                "(workflow_id, schedule_type, config, timezone, enabled, next_run) VALUES (?, ?, ?, ?, ?, ?)",
+                (workflow_id, schedule.type.value, json.dumps(schedule.config), schedule.timezone,
+                 int(schedule.enabled), next_run)
+            )
+
+    def delete(self, workflow_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM schedules WHERE workflow_id = ?", (workflow_id,))
+
+    def claim(self, runs: List[Tuple[str, float, Schedule, Optional[float]]]) -> List[str]:
+        """
+        Record fired runs: (workflow id, fire timestamp it was due at, schedule
+        after mark_run, new next run)
+
+        Each row is only updated if its stored next_run still equals the fire
+        timestamp, so when several processes load the same schedules each run
+        is claimed once. Returns the workflow ids whose claim failed (changed
+        or removed elsewhere).
+        """
+        lost = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for workflow_id, fired_at, schedule, next_run in runs:
+                    cursor = self._conn.execute(
+                        "UPDATE schedules SET config = ?, next_run = ? WHERE workflow_id = ? AND next_run = ?",
+                        (json.dumps(schedule.config), next_run, workflow_id, fired_at)
+                    )
+                    if cursor.rowcount == 0:
+                        lost.append(workflow_id)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return lost
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+Dispatch = Callable[[str, Schedule, datetime], Any]
+# Run as ScheduleStore.claim takes it
+PendingRun = Tuple[str, float, Schedule, Optional[float]]
+
+
+async def log_dispatch(workflow_id: str, schedule: Schedule, fired_at: datetime):
+    """
+    Default dispatch: only logs that the workflow is due
+
+    Nothing is executed; pass a real dispatch to WorkflowScheduler to run
+    workflows.
+    """
+    logger.info(f"Scheduled workflow {workflow_id} due at {fired_at.isoformat()} ({schedule.type.value})")
+
+
+class WorkflowScheduler:
+    """Drives a ScheduleManager: persists schedules and dispatches due workflows"""
+
+    def __init__(
+        self,
+        store: ScheduleStore = None,
+        dispatch: Dispatch = None,
+        workers: int = SCHEDULER_WORKERS,
+        queue_size: int = DISPATCH_QUEUE_SIZE,
+        poll_interval_seconds: float = 60.0
+    ):
+        """
+        Args:
+            store: Persistence (None keeps schedules in memory only)
+            dispatch: Called (sync or async) with (workflow_id, schedule, fired_at) for every due run
+                (None: log_dispatch, which runs nothing)
+            workers: Concurrent dispatches
+            queue_size: Due runs buffered for the workers; when full the run loop waits
+            poll_interval_seconds: Maximum sleep between checks
+        """
+        self.manager = ScheduleManager()
+        self.store = store
+        self.dispatch = dispatch or log_dispatch
+        self.runs_workflows = dispatch is not None
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.dispatched = 0
+        self.failed = 0
+        self.lost_claims = 0
+        self.tick_errors = 0
+        # Schedules disabled because their next fire time could not be computed
+        self.disabled_on_error = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        # Workflows whose schedule changed and is not stored yet (written by the run loop)
+        self._unsaved: Set[str] = set()
+
+        if self.store is not None:
+            self.manager.load(self.store.load())
+
+    def _running(self) -> bool:
+        return bool(self._tasks) and not self._tasks[0].done()
+
+    def _changed(self, workflow_id: str):
+        """
+        Store a workflow's changed schedule
+
+        While the run loop is running, the write is queued to it (it runs the
+        SQLite work in a thread, before its next claim), so async routes never
+        wait on the database. Otherwise it is written here.
+        """
+        if self.store is not None:
+            if self._running():
+                self._unsaved.add(workflow_id)
+            else:
+                self._write(self._snapshot([workflow_id]))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _snapshot(self, workflow_ids: List[str]) -> List[Tuple[str, Optional[Schedule], Optional[float]]]:
+        """(workflow id, copy of its schedule or None if removed, next run) to store"""
+        rows = []
+        for workflow_id in workflow_ids:
+            schedule = self.manager.get_schedule(workflow_id)
+            if schedule is not None:
+                # mark_run updates config in place on the loop while the thread serializes it
+                schedule = copy.copy(schedule)
+                schedule.config = dict(schedule.config)
+            rows.append((workflow_id, schedule, self.manager.next_run_timestamp(workflow_id)))
+        return rows
+
+    def _write(self, rows: List[Tuple[str, Optional[Schedule], Optional[float]]]):
+        for workflow_id, schedule, next_run in rows:
+            if schedule is None:
+                self.store.delete(workflow_id)
+            else:
+                self.store.save(workflow_id, schedule, next_run)
+
+    async def _write_unsaved(self):
+        """Store queued schedule changes in a thread; they stay queued if the write fails"""
+        if not self._unsaved:
+            return
+        workflow_ids = list(self._unsaved)
+        self._unsaved.clear()
+        try:
+            await asyncio.to_thread(self._write, self._snapshot(workflow_ids))
+        except BaseException:
+            self._unsaved.update(workflow_ids)
+            raise
+
+    def add_schedule(self, workflow_id: str, schedule: Schedule):
+        """Add (or replace) a workflow's schedule"""
+        self.manager.add_schedule(workflow_id, schedule)
+        self._changed(workflow_id)
+
+    def remove_schedule(self, workflow_id: str) -> bool:
+        removed = self.manager.remove_schedule(workflow_id)
+        if removed:
+            self._changed(workflow_id)
+        return removed
+
+    def enable_schedule(self, workflow_id: str) -> bool:
+        enabled = self.manager.enable_schedule(workflow_id)
+        if enabled:
+            self._changed(workflow_id)
+        return enabled
+
+    def disable_schedule(self, workflow_id: str) -> bool:
+        disabled = self.manager.disable_schedule(workflow_id)
+        if disabled:
+            self._changed(workflow_id)
+        return disabled
+
+    def get_schedule(self, workflow_id: str) -> Optional[Schedule]:
+        return self.manager.get_schedule(workflow_id)
+
+    def _take_due(self, now: datetime) -> Tuple[List[PendingRun], List[Dict[str, Any]], List[Tuple[str, Schedule]]]:
+        """
+        Pop every due schedule, record the run and re-arm it (in memory)
+
+        Returns the runs, as ScheduleStore.claim takes them, the config each
+        of their schedules had before (to put back if the claim cannot be
+        made), and the schedules disabled because their next fire time could
+        not be computed.
+        """
+        runs, previous, disabled = [], [], []
+        for workflow_id, fired_at in self.manager.pop_due(now):
+            schedule = self.manager.get_schedule(workflow_id)
+            if schedule is None:
+                continue
+            config = dict(schedule.config)
+            try:
+                schedule.mark_run(now)
+                next_run = self.manager.rearm(workflow_id, now)
+            except Exception as e:
+                logger.error(f"Disabling schedule of workflow {workflow_id}: {type(e).__name__}: {e}")
+                schedule.config = config
+                self.manager.disable_schedule(workflow_id)
+                self.disabled_on_error += 1
+                disabled.append((workflow_id, schedule))
+                continue
+            runs.append((workflow_id, fired_at, schedule, next_run))
+            previous.append(config)
+        return runs, previous, disabled
+
+    def _persist(
+        self,
+        runs: List[PendingRun],
+        disabled: List[Tuple[str, Schedule]]
+    ) -> Dict[str, Optional[Tuple[str, Schedule, Optional[float]]]]:
+        """Store disabled schedules and claim runs; the stored state of each lost claim (SQLite only)"""
+        for workflow_id, schedule in disabled:
+            self.store.save(workflow_id, schedule, None)
+        lost = self.store.claim(runs) if runs else []
+        return {workflow_id: self.store.get(workflow_id) for workflow_id in lost}
+
+    def _settle(
+        self,
+        runs: List[PendingRun],
+        lost: Dict[str, Optional[Tuple[str, Schedule, Optional[float]]]]
+    ) -> List[Tuple[str, Schedule, datetime]]:
+        for workflow_id, stored in lost.items():
+            # Changed or removed by another process: take the stored state
+            self.lost_claims += 1
+            if stored is None:
+                self.manager.remove_schedule(workflow_id)
+            else:
+                self.manager.add_schedule(*stored)
+
+        return [
+            (workflow_id, schedule, datetime.fromtimestamp(fired_at, dt_timezone.utc))
+            for workflow_id, fired_at, schedule, _ in runs
+            if workflow_id not in lost
+        ]
+
+    def _restore(self, runs: List[PendingRun], previous: List[Dict[str, Any]]):
+        """Undo _take_due for runs that could not be claimed, so they fire on the next tick"""
+        for (workflow_id, fired_at, schedule, _), config in zip(runs, previous):
+            if self.manager.get_schedule(workflow_id) is schedule:
+                schedule.config = config
+                self.manager.add_schedule(workflow_id, schedule, fired_at)
+
+    def fire_due(self, now: datetime = None) -> List[Tuple[str, Schedule, datetime]]:
+        """
+        Pop every due schedule, record the run and re-arm it
+
+        Returns the (workflow id, schedule, fired_at) runs this process
+        claimed. O(k log n) for k due schedules.
+        """
+        runs, previous, disabled = self._take_due(now or _utc_now())
+        if self.store is None or not (runs or disabled):
+            return self._settle(runs, {})
+        try:
+            lost = self._persist(runs, disabled)
+        except Exception:
+            self._restore(runs, previous)
+            raise
+        return self._settle(runs, lost)
+
+    async def _fire_due_async(self) -> List[Tuple[str, Schedule, datetime]]:
+        """fire_due with the SQLite work in a thread; schedule state is only touched on the event loop"""
+        runs, previous, disabled = self._take_due(_utc_now())
+        if self.store is None or not (runs or disabled):
+            return self._settle(runs, {})
+        try:
+            lost = await asyncio.to_thread(self._persist, runs, disabled)
+        except Exception:
+            self._restore(runs, previous)
+            raise
+        return self._settle(runs, lost)
+
+    async def _worker(self):
+        while True:
+            workflow_id, schedule, fired_at = await self._queue.get()
+            try:
+                result = self.dispatch(workflow_id, schedule, fired_at)
+                if inspect.isawaitable(result):
+                    await result
+                self.dispatched += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Scheduled run of workflow {workflow_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_loop(self):
+        while True:
+            timeout = self.poll_interval_seconds
+            # Cleared before the tick, so changes made during it wake the next one
+            self._wakeup.clear()
+            try:
+                # Before claiming, so claims compare against the latest stored state
+                await self._write_unsaved()
+                for run in await self._fire_due_async():
+                    # Blocks (delaying the next tick) while the workers are saturated
+                    await self._queue.put(run)
+
+                next_due = self.manager.next_due_timestamp()
+                if next_due is not None:
+                    timeout = max(0.0, min(timeout, next_due - _utc_now().timestamp()))
+            except Exception as e:
+                # e.g. the store is locked; unclaimed runs were re-armed
+                self.tick_errors += 1
+                logger.error(f"Scheduler tick failed, retrying in {TICK_RETRY_SECONDS:g}s: {type(e).__name__}: {e}")
+                timeout = min(timeout, TICK_RETRY_SECONDS)
+
+            # asyncio.wait, not wait_for: wait_for can swallow stop()'s
+            # cancellation when the wakeup is set at the same moment
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait([waiter], timeout=timeout)
+            finally:
+                waiter.cancel()
+
+    def start(self):
+        """Start the run loop and dispatch workers on the running event loop"""
+        if self._running():
+            return
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [loop.create_task(self._run_loop())]
+        self._tasks += [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the run loop and workers (queued runs are dropped, queued schedule changes stored)"""
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        try:
+            await self._write_unsaved()
+        except Exception as e:
+            logger.error(f"Could not store {len(self._unsaved)} changed schedules on shutdown: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        next_due = self.manager.next_due_timestamp()
+        return {
+            "running": self._running(),
+            "unsaved": len(self._unsaved),
+            "schedules": len(self.manager.schedules),
+            "armed": len(self.manager._armed),
+            "nextDue": datetime.fromtimestamp(next_due, dt_timezone.utc).isoformat() if next_due else None,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "workers": self.workers,
+            "dispatch": "custom" if self.runs_workflows else "log_only",
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "lostClaims": self.lost_claims,
+            "tickErrors": self.tick_errors,
+            "disabledOnError": self.disabled_on_error
+        }
+
+
 def validate_cron_expression(cron: str) -> Dict[str, Any]:
     """Validate cron expression"""
     errors = []
 
     # Basic cron format: minute hour day month weekday
-    parts = cron.split()
-
-    if len(parts) != 5:
-        errors.append("Cron expression must have 5 parts: minute hour day month weekday")
+    try:
+        CronExpression(cron)
+    except ValueError as e:
+        errors.append(str(e))
 
     return {
         "valid": len(errors) == 0,
@@ -158,6 +912,6 @@ def parse_schedule_description(schedule: Schedule) -> str:
 
     elif schedule.type == ScheduleType.CRON:
         cron = schedule.config.get("cron", "0 * * * *")
-        return f"Run on schedule: {cron}"
+        return f"Run on schedule: {cron} ({schedule.timezone})"
 
     return "No schedule"
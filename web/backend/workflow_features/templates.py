@@ -1,9 +1,31 @@
 """
 Template Management - Epic 12: Story 12.6
 Pre-built workflow templates for common use cases
+
+Templates are kept in an in-memory inverted index (terms of name, tags and
+description -> template ids) with per-category and per-difficulty id sets,
+so searching and faceting do not rescan the library. Listings return
+summaries; a template's workflow JSON is only built or read from disk when
+it is requested (niche snapshots from scripts/generate-niche-snapshots.py
+are indexed at startup and read again on access).
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+from collections import Counter
+from pathlib import Path
+import bisect
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Output directory of scripts/generate-niche-snapshots.py (run from the repository root)
+NICHE_SNAPSHOTS_DIR = Path(os.getenv(
+    'NICHE_SNAPSHOTS_DIR',
+    str(Path(__file__).resolve().parents[3] / 'data' / 'snapshots' / 'niche-library')
+))
 
 
 # Template categories
@@ -21,6 +43,19 @@ TEMPLATE_CATEGORIES = [
 ]
 
 
+# Search ranking: weight of a query term found in each field, scaled by how it matched
+FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "description": 1.0}
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+INFIX_MATCH = 0.4
+
+TERM_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    return TERM_PATTERN.findall(text.lower())
+
+
 class WorkflowTemplate:
     """Represents a workflow template"""
 
@@ -30,43 +65,172 @@ class WorkflowTemplate:
         name: str,
         description: str,
         category: str,
-        workflow: Dict[str, Any],
+        workflow: Optional[Dict[str, Any]] = None,
         tags: List[str] = None,
         difficulty: str = "beginner",
         author: str = "GHL WHIZ",
-        version: str = "1.0"
+        version: str = "1.0",
+        workflow_loader: Optional[Callable[[], Dict[str, Any]]] = None
     ):
         self.id = id
         self.name = name
         self.description = description
         self.category = category
-        self.workflow = workflow
         self.tags = tags or []
         self.difficulty = difficulty
         self.author = author
         self.version = version
+        self._workflow = workflow
+        # Builds the workflow on first access (e.g. reads it from disk)
+        self._workflow_loader = workflow_loader
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+    @property
+    def workflow(self) -> Dict[str, Any]:
+        if self._workflow is None and self._workflow_loader is not None:
+            self._workflow = self._workflow_loader()
+        return self._workflow if self._workflow is not None else {}
+
+    @workflow.setter
+    def workflow(self, workflow: Dict[str, Any]):
+        self._workflow = workflow
+
+    def to_summary(self) -> Dict[str, Any]:
+        """Everything except the workflow"""
         return {
             "id": self.id,
             "name": self.name,
             "description": self.description,
             "category": self.category,
-            "workflow": self.workflow,
             "tags": self.tags,
             "difficulty": self.difficulty,
             "author": self.author,
             "version": self.version
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        data = self.to_summary()
+        data["workflow"] = self.workflow
+        return data
+
+
+class TemplateIndex:
+    """Inverted index and facet sets over template metadata"""
+
+    def __init__(self):
+        # term -> template id -> weight (sum of the weights of the fields containing it)
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.by_category: Dict[str, Set[str]] = {}
+        self.by_difficulty: Dict[str, Set[str]] = {}
+        # template id -> (category, difficulty, terms), for removal
+        self._entries: Dict[str, Tuple[str, str, Set[str]]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._expansions: Dict[str, List[Tuple[str, float]]] = {}
+
+    def add(self, template: WorkflowTemplate):
+        self.remove(template.id)
+        weights: Counter = Counter()
+        for field, texts in (("name", [template.name]), ("tags", template.tags), ("description", [template.description])):
+            for term in {term for text in texts for term in tokenize(text or "")}:
+                weights[term] += FIELD_WEIGHTS[field]
+
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[template.id] = weight
+        self.by_category.setdefault(template.category, set()).add(template.id)
+        self.by_difficulty.setdefault(template.difficulty, set()).add(template.id)
+        self._entries[template.id] = (template.category, template.difficulty, set(weights))
+        self._changed()
+
+    def remove(self, template_id: str):
+        entry = self._entries.pop(template_id, None)
+        if entry is None:
+            return
+        category, difficulty, terms = entry
+        for term in terms:
+            ids = self.postings[term]
+            del ids[template_id]
+            if not ids:
+                del self.postings[term]
+        for facet, value in ((self.by_category, category), (self.by_difficulty, difficulty)):
+            facet[value].discard(template_id)
+            if not facet[value]:
+                del facet[value]
+        self._changed()
+
+    def _changed(self):
+        self._vocabulary = None
+        self._expansions.clear()
+
+    def _expand(self, query_term: str) -> List[Tuple[str, float]]:
+        """Indexed terms matching a query term: exact, prefix (bisect) and infix (vocabulary scan)"""
+        expansion = self._expansions.get(query_term)
+        if expansion is not None:
+            return expansion
+
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+
+        expansion = []
+        i = bisect.bisect_left(vocabulary, query_term)
+        while i < len(vocabulary) and vocabulary[i].startswith(query_term):
+            term = vocabulary[i]
+            expansion.append((term, EXACT_MATCH if term == query_term else PREFIX_MATCH))
+            i += 1
+        expansion.extend(
+            (term, INFIX_MATCH) for term in vocabulary
+            if query_term in term and not term.startswith(query_term)
+        )
+        self._expansions[query_term] = expansion
+        return expansion
+
+    def search(self, query: str) -> Optional[Dict[str, float]]:
+        """
+        Template id -> score for templates matching every term of the query
+
+        Query terms match indexed terms exactly, as a prefix or inside them
+        ("mail" finds "email"). None if the query has no terms.
+        """
+        terms = tokenize(query or "")
+        if not terms:
+            return None
+
+        scores: Optional[Dict[str, float]] = None
+        for query_term in dict.fromkeys(terms):
+            term_scores: Dict[str, float] = {}
+            for term, factor in self._expand(query_term):
+                for template_id, weight in self.postings[term].items():
+                    score = weight * factor
+                    if score > term_scores.get(template_id, 0):
+                        term_scores[template_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {template_id: score + term_scores[template_id]
+                          for template_id, score in scores.items() if template_id in term_scores}
+            if not scores:
+                break
+        return scores
+
+    @staticmethod
+    def facet_counts(facet: Dict[str, Set[str]], ids: Optional[Iterable[str]]) -> Dict[str, int]:
+        """Templates per facet value, among `ids` (all templates if None)"""
+        if ids is None:
+            return {value: len(members) for value, members in facet.items()}
+        ids = ids if isinstance(ids, (set, dict)) else set(ids)
+        counts = {value: sum(1 for template_id in ids if template_id in members) for value, members in facet.items()}
+        return {value: count for value, count in counts.items() if count}
+
 
 class TemplateManager:
     """Manages workflow templates"""
 
-    def __init__(self):
+    def __init__(self, snapshot_dir: Optional[Path] = NICHE_SNAPSHOTS_DIR):
         self.templates: Dict[str, WorkflowTemplate] = {}
+        self.index = TemplateIndex()
         self._load_default_templates()
+        if snapshot_dir is not None:
+            self.load_snapshot_library(snapshot_dir)
 
     def _load_default_templates(self):
         """Load default templates"""
@@ -136,44 +300,123 @@ class TemplateManager:
             difficulty="intermediate"
         ))
 
+    def load_snapshot_library(self, directory: Path) -> int:
+        """
+        Index niche snapshots (scripts/generate-niche-snapshots.py output) as templates
+
+        Only the metadata is kept in memory; a snapshot's JSON is read again
+        when its workflow is requested. Returns the number of snapshots loaded.
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            return 0
+
+        loaded = 0
+        for path in sorted(directory.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                industry = snapshot.get("industry", "")
+                self.add_template(WorkflowTemplate(
+                    id=f"snapshot-{snapshot['snapshot_id']}",
+                    name=snapshot.get("snapshot_name", path.stem),
+                    description=snapshot.get("use_case", ""),
+                    category=industry.split(" / ")[-1] if industry else "General",
+                    tags=snapshot.get("tags", []),
+                    difficulty="advanced",
+                    author=snapshot.get("author", "GHL WHIZ"),
+                    version=snapshot.get("version", "1.0"),
+                    workflow_loader=lambda path=path: json.loads(path.read_text(encoding="utf-8"))
+                ))
+                loaded += 1
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"Skipping snapshot {path.name}: {e}")
+
+        return loaded
+
     def add_template(self, template: WorkflowTemplate) -> bool:
         """Add a template"""
         self.templates[template.id] = template
+        self.index.add(template)
+        return True
+
+    def remove_template(self, template_id: str) -> bool:
+        if template_id not in self.templates:
+            return False
+        del self.templates[template_id]
+        self.index.remove(template_id)
         return True
 
     def get_template(self, template_id: str) -> Optional[WorkflowTemplate]:
         """Get a template by ID"""
         return self.templates.get(template_id)
 
-    def list_templates(
+    def search_templates(
         self,
         category: Optional[str] = None,
         difficulty: Optional[str] = None,
-        search: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """List templates with optional filtering"""
-        templates = list(self.templates.values())
+        search: Optional[str] = None,
+        include_workflow: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Filtered, ranked templates with facet counts
 
-        # Filter by category
-        if category:
-            templates = [t for t in templates if t.category == category]
+        With a search query, results are ordered by score (name matches
+        outrank tag matches, which outrank description matches); otherwise in
+        the order templates were added. Each facet's counts apply the search
+        and the other facet's filter, but not its own, so they show what
+        selecting another value would return.
 
-        # Filter by difficulty
-        if difficulty:
-            templates = [t for t in templates if t.difficulty == difficulty]
+        Returns {"templates", "total", "facets": {"category", "difficulty"}}.
+        """
+        index = self.index
+        scores = index.search(search) if search else None
+        if search and scores is None:
+            scores = {}
 
-        # Search in name/description/tags
-        if search:
-            search_lower = search.lower()
-            templates = [
-                t for t in templates
-                if search_lower in t.name.lower()
-                or search_lower in t.description.lower()
-                or any(search_lower in tag.lower() for tag in t.tags)
-            ]
+        in_category = index.by_category.get(category, set()) if category else None
+        in_difficulty = index.by_difficulty.get(difficulty, set()) if difficulty else None
 
-        return [t.to_dict() for t in templates]
+        def narrowed(ids: Optional[Iterable[str]], facet_ids: Optional[Set[str]]) -> Optional[Iterable[str]]:
+            if facet_ids is None:
+                return ids
+            return facet_ids if ids is None else [i for i in ids if i in facet_ids]
+
+        facets = {
+            "category": index.facet_counts(index.by_category, narrowed(scores, in_difficulty)),
+            "difficulty": index.facet_counts(index.by_difficulty, narrowed(scores, in_category))
+        }
+
+        matched = narrowed(narrowed(scores, in_category), in_difficulty)
+        if matched is None:
+            ids = list(self.templates)
+        elif scores is not None:
+            ids = sorted(matched, key=lambda i: (-scores[i], self.templates[i].name))
+        else:
+            matched = set(matched)
+            ids = [i for i in self.templates if i in matched]
+
+        page = ids[offset:offset + limit] if limit is not None else ids[offset:]
+        templates = [self.templates[i] for i in page]
+        return {
+            "templates": [t.to_dict() if include_workflow else t.to_summary() for t in templates],
+            "total": len(ids),
+            "facets": facets
+        }
+
+    def list_templates(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        search: Optional[str] = None,
+        include_workflow: bool = False
+    ) -> List[Dict[str, Any]]:
+        """List templates with optional filtering (summaries unless include_workflow)"""
+        return self.search_templates(category, difficulty, search, include_workflow)["templates"]
 
     def get_categories(self) -> List[str]:
         """Get all template categories"""
-        return TEMPLATE_CATEGORIES
+        extra = sorted(set(self.index.by_category) - set(TEMPLATE_CATEGORIES))
+        return TEMPLATE_CATEGORIES + extra
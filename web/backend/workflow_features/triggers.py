@@ -1,12 +1,18 @@
 """
 Custom Trigger System - Epic 12: Story 12.3
 Support for webhook, form, tag, and event-based triggers
+
+Incoming events are routed through a TriggerRouter, which indexes triggers
+by type and by one of their equals filters, so an event is only checked
+against the triggers that could match it.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Hashable, List, Optional, Set, Tuple
 from enum import Enum
 from datetime import datetime
 
+from .expressions import compile_path
+
 
 class TriggerType(Enum):
     """Available trigger types"""
@@ -20,6 +26,26 @@ class TriggerType(Enum):
     CUSTOM_EVENT = "custom_event"
 
 
+def compile_filter(filter_rule: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile one {"field", "operator", "value"} trigger filter
+
+    Supported operators are equals, contains and starts_with; filters with any
+    other operator always pass.
+    """
+    get = compile_path(filter_rule.get("field"))
+    operator = filter_rule.get("operator")
+    value = filter_rule.get("value")
+
+    if operator == "equals":
+        return lambda event_data: get(event_data) == value
+    if operator == "contains":
+        return lambda event_data: value in str(get(event_data))
+    if operator == "starts_with":
+        return lambda event_data: str(get(event_data)).startswith(value)
+    return lambda event_data: True
+
+
 class Trigger:
     """Represents a workflow trigger"""
 
@@ -34,46 +60,30 @@ class Trigger:
         self.filters = filters or []
         self.created_at = datetime.now().isoformat()
 
+    @property
+    def filters(self) -> List[Dict[str, Any]]:
+        return self._filters
+
+    @filters.setter
+    def filters(self, filters: List[Dict[str, Any]]):
+        # Assign a new list to change filters; it is compiled on the next match
+        self._filters = filters
+        self._compiled_filters = None
+
     def matches_event(self, event_data: Dict[str, Any]) -> bool:
         """Check if event matches this trigger"""
         if not self.filters:
             return True  # No filters = match all
 
-        for filter_rule in self.filters:
-            field = filter_rule.get("field")
-            operator = filter_rule.get("operator")
-            value = filter_rule.get("value")
+        if self._compiled_filters is None:
+            self._compiled_filters = [compile_filter(rule) for rule in self.filters]
 
-            event_value = self._get_nested_value(event_data, field)
-
-            if operator == "equals" and event_value != value:
-                return False
-            elif operator == "contains" and value not in str(event_value):
-                return False
-            elif operator == "starts_with" and not str(event_value).startswith(value):
+        for matches in self._compiled_filters:
+            if not matches(event_data):
                 return False
 
         return True
 
-    def _get_nested_value(self, data: Dict, path: str) -> Any:
-        """Get nested value using dot notation"""
-        if not path:
-            return None
-
-        keys = path.split(".")
-        value = data
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                return None
-
-            if value is None:
-                return None
-
-        return value
-
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -84,21 +94,178 @@ class Trigger:
         }
 
 
+def _index_key(trigger: Trigger, indexed_fields: Dict[str, Any]) -> Optional[Tuple[str, Hashable]]:
+    """
+    (field, value) of the equals filter a trigger is indexed under
+
+    Prefers a field other triggers of the type are already indexed by, so an
+    event needs as few field lookups as possible. None if the trigger has no
+    equals filter on a hashable value.
+    """
+    candidates = []
+    for rule in trigger.filters:
+        if rule.get("operator") != "equals" or not rule.get("field"):
+            continue
+        value = rule.get("value")
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        candidates.append((rule["field"], value))
+
+    for field, value in candidates:
+        if field in indexed_fields:
+            return field, value
+    return candidates[0] if candidates else None
+
+
+class _TypeIndex:
+    """Triggers of one type: equals-filter index plus the unindexed rest"""
+
+    def __init__(self):
+        # field -> (getter, value -> trigger ids)
+        self.fields: Dict[str, Tuple[Callable[[Any], Any], Dict[Hashable, Set[str]]]] = {}
+        self.unindexed: Set[str] = set()
+
+    def add(self, trigger_id: str, key: Optional[Tuple[str, Hashable]]):
+        if key is None:
+            self.unindexed.add(trigger_id)
+            return
+        field, value = key
+        if field not in self.fields:
+            self.fields[field] = (compile_path(field), {})
+        self.fields[field][1].setdefault(value, set()).add(trigger_id)
+
+    def remove(self, trigger_id: str, key: Optional[Tuple[str, Hashable]]):
+        if key is None:
+            self.unindexed.discard(trigger_id)
+            return
+        field, value = key
+        getter, values = self.fields[field]
+        ids = values[value]
+        ids.discard(trigger_id)
+        if not ids:
+            del values[value]
+            if not values:
+                del self.fields[field]
+
+    def candidates(self, event_data: Dict[str, Any]) -> List[str]:
+        found = list(self.unindexed)
+        for get, values in self.fields.values():
+            try:
+                ids = values.get(get(event_data))
+            except TypeError:
+                # Unhashable event value: cannot equal any indexed (hashable) value
+                continue
+            if ids:
+                found.extend(ids)
+        return found
+
+
+class TriggerRouter:
+    """
+    Finds the triggers matching an event without testing every trigger
+
+    Triggers are grouped by TriggerType, then indexed under one of their
+    equals filters (field -> value -> trigger ids), one level of a
+    discrimination tree. An event looks each indexed field up once; only the
+    triggers found there, plus those without an equals filter, are checked
+    with matches_event. Cost per event is O(indexed fields + candidates)
+    instead of O(triggers).
+
+    Filters are indexed when a trigger is added; re-add a trigger after
+    assigning it new filters.
+    """
+
+    def __init__(self):
+        self._types: Dict[TriggerType, _TypeIndex] = {}
+        # trigger id -> (trigger, index key, insertion sequence)
+        self._entries: Dict[str, Tuple[Trigger, Optional[Tuple[str, Hashable]], int]] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, trigger_id: str, trigger: Trigger):
+        """Add or replace a trigger (a replaced trigger keeps its position)"""
+        previous = self._entries.get(trigger_id)
+        self.remove(trigger_id)
+        index = self._types.setdefault(trigger.type, _TypeIndex())
+        key = _index_key(trigger, index.fields)
+        index.add(trigger_id, key)
+        if previous is None:
+            self._sequence += 1
+        self._entries[trigger_id] = (trigger, key, previous[2] if previous else self._sequence)
+
+    def remove(self, trigger_id: str) -> bool:
+        entry = self._entries.pop(trigger_id, None)
+        if entry is None:
+            return False
+        trigger, key, _ = entry
+        index = self._types[trigger.type]
+        index.remove(trigger_id, key)
+        if not index.fields and not index.unindexed:
+            del self._types[trigger.type]
+        return True
+
+    def candidates(self, event_type: Optional[TriggerType], event_data: Dict[str, Any]) -> List[str]:
+        """Trigger ids that may match (all types if event_type is None)"""
+        if event_type is not None:
+            index = self._types.get(event_type)
+            return index.candidates(event_data) if index else []
+        found = []
+        for index in self._types.values():
+            found.extend(index.candidates(event_data))
+        return found
+
+    def route(self, event_type: Any, event_data: Dict[str, Any]) -> List[str]:
+        """
+        Ids of the triggers matching an event, in the order they were added
+
+        event_type is a TriggerType or its value ("tag_added"); None matches
+        triggers of every type.
+        """
+        if isinstance(event_type, str):
+            event_type = TriggerType(event_type)
+        entries = self._entries
+        matched = [
+            trigger_id for trigger_id in self.candidates(event_type, event_data)
+            if entries[trigger_id][0].matches_event(event_data)
+        ]
+        matched.sort(key=lambda trigger_id: entries[trigger_id][2])
+        return matched
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "triggers": len(self._entries),
+            "types": {
+                trigger_type.value: {
+                    "indexedFields": {field: len(values) for field, (_, values) in index.fields.items()},
+                    "unindexed": len(index.unindexed)
+                }
+                for trigger_type, index in self._types.items()
+            }
+        }
+
+
 class TriggerManager:
     """Manages workflow triggers"""
 
     def __init__(self):
         self.triggers: Dict[str, Trigger] = {}
+        self.router = TriggerRouter()
 
     def add_trigger(self, trigger_id: str, trigger: Trigger) -> bool:
         """Add a trigger"""
         self.triggers[trigger_id] = trigger
+        self.router.add(trigger_id, trigger)
         return True
 
     def remove_trigger(self, trigger_id: str) -> bool:
         """Remove a trigger"""
         if trigger_id in self.triggers:
             del self.triggers[trigger_id]
+            self.router.remove(trigger_id)
             return True
         return False
 
@@ -106,15 +273,9 @@ class TriggerManager:
         """Get a trigger by ID"""
         return self.triggers.get(trigger_id)
 
-    def find_matching_triggers(self, event_data: Dict[str, Any]) -> List[str]:
-        """Find all triggers that match the event"""
-        matching_ids = []
-
-        for trigger_id, trigger in self.triggers.items():
-            if trigger.matches_event(event_data):
-                matching_ids.append(trigger_id)
-
-        return matching_ids
+    def find_matching_triggers(self, event_data: Dict[str, Any], event_type: Any = None) -> List[str]:
+        """Find all triggers that match the event (of the given type, if any)"""
+        return self.router.route(event_type, event_data)
 
 
 def validate_webhook_config(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -6,7 +6,8 @@ Manage workflow variables with type validation and resolution
 from typing import Dict, Any, List, Optional
 from enum import Enum
 from datetime import datetime
-import re
+
+from .expressions import compile_path, compile_template
 
 
 class VariableType(Enum):
@@ -127,37 +128,14 @@ class VariableManager:
         if not text:
             return text
 
-        # Find all {{variableName}} patterns
-        pattern = r'\{\{([^}]+)\}\}'
-        matches = re.findall(pattern, text)
-
-        result = text
-        for match in matches:
-            # Get value from context using dot notation
-            value = self._get_nested_value(context, match.strip())
-            if value is not None:
-                result = result.replace(f"{{{{{match}}}}}", str(value))
-
-        return result
+        return compile_template(text).render(context)
 
     def _get_nested_value(self, data: Dict, path: str) -> Any:
         """Get nested value using dot notation"""
         if not path or not isinstance(data, dict):
             return None
 
-        keys = path.split(".")
-        value = data
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                return None
-
-            if value is None:
-                return None
-
-        return value
+        return compile_path(path)(data)
 
 
 def resolve_variables_in_text(text: str, context: Dict[str, Any]) -> str:
@@ -175,26 +153,4 @@ def resolve_variables_in_text(text: str, context: Dict[str, Any]) -> str:
     if not text:
         return text
 
-    pattern = r'\{\{([^}]+)\}\}'
-    matches = re.findall(pattern, text)
-
-    result = text
-    for match in matches:
-        # Get value from context
-        keys = match.strip().split(".")
-        value = context
-
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            else:
-                value = None
-                break
-
-            if value is None:
-                break
-
-        if value is not None:
-            result = result.replace(f"{{{{{match}}}}}", str(value))
-
-    return result
+    return compile_template(text).render(context)
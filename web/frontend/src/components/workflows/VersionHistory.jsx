@@ -319,6 +319,12 @@ export function VersionHistory({ workflowId, currentBranch, onRestore, onClose }
                     ~{selectedCommit.diff.summary.nodes_modified}
                   </span>
                 </div>
+                <div className="diff-stat">
+                  <span className="stat-label">Nodes Moved:</span>
+                  <span className="stat-value modified">
+                    {selectedCommit.diff.summary.nodes_moved}
+                  </span>
+                </div>
               </div>
 
               {/* Added Nodes */}
@@ -339,7 +345,7 @@ export function VersionHistory({ workflowId, currentBranch, onRestore, onClose }
                   <h5>Removed Nodes</h5>
                   {selectedCommit.diff.removed_nodes.map((node) => (
                     <div key={node.id} className="diff-node removed">
-                      <span>- {node.data?.title || node.id}</span>
+                      <span>- {node.title || node.id}</span>
                     </div>
                   ))}
                 </div>
@@ -351,7 +357,20 @@ export function VersionHistory({ workflowId, currentBranch, onRestore, onClose }
                   <h5>Modified Nodes</h5>
                   {selectedCommit.diff.modified_nodes.map((mod) => (
                     <div key={mod.id} className="diff-node modified">
-                      <span>~ {mod.before.data?.title || mod.id}</span>
+                      <span>~ {mod.title || mod.id}</span>
+                      <span> ({mod.changes.map((change) => change.path.slice(1)).join(', ')})</span>
+                    </div>
+                  ))}
+                </div>
+              )}
+
+              {/* Moved Nodes */}
+              {selectedCommit.diff.moved_nodes.length > 0 && (
+                <div className="diff-section">
+                  <h5>Moved Nodes</h5>
+                  {selectedCommit.diff.moved_nodes.map((node) => (
+                    <div key={node.id} className="diff-node modified">
+                      <span>↔ {node.title || node.id}</span>
                     </div>
                   ))}
                 </div>